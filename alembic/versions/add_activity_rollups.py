@@ -0,0 +1,62 @@
+"""Add activity rollup tables for dashboard heatmap, yearly and usage views
+
+Revision ID: add_activity_rollups
+Revises: add_lead_custom_tags
+Create Date: 2026-10-18
+
+Adds:
+- activity_rollups: hour/day/week activity counts per tenant and channel
+- activity_rollup_watermarks: per-tenant incremental rollup progress
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_activity_rollups'
+down_revision = 'add_lead_custom_tags'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'activity_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('granularity', sa.String(length=10), nullable=False),
+        sa.Column('channel', sa.String(length=20), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('inbound_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('outbound_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_seconds', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'tenant_id', 'granularity', 'channel', 'bucket_start',
+            name='uix_activity_rollup_bucket',
+        ),
+    )
+    op.create_index('ix_activity_rollups_id', 'activity_rollups', ['id'])
+    op.create_index(
+        'ix_activity_rollup_tenant_gran_bucket',
+        'activity_rollups',
+        ['tenant_id', 'granularity', 'bucket_start'],
+    )
+
+    op.create_table(
+        'activity_rollup_watermarks',
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('rolled_up_through', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id']),
+        sa.PrimaryKeyConstraint('tenant_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('activity_rollup_watermarks')
+    op.drop_index('ix_activity_rollup_tenant_gran_bucket', table_name='activity_rollups')
+    op.drop_index('ix_activity_rollups_id', table_name='activity_rollups')
+    op.drop_table('activity_rollups')
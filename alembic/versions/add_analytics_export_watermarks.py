@@ -0,0 +1,31 @@
+"""Add analytics export watermarks
+
+Revision ID: add_analytics_export_watermarks
+Revises: add_jackrabbit_sync_upsert_keys
+Create Date: 2026-10-18
+
+Adds analytics_export_watermarks: per-table progress of the incremental
+Parquet export of conversation history.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_analytics_export_watermarks'
+down_revision = 'add_jackrabbit_sync_upsert_keys'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'analytics_export_watermarks',
+        sa.Column('table_name', sa.String(length=50), nullable=False),
+        sa.Column('exported_through', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('table_name'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('analytics_export_watermarks')
@@ -0,0 +1,28 @@
+"""Add call recording metadata
+
+Revision ID: add_call_recording_metadata
+Revises: add_webhook_events
+Create Date: 2026-10-18
+
+Adds calls.recording_conversation_id (Telnyx AI conversation used to look
+up the recording when it is viewed) and calls.recording_storage_path (our
+mirrored copy of the recording).
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = 'add_call_recording_metadata'
+down_revision = 'add_webhook_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('calls', sa.Column('recording_conversation_id', sa.String(length=255), nullable=True))
+    op.add_column('calls', sa.Column('recording_storage_path', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('calls', 'recording_storage_path')
+    op.drop_column('calls', 'recording_conversation_id')
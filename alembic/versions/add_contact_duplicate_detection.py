@@ -0,0 +1,103 @@
+"""Add incremental duplicate-contact detection tables
+
+Revision ID: add_contact_duplicate_detection
+Revises: add_normalized_contact_keys
+Create Date: 2026-10-18
+
+Adds:
+- contacts.name_key: phonetic blocking key (filled by the model / first refresh)
+- contacts.dedup_pending: set when matching fields change; existing rows
+  start pending so the worker sweep builds the initial clusters
+- contact_duplicate_pairs: scored candidate pairs
+- contact_duplicate_clusters: connected groups served by /contacts/duplicates
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = 'add_contact_duplicate_detection'
+down_revision = 'add_normalized_contact_keys'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('contacts', sa.Column('name_key', sa.String(length=20), nullable=True))
+    op.add_column(
+        'contacts',
+        sa.Column('dedup_pending', sa.Boolean(), nullable=False, server_default=sa.text('true')),
+    )
+    op.create_index('ix_contacts_tenant_name_key', 'contacts', ['tenant_id', 'name_key'])
+    op.create_index(
+        'ix_contacts_dedup_pending',
+        'contacts',
+        ['tenant_id'],
+        postgresql_where=sa.text('dedup_pending'),
+    )
+
+    op.create_table(
+        'contact_duplicate_pairs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('contact_id', sa.Integer(), nullable=False),
+        sa.Column('other_contact_id', sa.Integer(), nullable=False),
+        sa.Column('confidence', sa.Float(), nullable=False),
+        sa.Column('match_type', sa.String(length=20), nullable=False),
+        sa.Column('match_value', sa.String(length=255), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['contact_id'], ['contacts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['other_contact_id'], ['contacts.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'tenant_id', 'contact_id', 'other_contact_id',
+            name='uix_contact_duplicate_pair',
+        ),
+    )
+    op.create_index('ix_contact_duplicate_pairs_id', 'contact_duplicate_pairs', ['id'])
+    op.create_index(
+        'ix_contact_duplicate_pairs_other',
+        'contact_duplicate_pairs',
+        ['tenant_id', 'other_contact_id'],
+    )
+
+    op.create_table(
+        'contact_duplicate_clusters',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('contact_ids', postgresql.ARRAY(sa.Integer()), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('confidence', sa.Float(), nullable=False),
+        sa.Column('match_type', sa.String(length=20), nullable=False),
+        sa.Column('match_value', sa.String(length=255), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_contact_duplicate_clusters_id', 'contact_duplicate_clusters', ['id'])
+    op.create_index(
+        'ix_contact_duplicate_clusters_tenant_confidence',
+        'contact_duplicate_clusters',
+        ['tenant_id', 'confidence', 'id'],
+    )
+    op.create_index(
+        'ix_contact_duplicate_clusters_members',
+        'contact_duplicate_clusters',
+        ['contact_ids'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contact_duplicate_clusters_members', table_name='contact_duplicate_clusters')
+    op.drop_index('ix_contact_duplicate_clusters_tenant_confidence', table_name='contact_duplicate_clusters')
+    op.drop_index('ix_contact_duplicate_clusters_id', table_name='contact_duplicate_clusters')
+    op.drop_table('contact_duplicate_clusters')
+    op.drop_index('ix_contact_duplicate_pairs_other', table_name='contact_duplicate_pairs')
+    op.drop_index('ix_contact_duplicate_pairs_id', table_name='contact_duplicate_pairs')
+    op.drop_table('contact_duplicate_pairs')
+    op.drop_index('ix_contacts_dedup_pending', table_name='contacts')
+    op.drop_index('ix_contacts_tenant_name_key', table_name='contacts')
+    op.drop_column('contacts', 'dedup_pending')
+    op.drop_column('contacts', 'name_key')
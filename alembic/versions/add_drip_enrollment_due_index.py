@@ -0,0 +1,30 @@
+"""Add partial index for batch drip dispatch claims
+
+Revision ID: add_drip_enrollment_due_index
+Revises: add_widget_event_settings_hash
+Create Date: 2026-10-18
+
+The batch drip dispatcher claims active enrollments without a pending Cloud
+Task whose next_step_at has passed (FOR UPDATE SKIP LOCKED, oldest first).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_drip_enrollment_due_index'
+down_revision = 'add_widget_event_settings_hash'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_drip_enrollments_due',
+        'drip_enrollments',
+        ['next_step_at'],
+        postgresql_where=sa.text("status = 'active' AND next_task_id IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_drip_enrollments_due', table_name='drip_enrollments')
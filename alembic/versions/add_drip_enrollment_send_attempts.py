@@ -0,0 +1,29 @@
+"""Add send_attempts to drip_enrollments
+
+Revision ID: add_drip_enrollment_send_attempts
+Revises: narrow_widget_settings_hash_index
+Create Date: 2026-10-18
+
+Counts failed batch-dispatch tries at an enrollment's current step, so
+steps that can't be sent back off and are eventually cancelled instead of
+being retried every lease period.
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = 'add_drip_enrollment_send_attempts'
+down_revision = 'narrow_widget_settings_hash_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'drip_enrollments',
+        sa.Column('send_attempts', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('drip_enrollments', 'send_attempts')
@@ -0,0 +1,76 @@
+"""Unique Jackrabbit keys and sync hashes for bulk family sync
+
+Revision ID: add_jackrabbit_sync_upsert_keys
+Revises: add_drip_enrollment_due_index
+Create Date: 2026-10-18
+
+The bulk Jackrabbit sync writes with INSERT ... ON CONFLICT, which needs
+unique arbiters: (tenant_id, jackrabbit_id) on jackrabbit_customers and
+(tenant_id, external_customer_id) on customers. Existing duplicates are
+resolved first, keeping the most recently updated row:
+
+- jackrabbit_customers: customers are repointed to the kept cache row and
+  the older cache rows are deleted.
+- customers: older rows keep their data but lose external_customer_id.
+
+sync_hash stores a hash of the last synced source record so unchanged
+families can be skipped.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_jackrabbit_sync_upsert_keys'
+down_revision = 'add_drip_enrollment_due_index'
+branch_labels = None
+depends_on = None
+
+_RANKED_JACKRABBIT = """
+    SELECT id, first_value(id) OVER (
+        PARTITION BY tenant_id, jackrabbit_id ORDER BY updated_at DESC, id DESC
+    ) AS keep_id
+    FROM jackrabbit_customers
+"""
+
+
+def upgrade() -> None:
+    op.add_column('customers', sa.Column('sync_hash', sa.String(length=32), nullable=True))
+    op.add_column('jackrabbit_customers', sa.Column('sync_hash', sa.String(length=32), nullable=True))
+
+    op.execute(f"""
+        UPDATE customers c SET jackrabbit_customer_id = r.keep_id
+        FROM ({_RANKED_JACKRABBIT}) r
+        WHERE c.jackrabbit_customer_id = r.id AND r.id <> r.keep_id
+    """)
+    op.execute(f"""
+        DELETE FROM jackrabbit_customers j
+        USING ({_RANKED_JACKRABBIT}) r
+        WHERE j.id = r.id AND r.id <> r.keep_id
+    """)
+    op.execute("""
+        UPDATE customers SET external_customer_id = NULL
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (
+                    PARTITION BY tenant_id, external_customer_id ORDER BY updated_at DESC, id DESC
+                ) AS rn
+                FROM customers
+                WHERE external_customer_id IS NOT NULL
+            ) d
+            WHERE rn > 1
+        )
+    """)
+
+    op.drop_index('ix_jackrabbit_tenant_jid', table_name='jackrabbit_customers')
+    op.create_index('ix_jackrabbit_tenant_jid', 'jackrabbit_customers', ['tenant_id', 'jackrabbit_id'], unique=True)
+    op.drop_index('ix_customers_tenant_external_id', table_name='customers')
+    op.create_index('ix_customers_tenant_external_id', 'customers', ['tenant_id', 'external_customer_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_customers_tenant_external_id', table_name='customers')
+    op.create_index('ix_customers_tenant_external_id', 'customers', ['tenant_id', 'external_customer_id'], unique=False)
+    op.drop_index('ix_jackrabbit_tenant_jid', table_name='jackrabbit_customers')
+    op.create_index('ix_jackrabbit_tenant_jid', 'jackrabbit_customers', ['tenant_id', 'jackrabbit_id'], unique=False)
+    op.drop_column('jackrabbit_customers', 'sync_hash')
+    op.drop_column('customers', 'sync_hash')
@@ -0,0 +1,57 @@
+"""Add normalized phone/email lookup columns to contacts, leads and customers
+
+Revision ID: add_normalized_contact_keys
+Revises: add_notification_deliveries
+Create Date: 2026-10-18
+
+Adds phone_last10 and email_normalized to contacts, leads, customers and
+jackrabbit_customers, backfills them from the raw columns and indexes them
+per tenant. The models keep them in sync on assignment (app.core.phone
+phone_match_key / normalize_email), so lookups can use plain equality
+instead of regexp_replace()/lower() over every row.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_normalized_contact_keys'
+down_revision = 'add_notification_deliveries'
+branch_labels = None
+depends_on = None
+
+
+# (table, raw phone column, index prefix)
+TABLES = [
+    ('contacts', 'phone', 'ix_contacts'),
+    ('leads', 'phone', 'ix_leads'),
+    ('customers', 'phone', 'ix_customers'),
+    ('jackrabbit_customers', 'phone_number', 'ix_jackrabbit'),
+]
+
+
+def upgrade() -> None:
+    for table, phone_column, prefix in TABLES:
+        op.add_column(table, sa.Column('email_normalized', sa.String(length=255), nullable=True))
+        op.add_column(table, sa.Column('phone_last10', sa.String(length=10), nullable=True))
+
+        # Must match app.core.phone.phone_match_key / normalize_email
+        op.execute(f"""
+            UPDATE {table}
+            SET phone_last10 = CASE
+                    WHEN length(regexp_replace({phone_column}, '[^0-9]', '', 'g')) >= 10
+                    THEN right(regexp_replace({phone_column}, '[^0-9]', '', 'g'), 10)
+                END,
+                email_normalized = NULLIF(lower(btrim(email)), '')
+            WHERE {phone_column} IS NOT NULL OR email IS NOT NULL
+        """)
+
+        op.create_index(f'{prefix}_tenant_phone_last10', table, ['tenant_id', 'phone_last10'])
+        op.create_index(f'{prefix}_tenant_email_normalized', table, ['tenant_id', 'email_normalized'])
+
+
+def downgrade() -> None:
+    for table, _, prefix in reversed(TABLES):
+        op.drop_index(f'{prefix}_tenant_email_normalized', table_name=table)
+        op.drop_index(f'{prefix}_tenant_phone_last10', table_name=table)
+        op.drop_column(table, 'phone_last10')
+        op.drop_column(table, 'email_normalized')
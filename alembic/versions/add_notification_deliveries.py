@@ -0,0 +1,57 @@
+"""Add notification_deliveries outbox table
+
+Revision ID: add_notification_deliveries
+Revises: add_activity_rollups
+Create Date: 2026-10-18
+
+Email/SMS admin notifications are written here and sent asynchronously
+by the notification dispatcher, which records status and retries.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_notification_deliveries'
+down_revision = 'add_activity_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'notification_deliveries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('tenant_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('channel', sa.String(length=20), nullable=False),
+        sa.Column('notification_type', sa.String(length=50), nullable=False),
+        sa.Column('recipient', sa.String(length=255), nullable=True),
+        sa.Column('subject', sa.String(length=255), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('extra_data', sa.JSON(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('provider_message_id', sa.String(length=255), nullable=True),
+        sa.Column('sent_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_notification_deliveries_id', 'notification_deliveries', ['id'])
+    op.create_index('ix_notification_deliveries_tenant_id', 'notification_deliveries', ['tenant_id'])
+    op.create_index(
+        'ix_notification_deliveries_status_next',
+        'notification_deliveries',
+        ['status', 'next_attempt_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notification_deliveries_status_next', table_name='notification_deliveries')
+    op.drop_index('ix_notification_deliveries_tenant_id', table_name='notification_deliveries')
+    op.drop_index('ix_notification_deliveries_id', table_name='notification_deliveries')
+    op.drop_table('notification_deliveries')
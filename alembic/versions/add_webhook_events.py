@@ -0,0 +1,48 @@
+"""Add webhook event inbox
+
+Revision ID: add_webhook_events
+Revises: add_analytics_export_watermarks
+Create Date: 2026-10-18
+
+Adds webhook_events: raw provider webhooks stored on receipt and processed
+asynchronously, in order per ordering_key, with retries and dead-lettering.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_webhook_events'
+down_revision = 'add_analytics_export_watermarks'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'webhook_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('provider', sa.String(length=20), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=255), nullable=False),
+        sa.Column('ordering_key', sa.String(length=255), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('processed_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('now()')),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('provider', 'idempotency_key', name='uq_webhook_events_idempotency'),
+    )
+    op.create_index('ix_webhook_events_id', 'webhook_events', ['id'])
+    op.create_index('ix_webhook_events_status_next', 'webhook_events', ['status', 'next_attempt_at'])
+    op.create_index('ix_webhook_events_ordering', 'webhook_events', ['ordering_key', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_webhook_events_ordering', table_name='webhook_events')
+    op.drop_index('ix_webhook_events_status_next', table_name='webhook_events')
+    op.drop_index('ix_webhook_events_id', table_name='webhook_events')
+    op.drop_table('webhook_events')
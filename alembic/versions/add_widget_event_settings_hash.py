@@ -0,0 +1,76 @@
+"""Add settings_hash to widget_events for server-side A/B grouping
+
+Revision ID: add_widget_event_settings_hash
+Revises: add_contact_duplicate_detection
+Create Date: 2026-10-18
+
+Adds widget_events.settings_hash (the variant key the settings-snapshots
+analytics endpoint groups by), backfills it for existing snapshot rows and
+adds a partial (tenant_id, created_at, settings_hash, visitor_id) index so
+the per-variant aggregate can be answered from the index.
+
+The hash is md5 of the snapshot JSON serialized with sorted keys in Python,
+matching app.persistence.models.widget_event.settings_hash, so the backfill
+runs in Python rather than SQL (jsonb text output orders keys differently).
+"""
+import hashlib
+import json
+from collections import defaultdict
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'add_widget_event_settings_hash'
+down_revision = 'add_contact_duplicate_detection'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+
+def _settings_hash(snapshot):
+    return hashlib.md5(json.dumps(snapshot, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def upgrade() -> None:
+    op.add_column('widget_events', sa.Column('settings_hash', sa.String(length=12), nullable=True))
+
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text("""
+                SELECT id, settings_snapshot::text AS snapshot
+                FROM widget_events
+                WHERE id > :last_id AND settings_snapshot IS NOT NULL
+                ORDER BY id
+                LIMIT :batch
+            """),
+            {"last_id": last_id, "batch": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        ids_by_hash = defaultdict(list)
+        for row in rows:
+            snapshot = json.loads(row.snapshot)
+            if snapshot:
+                ids_by_hash[_settings_hash(snapshot)].append(row.id)
+        for settings_hash, ids in ids_by_hash.items():
+            bind.execute(
+                sa.text("UPDATE widget_events SET settings_hash = :hash WHERE id = ANY(:ids)"),
+                {"hash": settings_hash, "ids": ids},
+            )
+        last_id = rows[-1].id
+
+    op.create_index(
+        'ix_widget_events_tenant_settings_hash',
+        'widget_events',
+        ['tenant_id', 'created_at', 'settings_hash', 'visitor_id'],
+        postgresql_where=sa.text('settings_hash IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_widget_events_tenant_settings_hash', table_name='widget_events')
+    op.drop_column('widget_events', 'settings_hash')
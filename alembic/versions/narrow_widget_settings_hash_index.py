@@ -0,0 +1,40 @@
+"""Limit the widget settings_hash index to impressions
+
+Revision ID: narrow_widget_settings_hash_index
+Revises: add_call_recording_metadata
+Create Date: 2026-10-18
+
+The settings-snapshots aggregate only reads impression events, so the
+partial (tenant_id, created_at, settings_hash, visitor_id) index is rebuilt
+with event_type = 'impression' in its predicate. Open events carrying a
+snapshot no longer bloat it, and the planner can use it for the
+event_type filter without rechecking the heap.
+"""
+import sqlalchemy as sa
+
+from alembic import op
+
+revision = 'narrow_widget_settings_hash_index'
+down_revision = 'add_call_recording_metadata'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_widget_events_tenant_settings_hash', table_name='widget_events')
+    op.create_index(
+        'ix_widget_events_tenant_settings_hash',
+        'widget_events',
+        ['tenant_id', 'created_at', 'settings_hash', 'visitor_id'],
+        postgresql_where=sa.text("event_type = 'impression' AND settings_hash IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_widget_events_tenant_settings_hash', table_name='widget_events')
+    op.create_index(
+        'ix_widget_events_tenant_settings_hash',
+        'widget_events',
+        ['tenant_id', 'created_at', 'settings_hash', 'visitor_id'],
+        postgresql_where=sa.text('settings_hash IS NOT NULL'),
+    )
@@ -12,7 +12,9 @@ from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from app.core import metrics
 from app.core.idempotency import generate_idempotency_key
+from app.core.query_profiler import log_profile, start_profile
 from app.core.tenant_context import get_tenant_context, set_tenant_context
 from app.infrastructure.redis import redis_client
 from app.settings import settings
@@ -34,6 +36,9 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
     - Generates unique request IDs for correlation
     - Adds tenant context to Sentry
     - Logs request timing for performance monitoring
+    - Records request latency and per-request DB query count/time metrics
+    - With query_profiler_enabled, attributes statements to callers and
+      warns about repeated statement shapes (N+1)
     """
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
@@ -64,6 +69,8 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
 
         # Track request timing
         start_time = time.perf_counter()
+        db_stats = metrics.start_request_db_stats()
+        profile = start_profile(request.url.path) if settings.query_profiler_enabled else None
 
         try:
             response = await call_next(request)
@@ -73,17 +80,33 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
             raise
         finally:
             # Log request completion with timing
-            duration_ms = (time.perf_counter() - start_time) * 1000
+            duration = time.perf_counter() - start_time
+            duration_ms = duration * 1000
             path = str(request.url.path)
+            status_code = response.status_code if "response" in locals() else 500
+
+            # Label by route template (bounded cardinality), not raw path
+            route = request.scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            metrics.HTTP_REQUEST_DURATION.observe(
+                duration, route_label, request.method, f"{status_code // 100}xx"
+            )
+            metrics.DB_QUERIES_PER_REQUEST.observe(db_stats[0], route_label)
+            metrics.DB_TIME_PER_REQUEST.observe(db_stats[1], route_label)
+            if profile is not None:
+                profile.label = f"{request.method} {route_label}"
+                log_profile(profile, settings.query_profiler_n_plus_one_threshold)
 
             # Skip logging for health checks and static files
-            if not any(skip in path for skip in ["/health", "/static", "/assets"]):
+            if not any(skip in path for skip in ["/health", "/metrics", "/static", "/assets"]):
                 log_data = {
                     "request_id": request_id,
                     "method": request.method,
                     "path": path,
-                    "status_code": response.status_code if "response" in locals() else 500,
+                    "status_code": status_code,
                     "duration_ms": round(duration_ms, 2),
+                    "db_queries": db_stats[0],
+                    "db_time_ms": round(db_stats[1] * 1000, 2),
                 }
                 if tenant_id:
                     log_data["tenant_id"] = tenant_id
@@ -65,6 +65,7 @@ async def create_or_update_sms_config(
         SMS configuration
     """
     from sqlalchemy import select
+    from app.infrastructure.telephony.factory import invalidate_telephony_config
     from app.persistence.models.tenant_sms_config import TenantSmsConfig
     
     current_user, tenant_id = admin_data
@@ -108,6 +109,8 @@ async def create_or_update_sms_config(
         db.add(config)
         await db.commit()
         await db.refresh(config)
+
+    invalidate_telephony_config(tenant_id)
     
     return SmsConfigResponse(
         id=config.id,
@@ -11,6 +11,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import require_global_admin, require_tenant_context
+from app.infrastructure.telephony.factory import invalidate_telephony_config
 from app.persistence.database import get_db
 from app.persistence.models.tenant import User
 from app.persistence.models.tenant_sms_config import TenantSmsConfig
@@ -193,6 +194,7 @@ async def create_or_update_telephony_config(
         await db.commit()
         await db.refresh(config)
 
+    invalidate_telephony_config(tenant_id)
     logger.info(f"Updated telephony config for tenant {tenant_id}")
 
     return _config_to_response(config)
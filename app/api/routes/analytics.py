@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import aliased
 
 from app.api.deps import require_tenant_context
+from app.api.exports import ExportFormat, export_response
 from app.api.analytics_deps import (
     AnalyticsContext7d,
     AnalyticsContext30d,
@@ -19,7 +20,8 @@ from app.api.analytics_deps import (
     normalize_date,
     resolve_timezone,
 )
-from app.persistence.database import get_db
+from app.persistence.database import get_db, get_read_db
+from app.domain.services.activity_rollup_service import ActivityRollupService
 from app.domain.services.pushback_detector import PushbackDetector
 from app.domain.services.repetition_detector import RepetitionDetector
 from app.persistence.models.call import Call
@@ -76,100 +78,38 @@ def _day_bucket(column, timezone_name: str, use_timezone: bool):
 
 @router.get("/usage", response_model=UsageResponse)
 async def get_usage(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     ctx: AnalyticsContext7d,
 ) -> UsageResponse:
-    """Get daily usage metrics for SMS, chatbot, and calls."""
-    use_timezone = _supports_timezone(db)
-
-    sms_day = _day_bucket(Message.created_at, ctx.timezone, use_timezone)
-    sms_stmt = (
-        select(
-            sms_day,
-            Message.role.label("role"),
-            func.count(Message.id).label("count"),
-        )
-        .select_from(Message)
-        .join(Conversation, Conversation.id == Message.conversation_id)
-        .where(
-            Conversation.tenant_id == ctx.tenant_id,
-            Conversation.channel == "sms",
-            Message.role.in_(["user", "assistant"]),
-            Message.created_at >= ctx.start_datetime,
-            Message.created_at <= ctx.end_datetime,
-        )
-        .group_by(sms_day, Message.role)
-    )
-    sms_result = await db.execute(sms_stmt)
-
-    sms_in = {}
-    sms_out = {}
-    for row in sms_result:
-        day = normalize_date(row.day)
-        if not day:
-            continue
-        if row.role == "user":
-            sms_in[day] = int(row.count or 0)
-        elif row.role == "assistant":
-            sms_out[day] = int(row.count or 0)
-
-    chat_day = _day_bucket(Message.created_at, ctx.timezone, use_timezone)
-    chat_stmt = (
-        select(
-            chat_day,
-            func.count(Message.id).label("count"),
-        )
-        .select_from(Message)
-        .join(Conversation, Conversation.id == Message.conversation_id)
-        .where(
-            Conversation.tenant_id == ctx.tenant_id,
-            Conversation.channel == "web",
-            Message.role == "user",
-            Message.created_at >= ctx.start_datetime,
-            Message.created_at <= ctx.end_datetime,
-        )
-        .group_by(chat_day)
-    )
-    chat_result = await db.execute(chat_stmt)
+    """Get daily usage metrics for SMS, chatbot, and calls.
 
-    chat_interactions = {}
-    for row in chat_result:
-        day = normalize_date(row.day)
-        if not day:
-            continue
-        chat_interactions[day] = int(row.count or 0)
-
-    call_timestamp = func.coalesce(Call.started_at, Call.created_at)
-    calls_day = _day_bucket(call_timestamp, ctx.timezone, use_timezone)
-    duration_seconds = func.coalesce(
-        func.nullif(Call.duration, 0),
-        func.extract("epoch", Call.ended_at - Call.started_at),
-        0,
-    )
-    calls_stmt = (
-        select(
-            calls_day,
-            func.sum(duration_seconds).label("duration_seconds"),
-            func.count(Call.id).label("call_count"),
-        )
-        .where(
-            Call.tenant_id == ctx.tenant_id,
-            call_timestamp >= ctx.start_datetime,
-            call_timestamp <= ctx.end_datetime,
-        )
-        .group_by(calls_day)
+    Reads hourly activity rollups and buckets them into the tenant's local
+    days (timezones with sub-hour offsets are bucketed by hour start).
+    """
+    buckets = await ActivityRollupService(db).get_buckets(
+        ctx.tenant_id,
+        "hour",
+        ctx.start_datetime,
+        ctx.end_datetime + timedelta(microseconds=1),
     )
-    calls_result = await db.execute(calls_stmt)
 
-    call_minutes = {}
-    call_counts = {}
-    for row in calls_result:
-        day = normalize_date(row.day)
-        if not day:
-            continue
-        seconds = float(row.duration_seconds or 0)
-        call_minutes[day] = round(seconds / 60, 2)
-        call_counts[day] = int(row.call_count or 0)
+    tz = pytz.timezone(ctx.timezone)
+    sms_in: dict[date, int] = {}
+    sms_out: dict[date, int] = {}
+    chat_interactions: dict[date, int] = {}
+    call_counts: dict[date, int] = {}
+    call_seconds: dict[date, float] = {}
+    for b in buckets:
+        day = pytz.UTC.localize(b.bucket_start).astimezone(tz).date()
+        if b.channel == "sms":
+            sms_in[day] = sms_in.get(day, 0) + b.inbound
+            sms_out[day] = sms_out.get(day, 0) + b.outbound
+        elif b.channel == "web":
+            chat_interactions[day] = chat_interactions.get(day, 0) + b.inbound
+        elif b.channel == "call":
+            call_counts[day] = call_counts.get(day, 0) + b.total
+            call_seconds[day] = call_seconds.get(day, 0.0) + b.duration_seconds
+    call_minutes = {day: round(seconds / 60, 2) for day, seconds in call_seconds.items()}
 
     series = []
     current = ctx.start_date
@@ -392,7 +332,7 @@ class ConversationAnalyticsResponse(BaseModel):
 
 @router.get("/conversations", response_model=ConversationAnalyticsResponse)
 async def get_conversation_analytics(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     ctx: AnalyticsContext30d,
 ) -> ConversationAnalyticsResponse:
     """Get conversation analytics including length, escalation rate, intents, and response times."""
@@ -1389,7 +1329,7 @@ class WidgetAnalyticsResponse(BaseModel):
 
 @router.get("/widget", response_model=WidgetAnalyticsResponse)
 async def get_widget_analytics(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     ctx: AnalyticsContext30d,
 ) -> WidgetAnalyticsResponse:
     """Get widget engagement analytics including visibility and attention metrics."""
@@ -1500,6 +1440,9 @@ class SettingsVariationMetrics(BaseModel):
     open_rate: float
     manual_opens: int
     auto_opens: int
+    unique_visitors: int = 0
+    converted_visitors: int = 0  # Visitors with at least one open event
+    conversion_rate: float = 0.0
     first_seen: str
     last_seen: str
 
@@ -1524,127 +1467,105 @@ class SettingsSnapshotsResponse(BaseModel):
 
 @router.get("/widget/settings-snapshots", response_model=SettingsSnapshotsResponse)
 async def get_widget_settings_snapshots(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     ctx: AnalyticsContext30d,
 ) -> SettingsSnapshotsResponse:
-    """Get unique widget settings configurations and their performance metrics for A/B testing analysis."""
-    # Get all impression events with settings snapshots
-    impressions_stmt = (
+    """Get unique widget settings configurations and their performance metrics for A/B testing analysis.
+
+    Impressions are grouped by the settings_hash stored at ingest. Opens are
+    attributed to every variant the opening visitor saw in the range.
+    """
+    in_range = (
+        WidgetEvent.tenant_id == ctx.tenant_id,
+        WidgetEvent.created_at >= ctx.start_datetime,
+        WidgetEvent.created_at <= ctx.end_datetime,
+    )
+
+    # Impressions per (variant, visitor)
+    variant_visitors = (
         select(
-            WidgetEvent.settings_snapshot,
+            WidgetEvent.settings_hash,
             WidgetEvent.visitor_id,
-            WidgetEvent.created_at,
+            func.count().label("impressions"),
+            func.min(WidgetEvent.created_at).label("first_seen"),
+            func.max(WidgetEvent.created_at).label("last_seen"),
+            func.max(WidgetEvent.id).label("sample_id"),
         )
         .where(
-            WidgetEvent.tenant_id == ctx.tenant_id,
+            *in_range,
             WidgetEvent.event_type == "impression",
-            WidgetEvent.created_at >= ctx.start_datetime,
-            WidgetEvent.created_at <= ctx.end_datetime,
-            WidgetEvent.settings_snapshot.isnot(None),
+            WidgetEvent.settings_hash.isnot(None),
         )
+        .group_by(WidgetEvent.settings_hash, WidgetEvent.visitor_id)
+        .cte("variant_visitors")
     )
-    impressions_result = await db.execute(impressions_stmt)
-
-    # Group impressions by settings snapshot
-    import hashlib
-    import json
-
-    settings_groups: dict[str, dict] = {}
-
-    for row in impressions_result:
-        settings = row.settings_snapshot
-        if not settings:
-            continue
 
-        # Create a hash of the settings for grouping
-        settings_str = json.dumps(settings, sort_keys=True)
-        settings_hash = hashlib.md5(settings_str.encode()).hexdigest()[:12]
-
-        if settings_hash not in settings_groups:
-            settings_groups[settings_hash] = {
-                "settings": settings,
-                "visitor_ids": set(),
-                "first_seen": row.created_at,
-                "last_seen": row.created_at,
-                "impressions": 0,
-            }
+    # Open events per visitor who saw any variant
+    visitor_opens = (
+        select(
+            WidgetEvent.visitor_id,
+            func.count().filter(WidgetEvent.event_type == "widget_open").label("widget_opens"),
+            func.count().filter(WidgetEvent.event_type == "manual_open").label("manual_opens"),
+            func.count().filter(WidgetEvent.event_type == "auto_open").label("auto_opens"),
+        )
+        .where(
+            *in_range,
+            WidgetEvent.event_type.in_(["widget_open", "manual_open", "auto_open"]),
+            WidgetEvent.visitor_id.in_(select(variant_visitors.c.visitor_id)),
+        )
+        .group_by(WidgetEvent.visitor_id)
+        .cte("visitor_opens")
+    )
 
-        group = settings_groups[settings_hash]
-        group["visitor_ids"].add(row.visitor_id)
-        group["impressions"] += 1
-        if row.created_at < group["first_seen"]:
-            group["first_seen"] = row.created_at
-        if row.created_at > group["last_seen"]:
-            group["last_seen"] = row.created_at
-
-    # Get open events for each visitor to calculate conversion rates
-    if settings_groups:
-        all_visitor_ids = set()
-        for group in settings_groups.values():
-            all_visitor_ids.update(group["visitor_ids"])
-
-        opens_stmt = (
-            select(
-                WidgetEvent.visitor_id,
-                WidgetEvent.event_type,
-            )
-            .where(
-                WidgetEvent.tenant_id == ctx.tenant_id,
-                WidgetEvent.event_type.in_(["widget_open", "manual_open", "auto_open"]),
-                WidgetEvent.created_at >= ctx.start_datetime,
-                WidgetEvent.created_at <= ctx.end_datetime,
-                WidgetEvent.visitor_id.in_(list(all_visitor_ids)),
+    variants = (
+        select(
+            variant_visitors.c.settings_hash,
+            func.sum(variant_visitors.c.impressions).label("impressions"),
+            func.count().label("unique_visitors"),
+            func.count(visitor_opens.c.visitor_id).label("converted_visitors"),
+            func.coalesce(func.sum(visitor_opens.c.widget_opens), 0).label("widget_opens"),
+            func.coalesce(func.sum(visitor_opens.c.manual_opens), 0).label("manual_opens"),
+            func.coalesce(func.sum(visitor_opens.c.auto_opens), 0).label("auto_opens"),
+            func.min(variant_visitors.c.first_seen).label("first_seen"),
+            func.max(variant_visitors.c.last_seen).label("last_seen"),
+            func.max(variant_visitors.c.sample_id).label("sample_id"),
+        )
+        .select_from(variant_visitors)
+        .outerjoin(visitor_opens, visitor_opens.c.visitor_id == variant_visitors.c.visitor_id)
+        .group_by(variant_visitors.c.settings_hash)
+        .subquery("variants")
+    )
+
+    # One snapshot row per variant supplies the settings payload
+    result = await db.execute(
+        select(variants, WidgetEvent.settings_snapshot)
+        .join(WidgetEvent, WidgetEvent.id == variants.c.sample_id)
+        .order_by(variants.c.impressions.desc(), variants.c.settings_hash)
+    )
+
+    variations = []
+    for row in result:
+        impressions = int(row.impressions)
+        open_rate = row.widget_opens / impressions if impressions > 0 else 0
+        conversion_rate = row.converted_visitors / row.unique_visitors if row.unique_visitors else 0
+        variations.append(
+            SettingsVariation(
+                settings_hash=row.settings_hash,
+                settings=row.settings_snapshot,
+                metrics=SettingsVariationMetrics(
+                    impressions=impressions,
+                    widget_opens=row.widget_opens,
+                    open_rate=round(open_rate, 3),
+                    manual_opens=row.manual_opens,
+                    auto_opens=row.auto_opens,
+                    unique_visitors=row.unique_visitors,
+                    converted_visitors=row.converted_visitors,
+                    conversion_rate=round(conversion_rate, 3),
+                    first_seen=row.first_seen.isoformat(),
+                    last_seen=row.last_seen.isoformat(),
+                ),
             )
         )
-        opens_result = await db.execute(opens_stmt)
-
-        # Map visitors to their open events
-        visitor_opens: dict[str, dict] = {}
-        for row in opens_result:
-            if row.visitor_id not in visitor_opens:
-                visitor_opens[row.visitor_id] = {
-                    "widget_open": 0,
-                    "manual_open": 0,
-                    "auto_open": 0,
-                }
-            visitor_opens[row.visitor_id][row.event_type] += 1
-
-        # Calculate metrics for each settings variation
-        variations = []
-        for settings_hash, group in settings_groups.items():
-            widget_opens = 0
-            manual_opens = 0
-            auto_opens = 0
-
-            for visitor_id in group["visitor_ids"]:
-                if visitor_id in visitor_opens:
-                    widget_opens += visitor_opens[visitor_id]["widget_open"]
-                    manual_opens += visitor_opens[visitor_id]["manual_open"]
-                    auto_opens += visitor_opens[visitor_id]["auto_open"]
-
-            impressions = group["impressions"]
-            open_rate = widget_opens / impressions if impressions > 0 else 0
-
-            variations.append(
-                SettingsVariation(
-                    settings_hash=settings_hash,
-                    settings=group["settings"],
-                    metrics=SettingsVariationMetrics(
-                        impressions=impressions,
-                        widget_opens=widget_opens,
-                        open_rate=round(open_rate, 3),
-                        manual_opens=manual_opens,
-                        auto_opens=auto_opens,
-                        first_seen=group["first_seen"].isoformat(),
-                        last_seen=group["last_seen"].isoformat(),
-                    ),
-                )
-            )
-
-        # Sort by impressions descending
-        variations.sort(key=lambda v: v.metrics.impressions, reverse=True)
-    else:
-        variations = []
 
     return SettingsSnapshotsResponse(
         start_date=ctx.start_date.isoformat(),
@@ -1747,18 +1668,12 @@ async def _fetch_verified_customers(
         .correlate(Contact)
         .exists()
     )
-    _norm_contact_phone = func.right(
-        func.regexp_replace(Contact.phone, '[^0-9]', '', 'g'), 10
-    )
-    _norm_customer_phone = func.right(
-        func.regexp_replace(Customer.phone, '[^0-9]', '', 'g'), 10
-    )
     phone_match = (
         select(Contact.id)
         .where(
             Contact.tenant_id == tenant_id,
-            Contact.phone.isnot(None),
-            _norm_contact_phone == _norm_customer_phone,
+            Contact.phone_last10.isnot(None),
+            Contact.phone_last10 == Customer.phone_last10,
             Contact.deleted_at.is_(None),
             Contact.merged_into_contact_id.is_(None),
             has_chat_engagement | has_call_engagement,
@@ -1770,9 +1685,8 @@ async def _fetch_verified_customers(
         select(Contact.id)
         .where(
             Contact.tenant_id == tenant_id,
-            Contact.email.isnot(None),
-            Customer.email.isnot(None),
-            func.lower(Contact.email) == func.lower(Customer.email),
+            Contact.email_normalized.isnot(None),
+            Contact.email_normalized == Customer.email_normalized,
             Contact.deleted_at.is_(None),
             Contact.merged_into_contact_id.is_(None),
             has_chat_engagement | has_call_engagement,
@@ -1801,7 +1715,7 @@ async def _fetch_verified_customers(
 
 @router.get("/savings", response_model=SavingsAnalyticsResponse)
 async def get_savings_analytics(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     ctx: AnalyticsContext30d,
     sms_minutes_per_msg: Annotated[float, Query(ge=0.1, le=10.0)] = DEFAULT_SMS_MINUTES_PER_MESSAGE,
     web_minutes_per_msg: Annotated[float, Query(ge=0.1, le=10.0)] = DEFAULT_WEB_MINUTES_PER_MESSAGE,
@@ -2004,7 +1918,7 @@ class VerifiedEnrollmentsResponse(BaseModel):
 
 @router.get("/savings/verified-enrollments", response_model=VerifiedEnrollmentsResponse)
 async def get_verified_enrollments(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     tenant_id: Annotated[int, Depends(require_tenant_context)],
 ) -> VerifiedEnrollmentsResponse:
     """Return the detailed list of customers counted as verified enrollments."""
@@ -2026,16 +1940,15 @@ async def get_verified_enrollments(
 @router.get("/savings/export/{dataset}")
 async def export_savings_csv(
     dataset: str,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     tenant_id: Annotated[int, Depends(require_tenant_context)],
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "csv",
 ) -> StreamingResponse:
-    """Export customers, engaged contacts, or matched records as CSV.
+    """Export customers, engaged contacts, or matched records as CSV or NDJSON.
 
-    dataset: "customers", "contacts", or "matched"
+    dataset: "customers", "contacts", or "matched". Rows are streamed from
+    a server-side cursor rather than loaded up front.
     """
-    import csv
-    import io
-
     if dataset not in ("customers", "contacts", "matched"):
         raise HTTPException(status_code=400, detail="dataset must be customers, contacts, or matched")
 
@@ -2076,10 +1989,8 @@ async def export_savings_csv(
             .where(Customer.tenant_id == tenant_id)
             .order_by(Customer.name)
         )
-        result = await db.execute(stmt)
-        rows = result.all()
         headers = ["id", "name", "phone", "email", "status", "external_id"]
-        filename = "customers.csv"
+        filename = "customers"
 
     elif dataset == "contacts":
         # Contacts who actually engaged (sent a message or called)
@@ -2100,24 +2011,16 @@ async def export_savings_csv(
             )
             .order_by(Contact.name)
         )
-        result = await db.execute(stmt)
-        rows = result.all()
         headers = ["id", "name", "phone", "email", "source", "created_at"]
-        filename = "engaged_contacts.csv"
+        filename = "engaged_contacts"
 
     else:  # matched
-        _norm_contact_phone = func.right(
-            func.regexp_replace(Contact.phone, '[^0-9]', '', 'g'), 10
-        )
-        _norm_customer_phone = func.right(
-            func.regexp_replace(Customer.phone, '[^0-9]', '', 'g'), 10
-        )
         phone_match = (
             select(Contact.id)
             .where(
                 Contact.tenant_id == tenant_id,
-                Contact.phone.isnot(None),
-                _norm_contact_phone == _norm_customer_phone,
+                Contact.phone_last10.isnot(None),
+                Contact.phone_last10 == Customer.phone_last10,
                 Contact.deleted_at.is_(None),
                 Contact.merged_into_contact_id.is_(None),
                 has_chat_engagement | has_call_engagement,
@@ -2129,9 +2032,8 @@ async def export_savings_csv(
             select(Contact.id)
             .where(
                 Contact.tenant_id == tenant_id,
-                Contact.email.isnot(None),
-                Customer.email.isnot(None),
-                func.lower(Contact.email) == func.lower(Customer.email),
+                Contact.email_normalized.isnot(None),
+                Contact.email_normalized == Customer.email_normalized,
                 Contact.deleted_at.is_(None),
                 Contact.merged_into_contact_id.is_(None),
                 has_chat_engagement | has_call_engagement,
@@ -2153,23 +2055,10 @@ async def export_savings_csv(
             )
             .order_by(Customer.name)
         )
-        result = await db.execute(stmt)
-        rows = result.all()
         headers = ["customer_id", "customer_name", "customer_phone", "customer_email", "status"]
-        filename = "verified_matches.csv"
-
-    buf = io.StringIO()
-    writer = csv.writer(buf)
-    writer.writerow(headers)
-    for row in rows:
-        writer.writerow([str(v) if v is not None else "" for v in row])
+        filename = "verified_matches"
 
-    buf.seek(0)
-    return StreamingResponse(
-        iter([buf.getvalue()]),
-        media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename={filename}"},
-    )
+    return export_response(db, stmt, headers, filename, export_format)
 
 
 # ---------------------------------------------------------------------------
@@ -2211,7 +2100,7 @@ TOPIC_LABELS = {
 
 @router.get("/topics", response_model=TopicAnalyticsResponse)
 async def get_topic_analytics(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     ctx: AnalyticsContext30d,
     channel: Annotated[str | None, Query()] = None,
 ) -> TopicAnalyticsResponse:
@@ -2347,7 +2236,7 @@ class BillingUsageResponse(BaseModel):
 
 @router.get("/billing", response_model=BillingUsageResponse)
 async def get_billing_usage(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     tenant_id: Annotated[int, Depends(require_tenant_context)],
     year: Annotated[int | None, Query(ge=2020, le=2099)] = None,
     month: Annotated[int | None, Query(ge=1, le=12)] = None,
@@ -2359,7 +2248,7 @@ async def get_billing_usage(
     Returns call minutes and SMS counts vs. plan limits.
     """
     import calendar
-    from app.api.analytics_deps import get_tenant_timezone, resolve_timezone
+    from app.api.analytics_deps import get_tenant_timezone
 
     # Resolve timezone
     tenant_tz = await get_tenant_timezone(db, tenant_id)
@@ -2536,7 +2425,7 @@ class VoiceABTestAnalyticsResponse(BaseModel):
 
 @router.get("/voice-ab-test", response_model=VoiceABTestAnalyticsResponse)
 async def get_voice_ab_test_analytics(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     ctx: AnalyticsContext30d,
     test_id: Annotated[int | None, Query()] = None,
 ) -> VoiceABTestAnalyticsResponse:
@@ -2801,7 +2690,7 @@ class TelnyxSyncResponse(BaseModel):
 
 @router.get("/telnyx-sync", response_model=TelnyxSyncResponse)
 async def get_telnyx_sync_results(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     tenant_id: Annotated[int, Depends(require_tenant_context)],
     status_filter: str | None = Query(None, alias="status", description="Filter by status: open, backfilled, dismissed"),
     limit: int = Query(50, le=200),
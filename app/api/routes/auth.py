@@ -9,7 +9,7 @@ from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from pydantic import BaseModel
 
 from app.core.auth import create_access_token, decode_access_token
-from app.core.password import verify_password, hash_password
+from app.core.password import verify_password_async, hash_password_async
 from app.api.deps import get_current_user, is_global_admin
 from app.infrastructure.rate_limiter import rate_limit
 from app.domain.services.audit_service import AuditService
@@ -125,7 +125,7 @@ async def login(
     # Use a dummy hash if user doesn't exist so response time is constant
     dummy_hash = "$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/X4.V4ferYxZ1uYmWe"
     stored_hash = user.hashed_password if user else dummy_hash
-    password_valid = verify_password(login_data.password, stored_hash)
+    password_valid = await verify_password_async(login_data.password, stored_hash)
 
     if not user or not password_valid:
         # Log failed login attempt (with email for investigation)
@@ -206,7 +206,7 @@ async def signup(
         )
 
     # Hash password
-    hashed = hash_password(signup_data.password)
+    hashed = await hash_password_async(signup_data.password)
 
     # Create user
     user = await user_repo.create(
@@ -399,7 +399,7 @@ async def reset_password(
             detail="Invalid reset token.",
         )
 
-    user.hashed_password = hash_password(data.new_password)
+    user.hashed_password = await hash_password_async(data.new_password)
     user.must_change_password = False
     await db.commit()
 
@@ -413,7 +413,7 @@ async def change_password(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Change password for the currently authenticated user."""
-    if not verify_password(data.current_password, current_user.hashed_password):
+    if not await verify_password_async(data.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect.",
@@ -425,7 +425,7 @@ async def change_password(
             detail="New password must be at least 8 characters.",
         )
 
-    current_user.hashed_password = hash_password(data.new_password)
+    current_user.hashed_password = await hash_password_async(data.new_password)
     current_user.must_change_password = False
     await db.commit()
 
@@ -4,18 +4,22 @@ import logging
 from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from app.api.deps import get_current_tenant, get_current_user, require_tenant_context
+from app.domain.services.call_recording_service import (
+    CallRecordingService,
+    TelnyxNotConfiguredError,
+    mirror_call_recording,
+)
 from app.persistence.database import get_db
 from app.persistence.models.call import Call
 from app.persistence.models.call_summary import CallSummary
 from app.persistence.models.tenant import User
-from app.persistence.models.tenant_sms_config import TenantSmsConfig
 from app.persistence.repositories.call_repository import CallRepository
 from app.persistence.repositories.call_summary_repository import CallSummaryRepository
 
@@ -24,6 +28,22 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _has_recording(call: Call) -> bool:
+    """Whether GET /calls/{id}/recording can look up a recording for the call.
+
+    Matches the endpoint's guard: any completed call can be searched by
+    call_sid. Stored Telnyx URLs expire, so clients play recordings through
+    that endpoint rather than recording_url.
+    """
+    return bool(
+        call.recording_url
+        or call.recording_sid
+        or call.recording_conversation_id
+        or call.recording_storage_path
+        or (call.call_sid and call.status == "completed")
+    )
+
+
 # Response models
 class CallSummaryResponse(BaseModel):
     """Call summary response model."""
@@ -55,6 +75,7 @@ class CallResponse(BaseModel):
     ended_at: datetime | None = None
     duration: int | None = None
     recording_url: str | None = None
+    has_recording: bool = False
     created_at: datetime
     summary: CallSummaryResponse | None = None
 
@@ -78,6 +99,7 @@ class ContactCallResponse(BaseModel):
     ended_at: datetime | None = None
     duration: int | None = None
     recording_url: str | None = None
+    has_recording: bool = False
     intent: str | None = None
     outcome: str | None = None
     summary_preview: str | None = None
@@ -187,6 +209,7 @@ async def list_calls(
             ended_at=call.ended_at,
             duration=call.duration,
             recording_url=call.recording_url,
+            has_recording=_has_recording(call),
             created_at=call.created_at,
             summary=summary_response,
         ))
@@ -262,6 +285,7 @@ async def get_call(
         ended_at=call.ended_at,
         duration=call.duration,
         recording_url=call.recording_url,
+        has_recording=_has_recording(call),
         created_at=call.created_at,
         summary=summary_response,
     )
@@ -273,11 +297,14 @@ async def get_call_recording(
     current_user: Annotated[User, Depends(get_current_user)],
     tenant_id: Annotated[int, Depends(require_tenant_context)],
     db: Annotated[AsyncSession, Depends(get_db)],
+    background_tasks: BackgroundTasks,
 ):
-    """Get a fresh recording URL for a call and redirect to it.
+    """Get a playable recording URL for a call.
 
     Telnyx recording URLs are pre-signed S3 URLs that expire after ~10 minutes.
-    This endpoint fetches a fresh URL from Telnyx and redirects the client to it.
+    The URL is resolved on first view and cached until shortly before it
+    expires. With recording mirroring enabled, the recording is then copied
+    to our storage in the background.
     """
     query = select(Call).where(Call.id == call_id, Call.tenant_id == tenant_id)
     result = await db.execute(query)
@@ -286,37 +313,24 @@ async def get_call_recording(
     if not call:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Call not found")
 
-    if not call.recording_sid and not call.call_sid:
+    if not call.recording_sid and not call.call_sid and not call.recording_storage_path:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No recording available")
 
-    # Get tenant's Telnyx API key
-    sms_config_result = await db.execute(
-        select(TenantSmsConfig).where(TenantSmsConfig.tenant_id == tenant_id)
-    )
-    sms_config = sms_config_result.scalar_one_or_none()
-
-    if not sms_config or not sms_config.telnyx_api_key:
+    recording_service = CallRecordingService(db)
+    try:
+        url = await recording_service.get_playback_url(call)
+    except TelnyxNotConfiguredError:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Telnyx not configured")
+    # Keep a recording ID the lookup found
+    await db.commit()
 
-    api_key = sms_config.telnyx_api_key  # EncryptedString auto-decrypts
-
-    from app.infrastructure.telephony.telnyx_provider import TelnyxAIService
-    telnyx_ai = TelnyxAIService(api_key)
-
-    # Try by recording_sid first (direct lookup), then fall back to call_sid search
-    fresh_url = None
-    if call.recording_sid:
-        fresh_url = await telnyx_ai.get_fresh_recording_url(call.recording_sid)
-
-    if not fresh_url and call.call_sid:
-        recording_data = await telnyx_ai.get_recording_for_call(call.call_sid)
-        if recording_data:
-            fresh_url = recording_data.get("recording_url")
-
-    if not fresh_url:
+    if not url:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Recording no longer available")
 
-    return {"url": fresh_url}
+    if recording_service.storage.enabled and not call.recording_storage_path:
+        background_tasks.add_task(mirror_call_recording, call.id, url)
+
+    return {"url": url}
 
 
 @router.get("/by-contact/{contact_id}", response_model=list[ContactCallResponse])
@@ -364,6 +378,7 @@ async def get_calls_for_contact(
                 ended_at=call.ended_at,
                 duration=call.duration,
                 recording_url=call.recording_url,
+                has_recording=_has_recording(call),
                 intent=summary.intent,
                 outcome=summary.outcome,
                 summary_preview=summary_preview,
@@ -433,6 +448,7 @@ async def get_calls_for_phone(
             ended_at=call.ended_at,
             duration=call.duration,
             recording_url=call.recording_url,
+            has_recording=_has_recording(call),
             intent=intent,
             outcome=outcome,
             summary_preview=summary_preview,
@@ -19,9 +19,15 @@ from app.persistence.models.customer import Customer
 from app.persistence.models.jackrabbit_customer import JackrabbitCustomer
 from app.persistence.repositories.contact_repository import ContactRepository
 from app.domain.services.contact_merge_service import ContactMergeService
+from app.domain.services.contact_timeline_service import ContactTimelineService, InvalidCursorError
+from app.domain.services.duplicate_detection_service import DuplicateDetectionService
 
 router = APIRouter()
 
+# Pending contacts re-scored per POST /duplicates/refresh
+INLINE_DUPLICATE_REFRESH_LIMIT = 200
+MAX_BULK_MERGE_GROUPS = 500
+
 
 class ContactResponse(BaseModel):
     """Contact response schema."""
@@ -99,6 +105,8 @@ class DuplicatesResponse(BaseModel):
     groups: list[DuplicateGroup]
     total_groups: int
     total_duplicates: int
+    page: int = 1
+    page_size: int = 25
 
 
 class MergeConflictResponse(BaseModel):
@@ -123,6 +131,38 @@ class MergeContactsRequest(BaseModel):
     field_resolutions: dict[str, str | int]  # field -> "primary" or contact_id
 
 
+class BulkMergeGroup(BaseModel):
+    """One group of contacts to merge."""
+
+    contact_ids: list[int]
+    primary_contact_id: int | None = None  # Default: oldest contact
+
+
+class BulkMergeRequest(BaseModel):
+    """Bulk merge request: duplicate cluster IDs and/or explicit groups."""
+
+    cluster_ids: list[int] = []
+    groups: list[BulkMergeGroup] = []
+
+
+class BulkMergeResult(BaseModel):
+    """Outcome for one group of a bulk merge."""
+
+    contact_ids: list[int]
+    status: str  # merged, skipped
+    primary_contact_id: int | None = None
+    merged_contact_ids: list[int] = []
+    error: str | None = None
+
+
+class BulkMergeResponse(BaseModel):
+    """Bulk merge response."""
+
+    results: list[BulkMergeResult]
+    merged_groups: int
+    merged_contacts: int
+
+
 class ContactAliasResponse(BaseModel):
     """Contact alias response."""
     
@@ -198,6 +238,7 @@ class ActivityFeedResponse(BaseModel):
     total: int
     page: int
     has_more: bool
+    next_cursor: str | None = None  # Pass as ?cursor= to fetch the next page
 
 
 async def _get_customer_names_by_phone(
@@ -226,16 +267,13 @@ async def _get_customer_names_by_phone(
     if not norm_to_contact:
         return {}
 
-    # Normalize customer phones in SQL: strip non-digits, take last 10
-    norm_expr = func.right(
-        func.regexp_replace(Customer.phone, '[^0-9]', '', 'g'), 10
-    )
+    # Customer.phone_last10 holds the same last-10-digits key (indexed)
     stmt = select(
-        norm_expr.label("norm_phone"),
+        Customer.phone_last10.label("norm_phone"),
         Customer.name,
     ).where(
         Customer.tenant_id == tenant_id,
-        norm_expr.in_(list(norm_to_contact.keys())),
+        Customer.phone_last10.in_(list(norm_to_contact.keys())),
     )
     result = await db.execute(stmt)
 
@@ -430,105 +468,74 @@ async def find_duplicates(
     current_user: Annotated[User, Depends(get_current_user)],
     tenant_id: Annotated[int, Depends(require_tenant_context)],
     min_confidence: float = Query(0.5, ge=0.0, le=1.0),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(25, ge=1, le=100),
 ) -> DuplicatesResponse:
-    """Find potential duplicate contacts within the tenant."""
-    repo = ContactRepository(db)
-    
-    # Get all active contacts
-    contacts = await repo.list_by_tenant(
-        tenant_id=tenant_id,
-        skip=0,
-        limit=10000,  # Get all for duplicate detection
+    """Find potential duplicate contacts within the tenant.
+
+    Served from the stored duplicate clusters, which the worker sweep
+    keeps up to date. Read-only; POST /duplicates/refresh re-scores
+    recently changed contacts on demand.
+    """
+    service = DuplicateDetectionService(db)
+    clusters, total_groups, total_duplicates = await service.list_clusters(
+        tenant_id,
+        min_confidence=min_confidence,
+        skip=(page - 1) * page_size,
+        limit=page_size,
     )
-    
-    # Group by potential duplicates
-    email_groups: dict[str, list[Contact]] = {}
-    phone_groups: dict[str, list[Contact]] = {}
-    name_groups: dict[str, list[Contact]] = {}
-    
-    for contact in contacts:
-        if contact.email:
-            email_key = contact.email.lower().strip()
-            if email_key not in email_groups:
-                email_groups[email_key] = []
-            email_groups[email_key].append(contact)
-        
-        if contact.phone:
-            # Normalize phone (remove non-digits)
-            phone_key = ''.join(c for c in contact.phone if c.isdigit())
-            if len(phone_key) >= 10:  # At least 10 digits
-                if phone_key not in phone_groups:
-                    phone_groups[phone_key] = []
-                phone_groups[phone_key].append(contact)
-        
-        if contact.name:
-            name_key = contact.name.lower().strip()
-            if name_key not in name_groups:
-                name_groups[name_key] = []
-            name_groups[name_key].append(contact)
-    
-    # Build duplicate groups
-    duplicate_groups: list[DuplicateGroup] = []
-    seen_contact_ids: set[int] = set()
-    group_counter = 0
-    
-    # Email matches (highest confidence)
-    for email, group_contacts in email_groups.items():
-        if len(group_contacts) > 1:
-            contact_ids = {c.id for c in group_contacts}
-            if not contact_ids.issubset(seen_contact_ids):
-                group_counter += 1
-                duplicate_groups.append(DuplicateGroup(
-                    group_id=f"email-{group_counter}",
-                    match_type="email",
-                    match_value=email,
-                    contacts=[_contact_to_response(c) for c in group_contacts],
-                    confidence=0.95,
-                ))
-                seen_contact_ids.update(contact_ids)
-    
-    # Phone matches (high confidence)
-    for phone, group_contacts in phone_groups.items():
-        if len(group_contacts) > 1:
-            contact_ids = {c.id for c in group_contacts}
-            if not contact_ids.issubset(seen_contact_ids):
-                group_counter += 1
-                duplicate_groups.append(DuplicateGroup(
-                    group_id=f"phone-{group_counter}",
-                    match_type="phone",
-                    match_value=phone,
-                    contacts=[_contact_to_response(c) for c in group_contacts],
-                    confidence=0.9,
-                ))
-                seen_contact_ids.update(contact_ids)
-    
-    # Name matches (lower confidence)
-    for name, group_contacts in name_groups.items():
-        if len(group_contacts) > 1:
-            contact_ids = {c.id for c in group_contacts}
-            if not contact_ids.issubset(seen_contact_ids):
-                group_counter += 1
-                duplicate_groups.append(DuplicateGroup(
-                    group_id=f"name-{group_counter}",
-                    match_type="name",
-                    match_value=name,
-                    contacts=[_contact_to_response(c) for c in group_contacts],
-                    confidence=0.6,
-                ))
-                seen_contact_ids.update(contact_ids)
-    
-    # Filter by minimum confidence
-    filtered_groups = [g for g in duplicate_groups if g.confidence >= min_confidence]
-    
-    total_duplicates = sum(len(g.contacts) for g in filtered_groups)
-    
+
+    # One query for every contact on this page
+    member_ids = {contact_id for cluster in clusters for contact_id in cluster.contact_ids}
+    contacts_by_id: dict[int, Contact] = {}
+    if member_ids:
+        result = await db.execute(
+            select(Contact).where(
+                Contact.tenant_id == tenant_id,
+                Contact.id.in_(member_ids),
+                Contact.deleted_at.is_(None),
+                Contact.merged_into_contact_id.is_(None),
+            )
+        )
+        contacts_by_id = {c.id: c for c in result.scalars().all()}
+
+    groups: list[DuplicateGroup] = []
+    for cluster in clusters:
+        members = [contacts_by_id[cid] for cid in cluster.contact_ids if cid in contacts_by_id]
+        if len(members) < 2:
+            continue
+        groups.append(DuplicateGroup(
+            group_id=f"{cluster.match_type}-{cluster.id}",
+            match_type=cluster.match_type,
+            match_value=cluster.match_value or "",
+            contacts=[_contact_to_response(c) for c in members],
+            confidence=cluster.confidence,
+        ))
+
     return DuplicatesResponse(
-        groups=filtered_groups,
-        total_groups=len(filtered_groups),
+        groups=groups,
+        total_groups=total_groups,
         total_duplicates=total_duplicates,
+        page=page,
+        page_size=page_size,
     )
 
 
+@router.post("/duplicates/refresh")
+async def refresh_duplicates(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    tenant_id: Annotated[int, Depends(require_tenant_context)],
+) -> dict[str, int]:
+    """Re-score the tenant's recently changed contacts now (bounded).
+
+    Anything past the limit is left to the worker sweep.
+    """
+    service = DuplicateDetectionService(db)
+    processed = await service.refresh_pending(tenant_id=tenant_id, limit=INLINE_DUPLICATE_REFRESH_LIMIT)
+    return {"processed": processed}
+
+
 @router.get("/{contact_id}", response_model=ContactResponse)
 async def get_contact(
     contact_id: int,
@@ -824,6 +831,50 @@ async def merge_preview(
     )
 
 
+@router.post("/bulk-merge", response_model=BulkMergeResponse)
+async def bulk_merge_contacts(
+    request: BulkMergeRequest,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_user)],
+    tenant_id: Annotated[int, Depends(require_tenant_context)],
+) -> BulkMergeResponse:
+    """Merge many duplicate groups (e.g. clusters from /duplicates) at once.
+
+    All groups are merged in one transaction with set-based updates.
+    Groups whose contacts are no longer active are skipped.
+    """
+    if len(request.cluster_ids) + len(request.groups) > MAX_BULK_MERGE_GROUPS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_MERGE_GROUPS} groups per request",
+        )
+
+    groups = [group.contact_ids for group in request.groups]
+    primary_ids = {
+        index: group.primary_contact_id
+        for index, group in enumerate(request.groups)
+        if group.primary_contact_id is not None
+    }
+    clusters = await DuplicateDetectionService(db).get_clusters(tenant_id, request.cluster_ids)
+    groups.extend(list(cluster.contact_ids) for cluster in clusters)
+
+    if not groups:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No groups to merge",
+        )
+
+    results = await ContactMergeService(db).bulk_merge(
+        tenant_id, groups, current_user.id, primary_ids=primary_ids
+    )
+    merged = [r for r in results if r["status"] == "merged"]
+    return BulkMergeResponse(
+        results=[BulkMergeResult(**r) for r in results],
+        merged_groups=len(merged),
+        merged_contacts=sum(len(r["merged_contact_ids"]) for r in merged),
+    )
+
+
 @router.post("/{contact_id}/merge", response_model=ContactResponse)
 async def merge_contacts(
     contact_id: int,
@@ -944,7 +995,7 @@ async def get_combined_history(
     
     merge_service = ContactMergeService(db)
     
-    # Get combined conversations
+    # Get combined conversations with message counts
     conversations = await merge_service.get_combined_conversation_history(
         tenant_id, contact_id
     )
@@ -963,9 +1014,9 @@ async def get_combined_history(
                 "id": c.id,
                 "channel": c.channel,
                 "created_at": c.created_at.isoformat() if c.created_at else None,
-                "message_count": len(c.messages) if c.messages else 0,
+                "message_count": message_count,
             }
-            for c in conversations
+            for c, message_count in conversations
         ],
         merge_history=[MergeHistoryEntry(**entry) for entry in history],
         aliases=[
@@ -1104,14 +1155,14 @@ async def get_contact_activity_feed(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     channel: str | None = Query(None, description="Filter by channel: call, sms, email, chat"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (overrides page)"),
 ) -> ActivityFeedResponse:
     """Get paginated chronological activity feed for a contact.
 
     Returns a unified feed of all interactions (calls, SMS, emails, chat)
-    sorted by most recent first.
+    sorted by most recent first. Follow next_cursor for deep pages; page
+    numbers still work but skip rows on the database.
     """
-    from app.persistence.models.tenant_email_config import EmailConversation
-
     repo = ContactRepository(db)
     contact = await repo.get_by_id(tenant_id, contact_id)
 
@@ -1121,124 +1172,66 @@ async def get_contact_activity_feed(
             detail="Contact not found",
         )
 
-    items: list[ActivityItem] = []
-
-    # Get calls with summaries
-    if not channel or channel == "call":
-        calls_stmt = (
-            select(Call, CallSummary)
-            .select_from(CallSummary)
-            .join(Call, CallSummary.call_id == Call.id)
-            .where(CallSummary.contact_id == contact_id)
-            .order_by(Call.started_at.desc())
+    timeline = ContactTimelineService(db)
+    try:
+        result = await timeline.get_page(
+            tenant_id,
+            contact_id,
+            limit=page_size,
+            channel=channel,
+            cursor=cursor,
+            offset=(page - 1) * page_size,
         )
-        calls_result = await db.execute(calls_stmt)
-        for call, summary in calls_result:
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    items: list[ActivityItem] = []
+    for row in result.rows:
+        if row.kind == "call":
             duration_str = ""
-            if call.duration:
-                mins = call.duration // 60
-                secs = call.duration % 60
+            if row.duration:
+                mins = row.duration // 60
+                secs = row.duration % 60
                 duration_str = f"{mins}m {secs}s"
 
-            intent_label = summary.intent.replace("_", " ").title() if summary.intent else ""
+            intent_label = row.intent.replace("_", " ").title() if row.intent else ""
             summary_text = f"{duration_str} - {intent_label}" if duration_str and intent_label else (duration_str or intent_label or "Voice call")
-
-            items.append(ActivityItem(
-                id=f"call-{call.id}",
-                type="call",
-                timestamp=call.started_at.isoformat() if call.started_at else "",
-                summary=summary_text,
-                details=ActivityItemDetails(
-                    duration=call.duration,
-                    intent=summary.intent,
-                    outcome=summary.outcome,
-                ),
-            ))
-
-    # Get conversations (SMS and web chat)
-    if not channel or channel in ("sms", "chat"):
-        conv_stmt = (
-            select(Conversation)
-            .select_from(Lead)
-            .join(Conversation, Lead.conversation_id == Conversation.id)
-            .where(Lead.contact_id == contact_id)
-        )
-        if channel == "sms":
-            conv_stmt = conv_stmt.where(Conversation.channel == "sms")
-        elif channel == "chat":
-            conv_stmt = conv_stmt.where(Conversation.channel == "web")
-
-        conv_result = await db.execute(conv_stmt)
-        for (conv,) in conv_result:
-            # Get message count and preview
-            msg_count_stmt = select(func.count()).where(
-                Message.conversation_id == conv.id,
-                Message.role != "system"
+            details = ActivityItemDetails(
+                duration=row.duration,
+                intent=row.intent,
+                outcome=row.outcome,
             )
-            msg_count = (await db.execute(msg_count_stmt)).scalar() or 0
-
-            # Get last message for preview
-            last_msg_stmt = (
-                select(Message)
-                .where(Message.conversation_id == conv.id, Message.role == "user")
-                .order_by(Message.created_at.desc())
-                .limit(1)
+        elif row.kind == "email":
+            summary_text = row.subject or "(No subject)"
+            details = ActivityItemDetails(
+                channel="email",
+                message_count=row.message_count,
+                subject=row.subject,
             )
-            last_msg_result = await db.execute(last_msg_stmt)
-            last_msg = last_msg_result.scalar_one_or_none()
-
+        else:
             preview = ""
-            if last_msg and last_msg.content:
-                preview = last_msg.content[:100] + ("..." if len(last_msg.content) > 100 else "")
-
-            conv_type = "sms" if conv.channel == "sms" else "chat"
-            items.append(ActivityItem(
-                id=f"{conv_type}-{conv.id}",
-                type=conv_type,
-                timestamp=conv.updated_at.isoformat() if conv.updated_at else conv.created_at.isoformat(),
-                summary=preview or f"{msg_count} messages",
-                details=ActivityItemDetails(
-                    channel=conv.channel,
-                    message_count=msg_count,
-                ),
-            ))
-
-    # Get email conversations
-    if not channel or channel == "email":
-        email_stmt = (
-            select(EmailConversation)
-            .where(EmailConversation.contact_id == contact_id)
-            .order_by(EmailConversation.updated_at.desc())
-        )
-        email_result = await db.execute(email_stmt)
-        for (email_conv,) in email_result:
-            items.append(ActivityItem(
-                id=f"email-{email_conv.id}",
-                type="email",
-                timestamp=email_conv.last_response_at.isoformat() if email_conv.last_response_at else email_conv.created_at.isoformat(),
-                summary=email_conv.subject or "(No subject)",
-                details=ActivityItemDetails(
-                    channel="email",
-                    message_count=email_conv.message_count,
-                    subject=email_conv.subject,
-                ),
-            ))
-
-    # Sort all items by timestamp (most recent first)
-    items.sort(key=lambda x: x.timestamp, reverse=True)
-
-    # Calculate pagination
-    total = len(items)
-    start_idx = (page - 1) * page_size
-    end_idx = start_idx + page_size
-    paginated_items = items[start_idx:end_idx]
-    has_more = end_idx < total
+            if row.preview:
+                preview = row.preview[:100] + ("..." if len(row.preview) > 100 else "")
+            summary_text = preview or f"{row.message_count} messages"
+            details = ActivityItemDetails(
+                channel=row.channel,
+                message_count=row.message_count,
+            )
+
+        items.append(ActivityItem(
+            id=f"{row.kind}-{row.item_id}",
+            type=row.kind,
+            timestamp=row.ts.isoformat(),
+            summary=summary_text,
+            details=details,
+        ))
 
     return ActivityFeedResponse(
-        items=paginated_items,
-        total=total,
+        items=items,
+        total=result.total,
         page=page,
-        has_more=has_more,
+        has_more=result.next_cursor is not None,
+        next_cursor=result.next_cursor,
     )
 
 
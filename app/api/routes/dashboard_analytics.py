@@ -42,8 +42,10 @@ from app.api.schemas.dashboard_analytics import (
     YearlyActivityCell,
     YearlyActivityResponse,
 )
+from app.domain.services.activity_rollup_service import ActivityRollupService
 from app.domain.services.chi_service import CHIService
-from app.persistence.database import get_db
+from app.domain.services.sms_burst_detector import invalidate_burst_config
+from app.persistence.database import get_db, get_read_db
 from app.persistence.models.anomaly_alert import AnomalyAlert
 from app.persistence.models.call import Call
 from app.persistence.models.communications_health_snapshot import (
@@ -73,7 +75,7 @@ def _mask_phone(number: str) -> str:
 
 @router.get("/communications-health", response_model=CommunicationsHealthResponse)
 async def get_communications_health(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     tenant_id: Annotated[int, Depends(require_tenant_context)],
     days: int = Query(7, ge=1, le=90),
 ) -> CommunicationsHealthResponse:
@@ -326,173 +328,60 @@ def _aggregate_from_snapshots(
 
 @router.get("/communications-health/heatmap", response_model=HeatmapResponse)
 async def get_communications_heatmap(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     tenant_id: Annotated[int, Depends(require_tenant_context)],
     days: int = Query(7, ge=1, le=30),
 ) -> HeatmapResponse:
-    """Get time-of-day heatmap for call/SMS volume."""
+    """Get time-of-day heatmap for call/SMS/chat volume (day 0 = Monday)."""
     now = datetime.utcnow()
     start = now - timedelta(days=days)
 
-    # Try snapshots
-    stmt = (
-        select(CommunicationsHealthSnapshot)
-        .where(
-            CommunicationsHealthSnapshot.tenant_id == tenant_id,
-            CommunicationsHealthSnapshot.snapshot_date >= start,
-            CommunicationsHealthSnapshot.snapshot_hour.isnot(None),
-        )
-    )
-    result = await db.execute(stmt)
-    snapshots = list(result.scalars().all())
+    buckets = await ActivityRollupService(db).get_buckets(tenant_id, "hour", start, now)
 
-    if snapshots:
-        cells = []
-        # Group by (day_of_week, hour)
-        grid: dict[tuple[int, int], dict] = {}
-        for s in snapshots:
-            dow = s.snapshot_date.weekday() if hasattr(s.snapshot_date, 'weekday') else 0
-            key = (dow, s.snapshot_hour)
-            if key not in grid:
-                grid[key] = {"calls": 0, "sms": 0}
-            grid[key]["calls"] += s.total_calls
-            grid[key]["sms"] += s.total_sms
-        for (day, hour), vals in grid.items():
-            cells.append(HeatmapCell(day=day, hour=hour, calls=vals["calls"], sms=vals["sms"]))
-        return HeatmapResponse(cells=cells)
-
-    # Real-time fallback: query calls, SMS, and web chats by hour
-    call_stmt = (
-        select(
-            func.extract("dow", Call.started_at).label("dow"),
-            func.extract("hour", Call.started_at).label("hour"),
-            func.count().label("cnt"),
-        )
-        .where(Call.tenant_id == tenant_id, Call.started_at >= start)
-        .group_by("dow", "hour")
-    )
-    call_res = await db.execute(call_stmt)
-    call_data = {(int(r.dow), int(r.hour)): r.cnt for r in call_res.all()}
+    grid: dict[tuple[int, int], Counter] = {}
+    for b in buckets:
+        key = (b.bucket_start.weekday(), b.bucket_start.hour)
+        grid.setdefault(key, Counter())[b.channel] += b.total
 
-    sms_stmt = (
-        select(
-            func.extract("dow", Message.created_at).label("dow"),
-            func.extract("hour", Message.created_at).label("hour"),
-            func.count().label("cnt"),
+    cells = [
+        HeatmapCell(
+            day=day,
+            hour=hour,
+            calls=counts["call"],
+            sms=counts["sms"],
+            chats=counts["web"],
         )
-        .join(Conversation)
-        .where(
-            Conversation.tenant_id == tenant_id,
-            Conversation.channel == "sms",
-            Message.created_at >= start,
-        )
-        .group_by("dow", "hour")
-    )
-    sms_res = await db.execute(sms_stmt)
-    sms_data = {(int(r.dow), int(r.hour)): r.cnt for r in sms_res.all()}
-
-    chat_stmt = (
-        select(
-            func.extract("dow", Message.created_at).label("dow"),
-            func.extract("hour", Message.created_at).label("hour"),
-            func.count().label("cnt"),
-        )
-        .join(Conversation)
-        .where(
-            Conversation.tenant_id == tenant_id,
-            Conversation.channel == "web",
-            Message.created_at >= start,
-        )
-        .group_by("dow", "hour")
-    )
-    chat_res = await db.execute(chat_stmt)
-    chat_data = {(int(r.dow), int(r.hour)): r.cnt for r in chat_res.all()}
-
-    cells = []
-    for day in range(7):
-        for hour in range(24):
-            c = call_data.get((day, hour), 0)
-            s = sms_data.get((day, hour), 0)
-            w = chat_data.get((day, hour), 0)
-            if c or s or w:
-                cells.append(HeatmapCell(day=day, hour=hour, calls=c, sms=s, chats=w))
-
+        for (day, hour), counts in sorted(grid.items())
+        if counts["call"] or counts["sms"] or counts["web"]
+    ]
     return HeatmapResponse(cells=cells)
 
 
 @router.get("/communications-health/yearly", response_model=YearlyActivityResponse)
 async def get_yearly_activity(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     tenant_id: Annotated[int, Depends(require_tenant_context)],
 ) -> YearlyActivityResponse:
     """Get daily activity data for the past year (GitHub-style contribution graph)."""
     now = datetime.utcnow()
     start = now - timedelta(days=365)
 
-    # Calls by date
-    call_stmt = (
-        select(
-            func.date(Call.started_at).label("date"),
-            func.count().label("cnt"),
-        )
-        .where(Call.tenant_id == tenant_id, Call.started_at >= start)
-        .group_by(func.date(Call.started_at))
-    )
-    call_res = await db.execute(call_stmt)
-    call_data = {str(r.date): r.cnt for r in call_res.all()}
+    buckets = await ActivityRollupService(db).get_buckets(tenant_id, "day", start, now)
 
-    # SMS by date
-    sms_stmt = (
-        select(
-            func.date(Message.created_at).label("date"),
-            func.count().label("cnt"),
-        )
-        .join(Conversation)
-        .where(
-            Conversation.tenant_id == tenant_id,
-            Conversation.channel == "sms",
-            Message.created_at >= start,
-        )
-        .group_by(func.date(Message.created_at))
-    )
-    sms_res = await db.execute(sms_stmt)
-    sms_data = {str(r.date): r.cnt for r in sms_res.all()}
+    by_date: dict[str, Counter] = {}
+    for b in buckets:
+        by_date.setdefault(b.bucket_start.date().isoformat(), Counter())[b.channel] += b.total
 
-    # Emails by date
-    email_stmt = (
-        select(
-            func.date(Message.created_at).label("date"),
-            func.count().label("cnt"),
+    cells = [
+        YearlyActivityCell(
+            date=date_str,
+            calls=counts["call"],
+            sms=counts["sms"],
+            emails=counts["email"],
         )
-        .join(Conversation)
-        .where(
-            Conversation.tenant_id == tenant_id,
-            Conversation.channel == "email",
-            Message.created_at >= start,
-        )
-        .group_by(func.date(Message.created_at))
-    )
-    email_res = await db.execute(email_stmt)
-    email_data = {str(r.date): r.cnt for r in email_res.all()}
-
-    # Generate all dates in range
-    cells = []
-    current = start.date()
-    end_date = now.date()
-    while current <= end_date:
-        date_str = current.isoformat()
-        calls = call_data.get(date_str, 0)
-        sms = sms_data.get(date_str, 0)
-        emails = email_data.get(date_str, 0)
-        if calls or sms or emails:
-            cells.append(YearlyActivityCell(
-                date=date_str,
-                calls=calls,
-                sms=sms,
-                emails=emails,
-            ))
-        current += timedelta(days=1)
-
+        for date_str, counts in sorted(by_date.items())
+        if counts["call"] or counts["sms"] or counts["email"]
+    ]
     return YearlyActivityResponse(cells=cells)
 
 
@@ -503,7 +392,7 @@ async def get_yearly_activity(
 
 @router.get("/anomalies", response_model=AnomalyAlertListResponse)
 async def get_anomaly_alerts(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     tenant_id: Annotated[int, Depends(require_tenant_context)],
     status_filter: str | None = Query(None, alias="status"),
     limit: int = Query(50, le=100),
@@ -581,7 +470,7 @@ async def update_anomaly_alert(
 
 @router.get("/chi", response_model=CHIAnalyticsResponse)
 async def get_chi_analytics(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     tenant_id: Annotated[int, Depends(require_tenant_context)],
     days: int = Query(7, ge=1, le=90),
 ) -> CHIAnalyticsResponse:
@@ -752,7 +641,7 @@ async def get_conversation_chi(
 @router.get("/sms-bursts", response_model=SmsBurstDashboardResponse)
 async def get_sms_burst_dashboard(
     _admin: Annotated[User, Depends(require_global_admin)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     tenant_id: Annotated[int, Depends(require_tenant_context)],
     hours: int = Query(24, ge=1, le=168),
 ) -> SmsBurstDashboardResponse:
@@ -855,7 +744,7 @@ async def update_burst_incident(
 @router.get("/sms-burst-config", response_model=SmsBurstConfigResponse)
 async def get_burst_config(
     _admin: Annotated[User, Depends(require_global_admin)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     tenant_id: Annotated[int, Depends(require_tenant_context)],
 ) -> SmsBurstConfigResponse:
     """Get current SMS burst detection configuration."""
@@ -903,6 +792,7 @@ async def update_burst_config(
 
     await db.commit()
     await db.refresh(config)
+    invalidate_burst_config(tenant_id)
 
     return SmsBurstConfigResponse(
         enabled=config.enabled,
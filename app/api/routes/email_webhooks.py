@@ -64,7 +64,7 @@ async def gmail_pubsub_webhook(
         Simple acknowledgment response
     """
     try:
-        print(f"[EMAIL_WEBHOOK] Received pubsub push request", flush=True)
+        logger.info("[EMAIL_WEBHOOK] Received pubsub push request")
         
         # Verify Pub/Sub authorization token (optional)
         auth_header = request.headers.get("Authorization", "")
@@ -82,9 +82,8 @@ async def gmail_pubsub_webhook(
             notification = GmailPushNotification.from_pubsub_message(
                 push_request.message.data
             )
-            print(f"[EMAIL_WEBHOOK] Parsed notification: email={notification.email_address}, history_id={notification.history_id}", flush=True)
+            logger.info(f"[EMAIL_WEBHOOK] Parsed notification: email={notification.email_address}, history_id={notification.history_id}")
         except ValueError as e:
-            print(f"[EMAIL_WEBHOOK] Failed to parse notification: {e}", flush=True)
             logger.error(f"Failed to parse Gmail notification: {e}")
             # Return 200 to prevent Pub/Sub retries for malformed messages
             return {"status": "ignored", "reason": "invalid_format"}
@@ -96,7 +95,7 @@ async def gmail_pubsub_webhook(
         
         # Queue for async processing via Cloud Tasks
         if settings.cloud_tasks_email_worker_url:
-            print(f"[EMAIL_WEBHOOK] Using Cloud Tasks worker: {settings.cloud_tasks_email_worker_url}", flush=True)
+            logger.info(f"[EMAIL_WEBHOOK] Using Cloud Tasks worker: {settings.cloud_tasks_email_worker_url}")
             cloud_tasks = CloudTasksClient()
             await cloud_tasks.create_task_async(
                 payload={
@@ -108,14 +107,12 @@ async def gmail_pubsub_webhook(
             logger.info(f"Email notification queued for {notification.email_address}")
         else:
             # Fallback: process synchronously (not recommended for production)
-            print(f"[EMAIL_WEBHOOK] Processing synchronously (no Cloud Tasks URL configured)", flush=True)
             logger.warning("Cloud Tasks email worker URL not configured, processing synchronously")
             email_service = EmailService(db)
             results = await email_service.process_gmail_notification(
                 email_address=notification.email_address,
                 history_id=notification.history_id,
             )
-            print(f"[EMAIL_WEBHOOK] Processed {len(results)} messages", flush=True)
             logger.info(f"Email processed synchronously: {len(results)} messages")
         
         return {"status": "ok"}
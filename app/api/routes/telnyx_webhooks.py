@@ -1,5 +1,6 @@
 """Telnyx webhooks for AI Assistant and SMS."""
 
+import functools
 import json
 import logging
 import time
@@ -13,13 +14,16 @@ from sqlalchemy import or_, select, cast, String, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.attributes import flag_modified
 
+from app.core.idempotency import generate_idempotency_key
+from app.domain.services.call_recording_service import URL_CACHE_PREFIX as RECORDING_URL_CACHE_PREFIX
 from app.domain.services.sms_service import SmsService
 from app.infrastructure.cloud_tasks import CloudTasksClient
 from app.infrastructure.redis import redis_client
+from app.infrastructure.webhook_event_dispatcher import webhook_event_dispatcher
 from app.persistence.database import get_db
 from app.persistence.models.tenant_sms_config import TenantSmsConfig
 from app.settings import settings
-from app.core.phone import normalize_phone_for_dedup
+from app.core.phone import normalize_email, normalize_phone_for_dedup, phone_match_key
 
 logger = logging.getLogger(__name__)
 
@@ -46,6 +50,10 @@ VOICE_EVENT_TYPES = {
     "call.recording.saved",  # Fired when call recording is ready for download
 }
 
+# Webhook event kinds stored in the webhook inbox (webhook_ingest_enabled)
+AI_CALL_EVENT_KIND = "telnyx.ai_call_complete"
+SMS_EVENT_KIND = "telnyx.sms"
+
 # SMS/text event types from Telnyx (any message.* event is an SMS interaction)
 SMS_EVENT_TYPES = {
     "message.received",
@@ -269,21 +277,23 @@ async def _sync_lead_to_contact(
     # Find existing contact by phone OR email
     contact = None
 
-    if phone:
+    phone_key = phone_match_key(phone)
+    if phone_key:
         result = await db.execute(
             select(Contact).where(
                 Contact.tenant_id == tenant_id,
-                Contact.phone == phone,
+                Contact.phone_last10 == phone_key,
                 Contact.deleted_at.is_(None),
             ).order_by(Contact.created_at.desc()).limit(1)
         )
         contact = result.scalar_one_or_none()
 
-    if not contact and email:
+    email_key = normalize_email(email)
+    if not contact and email_key:
         result = await db.execute(
             select(Contact).where(
                 Contact.tenant_id == tenant_id,
-                Contact.email == email,
+                Contact.email_normalized == email_key,
                 Contact.deleted_at.is_(None),
             ).order_by(Contact.created_at.desc()).limit(1)
         )
@@ -325,6 +335,89 @@ async def _sync_lead_to_contact(
     return contact.id if contact else None
 
 
+# =============================================================================
+# Webhook Inbox (webhook_ingest_enabled)
+# =============================================================================
+
+
+def _webhook_event_id(body: dict) -> str | None:
+    """Telnyx event ID of a webhook body, if it has one."""
+    data = body.get("data", body)
+    payload = data.get("payload") or body.get("payload") or data
+    return (
+        data.get("id")  # Standard Telnyx event ID
+        or body.get("id")
+        or (payload.get("event_id") if isinstance(payload, dict) else None)
+    )
+
+
+def _extract_call_id(body: dict) -> str:
+    """Call ID of an AI call webhook body ("" if not found).
+
+    TeXML status callbacks use PascalCase (CallControlId, From, To, etc.)
+    """
+    data = body.get("data", body)
+    payload = data.get("payload") or body.get("payload") or data
+    if not isinstance(payload, dict):
+        payload = {}
+    metadata = payload.get("metadata", {}) or {}
+    conversation = body.get("conversation", {}) or data.get("conversation", {})
+    return (
+        body.get("CallControlId")  # TeXML PascalCase
+        or body.get("CallSessionId")
+        or body.get("CallSid")
+        or metadata.get("call_control_id")
+        or metadata.get("call_session_id")
+        or payload.get("conversation_id")
+        or payload.get("call_control_id")
+        or payload.get("call_id")
+        or data.get("call_control_id")
+        or data.get("CallControlId")
+        or data.get("conversation_id")
+        or body.get("conversation_id")
+        or conversation.get("id")
+        or data.get("id")
+        or ""
+    )
+
+
+def _ai_call_ordering_key(body: dict) -> str:
+    """Events of one call are processed in order."""
+    call_id = _extract_call_id(body)
+    return f"call:{call_id}" if call_id else f"event:{_webhook_idempotency_key(body)}"
+
+
+def _sms_ordering_key(body: dict) -> str:
+    """Inbound messages are ordered per conversation (phone pair), status updates per message."""
+    data = body.get("data", {})
+    payload = data.get("payload", {}) or {}
+    if data.get("event_type") == "message.received":
+        from_number = (payload.get("from") or {}).get("phone_number", "")
+        to_list = payload.get("to") or []
+        to_number = to_list[0].get("phone_number", "") if to_list else ""
+        return f"sms:{to_number}:{from_number}"
+    if payload.get("id"):
+        return f"sms-status:{payload['id']}"
+    return f"event:{_webhook_idempotency_key(body)}"
+
+
+def _webhook_idempotency_key(body: dict) -> str:
+    """The Telnyx event ID, or a hash of the body for events without one."""
+    return _webhook_event_id(body) or generate_idempotency_key("POST", "telnyx", body)
+
+
+async def _ingest_webhook(db: AsyncSession, kind: str, body: dict, ordering_key: str) -> JSONResponse:
+    """Store a webhook in the inbox and ack it; it is processed in the background."""
+    event_id = await webhook_event_dispatcher.enqueue(
+        db,
+        kind=kind,
+        payload=body,
+        idempotency_key=_webhook_idempotency_key(body),
+        ordering_key=ordering_key,
+    )
+    return JSONResponse(content={"status": "ok", "queued": event_id is not None})
+
+
 # =============================================================================
 # Telnyx SMS Webhooks
 # =============================================================================
@@ -383,6 +476,10 @@ async def telnyx_inbound_sms_webhook(
         }
     }
 
+    With webhook_ingest_enabled the payload is stored and acked right away,
+    and processed by the webhook event dispatcher in order per phone number
+    pair.
+
     Args:
         request: FastAPI request
         db: Database session
@@ -404,6 +501,27 @@ async def telnyx_inbound_sms_webhook(
         # Parse JSON body
         body = await request.json()
 
+        if settings.webhook_ingest_enabled and isinstance(body, dict) and body:
+            return await _ingest_webhook(db, SMS_EVENT_KIND, body, _sms_ordering_key(body))
+    except Exception as e:
+        logger.error(f"Error receiving Telnyx SMS webhook: {e}", exc_info=True)
+        # Return 200 to avoid retries
+        return JSONResponse(content={"status": "error", "message": str(e)})
+    return await _process_inbound_sms_webhook(body, db)
+
+
+async def _process_inbound_sms_webhook(
+    body: dict,
+    db: AsyncSession,
+    queued: bool = False,
+) -> JSONResponse:
+    """Process a Telnyx SMS webhook payload (inbound message or delivery status).
+
+    queued is set when called by the webhook event dispatcher: the event
+    was deduplicated when it was stored, and errors are raised so that it
+    is retried.
+    """
+    try:
         logger.info(
             "Telnyx SMS webhook received",
             extra={"event_type": body.get("data", {}).get("event_type")},
@@ -430,8 +548,9 @@ async def telnyx_inbound_sms_webhook(
         message_id = payload.get("id", "")
 
         # Deduplicate by message_id to prevent processing same message twice
-        # (handles Telnyx retries, webhook replay attacks, etc.)
-        if message_id:
+        # (handles Telnyx retries, webhook replay attacks, etc.; queued events
+        # were already deduplicated when stored)
+        if message_id and not queued:
             dedup_key = f"sms_msg_processed:{message_id}"
             if not await redis_client.setnx(dedup_key, "1", ttl=MESSAGE_DEDUP_TTL_SECONDS):
                 # MONITORING: Log duplicate webhook with structured data for alerting
@@ -461,8 +580,9 @@ async def telnyx_inbound_sms_webhook(
 
         logger.info(f"Found tenant_id={tenant_id} for Telnyx number: {to_number}")
 
-        # Queue message for async processing
-        if settings.cloud_tasks_worker_url:
+        # Queue message for async processing (queued events are processed
+        # here so that messages from one phone stay in order)
+        if settings.cloud_tasks_worker_url and not queued:
             cloud_tasks = CloudTasksClient()
             await cloud_tasks.create_task_async(
                 payload={
@@ -477,19 +597,22 @@ async def telnyx_inbound_sms_webhook(
             )
         else:
             # Fallback: process synchronously
-            logger.warning("Cloud Tasks not configured, processing synchronously")
+            if not queued:
+                logger.warning("Cloud Tasks not configured, processing synchronously")
             sms_service = SmsService(db)
             result = await sms_service.process_inbound_sms(
                 tenant_id=tenant_id,
                 phone_number=from_number,
                 message_body=message_body,
-                twilio_message_sid=message_id,  # Re-using param name for Telnyx message ID
+                external_message_id=message_id,
             )
             logger.info(f"SMS processed for tenant_id={tenant_id}, response_sent={bool(result.message_sid)}")
 
         return JSONResponse(content={"status": "ok"})
 
     except Exception as e:
+        if queued:
+            raise
         logger.error(f"Error processing Telnyx SMS webhook: {e}", exc_info=True)
         # Return 200 to avoid retries
         return JSONResponse(content={"status": "error", "message": str(e)})
@@ -756,7 +879,9 @@ async def telnyx_ai_call_complete(
     - Conversation insights are generated (call.conversation_insights.generated)
     - Post-call insights webhook fires from Insight Groups
 
-    The data is stored in the database and can trigger lead creation.
+    The data is stored in the database and can trigger lead creation. With
+    webhook_ingest_enabled the payload is stored and acked right away, and
+    processed by the webhook event dispatcher in order per call.
 
     Args:
         request: FastAPI request with call data
@@ -765,42 +890,66 @@ async def telnyx_ai_call_complete(
     Returns:
         JSON response with 200 status
     """
+    try:
+        body = await _read_webhook_body(request)
+        if settings.webhook_ingest_enabled and isinstance(body, dict) and body:
+            return await _ingest_webhook(db, AI_CALL_EVENT_KIND, body, _ai_call_ordering_key(body))
+    except Exception as e:
+        logger.error(f"Error receiving Telnyx AI call webhook: {e}", exc_info=True)
+        return JSONResponse(content={"status": "error", "message": str(e)})
+    return await _process_ai_call_complete(body, db)
+
+
+async def _read_webhook_body(request: Request) -> dict:
+    """Parse a webhook body sent as JSON or form data ({} if unparseable)."""
+    # Try JSON first, fall back to form data
+    content_type = request.headers.get("content-type", "")
+    body = {}
+
+    if "application/json" in content_type:
+        try:
+            body = await request.json()
+        except Exception as e:
+            logger.warning(f"Failed to parse JSON body: {e}")
+            raw = await request.body()
+            logger.info(f"Raw body (non-JSON): {raw[:500]}")
+    elif "form" in content_type:
+        form_data = await request.form()
+        body = dict(form_data)
+        logger.info(f"Received form data: {body}")
+    else:
+        # Try JSON anyway
+        try:
+            body = await request.json()
+        except Exception:
+            raw = await request.body()
+            logger.info(f"Raw body (unknown content-type {content_type}): {raw[:500]}")
+            # Try to parse as JSON if it looks like JSON
+            if raw and raw.strip().startswith(b'{'):
+                try:
+                    body = json.loads(raw)
+                except Exception:
+                    pass
+    return body
+
+
+async def _process_ai_call_complete(
+    body: dict,
+    db: AsyncSession,
+    queued: bool = False,
+) -> JSONResponse:
+    """Process a Telnyx AI Assistant call webhook payload.
+
+    queued is set when called by the webhook event dispatcher: the event
+    was deduplicated when it was stored, and errors are raised so that it
+    is retried.
+    """
     from app.persistence.models.call import Call
     from app.persistence.models.call_summary import CallSummary
     from app.persistence.models.contact import Contact
     from app.persistence.models.lead import Lead
-    import json
 
     try:
-        # Try JSON first, fall back to form data
-        content_type = request.headers.get("content-type", "")
-        body = {}
-
-        if "application/json" in content_type:
-            try:
-                body = await request.json()
-            except Exception as e:
-                logger.warning(f"Failed to parse JSON body: {e}")
-                raw = await request.body()
-                logger.info(f"Raw body (non-JSON): {raw[:500]}")
-        elif "form" in content_type:
-            form_data = await request.form()
-            body = dict(form_data)
-            logger.info(f"Received form data: {body}")
-        else:
-            # Try JSON anyway
-            try:
-                body = await request.json()
-            except Exception:
-                raw = await request.body()
-                logger.info(f"Raw body (unknown content-type {content_type}): {raw[:500]}")
-                # Try to parse as JSON if it looks like JSON
-                if raw and raw.strip().startswith(b'{'):
-                    try:
-                        body = json.loads(raw)
-                    except Exception:
-                        pass
-
         # Log full payload for debugging (in message for Cloud Run visibility)
         body_str = json.dumps(body)[:3000] if isinstance(body, dict) else str(body)[:500]
         logger.info(f"Telnyx AI webhook payload: {body_str}")
@@ -820,12 +969,9 @@ async def telnyx_ai_call_complete(
 
         # EVENT-BASED DEDUP: Prevent processing the same webhook event twice
         # This is the primary dedup layer - uses the Telnyx event ID with short TTL
-        webhook_event_id = (
-            data.get("id")  # Standard Telnyx event ID
-            or body.get("id")
-            or (payload.get("event_id") if isinstance(payload, dict) else None)
-        )
-        if webhook_event_id:
+        # (Queued events were already deduplicated when stored)
+        webhook_event_id = _webhook_event_id(body)
+        if webhook_event_id and not queued:
             event_dedup_key = f"telnyx_event:{webhook_event_id}"
             try:
                 await redis_client.connect()
@@ -842,24 +988,7 @@ async def telnyx_ai_call_complete(
         conversation = body.get("conversation", {}) or data.get("conversation", {})
 
         # Extract call details - try multiple possible field names
-        # TeXML status callbacks use PascalCase (CallControlId, From, To, etc.)
-        call_id = (
-            body.get("CallControlId")  # TeXML PascalCase
-            or body.get("CallSessionId")
-            or body.get("CallSid")
-            or metadata.get("call_control_id")
-            or metadata.get("call_session_id")
-            or payload.get("conversation_id")
-            or payload.get("call_control_id")
-            or payload.get("call_id")
-            or data.get("call_control_id")
-            or data.get("CallControlId")
-            or data.get("conversation_id")
-            or body.get("conversation_id")
-            or conversation.get("id")
-            or data.get("id")
-            or ""
-        )
+        call_id = _extract_call_id(body)
 
         # Extract assistant ID to distinguish voice vs text assistant
         assistant_id = (
@@ -1667,10 +1796,13 @@ async def telnyx_ai_call_complete(
                     logger.info(f"Added SMS messages (fallback) for usage tracking: conversation_id={sms_conversation.id}")
 
                 # Still create/update Lead from SMS AI Assistant interactions
+                # (short codes and other numbers without a match key are
+                # matched exactly, never against leads with no phone)
+                from_key = phone_match_key(normalized_from)
                 existing_lead = await db.execute(
                     select(Lead).where(
                         Lead.tenant_id == tenant_id,
-                        Lead.phone == normalized_from,
+                        Lead.phone_last10 == from_key if from_key else Lead.phone == normalized_from,
                     ).order_by(Lead.created_at.desc()).limit(1)
                 )
                 lead = existing_lead.scalar_one_or_none()
@@ -2048,26 +2180,11 @@ async def telnyx_ai_call_complete(
             except Exception as e:
                 logger.warning(f"Failed to calculate duration from Telnyx API: {e}")
 
-        # Fetch recording URL from Telnyx API if not already set
-        # This is a fallback because AI Agent calls don't always send call.recording.saved webhook
-        if not call.recording_url and call_id and telnyx_api_key_for_duration:
-            try:
-                from app.infrastructure.telephony.telnyx_provider import TelnyxAIService
-                telnyx_ai_recording = TelnyxAIService(telnyx_api_key_for_duration)
-                # Pass conversation_id for AI Agent calls - recordings are stored there
-                recording_data = await telnyx_ai_recording.get_recording_for_call(
-                    call_id,
-                    conversation_id=telnyx_conversation_id if telnyx_conversation_id else None
-                )
-                if recording_data and recording_data.get("recording_url"):
-                    call.recording_url = recording_data["recording_url"]
-                    if recording_data.get("recording_id"):
-                        call.recording_sid = recording_data["recording_id"]
-                    logger.info(f"Fetched recording URL from Telnyx API for call {call.id}: {call.recording_url[:80]}...")
-                else:
-                    logger.info(f"No recording available from Telnyx API for call {call.id}")
-            except Exception as e:
-                logger.warning(f"Failed to fetch recording from Telnyx API: {e}")
+        # AI Agent calls don't always send the call.recording.saved webhook.
+        # Keep the conversation ID so the recording can be looked up when it
+        # is played (GET /calls/{id}/recording) instead of fetching it here.
+        if telnyx_conversation_id and not call.recording_conversation_id:
+            call.recording_conversation_id = telnyx_conversation_id
 
         # Store transcript and summary in call metadata or separate table
         # For now, we'll create a lead with the information
@@ -2644,6 +2761,8 @@ async def telnyx_ai_call_complete(
         })
 
     except Exception as e:
+        if queued:
+            raise
         logger.error(f"Error processing Telnyx AI call webhook: {e}", exc_info=True)
         return JSONResponse(content={"status": "error", "message": str(e)})
 
@@ -2822,6 +2941,8 @@ async def telnyx_call_progress(
                         call.recording_url = recording_url
                         call.recording_sid = recording_id
                         await db.commit()
+                        # Drop a cached "no recording" from an earlier view
+                        await redis_client.delete(f"{RECORDING_URL_CACHE_PREFIX}:{call.id}")
                         logger.info(
                             f"Stored recording for call {call.id}: "
                             f"recording_id={recording_id}, url={recording_url[:80]}..."
@@ -2935,9 +3056,10 @@ async def sync_calls_to_leads(
             normalized_phone = _normalize_phone(call.from_number)
 
             # Check if lead exists for this phone number (get most recent if multiple)
+            phone_key = phone_match_key(normalized_phone)
             lead_stmt = select(Lead).where(
                 Lead.tenant_id == call.tenant_id,
-                Lead.phone == normalized_phone,
+                Lead.phone_last10 == phone_key if phone_key else Lead.phone == normalized_phone,
             ).order_by(Lead.created_at.desc()).limit(1)
             lead_result = await db.execute(lead_stmt)
             lead = lead_result.scalar_one_or_none()
@@ -4087,3 +4209,11 @@ def _normalize_level_name(level: str) -> str | None:
     }
 
     return level_map.get(level_lower, level)  # Return original if no mapping found
+
+
+webhook_event_dispatcher.register(
+    AI_CALL_EVENT_KIND, functools.partial(_process_ai_call_complete, queued=True)
+)
+webhook_event_dispatcher.register(
+    SMS_EVENT_KIND, functools.partial(_process_inbound_sms_webhook, queued=True)
+)
@@ -8,7 +8,8 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user, get_current_tenant, is_global_admin
-from app.domain.services.dnc_service import DncService
+from app.domain.services.compliance_gate import ComplianceGate
+from app.infrastructure.telephony.factory import invalidate_telephony_config
 from app.persistence.database import get_db
 from app.persistence.models.tenant import User
 from app.persistence.models.tenant_sms_config import TenantSmsConfig
@@ -292,6 +293,7 @@ async def update_sms_settings(
 
     await db.commit()
     await db.refresh(config)
+    invalidate_telephony_config(tenant_id)
 
     # Extract settings for response
     settings_json = config.settings or {}
@@ -361,8 +363,7 @@ async def initiate_outreach(
         )
 
     # Check Do Not Contact list
-    dnc_service = DncService(db)
-    if await dnc_service.is_blocked(tenant_id, phone=phone):
+    if (await ComplianceGate(db).check(tenant_id, phone)).is_blocked:
         return InitiateOutreachResponse(
             success=False,
             error="Cannot contact: This phone number is on the Do Not Contact list.",
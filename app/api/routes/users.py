@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 
 from app.api.deps import get_current_user, require_tenant_admin, require_tenant_context
-from app.core.password import hash_password
+from app.core.password import hash_password_async
 from app.persistence.database import get_db
 from app.persistence.models.tenant import User
 from app.persistence.repositories.user_repository import UserRepository
@@ -54,7 +54,7 @@ async def create_user(
         )
 
     # Hash password
-    hashed = hash_password(user_data.password)
+    hashed = await hash_password_async(user_data.password)
 
     user = await user_repo.create(
         tenant_id,
@@ -10,6 +10,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_db
 from app.domain.services.jackrabbit_data_transformer import transform_jackrabbit_to_account_data
+from app.domain.services.jackrabbit_sync_service import FamilyRecord, JackrabbitSyncService
 from app.domain.services.zapier_integration_service import ZapierIntegrationService
 from app.persistence.repositories.customer_repository import CustomerRepository
 from app.persistence.repositories.jackrabbit_customer_repository import JackrabbitCustomerRepository
@@ -309,44 +310,32 @@ async def zapier_family_sync(
     if email:
         customer_data["email"] = email
 
-    # Normalize phone (treat empty as None)
-    phone = phone if phone else None
-
-    customer_repo = JackrabbitCustomerRepository(db)
-    customer = await customer_repo.upsert(
-        tenant_id=tenant_id,
+    # Upsert the Jackrabbit cache row and the customers row (skipped if unchanged)
+    result = await JackrabbitSyncService(db).sync(tenant_id, [FamilyRecord(
         jackrabbit_id=jackrabbit_id,
-        phone_number=phone,
-        email=email,
-        name=name,
-        customer_data=customer_data,
-    )
-
-    # Sync to customers table
-    main_customer_repo = CustomerRepository(db)
-    account_data = transform_jackrabbit_to_account_data(customer_data)
-    await main_customer_repo.upsert_from_jackrabbit(
-        tenant_id=tenant_id,
-        external_customer_id=jackrabbit_id,
-        phone=phone,
+        phone=phone or None,
         name=name,
         email=email,
-        account_data=account_data,
-        jackrabbit_customer_id=customer.id,
         status=status,
-    )
+        customer_data=customer_data,
+    )])
+    customer_id = result.customer_ids.get(jackrabbit_id)
+    if customer_id is None:
+        logger.warning(f"family-sync: skipped family {jackrabbit_id} for tenant {tenant_id}")
+        return JSONResponse(content={"status": "skipped"}, status_code=200)
 
     logger.info(
         f"Family synced via Zapier",
         extra={
             "tenant_id": tenant_id,
             "jackrabbit_id": jackrabbit_id,
-            "customer_id": customer.id,
+            "customer_id": customer_id,
             "status": status,
+            "unchanged": bool(result.unchanged),
         },
     )
 
     return JSONResponse(
-        content={"status": "synced", "customer_id": customer.id},
+        content={"status": "synced", "customer_id": customer_id},
         status_code=200,
     )
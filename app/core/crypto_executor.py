@@ -0,0 +1,61 @@
+"""Bounded thread pool for CPU-heavy crypto work.
+
+bcrypt is intentionally slow (roughly 100-300ms per hash/check at the default
+cost factor) and releases the GIL while it runs. Calling it directly from an
+async route blocks the event loop for the full duration, stalling chat and
+webhook traffic on the same instance. Routing it through a small dedicated
+pool keeps the loop responsive and caps how many cores concurrent logins
+can consume.
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def get_crypto_executor() -> ThreadPoolExecutor:
+    """Get (lazily creating) the shared crypto thread pool."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.crypto_executor_max_workers,
+            thread_name_prefix="crypto",
+        )
+        logger.info(
+            f"Crypto executor started with {settings.crypto_executor_max_workers} workers"
+        )
+    return _executor
+
+
+async def run_in_crypto_executor(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking crypto function on the crypto pool and await its result.
+
+    Args:
+        func: Blocking callable (e.g. bcrypt.hashpw)
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The callable's return value
+    """
+    loop = asyncio.get_running_loop()
+    call = functools.partial(func, *args, **kwargs) if kwargs else functools.partial(func, *args)
+    return await loop.run_in_executor(get_crypto_executor(), call)
+
+
+def shutdown_crypto_executor() -> None:
+    """Shut down the crypto pool (called on application shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
@@ -4,7 +4,10 @@ Uses Fernet symmetric encryption for encrypting API keys, tokens, and secrets.
 The encryption key should be stored in GCP Secret Manager in production.
 """
 
+import hashlib
 import logging
+import time
+from collections import OrderedDict
 from typing import Optional
 
 from cryptography.fernet import Fernet, InvalidToken
@@ -28,11 +31,14 @@ class EncryptionService:
 
     _instance: Optional["EncryptionService"] = None
     _fernet: Optional[Fernet] = None
+    _decrypt_cache: "OrderedDict[str, tuple[float, str]]"
 
     def __new__(cls) -> "EncryptionService":
         """Singleton pattern to ensure consistent encryption key usage."""
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            # {sha256(ciphertext): (expires_at, plaintext)}, oldest first
+            cls._instance._decrypt_cache = OrderedDict()
         return cls._instance
 
     def __init__(self) -> None:
@@ -127,15 +133,43 @@ class EncryptionService:
         if not self._fernet:
             raise EncryptionError("Cannot decrypt: encryption key not configured")
 
+        # Credentials are re-read (and re-decrypted) on every provider
+        # construction; serve repeats from a short-TTL cache keyed by the
+        # ciphertext hash so the plaintext never appears in a cache key.
+        cache_key = hashlib.sha256(ciphertext.encode()).hexdigest()
+        now = time.monotonic()
+        cached = self._decrypt_cache.get(cache_key)
+        if cached and cached[0] > now:
+            return cached[1]
+
         try:
             encrypted_bytes = ciphertext[4:].encode()  # Remove 'enc:' prefix
             decrypted_bytes = self._fernet.decrypt(encrypted_bytes)
-            return decrypted_bytes.decode()
+            plaintext = decrypted_bytes.decode()
         except InvalidToken:
             raise EncryptionError("Failed to decrypt: invalid token or wrong key")
         except Exception as e:
             raise EncryptionError(f"Failed to decrypt value: {e}") from e
 
+        self._cache_decrypted(cache_key, plaintext, now)
+        return plaintext
+
+    def _cache_decrypted(self, cache_key: str, plaintext: str, now: float) -> None:
+        """Store a decrypted value, evicting the oldest entries past the size cap."""
+        from app.settings import settings
+
+        ttl = settings.credential_cache_ttl_seconds
+        if ttl <= 0:
+            return
+        self._decrypt_cache[cache_key] = (now + ttl, plaintext)
+        self._decrypt_cache.move_to_end(cache_key)
+        while len(self._decrypt_cache) > settings.credential_cache_max_entries:
+            self._decrypt_cache.popitem(last=False)
+
+    def clear_decrypt_cache(self) -> None:
+        """Drop all cached plaintext (e.g. after key rotation)."""
+        self._decrypt_cache.clear()
+
     def is_encrypted(self, value: str) -> bool:
         """Check if a value is already encrypted."""
         return value.startswith("enc:") if value else False
@@ -0,0 +1,310 @@
+"""In-process metrics with Prometheus text exposition.
+
+Counters, histograms and gauges live in a module-level registry and are
+rendered by GET /metrics. Recording is a dict lookup plus a bisect, with no
+locks or I/O, so it is cheap enough for per-query and per-token paths.
+Each Cloud Run instance exposes its own series; the scraper aggregates.
+
+Label values are passed positionally in labelnames order:
+
+    EXTERNAL_API_DURATION.observe(0.12, "telnyx", "POST", "2xx")
+"""
+
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DB_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """Base class: a named family of series keyed by label values."""
+
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+
+    def samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in list(self._values.items()):
+            yield f"{self.name}_total{_labels(self.labelnames, labels)} {_fmt(value)}"
+
+
+class Histogram(Metric):
+    """Bucketed distribution (cumulative buckets rendered at scrape time)."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: dict[tuple, list[float]] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        series = self._values.get(labels)
+        if series is None:
+            series = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    @contextmanager
+    def time(self, *labels) -> Iterator[None]:
+        """Observe the wall time of the with-block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels) -> int:
+        series = self._values.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def sum(self, *labels) -> float:
+        series = self._values.get(labels)
+        return series[-1] if series else 0.0
+
+    def samples(self) -> Iterator[str]:
+        for labels, series in list(self._values.items()):
+            cumulative = 0
+            for bound, hits in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += hits
+                le = f'le="{_fmt(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_fmt(series[-1])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}"
+
+
+class Gauge(Metric):
+    """Point-in-time value, either set directly or read from callbacks at scrape."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+        self._callbacks: dict[tuple, Callable[[], float]] = {}
+
+    def set(self, value: float, *labels) -> None:
+        self._values[labels] = value
+
+    def set_function(self, fn: Callable[[], float], *labels) -> None:
+        """Read the value from fn() on every scrape."""
+        self._callbacks[labels] = fn
+
+    def samples(self) -> Iterator[str]:
+        values = dict(self._values)
+        for labels, fn in list(self._callbacks.items()):
+            try:
+                values[labels] = fn()
+            except Exception:
+                continue
+        for labels, value in values.items():
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_fmt(value)}"
+
+
+class MetricsRegistry:
+    """Holds metric families and renders them in the text format."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        # Re-registering a name (module reload) returns the existing family
+        return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, help, labelnames))
+
+
+def histogram(
+    name: str,
+    help: str,
+    labelnames: tuple[str, ...] = (),
+    buckets: tuple[float, ...] = LATENCY_BUCKETS,
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, help, labelnames, buckets))
+
+
+def gauge(name: str, help: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, help, labelnames))
+
+
+# --- Application metrics ---
+
+HTTP_REQUEST_DURATION = histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template",
+    ("route", "method", "status_class"),
+)
+LLM_TIME_TO_FIRST_TOKEN = histogram(
+    "llm_time_to_first_token_seconds", "Streaming LLM time to first token",
+    ("call_site",),
+)
+LLM_REQUEST_DURATION = histogram(
+    "llm_request_duration_seconds", "LLM request latency (full response)",
+    ("call_site", "mode", "outcome"),
+)
+DB_QUERY_DURATION = histogram(
+    "db_query_duration_seconds", "Database statement execution time",
+    buckets=DB_LATENCY_BUCKETS,
+)
+DB_QUERIES_PER_REQUEST = histogram(
+    "db_queries_per_request", "Database statements issued per HTTP request",
+    ("route",), buckets=COUNT_BUCKETS,
+)
+DB_TIME_PER_REQUEST = histogram(
+    "db_time_per_request_seconds", "Database time spent per HTTP request",
+    ("route",), buckets=DB_LATENCY_BUCKETS,
+)
+DB_POOL_WAIT = histogram(
+    "db_pool_wait_seconds", "Time to check out a pooled connection (includes opening new ones)",
+    ("pool",), buckets=DB_LATENCY_BUCKETS,
+)
+DB_POOL_TIMEOUTS = counter(
+    "db_pool_timeouts", "Checkouts that gave up after pool_timeout", ("pool",),
+)
+DB_POOL_CONNECTIONS = gauge(
+    "db_pool_connections", "Connections in each engine pool by state", ("pool", "state"),
+)
+DB_READ_ROUTES = counter(
+    "db_read_routes", "Read sessions opened by target (replica/primary)", ("target",),
+)
+DB_REPLICA_LAG = gauge("db_replica_lag_seconds", "Last measured read replica replay lag")
+EXTERNAL_API_DURATION = histogram(
+    "external_api_duration_seconds", "Outbound API call latency",
+    ("service", "operation", "outcome"),
+)
+CACHE_REQUESTS = counter(
+    "cache_requests", "In-process cache lookups by result (hit/miss)", ("cache", "result"),
+)
+VOICE_STAGE_DURATION = histogram(
+    "voice_stage_duration_seconds", "Voice turn latency by processing stage", ("stage",),
+)
+QUEUE_DEPTH = gauge("queue_depth", "Items waiting in in-process queues", ("queue",))
+WEBHOOK_EVENTS = counter(
+    "webhook_events", "Stored webhook events by kind and outcome (queued/duplicate/done/retry/dead)",
+    ("kind", "outcome"),
+)
+WEBHOOK_EVENT_LAG = histogram(
+    "webhook_event_lag_seconds", "Time from webhook receipt to successful processing", ("kind",),
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache, "hit" if hit else "miss")
+
+
+@contextmanager
+def observe_external(service: str, operation: str) -> Iterator[None]:
+    """Time an outbound call; outcome is "ok" or "error"."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        EXTERNAL_API_DURATION.observe(time.perf_counter() - start, service, operation, outcome)
+
+
+def httpx_event_hooks(service: str) -> dict[str, list]:
+    """httpx event hooks recording EXTERNAL_API_DURATION for a client.
+
+    Timed from send to response headers; outcome is the status class.
+    """
+
+    async def on_request(request) -> None:
+        request.extensions["metrics_start"] = time.perf_counter()
+
+    async def on_response(response) -> None:
+        start = response.request.extensions.get("metrics_start")
+        if start is not None:
+            EXTERNAL_API_DURATION.observe(
+                time.perf_counter() - start,
+                service,
+                response.request.method,
+                f"{response.status_code // 100}xx",
+            )
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+# --- Per-request database accounting ---
+
+# [statement count, seconds]; a mutable list so statements run in child
+# tasks (BaseHTTPMiddleware's call_next) and greenlets add to the same totals
+_request_db_stats: ContextVar[list | None] = ContextVar("request_db_stats", default=None)
+
+
+def start_request_db_stats() -> list:
+    stats = [0, 0.0]
+    _request_db_stats.set(stats)
+    return stats
+
+
+def record_db_query(duration: float) -> None:
+    DB_QUERY_DURATION.observe(duration)
+    stats = _request_db_stats.get()
+    if stats is not None:
+        stats[0] += 1
+        stats[1] += duration
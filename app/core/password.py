@@ -2,10 +2,14 @@
 
 import bcrypt
 
+from app.core.crypto_executor import run_in_crypto_executor
+
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt.
 
+    Blocks for the full bcrypt cost - use hash_password_async from async code.
+
     Args:
         password: Plain text password to hash
 
@@ -21,6 +25,8 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash.
 
+    Blocks for the full bcrypt cost - use verify_password_async from async code.
+
     Args:
         plain_password: Plain text password to verify
         hashed_password: Stored password hash
@@ -35,3 +41,28 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         )
     except Exception:
         return False
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the crypto executor without blocking the event loop.
+
+    Args:
+        password: Plain text password to hash
+
+    Returns:
+        Hashed password string
+    """
+    return await run_in_crypto_executor(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the crypto executor without blocking the event loop.
+
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Stored password hash
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    return await run_in_crypto_executor(verify_password, plain_password, hashed_password)
@@ -59,3 +59,34 @@ def normalize_phone_for_dedup(phone: str) -> str:
         Last 10 digits of the phone number
     """
     return "".join(c for c in phone if c.isdigit())[-10:]
+
+
+def phone_match_key(phone: str | None) -> str | None:
+    """Return the persisted lookup key for a phone number.
+
+    The key is the last 10 digits of the E.164 form, matching
+    normalize_phone_for_dedup. Values with fewer than 10 digits
+    (extensions, short codes, junk input) have no key.
+
+    Runs on every model assignment and webhook lookup, so unlike
+    normalize_phone_e164 it does not log input it can't key.
+
+    Examples:
+        +12817882316 → 2817882316
+        (281) 788-2316 → 2817882316
+        555-1234 → None
+    """
+    if not phone:
+        return None
+    digits = re.sub(r'\D', '', phone)
+    if len(digits) < 10:
+        return None
+    return digits[-10:]
+
+
+def normalize_email(email: str | None) -> str | None:
+    """Normalize an email address for case-insensitive matching."""
+    if not email:
+        return None
+    normalized = email.strip().lower()
+    return normalized or None
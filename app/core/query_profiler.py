@@ -0,0 +1,191 @@
+"""Opt-in SQL profiler with N+1 detection.
+
+While a profile is active (started per request by RequestContextMiddleware
+when query_profiler_enabled is set, or by ``profile_queries()`` as in the
+``query_budget`` test fixture), every statement executed on the app engine
+is recorded with its duration and the app frame that issued it
+(repository, service or route). Statements are grouped by shape - the SQL
+with bound values and expanded IN-lists collapsed - so the same query
+issued once per row shows up as one shape with a high count.
+
+Attributing callers walks the stack on every statement, so the profiler is
+meant for staging, load tests and CI rather than always-on production use.
+"""
+
+import logging
+import re
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Frames from these modules are skipped when attributing a statement
+_SKIP_MODULE_PREFIXES = ("app.core.query_profiler", "app.persistence.database", "app.core.metrics")
+
+_PARAM = r"(?:\$\d+|%\(\w+\)s|\?)(?:::\w+)?"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})*\s*\)")
+_PLACEHOLDER = re.compile(r"\$\d+|%\(\w+\)s")
+_NUMBER = re.compile(r"\b\d+\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize SQL so executions differing only in bound values compare equal."""
+    shape = _PLACEHOLDER_LIST.sub("(?, ...)", statement)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER.sub("N", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def _caller() -> str:
+    """module:function of the nearest app frame that issued the statement.
+
+    Async sessions run statements in a greenlet whose stack ends at
+    SQLAlchemy's greenlet_spawn; the awaiting coroutine frames are on the
+    parent greenlet, so the walk continues there.
+    """
+    frame = sys._getframe(2)
+    parent = None
+    while True:
+        while frame is not None:
+            module = frame.f_globals.get("__name__", "")
+            if module.startswith("app.") and not module.startswith(_SKIP_MODULE_PREFIXES):
+                return f"{module}:{frame.f_code.co_name}"
+            frame = frame.f_back
+        try:
+            import greenlet
+        except ImportError:
+            return "unknown"
+        parent = (parent or greenlet.getcurrent()).parent
+        if parent is None or parent.gr_frame is None:
+            return "unknown"
+        frame = parent.gr_frame
+
+
+@dataclass
+class QueryRecord:
+    shape: str
+    duration: float
+    caller: str
+
+
+@dataclass
+class QueryProfile:
+    """Statements executed while the profile was active."""
+
+    label: str
+    queries: list[QueryRecord] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_time(self) -> float:
+        return sum(q.duration for q in self.queries)
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int, str]]:
+        """(shape, count, first caller) for shapes run at least threshold times."""
+        counts = Counter(q.shape for q in self.queries)
+        callers: dict[str, str] = {}
+        for q in self.queries:
+            callers.setdefault(q.shape, q.caller)
+        return [
+            (shape, n, callers[shape])
+            for shape, n in counts.most_common()
+            if n >= threshold
+        ]
+
+    def by_caller(self) -> dict[str, tuple[int, float]]:
+        """{caller: (statement count, seconds)}"""
+        totals: dict[str, tuple[int, float]] = {}
+        for q in self.queries:
+            count, seconds = totals.get(q.caller, (0, 0.0))
+            totals[q.caller] = (count + 1, seconds + q.duration)
+        return totals
+
+    def report(self, threshold: int = 2) -> str:
+        lines = [f"{self.label}: {self.count} statements, {self.total_time * 1000:.1f}ms"]
+        for caller, (count, seconds) in sorted(self.by_caller().items(), key=lambda kv: -kv[1][0]):
+            lines.append(f"  {count:4d}  {seconds * 1000:8.1f}ms  {caller}")
+        for shape, n, caller in self.repeated_shapes(threshold):
+            lines.append(f"  repeated x{n} from {caller}: {shape[:200]}")
+        return "\n".join(lines)
+
+
+_current_profile: ContextVar[QueryProfile | None] = ContextVar("query_profile", default=None)
+
+
+def start_profile(label: str) -> QueryProfile:
+    """Profile the rest of the current context (one request's task)."""
+    profile = QueryProfile(label)
+    _current_profile.set(profile)
+    return profile
+
+
+@contextmanager
+def profile_queries(label: str) -> Iterator[QueryProfile]:
+    """Record statements executed in this context (and tasks spawned from it)."""
+    profile = QueryProfile(label)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def record_statement(statement: str, duration: float) -> None:
+    """Engine hook: attach a statement to the active profile, if any."""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.queries.append(QueryRecord(statement_shape(statement), duration, _caller()))
+
+
+def log_profile(profile: QueryProfile, threshold: int) -> None:
+    """Warn about N+1 shapes; log the per-caller breakdown at DEBUG."""
+    repeated = profile.repeated_shapes(threshold)
+    if repeated:
+        logger.warning(
+            f"Possible N+1 in {profile.label}: "
+            + "; ".join(f"x{n} from {caller}" for _, n, caller in repeated),
+            extra={
+                "query_count": profile.count,
+                "query_time_ms": round(profile.total_time * 1000, 2),
+                "repeated_shapes": [shape[:500] for shape, _, _ in repeated],
+            },
+        )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(profile.report(threshold))
+
+
+def instrument(target) -> Callable[[], None]:
+    """Record statements from an engine or connection other than the app engine.
+
+    The app engine is instrumented in app.persistence.database; this is for
+    test fixtures and scripts with their own engine. Returns a function that
+    removes the listeners.
+    """
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        conn.info["profile_query_start"] = time.perf_counter()
+
+    def after(conn, cursor, statement, parameters, context, executemany):
+        start = conn.info.pop("profile_query_start", None)
+        if start is not None:
+            record_statement(statement, time.perf_counter() - start)
+
+    event.listen(target, "before_cursor_execute", before)
+    event.listen(target, "after_cursor_execute", after)
+
+    def remove() -> None:
+        event.remove(target, "before_cursor_execute", before)
+        event.remove(target, "after_cursor_execute", after)
+
+    return remove
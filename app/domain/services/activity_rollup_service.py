@@ -0,0 +1,447 @@
+"""Incremental activity rollups for dashboard analytics.
+
+Maintains hour/day/week activity counts per tenant and channel in
+activity_rollups so the heatmap, yearly activity and usage endpoints
+read a handful of pre-aggregated rows instead of scanning calls and
+messages on every request.
+
+Hour buckets are rebuilt from the raw tables starting a little before the
+tenant's watermark (to pick up late writes such as call durations), then
+day and week buckets are re-derived from the hour rows. Readers combine
+materialized buckets before the watermark with a live aggregate of the
+(short) tail after it, so results stay exact between worker runs.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, insert, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.persistence.models.activity_rollup import (
+    ActivityRollup,
+    ActivityRollupWatermark,
+)
+from app.persistence.models.call import Call
+from app.persistence.models.conversation import Conversation, Message
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_CHANNELS = ("sms", "email", "web")
+COARSE_GRANULARITIES = ("day", "week")
+
+# Hours before the watermark that are re-rolled on every refresh so rows
+# written late (call completion, delayed webhooks) still land in their bucket
+LATE_ARRIVAL_HOURS = 2
+# History rolled up the first time a tenant is seen (covers the yearly view)
+INITIAL_BACKFILL_DAYS = 366
+# Rebuild window per transaction, keeps delete/insert batches bounded
+REBUILD_CHUNK = timedelta(days=7)
+
+
+@dataclass
+class RollupBucket:
+    """Activity counts for one channel in one time bucket."""
+
+    bucket_start: datetime
+    channel: str
+    inbound: int = 0
+    outbound: int = 0
+    total: int = 0
+    duration_seconds: float = 0.0
+
+    def add(self, other: "RollupBucket") -> None:
+        self.inbound += other.inbound
+        self.outbound += other.outbound
+        self.total += other.total
+        self.duration_seconds += other.duration_seconds
+
+
+def floor_bucket(value: datetime, granularity: str) -> datetime:
+    """Truncate a UTC datetime to the start of its hour/day/week bucket."""
+    hour = value.replace(minute=0, second=0, microsecond=0)
+    if granularity == "hour":
+        return hour
+    day = hour.replace(hour=0)
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    raise ValueError(f"Unknown rollup granularity: {granularity}")
+
+
+def _ceil_bucket(value: datetime, granularity: str) -> datetime:
+    floored = floor_bucket(value, granularity)
+    if floored == value:
+        return floored
+    step = {"hour": timedelta(hours=1), "day": timedelta(days=1), "week": timedelta(weeks=1)}
+    return floored + step[granularity]
+
+
+def _date_trunc(granularity: str, column):
+    """date_trunc with the unit inlined so SELECT and GROUP BY match under asyncpg."""
+    if granularity not in ("hour", "day", "week"):
+        raise ValueError(f"Unknown rollup granularity: {granularity}")
+    return func.date_trunc(literal_column(f"'{granularity}'"), column)
+
+
+class ActivityRollupService:
+    """Maintains and reads per-tenant activity rollups."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    async def refresh_tenant(self, tenant_id: int, now: datetime | None = None) -> int:
+        """Roll a tenant forward to the last completed hour.
+
+        Returns:
+            Number of hours rebuilt (0 if already current or another
+            worker holds the tenant's watermark)
+        """
+        now = now or datetime.utcnow()
+        target = floor_bucket(now, "hour")
+
+        watermark = await self.get_watermark(tenant_id)
+        if watermark is None:
+            start = floor_bucket(target - timedelta(days=INITIAL_BACKFILL_DAYS), "day")
+        else:
+            start = watermark - timedelta(hours=LATE_ARRIVAL_HOURS)
+        if start >= target:
+            return 0
+
+        return await self._rebuild(tenant_id, start, target)
+
+    async def backfill(
+        self, tenant_id: int, start: datetime, end: datetime, now: datetime | None = None
+    ) -> int:
+        """Rebuild rollups for an explicit UTC range (e.g. after a data repair).
+
+        The watermark is only advanced if the range extends it contiguously,
+        so backfilling history never hides the live tail from readers. On a
+        tenant that has never been rolled up, the range is widened to include
+        the initial build: the watermark created here would otherwise mark
+        everything before start as done.
+
+        Returns:
+            Number of hours rebuilt
+        """
+        target = floor_bucket(now or datetime.utcnow(), "hour")
+        start = floor_bucket(start, "hour")
+        end = min(_ceil_bucket(end, "hour"), target)
+        if await self.get_watermark(tenant_id) is None:
+            start = min(start, floor_bucket(target - timedelta(days=INITIAL_BACKFILL_DAYS), "day"))
+            end = target
+        if start >= end:
+            return 0
+        return await self._rebuild(tenant_id, start, end)
+
+    async def get_watermark(self, tenant_id: int) -> datetime | None:
+        result = await self.session.execute(
+            select(ActivityRollupWatermark.rolled_up_through).where(
+                ActivityRollupWatermark.tenant_id == tenant_id
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def _rebuild(
+        self,
+        tenant_id: int,
+        start: datetime,
+        end: datetime,
+    ) -> int:
+        hours = 0
+        chunk_start = start
+        while chunk_start < end:
+            chunk_end = min(chunk_start + REBUILD_CHUNK, end)
+
+            if not await self._lock_watermark(tenant_id, chunk_start):
+                logger.info(f"Activity rollup for tenant {tenant_id} is locked by another worker, skipping")
+                await self.session.rollback()
+                return hours
+
+            buckets = await self._aggregate_hours(tenant_id, chunk_start, chunk_end)
+            await self._replace_hours(tenant_id, chunk_start, chunk_end, buckets)
+            for granularity in COARSE_GRANULARITIES:
+                await self._rebuild_coarse(tenant_id, granularity, chunk_start, chunk_end)
+
+            await self._advance_watermark(tenant_id, chunk_start, chunk_end)
+
+            await self.session.commit()
+            hours += int((chunk_end - chunk_start).total_seconds() // 3600)
+            chunk_start = chunk_end
+
+        return hours
+
+    async def _lock_watermark(self, tenant_id: int, initial: datetime) -> bool:
+        """Row-lock the tenant's watermark, creating it if needed.
+
+        Uses SKIP LOCKED so overlapping worker runs skip tenants already
+        being rolled up instead of queueing behind them.
+        """
+        await self.session.execute(
+            pg_insert(ActivityRollupWatermark)
+            .values(tenant_id=tenant_id, rolled_up_through=initial)
+            .on_conflict_do_nothing(index_elements=["tenant_id"])
+        )
+        result = await self.session.execute(
+            select(ActivityRollupWatermark.tenant_id)
+            .where(ActivityRollupWatermark.tenant_id == tenant_id)
+            .with_for_update(skip_locked=True)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def _advance_watermark(self, tenant_id: int, start: datetime, end: datetime) -> None:
+        """Move the watermark to end if [start, end) is contiguous with it."""
+        watermark = await self.get_watermark(tenant_id)
+        if watermark is None or start <= watermark < end:
+            await self.session.execute(
+                ActivityRollupWatermark.__table__.update()
+                .where(ActivityRollupWatermark.tenant_id == tenant_id)
+                .values(rolled_up_through=end, updated_at=datetime.utcnow())
+            )
+
+    async def _replace_hours(
+        self,
+        tenant_id: int,
+        start: datetime,
+        end: datetime,
+        buckets: list[RollupBucket],
+    ) -> None:
+        await self.session.execute(
+            delete(ActivityRollup).where(
+                ActivityRollup.tenant_id == tenant_id,
+                ActivityRollup.granularity == "hour",
+                ActivityRollup.bucket_start >= start,
+                ActivityRollup.bucket_start < end,
+            )
+        )
+        if not buckets:
+            return
+
+        now = datetime.utcnow()
+        await self.session.execute(
+            insert(ActivityRollup),
+            [
+                {
+                    "tenant_id": tenant_id,
+                    "granularity": "hour",
+                    "channel": b.channel,
+                    "bucket_start": b.bucket_start,
+                    "inbound_count": b.inbound,
+                    "outbound_count": b.outbound,
+                    "total_count": b.total,
+                    "duration_seconds": b.duration_seconds,
+                    "updated_at": now,
+                }
+                for b in buckets
+            ],
+        )
+
+    async def _rebuild_coarse(
+        self,
+        tenant_id: int,
+        granularity: str,
+        start: datetime,
+        end: datetime,
+    ) -> None:
+        """Re-derive day/week buckets overlapping [start, end) from hour rows."""
+        coarse_start = floor_bucket(start, granularity)
+        coarse_end = _ceil_bucket(end, granularity)
+
+        await self.session.execute(
+            delete(ActivityRollup).where(
+                ActivityRollup.tenant_id == tenant_id,
+                ActivityRollup.granularity == granularity,
+                ActivityRollup.bucket_start >= coarse_start,
+                ActivityRollup.bucket_start < coarse_end,
+            )
+        )
+
+        bucket = _date_trunc(granularity, ActivityRollup.bucket_start)
+        source = (
+            select(
+                ActivityRollup.tenant_id,
+                literal(granularity, ActivityRollup.granularity.type),
+                ActivityRollup.channel,
+                bucket,
+                func.sum(ActivityRollup.inbound_count),
+                func.sum(ActivityRollup.outbound_count),
+                func.sum(ActivityRollup.total_count),
+                func.sum(ActivityRollup.duration_seconds),
+                func.now(),
+            )
+            .where(
+                ActivityRollup.tenant_id == tenant_id,
+                ActivityRollup.granularity == "hour",
+                ActivityRollup.bucket_start >= coarse_start,
+                ActivityRollup.bucket_start < coarse_end,
+            )
+            .group_by(ActivityRollup.tenant_id, ActivityRollup.channel, bucket)
+        )
+        await self.session.execute(
+            insert(ActivityRollup).from_select(
+                [
+                    "tenant_id",
+                    "granularity",
+                    "channel",
+                    "bucket_start",
+                    "inbound_count",
+                    "outbound_count",
+                    "total_count",
+                    "duration_seconds",
+                    "updated_at",
+                ],
+                source,
+            )
+        )
+
+    async def _aggregate_hours(
+        self,
+        tenant_id: int,
+        start: datetime,
+        end: datetime,
+    ) -> list[RollupBucket]:
+        """Aggregate raw calls and messages into hour buckets for [start, end)."""
+        buckets: list[RollupBucket] = []
+
+        msg_hour = _date_trunc("hour", Message.created_at)
+        msg_stmt = (
+            select(
+                msg_hour.label("bucket"),
+                Conversation.channel.label("channel"),
+                func.count().filter(Message.role == "user").label("inbound"),
+                func.count().filter(Message.role == "assistant").label("outbound"),
+                func.count().label("total"),
+            )
+            .select_from(Message)
+            .join(Conversation, Conversation.id == Message.conversation_id)
+            .where(
+                Conversation.tenant_id == tenant_id,
+                Conversation.channel.in_(MESSAGE_CHANNELS),
+                Message.created_at >= start,
+                Message.created_at < end,
+            )
+            .group_by(msg_hour, Conversation.channel)
+        )
+        for row in (await self.session.execute(msg_stmt)).all():
+            buckets.append(
+                RollupBucket(
+                    bucket_start=row.bucket,
+                    channel=row.channel,
+                    inbound=int(row.inbound or 0),
+                    outbound=int(row.outbound or 0),
+                    total=int(row.total or 0),
+                )
+            )
+
+        call_timestamp = func.coalesce(Call.started_at, Call.created_at)
+        call_hour = _date_trunc("hour", call_timestamp)
+        duration_seconds = func.coalesce(
+            func.nullif(Call.duration, 0),
+            func.extract("epoch", Call.ended_at - Call.started_at),
+            0,
+        )
+        call_stmt = (
+            select(
+                call_hour.label("bucket"),
+                func.count().filter(Call.direction == "inbound").label("inbound"),
+                func.count().filter(Call.direction == "outbound").label("outbound"),
+                func.count().label("total"),
+                func.sum(duration_seconds).label("duration_seconds"),
+            )
+            .where(
+                Call.tenant_id == tenant_id,
+                call_timestamp >= start,
+                call_timestamp < end,
+            )
+            .group_by(call_hour)
+        )
+        for row in (await self.session.execute(call_stmt)).all():
+            buckets.append(
+                RollupBucket(
+                    bucket_start=row.bucket,
+                    channel="call",
+                    inbound=int(row.inbound or 0),
+                    outbound=int(row.outbound or 0),
+                    total=int(row.total or 0),
+                    duration_seconds=float(row.duration_seconds or 0),
+                )
+            )
+
+        return buckets
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def get_buckets(
+        self,
+        tenant_id: int,
+        granularity: str,
+        start: datetime,
+        end: datetime,
+    ) -> list[RollupBucket]:
+        """Get activity buckets covering [start, end).
+
+        start is truncated to its bucket. Buckets before the watermark come
+        from activity_rollups; the tail after it is aggregated live from
+        the raw tables (a few hours at most when the worker is running).
+        """
+        start = floor_bucket(start, granularity)
+        watermark = await self.get_watermark(tenant_id)
+        if watermark is None:
+            return self._regroup(
+                await self._aggregate_hours(tenant_id, start, end), granularity
+            )
+
+        # Only whole buckets before the watermark are fully materialized
+        materialized_end = min(floor_bucket(watermark, granularity), end)
+        buckets: list[RollupBucket] = []
+        if start < materialized_end:
+            stmt = select(ActivityRollup).where(
+                ActivityRollup.tenant_id == tenant_id,
+                ActivityRollup.granularity == granularity,
+                ActivityRollup.bucket_start >= start,
+                ActivityRollup.bucket_start < materialized_end,
+            )
+            for row in (await self.session.execute(stmt)).scalars().all():
+                buckets.append(
+                    RollupBucket(
+                        bucket_start=row.bucket_start,
+                        channel=row.channel,
+                        inbound=row.inbound_count,
+                        outbound=row.outbound_count,
+                        total=row.total_count,
+                        duration_seconds=row.duration_seconds,
+                    )
+                )
+
+        tail_start = max(start, materialized_end)
+        if tail_start < end:
+            tail: list[RollupBucket] = []
+            hours_end = min(watermark, end)
+            if granularity != "hour" and tail_start < hours_end:
+                # Partial coarse bucket: materialized hours up to the watermark
+                tail.extend(await self.get_buckets(tenant_id, "hour", tail_start, hours_end))
+            live_start = max(tail_start, watermark)
+            if live_start < end:
+                tail.extend(await self._aggregate_hours(tenant_id, live_start, end))
+            buckets.extend(self._regroup(tail, granularity))
+
+        return buckets
+
+    @staticmethod
+    def _regroup(buckets: list[RollupBucket], granularity: str) -> list[RollupBucket]:
+        grouped: dict[tuple[datetime, str], RollupBucket] = {}
+        for b in buckets:
+            key = (floor_bucket(b.bucket_start, granularity), b.channel)
+            if key not in grouped:
+                grouped[key] = RollupBucket(bucket_start=key[0], channel=b.channel)
+            grouped[key].add(b)
+        return list(grouped.values())
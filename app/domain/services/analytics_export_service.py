@@ -0,0 +1,162 @@
+"""Incremental export of conversation history to partitioned Parquet files.
+
+Each run exports, per table, the rows changed since that table's watermark
+(analytics_export_watermarks) up to now minus analytics_export_delay_minutes,
+which leaves in-flight transactions time to commit. Rows are read from a
+server-side cursor on the read replica when it has caught up past the end
+of the window. Files are partitioned by tenant and by the row's created_at
+day, so every version of a row lands in the same partition.
+
+Conversations, calls, call summaries and leads are tracked by updated_at: a
+row is exported again in every run in which it changed, so readers take
+the latest updated_at per id. Messages are append-only and tracked by
+created_at.
+
+Part files are named after the window start. A run that fails before
+advancing the watermark is redone from the same start and overwrites the
+files it wrote.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import Column, Select, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.persistence.database import read_session
+from app.persistence.models.analytics_export import AnalyticsExportWatermark
+from app.persistence.models.call import Call
+from app.persistence.models.call_summary import CallSummary
+from app.persistence.models.conversation import Conversation, Message
+from app.persistence.models.lead import Lead
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    """A table in the export.
+
+    changed_at is the watermark column. Tables without their own tenant_id
+    take it from tenant_parent (joined through the foreign key).
+    """
+
+    name: str
+    model: Any
+    changed_at: Any
+    tenant_parent: Any = None
+
+    @property
+    def columns(self) -> list[Column]:
+        """Columns written to the files (tenant_id is a partition key)."""
+        return [c for c in self.model.__table__.columns if c.name != "tenant_id"]
+
+    def statement(self, since: datetime | None, until: datetime) -> Select:
+        """Rows changed in [since, until) as (tenant_id, *columns), in partition order."""
+        tenant_id = (self.tenant_parent or self.model).tenant_id
+        stmt = select(tenant_id.label("tenant_id"), *self.columns).where(self.changed_at < until)
+        if self.tenant_parent is not None:
+            stmt = stmt.select_from(self.model).join(self.tenant_parent)
+        if since is not None:
+            stmt = stmt.where(self.changed_at >= since)
+        return stmt.order_by(tenant_id, self.model.created_at, self.model.id)
+
+
+EXPORT_TABLES = [
+    ExportTable("conversations", Conversation, Conversation.updated_at),
+    ExportTable("messages", Message, Message.created_at, tenant_parent=Conversation),
+    ExportTable("calls", Call, Call.updated_at),
+    ExportTable("call_summaries", CallSummary, CallSummary.updated_at, tenant_parent=Call),
+    ExportTable("leads", Lead, Lead.updated_at),
+]
+
+
+class AnalyticsExportService:
+    """Writes new and changed rows to a sink and advances the watermarks.
+
+    The sink opens one partition file at a time (see ParquetSink). When a
+    loader is given (see BigQueryLoader), each table's new files are loaded
+    before its watermark is advanced.
+    """
+
+    def __init__(self, session: AsyncSession, sink, loader=None) -> None:
+        self.session = session
+        self.sink = sink
+        self.loader = loader
+
+    async def run(self, now: datetime | None = None) -> dict[str, int]:
+        """Export every table.
+
+        Returns:
+            Rows exported per table
+        """
+        until = (now or datetime.utcnow()) - timedelta(minutes=settings.analytics_export_delay_minutes)
+        exported = {}
+        for table in EXPORT_TABLES:
+            exported[table.name] = await self.export_table(table, until)
+        logger.info(f"Analytics export through {until}: {exported}")
+        return exported
+
+    async def export_table(self, table: ExportTable, until: datetime) -> int:
+        """Export rows of one table changed since its watermark and before until."""
+        since = await self.get_watermark(table.name)
+        if since is not None and since >= until:
+            return 0
+        part = f"part-{since:%Y%m%dT%H%M%S}" if since else "part-initial"
+        created_at = 1 + [c.name for c in table.columns].index("created_at")
+
+        rows = 0
+        written: list[str] = []
+        partition = key = None
+        stmt = table.statement(since, until).execution_options(yield_per=settings.export_batch_size)
+        lag_tolerance = settings.analytics_export_delay_minutes * 60
+        async with read_session(max_lag_seconds=lag_tolerance) as reader:
+            result = await reader.stream(stmt)
+            async for batch in result.partitions():
+                pending = []
+                for row in batch:
+                    row_key = (row[0], row[created_at].date())
+                    if row_key != key:
+                        if pending:
+                            await partition.write(pending)
+                            pending = []
+                        if partition is not None:
+                            written.append(await partition.close())
+                        key = row_key
+                        partition = await self.sink.open(table.name, table.columns, *key, part)
+                    pending.append(row[1:])
+                if pending:
+                    await partition.write(pending)
+                rows += len(batch)
+        if partition is not None:
+            written.append(await partition.close())
+
+        if self.loader is not None and written:
+            await self.loader.load(table.name, written)
+        await self._advance_watermark(table.name, until)
+        return rows
+
+    async def get_watermark(self, table_name: str) -> datetime | None:
+        result = await self.session.execute(
+            select(AnalyticsExportWatermark.exported_through).where(
+                AnalyticsExportWatermark.table_name == table_name
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def _advance_watermark(self, table_name: str, until: datetime) -> None:
+        now = datetime.utcnow()
+        stmt = pg_insert(AnalyticsExportWatermark).values(
+            table_name=table_name, exported_through=until, updated_at=now
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[AnalyticsExportWatermark.table_name],
+                set_={"exported_through": until, "updated_at": now},
+            )
+        )
+        await self.session.commit()
@@ -0,0 +1,185 @@
+"""Lazy resolution and caching of call recording playback URLs.
+
+Call completion only stores what is needed to find the recording later
+(recording_sid, recording_conversation_id). The playback URL is resolved
+when the recording is viewed and cached in Redis until shortly before it
+expires, so repeated views don't go back to the Telnyx API.
+
+When gcs_call_recordings_bucket is set, a resolved recording is also
+copied into our own storage; later views are served from that copy with a
+signed URL.
+"""
+
+import logging
+import time
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import record_cache
+from app.infrastructure.call_recording_storage import (
+    CallRecordingStorage,
+    CallRecordingStorageError,
+    call_recording_storage,
+)
+from app.infrastructure.redis import redis_client
+from app.persistence.models.call import Call
+from app.persistence.models.tenant_sms_config import TenantSmsConfig
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+URL_CACHE_PREFIX = "call_recording_url"
+# Cached URLs are dropped this long before they expire
+EXPIRY_MARGIN_SECONDS = 60
+# "No recording" is cached briefly; Telnyx may still be processing it
+MISSING_TTL_SECONDS = 300
+DOWNLOAD_TIMEOUT_SECONDS = 60
+
+
+class TelnyxNotConfiguredError(Exception):
+    """Raised when a recording must be looked up but the tenant has no Telnyx API key."""
+
+
+def url_cache_ttl(url: str, now: float | None = None) -> int:
+    """Seconds a pre-signed URL can be cached (0 if it is about to expire).
+
+    Reads the expiry of S3 (X-Amz-Date + X-Amz-Expires), GCS v4
+    (X-Goog-Date + X-Goog-Expires) and legacy (Expires) signed URLs;
+    URLs without one are cached for call_recording_url_cache_ttl_seconds.
+    """
+    now = time.time() if now is None else now
+    params = {k.lower(): v[0] for k, v in parse_qs(urlparse(url).query).items()}
+    expires_at = None
+    try:
+        for prefix in ("x-amz-", "x-goog-"):
+            if f"{prefix}date" in params and f"{prefix}expires" in params:
+                signed_at = datetime.strptime(params[f"{prefix}date"], "%Y%m%dT%H%M%SZ")
+                expires_at = signed_at.replace(tzinfo=timezone.utc).timestamp() + int(params[f"{prefix}expires"])
+                break
+        else:
+            if "expires" in params:
+                expires_at = float(params["expires"])
+    except ValueError:
+        expires_at = None
+
+    if expires_at is None:
+        return settings.call_recording_url_cache_ttl_seconds
+    return max(0, int(expires_at - now) - EXPIRY_MARGIN_SECONDS)
+
+
+class CallRecordingService:
+    """Resolves playback URLs for call recordings."""
+
+    def __init__(self, session: AsyncSession, storage: CallRecordingStorage = call_recording_storage) -> None:
+        self.session = session
+        self.storage = storage
+
+    async def get_playback_url(self, call: Call) -> str | None:
+        """Get a playable URL for the call's recording, or None if there is none.
+
+        A recording ID found by searching is set on the call and flushed;
+        the caller commits.
+
+        Raises:
+            TelnyxNotConfiguredError: If the recording has to be looked up in
+                Telnyx and the tenant has no API key
+        """
+        cache_key = f"{URL_CACHE_PREFIX}:{call.id}"
+        await redis_client.connect()
+        cached = await redis_client.get(cache_key)
+        record_cache("call_recording_url", cached is not None)
+        if cached is not None:
+            return cached or None
+
+        url = None
+        if call.recording_storage_path:
+            try:
+                ttl = settings.call_recording_signed_url_ttl_seconds
+                url = await self.storage.get_signed_url(call.recording_storage_path, ttl)
+                cache_ttl = ttl - EXPIRY_MARGIN_SECONDS
+            except CallRecordingStorageError as e:
+                logger.warning(f"Falling back to Telnyx for recording of call {call.id}: {e}")
+        if url is None:
+            url = await self._resolve_from_telnyx(call)
+            cache_ttl = url_cache_ttl(url) if url else MISSING_TTL_SECONDS
+
+        if cache_ttl > 0:
+            await redis_client.set(cache_key, url or "", ttl=cache_ttl)
+        return url
+
+    async def _resolve_from_telnyx(self, call: Call) -> str | None:
+        from app.infrastructure.telephony.telnyx_provider import TelnyxAIService
+
+        if not call.recording_sid and not call.call_sid:
+            return None
+
+        result = await self.session.execute(
+            select(TenantSmsConfig.telnyx_api_key).where(TenantSmsConfig.tenant_id == call.tenant_id)
+        )
+        api_key = result.scalar_one_or_none()  # EncryptedString auto-decrypts
+        if not api_key:
+            raise TelnyxNotConfiguredError(f"Telnyx not configured for tenant {call.tenant_id}")
+        telnyx_ai = TelnyxAIService(api_key)
+
+        # Direct lookup by recording ID, then search by call/conversation
+        if call.recording_sid:
+            url = await telnyx_ai.get_fresh_recording_url(call.recording_sid)
+            if url:
+                return url
+
+        if not call.call_sid:
+            return None
+        recording_data = await telnyx_ai.get_recording_for_call(
+            call.call_sid, conversation_id=call.recording_conversation_id
+        )
+        if not recording_data or not recording_data.get("recording_url"):
+            return None
+
+        # Remember the recording ID so the next lookup is direct
+        recording_id = recording_data.get("recording_id")
+        if recording_id and recording_id != call.recording_conversation_id and not call.recording_sid:
+            call.recording_sid = recording_id
+            await self.session.flush()
+        return recording_data["recording_url"]
+
+    async def mirror(self, call: Call, url: str) -> str | None:
+        """Copy the recording at url into our storage and record its path.
+
+        Returns:
+            Blob path, or None if mirroring is disabled or failed
+        """
+        if not self.storage.enabled or call.recording_storage_path:
+            return call.recording_storage_path
+        try:
+            async with httpx.AsyncClient(timeout=DOWNLOAD_TIMEOUT_SECONDS) as client:
+                response = await client.get(url)
+                response.raise_for_status()
+            path = await self.storage.upload_recording(
+                call.tenant_id,
+                call.id,
+                response.content,
+                response.headers.get("content-type", "audio/mpeg"),
+            )
+        except (httpx.HTTPError, CallRecordingStorageError) as e:
+            logger.warning(f"Failed to mirror recording for call {call.id}: {e}")
+            return None
+
+        call.recording_storage_path = path
+        await self.session.commit()
+        # Serve the next view from our copy
+        await redis_client.delete(f"{URL_CACHE_PREFIX}:{call.id}")
+        return path
+
+
+async def mirror_call_recording(call_id: int, url: str) -> None:
+    """Mirror a call's recording on a dedicated session (background task)."""
+    from app.persistence.database import async_session_factory
+
+    async with async_session_factory() as session:
+        call = await session.get(Call, call_id)
+        if call is not None:
+            await CallRecordingService(session).mirror(call, url)
@@ -221,7 +221,7 @@ class ChatService:
             )
 
         # Add user message
-        await self.conversation_service.add_message(
+        user_msg = await self.conversation_service.add_message(
             tenant_id, conversation.id, "user", user_message
         )
 
@@ -392,7 +392,7 @@ class ChatService:
             )
 
         # Add assistant response
-        await self.conversation_service.add_message(
+        assistant_msg = await self.conversation_service.add_message(
             tenant_id, conversation.id, "assistant", llm_response
         )
 
@@ -407,11 +407,9 @@ class ChatService:
                 immediate_name = validated
                 logger.info(f"IMMEDIATE NAME EXTRACTION: Bot greeted user as '{immediate_name}' in response")
 
-        # Refresh messages to include current turn (user message + assistant response)
-        # This is needed for qualification checks that analyze the full conversation
-        messages = await self.conversation_service.get_conversation_history(
-            tenant_id, conversation.id
-        )
+        # Include the current turn (user message + assistant response) for the
+        # qualification checks that analyze the full conversation
+        messages = [*messages, user_msg, assistant_msg]
 
         # Always try to extract contact info from conversation
         # This ensures we capture newly provided information even if a lead already exists
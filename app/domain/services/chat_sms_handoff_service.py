@@ -224,13 +224,7 @@ class ChatSmsHandoffService:
                 logger.error(f"No SMS provider for tenant {tenant_id}")
                 return False
 
-            from app.persistence.models.tenant_sms_config import TenantSmsConfig
-
-            sms_config_stmt = select(TenantSmsConfig).where(
-                TenantSmsConfig.tenant_id == tenant_id
-            )
-            sms_config_result = await self.session.execute(sms_config_stmt)
-            sms_config = sms_config_result.scalar_one_or_none()
+            sms_config = await factory.get_config(tenant_id)
             if not sms_config:
                 logger.error(f"No SMS config for tenant {tenant_id}")
                 return False
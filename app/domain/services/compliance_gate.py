@@ -0,0 +1,149 @@
+"""Compliance gate: may we send an SMS to this number for this tenant?"""
+
+from dataclasses import dataclass
+
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.redis import redis_client
+from app.persistence.models.do_not_contact import DoNotContact
+from app.persistence.models.sms_opt_in import SmsOptIn
+from app.settings import settings
+
+# Cached per-phone states
+STATE_DNC = "dnc"
+STATE_OPTED_IN = "opted_in"
+STATE_NOT_OPTED_IN = "not_opted_in"
+
+_REASONS = {
+    STATE_DNC: "do_not_contact",
+    STATE_NOT_OPTED_IN: "not_opted_in",
+    STATE_OPTED_IN: None,
+}
+
+
+@dataclass(frozen=True)
+class ComplianceDecision:
+    """Outcome of a compliance check for one phone number."""
+
+    state: str
+
+    @property
+    def allowed(self) -> bool:
+        return self.state == STATE_OPTED_IN
+
+    @property
+    def is_blocked(self) -> bool:
+        """True if the number is on the Do Not Contact list."""
+        return self.state == STATE_DNC
+
+    @property
+    def reason(self) -> str | None:
+        """Skip reason used in worker results ("do_not_contact", "not_opted_in")."""
+        return _REASONS[self.state]
+
+
+def _cache_key(tenant_id: int, phone: str) -> str:
+    return f"compliance:{tenant_id}:{phone}"
+
+
+class ComplianceGate:
+    """Answers DNC + opt-in for outbound SMS from one lookup.
+
+    Each (tenant, phone) state is cached in Redis as a single key, so a
+    check is one GET and a batch check is one MGET. Misses (and every check
+    when Redis is disabled) are answered from the database with one query
+    covering both the DNC list and the opt-in table, and cached with SET NX
+    so a stale read can't overwrite a newer write-through.
+
+    DncService and OptInService call refresh() after every block/unblock and
+    opt-in/opt-out, so STOP/START and manual changes apply immediately.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def check(self, tenant_id: int, phone: str) -> ComplianceDecision:
+        """Check whether a phone number may be messaged.
+
+        Args:
+            tenant_id: Tenant ID
+            phone: Phone number (as stored on DNC/opt-in records)
+
+        Returns:
+            ComplianceDecision for the number
+        """
+        return (await self.check_many(tenant_id, [phone]))[phone]
+
+    async def check_many(self, tenant_id: int, phones: list[str]) -> dict[str, ComplianceDecision]:
+        """Check many phone numbers at once (e.g. a campaign run).
+
+        Args:
+            tenant_id: Tenant ID
+            phones: Phone numbers
+
+        Returns:
+            Decision per distinct phone number
+        """
+        phones = list(dict.fromkeys(p for p in phones if p))
+        if not phones:
+            return {}
+
+        cached = await redis_client.mget([_cache_key(tenant_id, p) for p in phones])
+        states = {p: s for p, s in zip(phones, cached) if s in _REASONS}
+
+        missing = [p for p in phones if p not in states]
+        if missing:
+            loaded = await self._load_states(tenant_id, missing)
+            states.update(loaded)
+            await redis_client.set_many(
+                {_cache_key(tenant_id, p): s for p, s in loaded.items()},
+                ttl=settings.compliance_cache_ttl_seconds,
+                nx=True,
+            )
+
+        return {p: ComplianceDecision(states[p]) for p in phones}
+
+    async def refresh(self, tenant_id: int, phone: str) -> ComplianceDecision:
+        """Re-read a number's state from the database and overwrite the cache.
+
+        Call after the DNC or opt-in records for the number change (and
+        after they're committed, so other sessions see the same state).
+
+        Args:
+            tenant_id: Tenant ID
+            phone: Phone number
+
+        Returns:
+            Current ComplianceDecision
+        """
+        state = (await self._load_states(tenant_id, [phone]))[phone]
+        await redis_client.set(
+            _cache_key(tenant_id, phone), state, ttl=settings.compliance_cache_ttl_seconds
+        )
+        return ComplianceDecision(state)
+
+    async def _load_states(self, tenant_id: int, phones: list[str]) -> dict[str, str]:
+        """Definitive states from the DNC and opt-in tables in one query."""
+        blocked = select(
+            DoNotContact.phone_number.label("phone"), literal(STATE_DNC).label("state")
+        ).where(
+            DoNotContact.tenant_id == tenant_id,
+            DoNotContact.is_active == True,
+            DoNotContact.phone_number.in_(phones),
+        )
+        opted_in = select(
+            SmsOptIn.phone_number.label("phone"), literal(STATE_OPTED_IN).label("state")
+        ).where(
+            SmsOptIn.tenant_id == tenant_id,
+            SmsOptIn.is_opted_in == True,
+            SmsOptIn.phone_number.in_(phones),
+        )
+        result = await self.session.execute(union_all(blocked, opted_in))
+
+        states = dict.fromkeys(phones, STATE_NOT_OPTED_IN)
+        for phone, state in result.all():
+            # DNC wins over an opt-in record for the same number
+            if states[phone] != STATE_DNC:
+                states[phone] = state
+        return states
@@ -1,20 +1,47 @@
 """Contact merge service for merging contacts."""
 
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import Integer, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.persistence.models.contact import Contact
 from app.persistence.models.contact_alias import ContactAlias
+from app.persistence.models.contact_merge_log import ContactMergeLog
 from app.persistence.models.lead import Lead
-from app.persistence.models.conversation import Conversation
+from app.persistence.models.conversation import Conversation, Message
+from app.persistence.repositories.base import any_of
 from app.persistence.repositories.contact_repository import ContactRepository
 from app.persistence.repositories.contact_alias_repository import ContactAliasRepository
 from app.persistence.repositories.contact_merge_log_repository import ContactMergeLogRepository
 
 
+MERGE_FIELDS = ('name', 'email', 'phone')
+
+
+def _merge_mapping(secondary_to_primary: dict[int, int]):
+    """Subquery of (secondary_id, primary_id) rows from two array parameters."""
+    secondary_ids = list(secondary_to_primary)
+    primary_ids = [secondary_to_primary[i] for i in secondary_ids]
+    return select(
+        func.unnest(literal(secondary_ids, ARRAY(Integer))).label("secondary_id"),
+        func.unnest(literal(primary_ids, ARRAY(Integer))).label("primary_id"),
+    ).subquery("merge_map")
+
+
+@dataclass
+class MergeGroup:
+    """One primary contact and the contacts being merged into it."""
+
+    primary: Contact
+    secondaries: list[Contact]
+    field_resolutions: dict[str, int | str]
+
+
 class MergeConflict:
     """Represents a field conflict between contacts."""
     
@@ -126,167 +153,237 @@ class ContactMergeService:
         if primary_contact_id in secondary_contact_ids:
             raise ValueError("Primary contact cannot be in secondary list")
         
-        all_ids = [primary_contact_id] + secondary_contact_ids
+        all_ids = list(dict.fromkeys([primary_contact_id] + secondary_contact_ids))
         contacts = await self.contact_repo.get_multiple_by_ids(tenant_id, all_ids)
         
         if len(contacts) != len(all_ids):
             raise ValueError("One or more contacts not found")
         
-        # Get primary and secondary contacts
-        primary = next(c for c in contacts if c.id == primary_contact_id)
-        secondaries = [c for c in contacts if c.id in secondary_contact_ids]
-        
-        # Resolve field conflicts and update primary contact
-        update_data = {}
-        # Handle case where field_resolutions might be None or empty
-        if field_resolutions:
-            for field, resolution in field_resolutions.items():
-                if resolution == "primary":
-                    continue  # Keep primary's value
-                elif isinstance(resolution, int):
-                    # Use value from specified contact
-                    source_contact = next((c for c in contacts if c.id == resolution), None)
-                    if source_contact:
-                        value = getattr(source_contact, field)
-                        if value:  # Only update if value exists
-                            update_data[field] = value
-        
-        # Update primary contact with resolved values
-        if update_data:
-            for key, value in update_data.items():
-                setattr(primary, key, value)
-            await self.session.commit()
-            # Re-fetch primary contact after commit to ensure it's still in session
-            primary = await self.contact_repo.get_by_id_any_status(tenant_id, primary_contact_id)
-            if not primary:
-                raise ValueError(f"Primary contact {primary_contact_id} not found after update")
-        
-        # Create aliases from all contacts' values
-        aliases_to_create = []
-        fields_for_aliases = {
-            'email': 'email',
-            'phone': 'phone', 
-            'name': 'name'
-        }
-        
-        for field, alias_type in fields_for_aliases.items():
-            # Collect all unique values for this field
-            all_values = {}
-            for contact in contacts:
-                value = getattr(contact, field)
-                if value and value not in all_values.values():
-                    all_values[contact.id] = value
-            
-            # Determine which is primary value
-            primary_value = getattr(primary, field)
-            
-            # Create aliases for all values
-            for contact_id, value in all_values.items():
-                # Skip if value is None or empty string
-                if not value:
-                    continue
-                is_primary_alias = (value == primary_value)
-                aliases_to_create.append({
-                    'contact_id': primary_contact_id,
-                    'alias_type': alias_type,
-                    'value': str(value).strip(),  # Ensure it's a string and trimmed
-                    'is_primary': is_primary_alias,
-                    'source_contact_id': contact_id if contact_id != primary_contact_id else None
+        by_id = {c.id: c for c in contacts}
+        group = MergeGroup(
+            primary=by_id[primary_contact_id],
+            secondaries=[by_id[i] for i in all_ids[1:]],
+            field_resolutions=field_resolutions or {},
+        )
+        await self._merge_groups(tenant_id, [group], user_id)
+        await self.session.commit()
+        await self.session.refresh(group.primary)
+        return group.primary
+
+    async def bulk_merge(
+        self,
+        tenant_id: int,
+        groups: list[list[int]],
+        user_id: int,
+        primary_ids: dict[int, int] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Merge many duplicate groups in one transaction.
+
+        Each group's primary is the caller's choice (primary_ids, keyed by
+        group index) or the oldest contact. Missing name/email/phone on the
+        primary are filled from the first secondary that has them.
+
+        Args:
+            tenant_id: Tenant ID
+            groups: Contact ID lists, one per duplicate group
+            user_id: ID of user performing the merge
+            primary_ids: Optional {group index: primary contact ID}
+
+        Returns:
+            One result dict per group (status "merged" or "skipped")
+        """
+        primary_ids = primary_ids or {}
+        requested = {cid for ids in groups for cid in ids}
+        contacts = await self.contact_repo.get_multiple_by_ids(tenant_id, list(requested))
+        by_id = {c.id: c for c in contacts}
+
+        results: list[dict[str, Any]] = []
+        merge_groups: list[MergeGroup] = []
+        claimed: set[int] = set()
+        for index, ids in enumerate(groups):
+            ids = list(dict.fromkeys(ids))
+            members = [by_id[cid] for cid in ids if cid in by_id and cid not in claimed]
+            primary_id = primary_ids.get(index)
+            if len(members) < 2 or (primary_id is not None and primary_id not in {c.id for c in members}):
+                results.append({
+                    "contact_ids": ids,
+                    "status": "skipped",
+                    "error": "Fewer than 2 active contacts or primary not in group",
                 })
-        
-        # Create aliases (skip if empty to avoid unnecessary database calls)
-        if aliases_to_create:
-            try:
-                # Filter out any aliases that might already exist
-                existing_aliases = await self.alias_repo.get_aliases_for_contact(primary_contact_id)
-                existing_values = {(a.alias_type, a.value) for a in existing_aliases}
-                aliases_to_create_filtered = [
-                    a for a in aliases_to_create
-                    if (a['alias_type'], a['value']) not in existing_values
-                ]
-                
-                if aliases_to_create_filtered:
-                    await self.alias_repo.create_aliases_bulk(aliases_to_create_filtered)
-            except Exception as e:
-                # Log but continue - alias creation failure shouldn't block merge
-                import sys
-                print(f"Warning: Failed to create some aliases: {e}", file=sys.stderr)
-        
-        # Update related entities to point to primary contact
-        for secondary in secondaries:
-            await self._reassign_related_entities(
-                tenant_id, secondary.id, primary_contact_id
-            )
-            
-            # Create merge log
-            secondary_snapshot = {
-                'name': secondary.name,
-                'email': secondary.email,
-                'phone': secondary.phone,
-                'source': secondary.source,
-                'created_at': secondary.created_at.isoformat() if secondary.created_at else None,
+                continue
+
+            if primary_id is None:
+                primary = min(members, key=lambda c: (c.created_at, c.id))
+            else:
+                primary = by_id[primary_id]
+            secondaries = [c for c in members if c.id != primary.id]
+            resolutions: dict[str, int | str] = {}
+            for field in MERGE_FIELDS:
+                resolutions[field] = "primary"
+                if not getattr(primary, field):
+                    donor = next((c for c in secondaries if getattr(c, field)), None)
+                    if donor:
+                        resolutions[field] = donor.id
+
+            claimed.update(c.id for c in members)
+            merge_groups.append(MergeGroup(primary, secondaries, resolutions))
+            results.append({
+                "contact_ids": ids,
+                "status": "merged",
+                "primary_contact_id": primary.id,
+                "merged_contact_ids": [c.id for c in secondaries],
+            })
+
+        if merge_groups:
+            await self._merge_groups(tenant_id, merge_groups, user_id)
+            await self.session.commit()
+        return results
+
+    async def _merge_groups(
+        self, tenant_id: int, groups: list[MergeGroup], user_id: int
+    ) -> None:
+        """Apply merges set-wise; the caller commits.
+
+        Statement count is independent of the number of groups: one
+        alias lookup, one UPDATE per related table, one UPDATE marking the
+        secondaries merged, and batched inserts for aliases and merge logs.
+        """
+        now = datetime.utcnow()
+        existing_aliases: dict[int, set[tuple[str, str]]] = {}
+        result = await self.session.execute(
+            select(ContactAlias.contact_id, ContactAlias.alias_type, ContactAlias.value)
+            .where(ContactAlias.contact_id == any_of(g.primary.id for g in groups))
+        )
+        for row in result:
+            existing_aliases.setdefault(row.contact_id, set()).add((row.alias_type, row.value))
+
+        aliases: list[ContactAlias] = []
+        merge_logs: list[ContactMergeLog] = []
+        secondary_to_primary: dict[int, int] = {}
+
+        for group in groups:
+            primary = group.primary
+            members = [primary] + group.secondaries
+            # Values as they were before resolutions are applied
+            original_values = {
+                (c.id, field): getattr(c, field) for c in members for field in MERGE_FIELDS
             }
-            
-            await self.merge_log_repo.create_merge_log(
-                tenant_id=tenant_id,
-                primary_contact_id=primary_contact_id,
-                secondary_contact_id=secondary.id,
+
+            for field, resolution in group.field_resolutions.items():
+                if isinstance(resolution, int) and resolution != primary.id:
+                    source = next((c for c in members if c.id == resolution), None)
+                    value = getattr(source, field) if source else None
+                    if value:
+                        setattr(primary, field, value)
+
+            seen = existing_aliases.setdefault(primary.id, set())
+            for field in MERGE_FIELDS:
+                primary_value = getattr(primary, field)
+                values_seen: set[str] = set()
+                for contact in members:
+                    value = original_values[(contact.id, field)]
+                    if not value or value in values_seen:
+                        continue
+                    values_seen.add(value)
+                    key = (field, str(value).strip())
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    aliases.append(ContactAlias(
+                        contact_id=primary.id,
+                        alias_type=field,
+                        value=key[1],
+                        is_primary=(value == primary_value),
+                        source_contact_id=contact.id if contact.id != primary.id else None,
+                    ))
+
+            for secondary in group.secondaries:
+                secondary_to_primary[secondary.id] = primary.id
+                merge_logs.append(ContactMergeLog(
+                    tenant_id=tenant_id,
+                    primary_contact_id=primary.id,
+                    secondary_contact_id=secondary.id,
+                    merged_by=user_id,
+                    merged_at=now,
+                    field_resolutions=group.field_resolutions,
+                    secondary_data_snapshot={
+                        'name': original_values[(secondary.id, 'name')],
+                        'email': original_values[(secondary.id, 'email')],
+                        'phone': original_values[(secondary.id, 'phone')],
+                        'source': secondary.source,
+                        'created_at': secondary.created_at.isoformat() if secondary.created_at else None,
+                    },
+                ))
+
+        # Primary field updates and the new rows go out in one flush
+        self.session.add_all(aliases)
+        self.session.add_all(merge_logs)
+        await self.session.flush()
+
+        await self._reassign_related_entities(tenant_id, secondary_to_primary)
+
+        mapping = _merge_mapping(secondary_to_primary)
+        await self.session.execute(
+            update(Contact)
+            .where(Contact.tenant_id == tenant_id, Contact.id == mapping.c.secondary_id)
+            .values(
+                merged_into_contact_id=mapping.c.primary_id,
+                merged_at=now,
                 merged_by=user_id,
-                field_resolutions=field_resolutions,
-                secondary_data_snapshot=secondary_snapshot
+                dedup_pending=True,
             )
-            
-            # Mark secondary as merged
-            await self.contact_repo.mark_as_merged(
-                tenant_id, secondary.id, primary_contact_id, user_id
-            )
-        
-        # Re-fetch the primary contact to ensure we have the latest data
-        primary = await self.contact_repo.get_by_id_any_status(tenant_id, primary_contact_id)
-        if not primary:
-            raise ValueError(f"Primary contact {primary_contact_id} not found after merge")
-        
-        return primary
+            .execution_options(synchronize_session=False)
+        )
+        # Keep the loaded secondaries consistent with the UPDATE above
+        for group in groups:
+            for secondary in group.secondaries:
+                set_committed_value(secondary, "merged_into_contact_id", group.primary.id)
+                set_committed_value(secondary, "merged_at", now)
+                set_committed_value(secondary, "merged_by", user_id)
 
     async def _reassign_related_entities(
         self,
         tenant_id: int,
-        from_contact_id: int,
-        to_contact_id: int
+        secondary_to_primary: dict[int, int],
     ) -> None:
-        """Reassign related entities from one contact to another.
+        """Point rows owned by merged contacts at their primary contact.
+
+        One UPDATE per table: ``contact_id = ANY(:ids)`` when every secondary
+        goes to the same primary, otherwise a join against an unnested
+        secondary → primary mapping.
 
         Args:
             tenant_id: Tenant ID
-            from_contact_id: Contact ID to reassign from
-            to_contact_id: Contact ID to reassign to
+            secondary_to_primary: {merged contact ID: surviving contact ID}
         """
+        from app.persistence.models.call_summary import CallSummary
+        from app.persistence.models.customer import Customer
         from app.persistence.models.tenant_email_config import EmailConversation
 
-        # Reassign leads pointing to the old contact
-        await self.session.execute(
-            update(Lead)
-            .where(Lead.tenant_id == tenant_id, Lead.contact_id == from_contact_id)
-            .values(contact_id=to_contact_id)
-        )
+        if not secondary_to_primary:
+            return
 
-        # Reassign conversations pointing to the old contact
-        await self.session.execute(
-            update(Conversation)
-            .where(Conversation.tenant_id == tenant_id, Conversation.contact_id == from_contact_id)
-            .values(contact_id=to_contact_id)
-        )
+        primaries = set(secondary_to_primary.values())
+        mapping = _merge_mapping(secondary_to_primary) if len(primaries) > 1 else None
 
-        # Reassign email conversations pointing to the old contact
-        await self.session.execute(
-            update(EmailConversation)
-            .where(EmailConversation.tenant_id == tenant_id, EmailConversation.contact_id == from_contact_id)
-            .values(contact_id=to_contact_id)
-        )
+        for model in (Lead, Conversation, EmailConversation, CallSummary, Customer):
+            stmt = update(model)
+            # call_summaries has no tenant_id; the secondaries were loaded tenant-scoped
+            if model is not CallSummary:
+                stmt = stmt.where(model.tenant_id == tenant_id)
+            if mapping is None:
+                stmt = stmt.where(model.contact_id == any_of(secondary_to_primary)).values(
+                    contact_id=next(iter(primaries))
+                )
+            else:
+                stmt = stmt.where(model.contact_id == mapping.c.secondary_id).values(
+                    contact_id=mapping.c.primary_id
+                )
+            await self.session.execute(stmt.execution_options(synchronize_session=False))
 
     async def get_combined_conversation_history(
         self, tenant_id: int, contact_id: int
-    ) -> list[Conversation]:
+    ) -> list[tuple[Conversation, int]]:
         """Get combined conversation history including merged contacts.
 
         Args:
@@ -294,46 +391,34 @@ class ContactMergeService:
             contact_id: Primary contact ID
 
         Returns:
-            List of all conversations, including from merged contacts
+            (conversation, message count) pairs, newest first, for the
+            contact and every contact merged into it
         """
-        from sqlalchemy.orm import selectinload
-
-        # Get the primary contact and all contacts merged into it
-        merged_contacts = await self.contact_repo.get_merged_contacts(tenant_id, contact_id)
-        all_contact_ids = [contact_id] + [c.id for c in merged_contacts]
-
-        # Get conversations via lead_id chain (Contact -> Lead -> Conversation)
-        contacts = await self.contact_repo.get_multiple_by_ids(tenant_id, all_contact_ids)
-
-        lead_ids = [c.lead_id for c in contacts if c.lead_id]
-
-        conversations = []
-        if lead_ids:
-            # Get leads
-            leads_stmt = select(Lead).where(
-                Lead.tenant_id == tenant_id,
-                Lead.id.in_(lead_ids)
+        # Contact -> Lead -> Conversation for the primary and its merged contacts
+        lead_ids = select(Contact.lead_id).where(
+            Contact.tenant_id == tenant_id,
+            or_(Contact.id == contact_id, Contact.merged_into_contact_id == contact_id),
+        )
+        conv_ids = select(Lead.conversation_id).where(
+            Lead.tenant_id == tenant_id,
+            Lead.id.in_(lead_ids),
+        )
+        message_count = (
+            select(func.count(Message.id))
+            .where(Message.conversation_id == Conversation.id)
+            .correlate(Conversation)
+            .scalar_subquery()
+        )
+        stmt = (
+            select(Conversation, message_count)
+            .where(
+                Conversation.tenant_id == tenant_id,
+                Conversation.id.in_(conv_ids),
             )
-            leads_result = await self.session.execute(leads_stmt)
-            leads = leads_result.scalars().all()
-
-            conv_ids = [l.conversation_id for l in leads if l.conversation_id]
-
-            if conv_ids:
-                # Get those conversations
-                conv_stmt = (
-                    select(Conversation)
-                    .options(selectinload(Conversation.messages))
-                    .where(
-                        Conversation.tenant_id == tenant_id,
-                        Conversation.id.in_(conv_ids)
-                    )
-                    .order_by(Conversation.created_at.desc())
-                )
-                conv_result = await self.session.execute(conv_stmt)
-                conversations = list(conv_result.scalars().all())
-
-        return conversations
+            .order_by(Conversation.created_at.desc())
+        )
+        result = await self.session.execute(stmt)
+        return [(conv, count) for conv, count in result.all()]
 
     async def get_merge_history(
         self, tenant_id: int, contact_id: int
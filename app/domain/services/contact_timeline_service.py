@@ -0,0 +1,225 @@
+"""Unified, keyset-paginated interaction timeline for a contact."""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    Integer,
+    String,
+    case,
+    cast,
+    func,
+    literal,
+    null,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.persistence.models.call import Call
+from app.persistence.models.call_summary import CallSummary
+from app.persistence.models.conversation import Conversation, Message
+from app.persistence.models.lead import Lead
+from app.persistence.models.tenant_email_config import EmailConversation
+
+# Characters of the last user message returned for previews (one extra so the
+# caller can tell whether to add an ellipsis)
+PREVIEW_CHARS = 101
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a timeline cursor cannot be decoded."""
+
+
+def encode_cursor(ts: datetime, kind: str, item_id: int) -> str:
+    raw = json.dumps([ts.isoformat(), kind, item_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ts, kind, item_id = json.loads(raw)
+        return datetime.fromisoformat(ts), str(kind), int(item_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+@dataclass
+class TimelinePage:
+    """One page of timeline rows, newest first.
+
+    Rows have kind (call/sms/chat/email), item_id, ts, and the per-kind
+    columns duration, intent, outcome, channel, message_count, subject and
+    preview (NULL where they don't apply).
+    """
+
+    rows: list[Any]
+    total: int
+    next_cursor: str | None
+
+
+class ContactTimelineService:
+    """Calls, SMS/chat conversations and email threads for a contact in one query.
+
+    The three sources are combined with UNION ALL and ordered by
+    (ts, kind, item_id) descending; a page is one round trip, and the next
+    page continues strictly after the last row's key rather than skipping
+    an OFFSET.
+    Conversation message counts and the last user message come from window
+    functions over the contact's messages instead of per-conversation queries.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    def _calls(self, tenant_id: int, contact_id: int):
+        return (
+            select(
+                literal("call").label("kind"),
+                Call.id.label("item_id"),
+                func.coalesce(Call.started_at, Call.created_at).label("ts"),
+                Call.duration.label("duration"),
+                CallSummary.intent.label("intent"),
+                CallSummary.outcome.label("outcome"),
+                cast(null(), String).label("channel"),
+                cast(null(), Integer).label("message_count"),
+                cast(null(), String).label("subject"),
+                cast(null(), String).label("preview"),
+            )
+            .select_from(CallSummary)
+            .join(Call, CallSummary.call_id == Call.id)
+            .where(CallSummary.contact_id == contact_id, Call.tenant_id == tenant_id)
+        )
+
+    def _conversations(self, tenant_id: int, contact_id: int, channel: str | None):
+        conv_ids = select(Lead.conversation_id).where(
+            Lead.tenant_id == tenant_id,
+            Lead.contact_id == contact_id,
+            Lead.conversation_id.isnot(None),
+        )
+        # One row per conversation: the non-system message count over the
+        # whole conversation, plus the newest user message (rn = 1)
+        ranked = (
+            select(
+                Message.conversation_id,
+                Message.role,
+                func.left(Message.content, PREVIEW_CHARS).label("content"),
+                func.count(Message.id)
+                .filter(Message.role != "system")
+                .over(partition_by=Message.conversation_id)
+                .label("message_count"),
+                func.row_number()
+                .over(
+                    partition_by=Message.conversation_id,
+                    order_by=(case((Message.role == "user", 0), else_=1), Message.created_at.desc()),
+                )
+                .label("rn"),
+            )
+            .where(Message.conversation_id.in_(conv_ids))
+            .subquery("ranked_messages")
+        )
+        stats = select(ranked).where(ranked.c.rn == 1).subquery("message_stats")
+
+        stmt = (
+            select(
+                case((Conversation.channel == "sms", "sms"), else_="chat").label("kind"),
+                Conversation.id.label("item_id"),
+                func.coalesce(Conversation.updated_at, Conversation.created_at).label("ts"),
+                cast(null(), Integer).label("duration"),
+                cast(null(), String).label("intent"),
+                cast(null(), String).label("outcome"),
+                Conversation.channel.label("channel"),
+                func.coalesce(stats.c.message_count, 0).label("message_count"),
+                cast(null(), String).label("subject"),
+                case((stats.c.role == "user", stats.c.content)).label("preview"),
+            )
+            .select_from(Lead)
+            .join(Conversation, Lead.conversation_id == Conversation.id)
+            .outerjoin(stats, stats.c.conversation_id == Conversation.id)
+            .where(Lead.tenant_id == tenant_id, Lead.contact_id == contact_id)
+        )
+        if channel == "sms":
+            stmt = stmt.where(Conversation.channel == "sms")
+        elif channel == "chat":
+            stmt = stmt.where(Conversation.channel == "web")
+        return stmt
+
+    def _emails(self, tenant_id: int, contact_id: int):
+        return select(
+            literal("email").label("kind"),
+            EmailConversation.id.label("item_id"),
+            func.coalesce(EmailConversation.last_response_at, EmailConversation.created_at).label("ts"),
+            cast(null(), Integer).label("duration"),
+            cast(null(), String).label("intent"),
+            cast(null(), String).label("outcome"),
+            literal("email").label("channel"),
+            EmailConversation.message_count.label("message_count"),
+            EmailConversation.subject.label("subject"),
+            cast(null(), String).label("preview"),
+        ).where(
+            EmailConversation.tenant_id == tenant_id,
+            EmailConversation.contact_id == contact_id,
+        )
+
+    async def get_page(
+        self,
+        tenant_id: int,
+        contact_id: int,
+        limit: int,
+        channel: str | None = None,
+        cursor: str | None = None,
+        offset: int = 0,
+    ) -> TimelinePage:
+        """Get one page of the contact's timeline.
+
+        Pass the previous page's next_cursor to continue. Without a cursor,
+        offset supports page-number clients.
+
+        Raises:
+            InvalidCursorError: If cursor is malformed
+        """
+        sources = []
+        if not channel or channel == "call":
+            sources.append(self._calls(tenant_id, contact_id))
+        if not channel or channel in ("sms", "chat"):
+            sources.append(self._conversations(tenant_id, contact_id, channel))
+        if not channel or channel == "email":
+            sources.append(self._emails(tenant_id, contact_id))
+        if not sources:
+            return TimelinePage(rows=[], total=0, next_cursor=None)
+
+        timeline = union_all(*sources).subquery("timeline")
+        # total is computed before the keyset filter so every page reports
+        # the full count
+        counted = select(timeline, func.count().over().label("total")).subquery("counted")
+        key = tuple_(counted.c.ts, counted.c.kind, counted.c.item_id)
+
+        stmt = select(counted).order_by(
+            counted.c.ts.desc(), counted.c.kind.desc(), counted.c.item_id.desc()
+        )
+        if cursor:
+            stmt = stmt.where(key < tuple_(*decode_cursor(cursor)))
+        elif offset:
+            stmt = stmt.offset(offset)
+        rows = list((await self.session.execute(stmt.limit(limit + 1))).all())
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if rows:
+            total = rows[0].total
+        elif cursor or offset:
+            # Past the end: the window count isn't available without rows
+            total = (await self.session.execute(select(func.count()).select_from(timeline))).scalar_one()
+        else:
+            total = 0
+
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            next_cursor = encode_cursor(last.ts, last.kind, last.item_id)
+        return TimelinePage(rows=rows, total=total, next_cursor=next_cursor)
@@ -104,10 +104,11 @@ class ConversationService:
         if metadata is not None:
             create_kwargs["message_metadata"] = metadata
 
-        message = await self.message_repo.create(
+        message = await self.message_repo.add(
             None,  # Messages inherit tenant_id from their Conversation
             **create_kwargs,
         )
+        await self.session.commit()
 
         # Fire in-app notification for inbound user messages
         if role == "user":
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.domain.services.compliance_gate import ComplianceGate
 from app.persistence.models.do_not_contact import DoNotContact
 from app.persistence.repositories.dnc_repository import DncRepository
 
@@ -101,6 +102,9 @@ class DncService:
             created_by=created_by,
         )
 
+        if phone:
+            await ComplianceGate(self.session).refresh(tenant_id, phone)
+
         identifier = phone or email
         logger.info(
             f"DNC block: Added to list - tenant_id={tenant_id}, "
@@ -138,6 +142,9 @@ class DncService:
             reason=reason,
         )
 
+        if success and phone:
+            await ComplianceGate(self.session).refresh(tenant_id, phone)
+
         identifier = phone or email
         if success:
             logger.info(
@@ -1,13 +1,13 @@
 """Service for managing drip campaign enrollment, step execution, and response handling."""
 
 import logging
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.domain.services.compliance_gate import ComplianceGate
 from app.domain.services.conversation_service import ConversationService
-from app.domain.services.dnc_service import DncService
 from app.domain.services.drip_message_service import DripMessageService
 from app.domain.services.opt_in_service import OptInService
 from app.infrastructure.cloud_tasks import CloudTasksClient
@@ -108,13 +108,10 @@ class DripCampaignService:
         lead.extra_data = extra_data
         await self.session.commit()
 
-        # Schedule first step
+        # Schedule first step (sets next_task_id / next_step_at)
         delay_minutes = campaign.trigger_delay_minutes or 10
-        task_id = await self._schedule_step(enrollment, delay_minutes)
-        if task_id:
-            enrollment.next_task_id = task_id
-            enrollment.next_step_at = datetime.now(timezone.utc)
-            await self.session.commit()
+        await self._schedule_step(enrollment, delay_minutes)
+        await self.session.commit()
 
         logger.info(
             f"Enrolled lead {lead_id} in drip campaign {campaign.id} ({campaign_type}), "
@@ -178,20 +175,20 @@ class DripCampaignService:
             delay_seconds = _seconds_until_quiet_hours_end(tz_name)
             logger.info(f"Quiet hours for enrollment {enrollment_id}, deferring {delay_seconds}s")
             await self._schedule_step_raw(enrollment, delay_seconds)
+            await self.session.commit()
             return {"status": "deferred", "reason": "quiet_hours", "seconds": delay_seconds}
 
-        # DNC check
-        dnc_service = DncService(self.session)
-        if await dnc_service.is_blocked(tenant_id, phone=lead.phone):
+        # DNC + opt-in check in one lookup
+        compliance = await ComplianceGate(self.session).check(tenant_id, lead.phone)
+        if compliance.is_blocked:
             enrollment.status = "cancelled"
             enrollment.cancelled_reason = "dnc"
             await self.session.commit()
             return {"status": "skipped", "reason": "dnc"}
 
         # Opt-in check (auto opt-in for email source with implied consent)
-        opt_in_service = OptInService(self.session)
-        is_opted_in = await opt_in_service.is_opted_in(tenant_id, lead.phone)
-        if not is_opted_in:
+        if not compliance.allowed:
+            opt_in_service = OptInService(self.session)
             source = lead.extra_data.get("source") if lead.extra_data else None
             if source in ("voice_call", "email"):
                 await opt_in_service.opt_in(
@@ -204,10 +201,7 @@ class DripCampaignService:
                 return {"status": "skipped", "reason": "not_opted_in"}
 
         # Build message
-        context = dict(enrollment.context_data or {})
-        # Add lead name to context if available
-        if lead.name and "first_name" not in context:
-            context["first_name"] = lead.name.split()[0] if lead.name else ""
+        context = self.step_context(enrollment, lead)
 
         if step.check_availability:
             message = await self.message_service.render_with_availability(
@@ -470,6 +464,15 @@ class DripCampaignService:
             return "adults"
         return "kids"  # Default
 
+    @staticmethod
+    def step_context(enrollment: DripEnrollment, lead) -> dict:
+        """Template variables for a step: enrollment context plus lead first name."""
+        context = dict(enrollment.context_data or {})
+        # Add lead name to context if available
+        if lead.name and "first_name" not in context:
+            context["first_name"] = lead.name.split()[0] if lead.name else ""
+        return context
+
     # ── Private Helpers ──────────────────────────────────────────────────
 
     async def _schedule_step(self, enrollment: DripEnrollment, delay_minutes: int) -> str | None:
@@ -477,7 +480,16 @@ class DripCampaignService:
         return await self._schedule_step_raw(enrollment, delay_minutes * 60)
 
     async def _schedule_step_raw(self, enrollment: DripEnrollment, delay_seconds: int) -> str | None:
-        """Schedule a drip step with raw seconds delay."""
+        """Schedule a drip step with raw seconds delay.
+
+        With drip_batch_dispatch_enabled, only next_step_at is set and the
+        step is picked up by DripDispatcher; otherwise a Cloud Task is created.
+        """
+        if settings.drip_batch_dispatch_enabled:
+            enrollment.next_step_at = datetime.utcnow() + timedelta(seconds=delay_seconds)
+            enrollment.next_task_id = None
+            return None
+
         worker_base_url = settings.cloud_tasks_worker_url
         if not worker_base_url:
             logger.error("cloud_tasks_worker_url not configured")
@@ -499,8 +511,7 @@ class DripCampaignService:
                 delay_seconds=delay_seconds,
             )
 
-            from datetime import timedelta
-            enrollment.next_step_at = datetime.now(timezone.utc) + timedelta(seconds=delay_seconds)
+            enrollment.next_step_at = datetime.utcnow() + timedelta(seconds=delay_seconds)
             enrollment.next_task_id = task_name
             return task_name
         except Exception as e:
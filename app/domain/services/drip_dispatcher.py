@@ -0,0 +1,361 @@
+"""Batch dispatcher for due drip campaign steps."""
+
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.domain.services.compliance_gate import ComplianceGate
+from app.domain.services.drip_campaign_service import DripCampaignService
+from app.domain.services.opt_in_service import OptInService
+from app.infrastructure.telephony.factory import TelephonyProviderFactory
+from app.persistence.models.conversation import Conversation, Message
+from app.persistence.models.drip_campaign import (
+    DripCampaign,
+    DripCampaignStep,
+    DripEnrollment,
+)
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class DripDispatcher:
+    """Sends due drip steps in batches instead of one Cloud Task per step.
+
+    Due enrollments (active, next_step_at passed, no pending Cloud Task) are
+    claimed with FOR UPDATE SKIP LOCKED and leased by pushing next_step_at
+    forward, so concurrent dispatchers never take the same row and rows from
+    a crashed run become due again when the lease expires. Steps that can't
+    be sent (SMS unavailable, send failure) back off exponentially and are
+    cancelled after drip_dispatch_max_attempts.
+
+    Each batch looks up SMS config, quiet hours, compliance state and
+    Jackrabbit availability once per tenant and sends through the provider
+    with bounded concurrency. Each sent step is recorded and committed as
+    soon as its send succeeds, so a later error can't send it again.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self.drip_service = DripCampaignService(session)
+        self.factory = TelephonyProviderFactory(session)
+
+    async def dispatch(self, batch_size: int | None = None) -> dict[str, int]:
+        """Claim and process due enrollments until none are left.
+
+        Args:
+            batch_size: Enrollments claimed per batch (default from settings)
+
+        Returns:
+            Counts per outcome (sent, completed, cancelled, deferred, skipped, error)
+        """
+        batch_size = batch_size or settings.drip_dispatch_batch_size
+        totals: Counter[str] = Counter()
+        while True:
+            enrollment_ids = await self.claim_due(batch_size)
+            if not enrollment_ids:
+                break
+            totals.update(await self.process_batch(enrollment_ids))
+            if len(enrollment_ids) < batch_size:
+                break
+        return dict(+totals)  # drop zero counts
+
+    async def claim_due(self, limit: int) -> list[int]:
+        """Lease up to limit due enrollments and return their IDs (oldest first)."""
+        now = datetime.utcnow()
+        due = (
+            select(DripEnrollment.id)
+            .where(
+                DripEnrollment.status == "active",
+                DripEnrollment.next_task_id.is_(None),
+                DripEnrollment.next_step_at <= now,
+            )
+            .order_by(DripEnrollment.next_step_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(DripEnrollment)
+            .where(DripEnrollment.id.in_(due.scalar_subquery()))
+            .values(next_step_at=now + timedelta(seconds=settings.drip_dispatch_lease_seconds))
+            .returning(DripEnrollment.id)
+            .execution_options(synchronize_session=False)
+        )
+        enrollment_ids = list((await self.session.execute(stmt)).scalars())
+        await self.session.commit()
+        return enrollment_ids
+
+    async def process_batch(self, enrollment_ids: list[int]) -> Counter[str]:
+        """Run the next step for each claimed enrollment.
+
+        Returns:
+            Counts per outcome
+        """
+        result = await self.session.execute(
+            select(DripEnrollment.id, DripEnrollment.tenant_id).where(
+                DripEnrollment.id.in_(enrollment_ids)
+            )
+        )
+        by_tenant: dict[int, list[int]] = defaultdict(list)
+        for enrollment_id, tenant_id in result.all():
+            by_tenant[tenant_id].append(enrollment_id)
+
+        outcomes: Counter[str] = Counter()
+        for tenant_id, ids in by_tenant.items():
+            # Loaded per tenant so a rollback for one tenant doesn't expire
+            # the next tenant's rows
+            result = await self.session.execute(
+                select(DripEnrollment)
+                .where(DripEnrollment.id.in_(ids))
+                .options(
+                    selectinload(DripEnrollment.lead),
+                    selectinload(DripEnrollment.campaign).selectinload(DripCampaign.steps),
+                )
+            )
+            try:
+                outcomes.update(await self._process_tenant(tenant_id, list(result.scalars())))
+            except Exception as e:
+                await self.session.rollback()
+                logger.error(f"Drip dispatch failed for tenant {tenant_id}: {e}", exc_info=True)
+                outcomes["error"] += len(ids)
+        return outcomes
+
+    async def _process_tenant(
+        self, tenant_id: int, enrollments: list[DripEnrollment]
+    ) -> Counter[str]:
+        outcomes: Counter[str] = Counter()
+        now = datetime.utcnow()
+
+        # Resolve the next step; finish or cancel enrollments that have none
+        pending = []
+        for enrollment in enrollments:
+            next_step_num = enrollment.current_step + 1
+            step = next(
+                (s for s in enrollment.campaign.steps if s.step_number == next_step_num), None
+            )
+            if not step:
+                enrollment.status = "completed"
+                enrollment.next_step_at = None
+                enrollment.updated_at = now
+                outcomes["completed"] += 1
+            elif not enrollment.lead or not enrollment.lead.phone:
+                enrollment.status = "cancelled"
+                enrollment.cancelled_reason = "no_phone"
+                outcomes["cancelled"] += 1
+            else:
+                pending.append((enrollment, step))
+        if not pending:
+            await self.session.commit()
+            return outcomes
+
+        sms_config = await self.factory.get_config(tenant_id)
+        if not sms_config or not sms_config.is_enabled:
+            outcomes.update(self._back_off([e for e, _ in pending], "sms_unavailable", now))
+            await self.session.commit()
+            return outcomes
+
+        # Quiet hours apply to the whole tenant
+        from app.workers.followup_worker import (
+            _is_quiet_hours,
+            _seconds_until_quiet_hours_end,
+        )
+        tz_name = sms_config.timezone or "UTC"
+        if _is_quiet_hours(tz_name):
+            resume_at = now + timedelta(seconds=_seconds_until_quiet_hours_end(tz_name))
+            for enrollment, _ in pending:
+                enrollment.next_step_at = resume_at
+            await self.session.commit()
+            outcomes["deferred"] += len(pending)
+            return outcomes
+
+        # DNC + opt-in for the whole batch in one lookup
+        decisions = await ComplianceGate(self.session).check_many(
+            tenant_id, [e.lead.phone for e, _ in pending]
+        )
+        allowed = []
+        implied_opt_ins: list[str] = []
+        for enrollment, step in pending:
+            decision = decisions[enrollment.lead.phone]
+            if decision.is_blocked:
+                enrollment.status = "cancelled"
+                enrollment.cancelled_reason = "dnc"
+                outcomes["cancelled"] += 1
+                continue
+            if not decision.allowed:
+                # Implied consent for voice/email leads, as in advance_step
+                source = (enrollment.lead.extra_data or {}).get("source")
+                if source not in ("voice_call", "email"):
+                    enrollment.status = "cancelled"
+                    enrollment.cancelled_reason = "not_opted_in"
+                    outcomes["cancelled"] += 1
+                    continue
+                # Committed with the batch; the cache is refreshed after that
+                await OptInService(self.session).record_opt_in(
+                    tenant_id, enrollment.lead.phone, method=f"implied_{source}_drip"
+                )
+                implied_opt_ins.append(enrollment.lead.phone)
+            allowed.append((enrollment, step))
+
+        from_phone = self.factory.get_sms_phone_number(sms_config)
+        sms_provider = await self.factory.get_sms_provider(tenant_id) if from_phone else None
+        if not allowed or not sms_provider:
+            outcomes.update(self._back_off([e for e, _ in allowed], "sms_unavailable", now))
+            await self.session.commit()
+            await self._refresh_compliance(tenant_id, implied_opt_ins)
+            return outcomes
+
+        # Render, fetching availability once for the tenant
+        message_service = self.drip_service.message_service
+        classes = None
+        if any(step.check_availability for _, step in allowed):
+            classes = await message_service.fetch_availability(tenant_id)
+        to_send = []
+        for enrollment, step in allowed:
+            context = self.drip_service.step_context(enrollment, enrollment.lead)
+            if step.check_availability:
+                message = message_service.render_availability(
+                    step.message_template, context, classes, step.fallback_template
+                )
+            else:
+                message = message_service.render_template(step.message_template, context)
+            if message:
+                to_send.append((enrollment, step, message))
+            else:
+                logger.error(f"Empty message for enrollment {enrollment.id} step {step.step_number}")
+                outcomes.update(self._back_off([enrollment], "empty_message", now, outcome="error"))
+
+        # Cancellations and opt-ins are final before anything is sent
+        await self.session.commit()
+        await self._refresh_compliance(tenant_id, implied_opt_ins)
+
+        status_callback_url = None
+        if settings.api_base_url:
+            webhook_prefix = self.factory.get_webhook_path_prefix(sms_config)
+            status_callback_url = f"{settings.api_base_url}/api/v1/sms{webhook_prefix}/status"
+
+        semaphore = asyncio.Semaphore(max(1, settings.drip_dispatch_send_concurrency))
+        # Sends run concurrently; writes to the shared session one at a time
+        write_lock = asyncio.Lock()
+
+        async def send(
+            enrollment: DripEnrollment, step: DripCampaignStep, message: str
+        ) -> Counter[str]:
+            enrollment_id, phone = enrollment.id, enrollment.lead.phone
+            async with semaphore:
+                try:
+                    await sms_provider.send_sms(
+                        to=phone,
+                        from_=from_phone,
+                        body=message,
+                        status_callback=status_callback_url,
+                    )
+                except Exception as e:
+                    logger.error(f"Drip send failed for enrollment {enrollment_id}: {e}")
+                    async with write_lock:
+                        result = self._back_off([enrollment], "send_failed", now, outcome="error")
+                        await self.session.commit()
+                    return result
+
+            async with write_lock:
+                try:
+                    # A failed write only loses this step's record, not the batch
+                    async with self.session.begin_nested():
+                        await self._record_sent(tenant_id, [(enrollment, step, message)])
+                    await self.session.commit()
+                except Exception as e:
+                    logger.error(
+                        f"Drip step sent but not recorded for enrollment {enrollment_id}: {e}",
+                        exc_info=True,
+                    )
+            return Counter(sent=1)
+
+        for result in await asyncio.gather(*(send(e, step, message) for e, step, message in to_send)):
+            outcomes.update(result)
+        return outcomes
+
+    def _back_off(
+        self,
+        enrollments: list[DripEnrollment],
+        reason: str,
+        now: datetime,
+        outcome: str = "skipped",
+    ) -> Counter[str]:
+        """Retry steps that couldn't be sent later; cancel them after drip_dispatch_max_attempts."""
+        outcomes: Counter[str] = Counter()
+        for enrollment in enrollments:
+            enrollment.send_attempts += 1
+            enrollment.updated_at = now
+            if enrollment.send_attempts >= settings.drip_dispatch_max_attempts:
+                enrollment.status = "cancelled"
+                enrollment.cancelled_reason = reason
+                enrollment.next_step_at = None
+                outcomes["cancelled"] += 1
+            else:
+                delay = settings.drip_dispatch_lease_seconds * 2 ** (enrollment.send_attempts - 1)
+                enrollment.next_step_at = now + timedelta(seconds=delay)
+                outcomes[outcome] += 1
+        return outcomes
+
+    async def _refresh_compliance(self, tenant_id: int, phones: list[str]) -> None:
+        """Update the ComplianceGate cache for numbers opted in by this batch."""
+        gate = ComplianceGate(self.session)
+        for phone in dict.fromkeys(phones):
+            await gate.refresh(tenant_id, phone)
+
+    async def _record_sent(self, tenant_id: int, sent: list) -> None:
+        """Store sent steps in their drip conversations and advance the enrollments."""
+        if not sent:
+            return
+        now = datetime.utcnow()
+
+        external_ids = [f"drip-{enrollment.id}" for enrollment, _, _ in sent]
+        result = await self.session.execute(
+            select(Conversation).where(
+                Conversation.tenant_id == tenant_id,
+                Conversation.external_id.in_(external_ids),
+            )
+        )
+        conversations = {c.external_id: c for c in result.scalars()}
+        for external_id, (enrollment, _, _) in zip(external_ids, sent):
+            conversation = conversations.get(external_id)
+            if conversation is None:
+                conversation = Conversation(tenant_id=tenant_id, channel="sms", external_id=external_id)
+                self.session.add(conversation)
+                conversations[external_id] = conversation
+            conversation.phone_number = enrollment.lead.phone
+        await self.session.flush()
+
+        conversation_ids = [c.id for c in conversations.values()]
+        result = await self.session.execute(
+            select(Message.conversation_id, func.max(Message.sequence_number))
+            .where(Message.conversation_id.in_(conversation_ids))
+            .group_by(Message.conversation_id)
+        )
+        last_sequence = dict(result.all())
+
+        for external_id, (enrollment, step, message) in zip(external_ids, sent):
+            conversation = conversations[external_id]
+            self.session.add(Message(
+                conversation_id=conversation.id,
+                role="assistant",
+                content=message,
+                sequence_number=last_sequence.get(conversation.id, 0) + 1,
+            ))
+
+            enrollment.current_step = step.step_number
+            enrollment.send_attempts = 0
+            enrollment.updated_at = now
+            next_step = next(
+                (s for s in enrollment.campaign.steps if s.step_number == step.step_number + 1), None
+            )
+            if next_step:
+                await self.drip_service._schedule_step(enrollment, next_step.delay_minutes)
+            else:
+                enrollment.status = "completed"
+                enrollment.next_task_id = None
+                enrollment.next_step_at = None
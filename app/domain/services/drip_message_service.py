@@ -73,8 +73,16 @@ class DripMessageService:
         If availability data can be fetched, injects it into the template.
         Falls back to fallback_template if the check fails.
         """
-        context = dict(context_data) if context_data else {}
+        classes = await self.fetch_availability(tenant_id)
+        return self.render_availability(template, context_data, classes, fallback_template)
+
+    async def fetch_availability(self, tenant_id: int) -> list[dict] | None:
+        """Fetch the tenant's Jackrabbit classes.
 
+        Returns None if the tenant has no org_id or the fetch fails. Batch
+        senders call this once per tenant and pass the result to
+        render_availability for each recipient.
+        """
         try:
             from app.infrastructure.jackrabbit_client import fetch_classes
 
@@ -82,12 +90,28 @@ class DripMessageService:
             org_id = await self._get_org_id(tenant_id)
             if not org_id:
                 logger.warning(f"No org_id found for tenant {tenant_id}, using fallback")
-                if fallback_template:
-                    return self.render_template(fallback_template, context)
-                return self.render_template(template, context)
+                return None
 
-            classes = await fetch_classes(org_id)
+            return await fetch_classes(org_id)
+        except Exception as e:
+            logger.error(f"Availability check failed for tenant {tenant_id}: {e}")
+            return None
 
+    def render_availability(
+        self,
+        template: str,
+        context_data: dict | None,
+        classes: list[dict] | None,
+        fallback_template: str | None,
+    ) -> str:
+        """Render a template with already-fetched class availability.
+
+        Uses fallback_template when no class with openings matches the
+        context location.
+        """
+        context = dict(context_data) if context_data else {}
+
+        try:
             if classes:
                 # Try to find a matching class from context
                 target_location = context.get("location", "").lower()
@@ -105,17 +129,13 @@ class DripMessageService:
                     )
                     context["availability"] = avail_text
                     return self.render_template(template, context)
-
-            # No matching availability — use fallback
-            if fallback_template:
-                return self.render_template(fallback_template, context)
-            return self.render_template(template, context)
-
         except Exception as e:
-            logger.error(f"Availability check failed for tenant {tenant_id}: {e}")
-            if fallback_template:
-                return self.render_template(fallback_template, context)
-            return self.render_template(template, context)
+            logger.error(f"Availability render failed: {e}")
+
+        # No matching availability — use fallback
+        if fallback_template:
+            return self.render_template(fallback_template, context)
+        return self.render_template(template, context)
 
     def classify_response(self, message_text: str, response_templates: dict) -> str:
         """Classify a lead's response into a category using keyword matching.
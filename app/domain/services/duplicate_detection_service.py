@@ -0,0 +1,433 @@
+"""Incremental duplicate-contact detection.
+
+Contacts carry a dedup_pending flag that the model sets whenever a
+matching field (email, phone, name) or the active state changes. The
+refresh step picks up pending contacts, finds candidates through indexed
+blocking keys (email_normalized, phone_last10 and the phonetic name_key),
+scores each candidate pair and stores the pairs. It then rebuilds only the
+clusters (connected components of pairs) around the changed contacts.
+
+GET /contacts/duplicates reads the stored clusters page by page, so
+tenant size no longer matters for a page view.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterable
+
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.persistence.models.contact import Contact
+from app.persistence.models.contact_duplicate import (
+    ContactDuplicateCluster,
+    ContactDuplicatePair,
+)
+from app.utils.name_matching import name_block_key, name_similarity
+
+logger = logging.getLogger(__name__)
+
+EMAIL_AND_PHONE_CONFIDENCE = 0.99
+EMAIL_CONFIDENCE = 0.95
+PHONE_CONFIDENCE = 0.9
+# Name-only pairs score 0.35 + 0.25 * similarity (exact name → 0.6)
+NAME_BASE_CONFIDENCE = 0.35
+NAME_SIMILARITY_WEIGHT = 0.25
+NAME_MIN_SIMILARITY = 0.6
+# Added to email/phone matches when the names also agree
+NAME_AGREEMENT_BOOST = 0.04
+
+REFRESH_BATCH_SIZE = 500
+# Name blocks larger than this (very common surnames) are too weak to use
+MAX_NAME_BLOCK_SIZE = 50
+# Components larger than this are split on their strong (email/phone) pairs
+MAX_COMPONENT_SIZE = 1000
+
+
+@dataclass
+class PairScore:
+    """Scored match between two contacts."""
+
+    confidence: float
+    match_type: str
+    match_value: str | None
+
+
+@dataclass
+class DuplicateCluster:
+    """Connected group of scored pairs."""
+
+    contact_ids: list[int]
+    confidence: float
+    match_type: str
+    match_value: str | None
+
+
+@dataclass
+class _Component:
+    contact_ids: set[int] = field(default_factory=set)
+    best: PairScore | None = None
+
+
+def score_pair(a: Any, b: Any) -> PairScore | None:
+    """Score two contacts (anything with name/name_key/email_normalized/phone_last10).
+
+    Returns:
+        PairScore, or None when the pair is not a plausible duplicate
+    """
+    same_email = bool(a.email_normalized) and a.email_normalized == b.email_normalized
+    same_phone = bool(a.phone_last10) and a.phone_last10 == b.phone_last10
+    similarity = name_similarity(a.name, b.name) if a.name and b.name else 0.0
+    boost = NAME_AGREEMENT_BOOST if similarity >= NAME_MIN_SIMILARITY else 0.0
+
+    if same_email and same_phone:
+        return PairScore(EMAIL_AND_PHONE_CONFIDENCE, "multiple", a.email_normalized)
+    if same_email:
+        return PairScore(round(EMAIL_CONFIDENCE + boost, 3), "email", a.email_normalized)
+    if same_phone:
+        return PairScore(round(PHONE_CONFIDENCE + boost, 3), "phone", a.phone_last10)
+    if a.name_key and a.name_key == b.name_key and similarity >= NAME_MIN_SIMILARITY:
+        confidence = NAME_BASE_CONFIDENCE + NAME_SIMILARITY_WEIGHT * similarity
+        return PairScore(round(confidence, 3), "name", a.name.strip().lower())
+    return None
+
+
+def build_clusters(pairs: Iterable[tuple[int, int, PairScore]]) -> list[DuplicateCluster]:
+    """Group scored pairs into connected components (union-find)."""
+    parent: dict[int, int] = {}
+
+    def find(x: int) -> int:
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    pair_list = list(pairs)
+    for a, b, _ in pair_list:
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    components: dict[int, _Component] = {}
+    for a, b, score in pair_list:
+        component = components.setdefault(find(a), _Component())
+        component.contact_ids.update((a, b))
+        if component.best is None or score.confidence > component.best.confidence:
+            component.best = score
+
+    return [
+        DuplicateCluster(
+            contact_ids=sorted(c.contact_ids),
+            confidence=c.best.confidence,
+            match_type=c.best.match_type,
+            match_value=c.best.match_value,
+        )
+        for c in components.values()
+    ]
+
+
+def split_oversized_clusters(
+    clusters: list[DuplicateCluster], edges: dict[tuple[int, int], PairScore]
+) -> list[DuplicateCluster]:
+    """Split clusters above MAX_COMPONENT_SIZE by dropping their name-only pairs.
+
+    Such clusters are usually fuzzy-name chains joining unrelated groups.
+    The split only depends on the stored pairs, so it is the same on
+    every rebuild; a part that is still oversized is kept whole.
+    """
+    result: list[DuplicateCluster] = []
+    for cluster in clusters:
+        if len(cluster.contact_ids) <= MAX_COMPONENT_SIZE:
+            result.append(cluster)
+            continue
+        members = set(cluster.contact_ids)
+        parts = build_clusters(
+            (a, b, score) for (a, b), score in edges.items()
+            if a in members and score.match_type != "name"
+        )
+        if any(len(part.contact_ids) > MAX_COMPONENT_SIZE for part in parts):
+            logger.warning(
+                f"Duplicate cluster of {len(cluster.contact_ids)} contacts "
+                f"still exceeds {MAX_COMPONENT_SIZE} after dropping name-only pairs"
+            )
+        result.extend(parts)
+    return result
+
+
+class DuplicateDetectionService:
+    """Maintains and serves duplicate-contact clusters."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def refresh_pending(
+        self, tenant_id: int | None = None, limit: int = REFRESH_BATCH_SIZE
+    ) -> int:
+        """Re-score pending contacts and rebuild their clusters.
+
+        Args:
+            tenant_id: Restrict to one tenant (None = all tenants)
+            limit: Max contacts processed in this call
+
+        Returns:
+            Number of contacts processed
+        """
+        stmt = (
+            select(Contact)
+            .where(Contact.dedup_pending.is_(True))
+            .order_by(Contact.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if tenant_id is not None:
+            stmt = stmt.where(Contact.tenant_id == tenant_id)
+        result = await self.session.execute(stmt)
+        contacts = list(result.scalars().all())
+        if not contacts:
+            return 0
+
+        by_tenant: dict[int, list[Contact]] = {}
+        for contact in contacts:
+            by_tenant.setdefault(contact.tenant_id, []).append(contact)
+        for tid, tenant_contacts in by_tenant.items():
+            await self._refresh_contacts(tid, tenant_contacts)
+
+        await self.session.commit()
+        return len(contacts)
+
+    async def _refresh_contacts(self, tenant_id: int, contacts: list[Contact]) -> None:
+        ids = [c.id for c in contacts]
+        for contact in contacts:
+            # Rows that predate name_key get it on first refresh
+            if contact.name and contact.name_key is None:
+                contact.name_key = name_block_key(contact.name)
+        # Batch members must see each other's keys in the candidate query
+        await self.session.flush()
+
+        # Previous neighbours must be re-clustered even if the pair goes away
+        touching = or_(
+            ContactDuplicatePair.contact_id.in_(ids),
+            ContactDuplicatePair.other_contact_id.in_(ids),
+        )
+        result = await self.session.execute(
+            select(ContactDuplicatePair.contact_id, ContactDuplicatePair.other_contact_id)
+            .where(ContactDuplicatePair.tenant_id == tenant_id, touching)
+        )
+        seeds = set(ids)
+        for row in result:
+            seeds.update((row.contact_id, row.other_contact_id))
+        await self.session.execute(
+            delete(ContactDuplicatePair).where(ContactDuplicatePair.tenant_id == tenant_id, touching)
+        )
+
+        active = [c for c in contacts if c.deleted_at is None and c.merged_into_contact_id is None]
+        pairs = await self._score_candidates(tenant_id, active)
+        if pairs:
+            now = datetime.utcnow()
+            stmt = pg_insert(ContactDuplicatePair).values([
+                {
+                    "tenant_id": tenant_id,
+                    "contact_id": a,
+                    "other_contact_id": b,
+                    "confidence": score.confidence,
+                    "match_type": score.match_type,
+                    "match_value": score.match_value,
+                    "updated_at": now,
+                }
+                for (a, b), score in pairs.items()
+            ])
+            stmt = stmt.on_conflict_do_update(
+                constraint="uix_contact_duplicate_pair",
+                set_={
+                    "confidence": stmt.excluded.confidence,
+                    "match_type": stmt.excluded.match_type,
+                    "match_value": stmt.excluded.match_value,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+            await self.session.execute(stmt)
+            for a, b in pairs:
+                seeds.update((a, b))
+
+        await self._recluster(tenant_id, seeds)
+
+        for contact in contacts:
+            contact.dedup_pending = False
+
+    async def _score_candidates(
+        self, tenant_id: int, contacts: list[Contact]
+    ) -> dict[tuple[int, int], PairScore]:
+        """Find and score candidates for a batch of contacts via the blocking indexes."""
+        emails = {c.email_normalized for c in contacts if c.email_normalized}
+        phones = {c.phone_last10 for c in contacts if c.phone_last10}
+        name_keys = {c.name_key for c in contacts if c.name_key}
+
+        if name_keys:
+            result = await self.session.execute(
+                select(Contact.name_key)
+                .where(
+                    Contact.tenant_id == tenant_id,
+                    Contact.name_key.in_(name_keys),
+                    Contact.deleted_at.is_(None),
+                    Contact.merged_into_contact_id.is_(None),
+                )
+                .group_by(Contact.name_key)
+                .having(func.count() > MAX_NAME_BLOCK_SIZE)
+            )
+            oversized = set(result.scalars().all())
+            if oversized:
+                logger.info(f"Skipping oversized name blocks for tenant {tenant_id}: {sorted(oversized)}")
+            name_keys -= oversized
+
+        conditions = []
+        if emails:
+            conditions.append(Contact.email_normalized.in_(emails))
+        if phones:
+            conditions.append(Contact.phone_last10.in_(phones))
+        if name_keys:
+            conditions.append(Contact.name_key.in_(name_keys))
+        if not conditions:
+            return {}
+
+        result = await self.session.execute(
+            select(
+                Contact.id,
+                Contact.name,
+                Contact.name_key,
+                Contact.email_normalized,
+                Contact.phone_last10,
+            ).where(
+                Contact.tenant_id == tenant_id,
+                Contact.deleted_at.is_(None),
+                Contact.merged_into_contact_id.is_(None),
+                or_(*conditions),
+            )
+        )
+        candidates = result.all()
+
+        blocks: dict[tuple[str, str], list[Any]] = {}
+        for row in candidates:
+            for kind, key in (("e", row.email_normalized), ("p", row.phone_last10), ("n", row.name_key)):
+                if key:
+                    blocks.setdefault((kind, key), []).append(row)
+
+        pairs: dict[tuple[int, int], PairScore] = {}
+        for contact in contacts:
+            seen: set[int] = set()
+            for kind, key in (("e", contact.email_normalized), ("p", contact.phone_last10), ("n", contact.name_key)):
+                if not key or (kind == "n" and key not in name_keys):
+                    continue
+                for other in blocks.get((kind, key), []):
+                    if other.id == contact.id or other.id in seen:
+                        continue
+                    seen.add(other.id)
+                    score = score_pair(contact, other)
+                    if score:
+                        pairs[(min(contact.id, other.id), max(contact.id, other.id))] = score
+        return pairs
+
+    async def _recluster(self, tenant_id: int, seeds: set[int]) -> None:
+        """Replace the stored clusters covering the seeds' components."""
+        nodes: set[int] = set()
+        frontier = set(seeds)
+        edges: dict[tuple[int, int], PairScore] = {}
+        stale_cluster_ids: set[int] = set()
+
+        while frontier:
+            nodes |= frontier
+            result = await self.session.execute(
+                select(ContactDuplicatePair).where(
+                    ContactDuplicatePair.tenant_id == tenant_id,
+                    or_(
+                        ContactDuplicatePair.contact_id.in_(frontier),
+                        ContactDuplicatePair.other_contact_id.in_(frontier),
+                    ),
+                )
+            )
+            discovered: set[int] = set()
+            for pair in result.scalars().all():
+                edges[(pair.contact_id, pair.other_contact_id)] = PairScore(
+                    pair.confidence, pair.match_type, pair.match_value
+                )
+                discovered.update((pair.contact_id, pair.other_contact_id))
+
+            # Existing clusters overlapping the component are replaced as a whole
+            result = await self.session.execute(
+                select(ContactDuplicateCluster.id, ContactDuplicateCluster.contact_ids).where(
+                    ContactDuplicateCluster.tenant_id == tenant_id,
+                    ContactDuplicateCluster.contact_ids.overlap(list(frontier)),
+                )
+            )
+            for row in result:
+                stale_cluster_ids.add(row.id)
+                discovered.update(row.contact_ids)
+
+            frontier = discovered - nodes
+
+        if stale_cluster_ids:
+            await self.session.execute(
+                delete(ContactDuplicateCluster).where(ContactDuplicateCluster.id.in_(stale_cluster_ids))
+            )
+
+        now = datetime.utcnow()
+        self.session.add_all([
+            ContactDuplicateCluster(
+                tenant_id=tenant_id,
+                contact_ids=cluster.contact_ids,
+                size=len(cluster.contact_ids),
+                confidence=cluster.confidence,
+                match_type=cluster.match_type,
+                match_value=cluster.match_value,
+                updated_at=now,
+            )
+            for cluster in split_oversized_clusters(
+                build_clusters((a, b, score) for (a, b), score in edges.items()), edges
+            )
+        ])
+
+    async def list_clusters(
+        self,
+        tenant_id: int,
+        min_confidence: float = 0.5,
+        skip: int = 0,
+        limit: int = 25,
+    ) -> tuple[list[ContactDuplicateCluster], int, int]:
+        """Page through stored clusters, strongest first.
+
+        Returns:
+            (clusters, total_groups, total_duplicates)
+        """
+        filters = (
+            ContactDuplicateCluster.tenant_id == tenant_id,
+            ContactDuplicateCluster.confidence >= min_confidence,
+        )
+        totals = await self.session.execute(
+            select(func.count(), func.coalesce(func.sum(ContactDuplicateCluster.size), 0)).where(*filters)
+        )
+        total_groups, total_duplicates = totals.one()
+
+        result = await self.session.execute(
+            select(ContactDuplicateCluster)
+            .where(*filters)
+            .order_by(ContactDuplicateCluster.confidence.desc(), ContactDuplicateCluster.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        return list(result.scalars().all()), total_groups, int(total_duplicates)
+
+    async def get_clusters(
+        self, tenant_id: int, cluster_ids: list[int]
+    ) -> list[ContactDuplicateCluster]:
+        """Get stored clusters by ID (e.g. the groups selected for bulk merge)."""
+        if not cluster_ids:
+            return []
+        result = await self.session.execute(
+            select(ContactDuplicateCluster).where(
+                ContactDuplicateCluster.tenant_id == tenant_id,
+                ContactDuplicateCluster.id.in_(cluster_ids),
+            )
+        )
+        return list(result.scalars().all())
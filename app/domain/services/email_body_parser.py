@@ -109,13 +109,13 @@ class EmailBodyParser:
         body_lines = email_body.replace('\r\n', '\n').replace('\r', '\n').split('\n')
 
         # Debug: print first few lines of email body
-        print(f"[EMAIL_BODY_PARSER] Total lines: {len(body_lines)}", flush=True)
+        logger.debug(f"[EMAIL_BODY_PARSER] Total lines: {len(body_lines)}")
         for idx, line in enumerate(body_lines[:15]):
-            print(f"[EMAIL_BODY_PARSER] Line {idx}: {repr(line)}", flush=True)
+            logger.debug(f"[EMAIL_BODY_PARSER] Line {idx}: {repr(line)}")
 
         # Parse key-value pairs
         parsed_data = self._parse_key_value_pairs(body_lines)
-        print(f"[EMAIL_BODY_PARSER] parsed_data: {parsed_data}", flush=True)
+        logger.debug(f"[EMAIL_BODY_PARSER] parsed_data: {parsed_data}")
 
         # Log parsed data for debugging
         logger.debug(f"Email body parser - parsed_data keys: {list(parsed_data.keys())}")
@@ -1,5 +1,6 @@
 """Email service for processing inbound emails via Gmail API."""
 
+import asyncio
 import logging
 import re
 from dataclasses import dataclass
@@ -55,6 +56,9 @@ class EmailService:
     # Watch renewal threshold - refresh if expiring within 1 day
     WATCH_RENEWAL_THRESHOLD = timedelta(days=1)
 
+    # Headers fetched when triaging Gmail notifications (format=metadata)
+    TRIAGE_HEADERS = ["Subject", "From", "To"]
+
     def __init__(self, session: AsyncSession) -> None:
         """Initialize Email service."""
         self.session = session
@@ -234,13 +238,12 @@ class EmailService:
         
         # Only log subject details when it matches configured prefixes (privacy protection)
         if should_capture_lead:
-            print(f"[LEAD_CAPTURE] subject='{subject}', has_extracted_info={extracted_info is not None}, existing_lead_id={email_conversation.lead_id}", flush=True)
-            print(f"[LEAD_CAPTURE] extracted_info={extracted_info}", flush=True)
+            logger.info(f"[LEAD_CAPTURE] subject='{subject}', has_extracted_info={extracted_info is not None}, existing_lead_id={email_conversation.lead_id}")
             logger.info(f"Lead capture check: subject='{subject}', has_extracted_info={extracted_info is not None}, has_existing_lead={email_conversation.lead_id is not None}")
 
         # Only capture leads from emails with matching subject prefixes
         if extracted_info and should_capture_lead:
-            print(f"[LEAD_CAPTURE] Subject matches prefix, attempting to create lead", flush=True)
+            logger.info("[LEAD_CAPTURE] Subject matches prefix, attempting to create lead")
             # Build metadata for lead (include additional fields and parsing metadata)
             # Include email_subject so follow-up worker can use subject-specific SMS templates
             metadata = {"source": "email", "email_subject": subject}
@@ -262,7 +265,6 @@ class EmailService:
                 if lead:
                     lead_captured = True
                     lead_id = lead.id
-                    print(f"[LEAD_CAPTURE] SUCCESS: lead_id={lead.id}, email={extracted_info.get('email')}, name={extracted_info.get('name')}", flush=True)
                     logger.info(f"Lead captured: lead_id={lead.id}, email={extracted_info.get('email')}, name={extracted_info.get('name')}")
                     # Link to email conversation
                     await self.email_conv_repo.link_to_contact(
@@ -297,20 +299,17 @@ class EmailService:
                         except Exception as e:
                             logger.error(f"Drip enrollment failed for lead {lead.id}: {e}", exc_info=True)
                 else:
-                    print(f"[LEAD_CAPTURE] FAILED: lead_service.capture_lead returned None", flush=True)
+                    logger.info("[LEAD_CAPTURE] FAILED: lead_service.capture_lead returned None")
             except Exception as e:
-                print(f"[LEAD_CAPTURE] ERROR: {type(e).__name__}: {e}", flush=True)
                 logger.error(f"Error capturing lead: {e}", exc_info=True)
         elif not should_capture_lead:
-            print(f"[LEAD_CAPTURE] SKIP: subject does not match configured prefixes", flush=True)
             logger.info(f"Skipping lead capture - subject does not match prefixes")
         else:
-            print(f"[LEAD_CAPTURE] SKIP: no contact info extracted from email", flush=True)
+            logger.info("[LEAD_CAPTURE] SKIP: no contact info extracted from email")
 
         # For emails with matching subject prefix, capture lead and skip LLM response
         # This prevents auto-replies to form submission emails
         if should_capture_lead:
-            print(f"[LEAD_CAPTURE] Lead capture email - skipping LLM response and email reply", flush=True)
             logger.info(f"Lead capture email processed - not sending automated response")
             return EmailResult(
                 response_message="Lead captured from form submission (no response sent)",
@@ -384,20 +383,17 @@ class EmailService:
         Returns:
             List of EmailResult for each processed message
         """
-        print(f"[EMAIL_SERVICE] process_gmail_notification: email={email_address}, history_id={history_id}", flush=True)
         logger.info(f"Processing Gmail notification: email={email_address}, history_id={history_id}")
         
         # Get email config by Gmail address
         email_config = await self.email_config_repo.get_by_email(email_address)
         if not email_config:
-            print(f"[EMAIL_SERVICE] No email config found for {email_address}", flush=True)
             logger.warning(f"No email config found for {email_address}")
             return []
         
-        print(f"[EMAIL_SERVICE] Found config for tenant_id={email_config.tenant_id}, enabled={email_config.is_enabled}", flush=True)
+        logger.info(f"[EMAIL_SERVICE] Found config for tenant_id={email_config.tenant_id}, enabled={email_config.is_enabled}")
         
         if not email_config.is_enabled:
-            print(f"[EMAIL_SERVICE] Email processing disabled for {email_address}", flush=True)
             logger.info(f"Email processing disabled for {email_address}")
             return []
         
@@ -440,35 +436,53 @@ class EmailService:
             # Process new messages
             results = []
             history_messages = history.get("messages", [])
-            print(f"[EMAIL_SERVICE] Gmail history retrieved: {len(history_messages)} messages", flush=True)
             logger.info(f"Gmail history retrieved: {len(history_messages)} messages")
             
-            for msg_info in history_messages:
-                message_id = msg_info.get("id")
-                if not message_id:
-                    continue
-                
-                # Fetch full message (skip if deleted/unavailable)
-                try:
-                    message = gmail_client.get_message(message_id)
-                except GmailAPIError as e:
-                    logger.warning(f"Message {message_id} not found (may have been deleted): {e}")
+            message_ids = list(dict.fromkeys(m["id"] for m in history_messages if m.get("id")))
+
+            # Phase 1: headers only, so non-lead traffic never downloads a body.
+            # Messages missing here were deleted/unavailable and are skipped.
+            metadata = await asyncio.to_thread(
+                gmail_client.get_messages_batch,
+                message_ids,
+                format="metadata",
+                metadata_headers=self.TRIAGE_HEADERS,
+            )
+            candidate_ids = []
+            for message_id in message_ids:
+                message = metadata.get(message_id)
+                if message is None:
                     continue
 
                 # Skip messages sent by us
                 if self._is_outgoing_message(message, email_address):
                     continue
-                
-                subject = message.get("subject", "")
 
                 # Only process emails with subjects matching configured lead capture prefixes
                 # Check BEFORE logging to avoid exposing non-matching subjects (privacy)
-                if not self._should_capture_lead_from_subject(subject, email_config):
-                    print(f"[EMAIL_SERVICE] SKIPPING email - subject does not match configured prefixes", flush=True)
+                if not self._should_capture_lead_from_subject(message.get("subject", ""), email_config):
+                    logger.info("[EMAIL_SERVICE] SKIPPING email - subject does not match configured prefixes")
                     continue
 
+                candidate_ids.append(message_id)
+
+            logger.info(
+                f"Gmail triage: {len(candidate_ids)} of {len(message_ids)} messages match lead capture"
+            )
+
+            # Phase 2: full bodies for the survivors only
+            full_messages = await asyncio.to_thread(
+                gmail_client.get_messages_batch, candidate_ids, format="full"
+            )
+
+            for message_id in candidate_ids:
+                message = full_messages.get(message_id)
+                if message is None:
+                    continue
+
+                subject = message.get("subject", "")
+
                 # Only log subject details for emails that match our prefixes
-                print(f"[EMAIL_SERVICE] Processing inbound email: subject='{subject}', from='{message.get('from', '')}'", flush=True)
                 logger.info(f"Processing inbound email: subject='{subject}', from='{message.get('from', '')}')")
 
                 # Process the inbound email (lead capture decision happens inside based on subject)
@@ -487,7 +501,6 @@ class EmailService:
             return results
             
         except GmailAPIError as e:
-            print(f"[EMAIL_SERVICE] GmailAPIError: {e}", flush=True)
             logger.error(f"Failed to process Gmail notification: {e}")
             return []
 
@@ -749,15 +762,14 @@ class EmailService:
         """
         # Only use tenant-specified prefixes; no defaults.
         prefixes = email_config.lead_capture_subject_prefixes
-        print(f"[LEAD_CAPTURE] Prefixes from config: {prefixes}", flush=True)
         logger.debug(f"Lead capture prefixes from config: {prefixes}")
 
         if prefixes is None:
-            print("[LEAD_CAPTURE] No prefixes configured - skipping capture", flush=True)
+            logger.info("[LEAD_CAPTURE] No prefixes configured - skipping capture")
             return False
 
         if len(prefixes) == 0:
-            print("[LEAD_CAPTURE] Empty prefix list - capturing ALL emails", flush=True)
+            logger.info("[LEAD_CAPTURE] Empty prefix list - capturing ALL emails")
             return True
         
         # Strip common email prefixes (Fwd:, Re:, etc.) before checking
@@ -780,7 +792,6 @@ class EmailService:
             # Strip whitespace from prefix to handle any trailing spaces in database
             prefix_lower = (prefix or "").lower().strip()
             if cleaned_subject.startswith(prefix_lower):
-                print(f"[LEAD_CAPTURE] MATCH: Subject '{subject}' matches prefix '{prefix}'", flush=True)
                 logger.debug(f"Subject '{subject}' matches prefix '{prefix}'")
                 return True
 
@@ -907,8 +918,8 @@ class EmailService:
             (parsed_fields and len(parsed_fields) > 3)  # More than just name/email/phone
         )
         
-        print(f"[EMAIL_EXTRACT] has_form_indicators={has_form_indicators}, has_structured_data={has_structured_data}", flush=True)
-        print(f"[EMAIL_EXTRACT] sender_name={sender_name}, from_email={from_email}", flush=True)
+        logger.debug(f"[EMAIL_EXTRACT] has_form_indicators={has_form_indicators}, has_structured_data={has_structured_data}")
+        logger.debug(f"[EMAIL_EXTRACT] sender_name={sender_name}, from_email={from_email}")
         
         # Log for debugging
         logger.debug(
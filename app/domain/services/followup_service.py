@@ -3,10 +3,10 @@
 import logging
 from datetime import datetime, timezone
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.infrastructure.cloud_tasks import CloudTasksClient
+from app.infrastructure.telephony.factory import TelephonyProviderFactory
 from app.persistence.models.lead import Lead
 from app.persistence.models.tenant_sms_config import TenantSmsConfig
 from app.persistence.repositories.conversation_repository import ConversationRepository
@@ -45,27 +45,24 @@ class FollowUpService:
         Returns:
             True if follow-up should be scheduled
         """
-        print(f"[FOLLOWUP_SHOULD] Checking lead {lead.id}, phone={lead.phone}", flush=True)
+        logger.info(f"[FOLLOWUP_SHOULD] Checking lead {lead.id}, phone={lead.phone}")
 
         # Check if lead has phone number
         if not lead.phone:
-            print(f"[FOLLOWUP_SHOULD] Lead {lead.id} has no phone number, skipping", flush=True)
             logger.debug(f"Lead {lead.id} has no phone number, skipping follow-up")
             return False
 
         # Get tenant SMS config
         config = await self._get_sms_config(tenant_id)
-        print(f"[FOLLOWUP_SHOULD] SMS config: enabled={config.is_enabled if config else None}, provider={config.provider if config else None}", flush=True)
+        logger.info(f"[FOLLOWUP_SHOULD] SMS config: enabled={config.is_enabled if config else None}, provider={config.provider if config else None}")
         if not config or not config.is_enabled:
-            print(f"[FOLLOWUP_SHOULD] SMS not enabled for tenant {tenant_id}", flush=True)
             logger.debug(f"SMS not enabled for tenant {tenant_id}")
             return False
 
         # Verify phone number is configured for the selected provider
         has_phone = self._has_sms_phone_number(config)
-        print(f"[FOLLOWUP_SHOULD] Has SMS phone configured: {has_phone}", flush=True)
+        logger.info(f"[FOLLOWUP_SHOULD] Has SMS phone configured: {has_phone}")
         if not has_phone:
-            print(f"[FOLLOWUP_SHOULD] No SMS phone number configured for tenant {tenant_id} (provider: {config.provider})", flush=True)
             logger.debug(f"No SMS phone number configured for tenant {tenant_id} (provider: {config.provider})")
             return False
 
@@ -73,9 +70,8 @@ class FollowUpService:
         followup_enabled = False
         if config.settings:
             followup_enabled = config.settings.get("followup_enabled", False)
-        print(f"[FOLLOWUP_SHOULD] Follow-up enabled in settings: {followup_enabled}", flush=True)
+        logger.info(f"[FOLLOWUP_SHOULD] Follow-up enabled in settings: {followup_enabled}")
         if not followup_enabled:
-            print(f"[FOLLOWUP_SHOULD] Follow-up not enabled for tenant {tenant_id}", flush=True)
             logger.debug(f"Follow-up not enabled for tenant {tenant_id}")
             return False
 
@@ -84,9 +80,8 @@ class FollowUpService:
         allowed_sources = self.DEFAULT_FOLLOWUP_SOURCES
         if config.settings:
             allowed_sources = config.settings.get("followup_sources", self.DEFAULT_FOLLOWUP_SOURCES)
-        print(f"[FOLLOWUP_SHOULD] Source: {source}, allowed: {allowed_sources}", flush=True)
+        logger.info(f"[FOLLOWUP_SHOULD] Source: {source}, allowed: {allowed_sources}")
         if source and source not in allowed_sources:
-            print(f"[FOLLOWUP_SHOULD] Source {source} not in allowed sources", flush=True)
             logger.debug(f"Source {source} not in allowed sources for follow-up")
             return False
 
@@ -94,13 +89,12 @@ class FollowUpService:
         if lead.extra_data:
             already_scheduled = lead.extra_data.get("followup_scheduled")
             already_sent = lead.extra_data.get("followup_sent_at")
-            print(f"[FOLLOWUP_SHOULD] Already scheduled: {already_scheduled}, sent: {already_sent}", flush=True)
+            logger.info(f"[FOLLOWUP_SHOULD] Already scheduled: {already_scheduled}, sent: {already_sent}")
             if already_scheduled or already_sent:
-                print(f"[FOLLOWUP_SHOULD] Follow-up already scheduled/sent for lead {lead.id}", flush=True)
                 logger.debug(f"Follow-up already scheduled/sent for lead {lead.id}")
                 return False
 
-        print(f"[FOLLOWUP_SHOULD] All checks passed! Scheduling follow-up for lead {lead.id}", flush=True)
+        logger.info(f"[FOLLOWUP_SHOULD] All checks passed! Scheduling follow-up for lead {lead.id}")
         return True
 
     async def schedule_followup(
@@ -274,10 +268,8 @@ class FollowUpService:
             return None, f"Failed to schedule task: {str(e)}"
 
     async def _get_sms_config(self, tenant_id: int) -> TenantSmsConfig | None:
-        """Get tenant SMS configuration."""
-        stmt = select(TenantSmsConfig).where(TenantSmsConfig.tenant_id == tenant_id)
-        result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        """Get tenant SMS configuration (from the shared telephony config cache)."""
+        return await TelephonyProviderFactory(self.session).get_config(tenant_id)
 
     def _has_sms_phone_number(self, config: TenantSmsConfig) -> bool:
         """Check if the tenant has an SMS phone number configured for their provider.
@@ -0,0 +1,269 @@
+"""Bulk sync of Jackrabbit families into jackrabbit_customers and customers."""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.phone import normalize_email, normalize_phone_e164, phone_match_key
+from app.domain.services.jackrabbit_data_transformer import (
+    transform_jackrabbit_to_account_data,
+)
+from app.persistence.models.customer import Customer
+from app.persistence.models.jackrabbit_customer import JackrabbitCustomer
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_ID_KEYS = ("id", "family_id", "fam_id")
+_PHONE_KEYS = ("phone", "phone1", "home_phone", "cell_phone", "mobile")
+_EMAIL_KEYS = ("email", "email1", "eMailAddress", "email_address", "Email")
+_NAME_KEYS = ("name", "family_name")
+
+
+@dataclass
+class FamilyRecord:
+    """One Jackrabbit family, normalized for sync."""
+
+    jackrabbit_id: str
+    phone: str | None
+    name: str | None = None
+    email: str | None = None
+    status: str | None = None
+    customer_data: dict = field(default_factory=dict)
+
+
+@dataclass
+class SyncResult:
+    """Per-sync counts; customer_ids maps jackrabbit_id -> customers.id."""
+
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0
+    customer_ids: dict[str, int] = field(default_factory=dict)
+
+
+def family_record_from_api(family: dict) -> FamilyRecord | None:
+    """Build a FamilyRecord from a Families API row (None if it has no ID)."""
+    jackrabbit_id = next((str(family[k]) for k in _ID_KEYS if family.get(k)), None)
+    if not jackrabbit_id:
+        return None
+    name = (
+        next((family[k] for k in _NAME_KEYS if family.get(k)), None)
+        or f"{family.get('first_name', '')} {family.get('last_name', '')}".strip()
+        or None
+    )
+    email = next((family[k] for k in _EMAIL_KEYS if family.get(k)), None)
+    customer_data = {k: v for k, v in family.items() if v is not None}
+    if name:
+        customer_data["name"] = name
+    if email:
+        customer_data["email"] = email
+    return FamilyRecord(
+        jackrabbit_id=jackrabbit_id,
+        phone=next((str(family[k]) for k in _PHONE_KEYS if family.get(k)), None),
+        name=name,
+        email=email,
+        status=family.get("status"),
+        customer_data=customer_data,
+    )
+
+
+def _resolve_status(status: str | None) -> str:
+    resolved = (status or "active").lower().strip()
+    return resolved if resolved in ("active", "inactive", "suspended") else "active"
+
+
+def _content_hash(record: FamilyRecord) -> str:
+    payload = [record.phone, record.name, record.email, record.status, record.customer_data]
+    return hashlib.md5(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class JackrabbitSyncService:
+    """Upserts Jackrabbit families in batches.
+
+    Each batch is written with one INSERT ... ON CONFLICT DO UPDATE per table
+    (keyed on the Jackrabbit ID), after a single lookup of the existing
+    customers by Jackrabbit ID and phone. Families whose content hash matches
+    the stored sync_hash are skipped. A family is also skipped when its phone
+    already belongs to a customer with a different Jackrabbit ID
+    (customers are unique per phone); a customer with that phone and no
+    Jackrabbit ID is adopted instead.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def sync(
+        self, tenant_id: int, records: list[FamilyRecord], batch_size: int | None = None
+    ) -> SyncResult:
+        """Upsert families for a tenant, committing once per batch.
+
+        Args:
+            tenant_id: Tenant ID
+            records: Families to sync
+            batch_size: Families per statement (default from settings)
+
+        Returns:
+            SyncResult with created/updated/unchanged/skipped counts
+        """
+        batch_size = batch_size or settings.jackrabbit_sync_batch_size
+        result = SyncResult()
+        for start in range(0, len(records), batch_size):
+            await self._sync_batch(tenant_id, records[start:start + batch_size], result)
+            await self.session.commit()
+        logger.info(
+            f"Jackrabbit sync for tenant {tenant_id}: {result.created} created, "
+            f"{result.updated} updated, {result.unchanged} unchanged, {result.skipped} skipped"
+        )
+        return result
+
+    async def _sync_batch(self, tenant_id: int, records: list[FamilyRecord], result: SyncResult) -> None:
+        # Normalize; the last record wins for a repeated Jackrabbit ID
+        by_jid: dict[str, tuple[FamilyRecord, str]] = {}
+        for record in records:
+            phone = normalize_phone_e164(record.phone) or record.phone
+            if not phone:
+                logger.debug(f"Skipping family {record.jackrabbit_id} - no phone")
+                result.skipped += 1
+                continue
+            record.phone = phone
+            by_jid[record.jackrabbit_id] = (record, _content_hash(record))
+        if not by_jid:
+            return
+
+        # Phones match on phone_last10 (any stored format); numbers without a
+        # key fall back to an exact match
+        phone_keys = {jid: phone_match_key(r.phone) for jid, (r, _) in by_jid.items()}
+        keyless = [by_jid[jid][0].phone for jid, key in phone_keys.items() if not key]
+        existing = await self.session.execute(
+            select(
+                Customer.id,
+                Customer.external_customer_id,
+                Customer.phone,
+                Customer.phone_last10,
+                Customer.sync_hash,
+            ).where(
+                Customer.tenant_id == tenant_id,
+                or_(
+                    Customer.external_customer_id.in_(list(by_jid)),
+                    Customer.phone_last10.in_([key for key in phone_keys.values() if key]),
+                    Customer.phone.in_(keyless),
+                ),
+            )
+        )
+        by_external_id, by_phone = {}, {}
+        for row in existing.all():
+            if row.external_customer_id:
+                by_external_id[row.external_customer_id] = row
+            by_phone[row.phone_last10 or row.phone] = row
+
+        to_write: list[tuple[FamilyRecord, str]] = []
+        adopt: dict[str, int] = {}  # jackrabbit_id -> customers.id without an external ID
+        claimed_phones: set[str] = set()
+        for jid, (record, content_hash) in by_jid.items():
+            current = by_external_id.get(jid)
+            if current is not None and current.sync_hash == content_hash:
+                result.unchanged += 1
+                result.customer_ids[jid] = current.id
+                continue
+            match_key = phone_keys[jid] or record.phone
+            owner = by_phone.get(match_key)
+            conflict = match_key in claimed_phones or (
+                owner is not None
+                and owner.external_customer_id != jid
+                and (owner.external_customer_id is not None or current is not None)
+            )
+            if conflict:
+                logger.warning(
+                    f"Skipping family {jid} - phone {record.phone} already belongs to another customer"
+                )
+                result.skipped += 1
+                continue
+            claimed_phones.add(match_key)
+            if current is not None:
+                result.updated += 1
+            elif owner is not None:
+                adopt[jid] = owner.id
+                result.updated += 1
+            else:
+                result.created += 1
+            to_write.append((record, content_hash))
+        if not to_write:
+            return
+
+        now = datetime.utcnow()
+        cache_ids = await self._upsert_cache(tenant_id, to_write, now)
+
+        rows = []
+        for record, content_hash in to_write:
+            rows.append({
+                "tenant_id": tenant_id,
+                "external_customer_id": record.jackrabbit_id,
+                "jackrabbit_customer_id": cache_ids[record.jackrabbit_id],
+                "phone": record.phone,
+                "phone_last10": phone_match_key(record.phone),
+                "name": record.name,
+                "email": record.email,
+                "email_normalized": normalize_email(record.email),
+                "status": _resolve_status(record.status),
+                "account_data": transform_jackrabbit_to_account_data(record.customer_data),
+                "sync_hash": content_hash,
+                "last_synced_at": now,
+                "sync_source": "jackrabbit",
+                "updated_at": now,
+            })
+
+        adopted = [dict(row, id=adopt[row["external_customer_id"]]) for row in rows
+                   if row["external_customer_id"] in adopt]
+        if adopted:
+            await self.session.execute(update(Customer), adopted)
+            for row in adopted:
+                result.customer_ids[row["external_customer_id"]] = row["id"]
+
+        upserts = [row for row in rows if row["external_customer_id"] not in adopt]
+        if upserts:
+            stmt = pg_insert(Customer).values(upserts)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Customer.tenant_id, Customer.external_customer_id],
+                set_={
+                    key: stmt.excluded[key] for key in upserts[0]
+                    if key not in ("tenant_id", "external_customer_id")
+                },
+            ).returning(Customer.external_customer_id, Customer.id)
+            for jid, customer_id in (await self.session.execute(stmt)).all():
+                result.customer_ids[jid] = customer_id
+
+    async def _upsert_cache(
+        self, tenant_id: int, to_write: list[tuple[FamilyRecord, str]], now: datetime
+    ) -> dict[str, int]:
+        """Upsert jackrabbit_customers rows; returns jackrabbit_id -> row id."""
+        rows = [
+            {
+                "tenant_id": tenant_id,
+                "jackrabbit_id": record.jackrabbit_id,
+                "phone_number": record.phone,
+                "phone_last10": phone_match_key(record.phone),
+                "email": record.email,
+                "email_normalized": normalize_email(record.email),
+                "name": record.name,
+                "customer_data": record.customer_data,
+                "sync_hash": content_hash,
+                "last_synced_at": now,
+                "cache_expires_at": None,
+                "updated_at": now,
+            }
+            for record, content_hash in to_write
+        ]
+        stmt = pg_insert(JackrabbitCustomer).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JackrabbitCustomer.tenant_id, JackrabbitCustomer.jackrabbit_id],
+            set_={key: stmt.excluded[key] for key in rows[0] if key not in ("tenant_id", "jackrabbit_id")},
+        ).returning(JackrabbitCustomer.jackrabbit_id, JackrabbitCustomer.id)
+        return dict((await self.session.execute(stmt)).all())
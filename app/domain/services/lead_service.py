@@ -1,13 +1,14 @@
 """Lead service for managing lead capture (schema + state only)."""
 
 import logging
-import re
 from datetime import datetime
-from sqlalchemy import delete, select, text, update
+from sqlalchemy import delete, func, or_, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.phone import normalize_email, normalize_phone_e164, phone_match_key
 from app.persistence.models.contact import Contact
 from app.persistence.models.lead import Lead
+from app.persistence.repositories.base import any_of
 from app.persistence.repositories.contact_repository import ContactRepository
 from app.persistence.repositories.lead_repository import LeadRepository
 from app.utils.name_validator import validate_name
@@ -15,48 +16,6 @@ from app.utils.name_validator import validate_name
 logger = logging.getLogger(__name__)
 
 
-def normalize_phone_e164(phone: str | None) -> str | None:
-    """Normalize phone number to E.164 format (+1XXXXXXXXXX for US numbers).
-
-    Handles various input formats:
-    - 2817882316
-    - (281)788-2316
-    - 281-788-2316
-    - 281.788.2316
-    - +1 281 788 2316
-    - 1-281-788-2316
-
-    Args:
-        phone: Raw phone number string
-
-    Returns:
-        Phone in E.164 format (+1XXXXXXXXXX) or None if invalid
-    """
-    if not phone:
-        return None
-
-    # Remove all non-digit characters except leading +
-    digits = re.sub(r'\D', '', phone)
-
-    # Handle US numbers
-    if len(digits) == 10:
-        # 10 digits: add +1 prefix
-        return f"+1{digits}"
-    elif len(digits) == 11 and digits.startswith('1'):
-        # 11 digits starting with 1: add + prefix
-        return f"+{digits}"
-    elif len(digits) > 10 and phone.strip().startswith('+'):
-        # International format: keep as-is with + prefix
-        return f"+{digits}"
-
-    # If already in E.164 format, return as-is
-    if phone.startswith('+') and len(digits) >= 10:
-        return f"+{digits}"
-
-    logger.warning(f"Could not normalize phone number: {phone}")
-    return phone  # Return original if we can't normalize (better than losing it)
-
-
 def _lead_qualifies_for_auto_conversion(lead: Lead) -> bool:
     """Check if lead has sufficient info for automatic contact creation.
 
@@ -189,33 +148,26 @@ class LeadService:
             )
 
         # Schedule SMS follow-up if conditions are met
-        print(f"[FOLLOWUP_CHECK] lead_id={lead.id}, phone={normalized_phone}, metadata={metadata}", flush=True)
         logger.info(f"[FOLLOWUP_CHECK] lead_id={lead.id}, phone={normalized_phone}, metadata={metadata}")
         if normalized_phone and metadata and metadata.get("source") in ["voice_call", "sms", "email", "chatbot"]:
             # Check if follow-up should be skipped (voice call not qualified/no promise)
             if metadata.get("skip_followup"):
                 skip_reason = metadata.get("skip_followup_reason", "not qualified")
-                print(f"[FOLLOWUP_CHECK] Skipping follow-up for lead {lead.id}: {skip_reason}", flush=True)
                 logger.info(f"[FOLLOWUP_CHECK] Skipping follow-up for lead {lead.id}: {skip_reason}")
             else:
-                print(f"[FOLLOWUP_CHECK] Conditions met, attempting to schedule follow-up for lead {lead.id}", flush=True)
                 logger.info(f"[FOLLOWUP_CHECK] Conditions met, attempting to schedule follow-up for lead {lead.id}")
                 try:
                     from app.domain.services.followup_service import FollowUpService
                     followup_service = FollowUpService(self.session)
                     task_name = await followup_service.schedule_followup(tenant_id, lead.id)
                     if task_name:
-                        print(f"[FOLLOWUP_CHECK] Scheduled follow-up for lead {lead.id}: {task_name}", flush=True)
                         logger.info(f"Scheduled follow-up for lead {lead.id}: {task_name}")
                     else:
-                        print(f"[FOLLOWUP_CHECK] schedule_followup returned None for lead {lead.id}", flush=True)
                         logger.info(f"[FOLLOWUP_CHECK] schedule_followup returned None for lead {lead.id}")
                 except Exception as e:
                     # Don't fail lead creation if follow-up scheduling fails
-                    print(f"[FOLLOWUP_CHECK] ERROR: Failed to schedule follow-up for lead {lead.id}: {e}", flush=True)
                     logger.error(f"Failed to schedule follow-up for lead {lead.id}: {e}", exc_info=True)
         else:
-            print(f"[FOLLOWUP_CHECK] Conditions NOT met - phone={bool(normalized_phone)}, has_metadata={bool(metadata)}, source={metadata.get('source') if metadata else None}", flush=True)
             logger.info(f"[FOLLOWUP_CHECK] Conditions NOT met - phone={bool(normalized_phone)}, has_metadata={bool(metadata)}, source={metadata.get('source') if metadata else None}")
 
         # Check for auto-conversion to contact
@@ -242,10 +194,14 @@ class LeadService:
         from sqlalchemy import or_
 
         conditions = []
-        if email:
-            conditions.append(Lead.email == email)
-        if phone:
-            conditions.append(Lead.phone == phone)
+        email_key = normalize_email(email)
+        if email_key:
+            conditions.append(Lead.email_normalized == email_key)
+        phone_key = phone_match_key(phone)
+        if phone_key:
+            conditions.append(Lead.phone_last10 == phone_key)
+        if not conditions:
+            return None
 
         stmt = (
             select(Lead)
@@ -769,6 +725,32 @@ class LeadService:
             secondary_lead_id: Lead to merge in and delete
             user_id: Who initiated the merge (0 = system auto-merge)
 
+        Returns:
+            The updated primary lead
+        """
+        return await self.merge_leads_bulk(
+            tenant_id, primary_lead_id, [secondary_lead_id], user_id=user_id
+        )
+
+    async def merge_leads_bulk(
+        self,
+        tenant_id: int,
+        primary_lead_id: int,
+        secondary_lead_ids: list[int],
+        user_id: int = 0,
+    ) -> Lead:
+        """Merge several secondary leads into a primary lead in one transaction.
+
+        Secondaries are folded in the given order (field fills, extra_data
+        merge). Child records are reassigned with one UPDATE per table using
+        ``lead_id = ANY(:ids)``; merge logs are inserted in one batch.
+
+        Args:
+            tenant_id: Tenant ID
+            primary_lead_id: Lead to keep
+            secondary_lead_ids: Leads to merge in and delete
+            user_id: Who initiated the merge (0 = system auto-merge)
+
         Returns:
             The updated primary lead
         """
@@ -778,30 +760,120 @@ class LeadService:
         from app.persistence.models.lead_merge_log import LeadMergeLog
         from app.persistence.models.tenant_email_config import EmailConversation
 
-        primary = await self.lead_repo.get_by_id(tenant_id, primary_lead_id)
-        secondary = await self.lead_repo.get_by_id(tenant_id, secondary_lead_id)
-
-        if not primary or not secondary:
-            raise ValueError(f"Lead not found: primary={primary_lead_id}, secondary={secondary_lead_id}")
-        if primary.id == secondary.id:
+        secondary_lead_ids = [i for i in dict.fromkeys(secondary_lead_ids) if i != primary_lead_id]
+        result = await self.session.execute(
+            select(Lead).where(
+                Lead.tenant_id == tenant_id,
+                Lead.id == any_of([primary_lead_id] + secondary_lead_ids),
+            )
+        )
+        leads = {lead.id: lead for lead in result.scalars().all()}
+        primary = leads.get(primary_lead_id)
+        missing = [i for i in secondary_lead_ids if i not in leads]
+        if not primary or missing:
+            raise ValueError(f"Lead not found: primary={primary_lead_id}, secondary={missing or secondary_lead_ids}")
+        if not secondary_lead_ids:
             return primary
+        secondaries = [leads[i] for i in secondary_lead_ids]
+
+        logger.info(f"Merging leads {secondary_lead_ids} into lead {primary.id} for tenant {tenant_id}")
+
+        merge_logs = []
+        for secondary in secondaries:
+            # --- 1. Snapshot secondary before any changes ---
+            secondary_snapshot = {
+                "id": secondary.id,
+                "name": secondary.name,
+                "email": secondary.email,
+                "phone": secondary.phone,
+                "conversation_id": secondary.conversation_id,
+                "contact_id": secondary.contact_id,
+                "status": secondary.status,
+                "extra_data": secondary.extra_data,
+                "created_at": secondary.created_at.isoformat() if secondary.created_at else None,
+            }
+            # --- 2./3. Copy missing fields and deep-merge extra_data ---
+            field_resolutions = self._fold_lead_into_primary(primary, secondary)
+            merge_logs.append(LeadMergeLog(
+                tenant_id=tenant_id,
+                primary_lead_id=primary.id,
+                secondary_lead_id=secondary.id,
+                merged_by=user_id,
+                field_resolutions=field_resolutions,
+                secondary_data_snapshot=secondary_snapshot,
+            ))
+
+        # --- 4. Reassign child FK records (one statement per table) ---
+        ids = any_of(secondary_lead_ids)
+        for model in (CallSummary, EmailConversation, EmailIngestionLog, Contact):
+            await self.session.execute(
+                update(model)
+                .where(model.lead_id == ids)
+                .values(lead_id=primary.id)
+                .execution_options(synchronize_session=False)
+            )
+
+        # drip_enrollments (NOT NULL + unique per tenant/campaign/lead):
+        # drop enrollments in campaigns the primary (or an earlier secondary)
+        # already has, then move the rest
+        primary_campaigns = (
+            select(DripEnrollment.campaign_id)
+            .where(DripEnrollment.tenant_id == tenant_id, DripEnrollment.lead_id == primary.id)
+        )
+        first_per_campaign = (
+            select(func.min(DripEnrollment.id))
+            .where(DripEnrollment.tenant_id == tenant_id, DripEnrollment.lead_id == any_of(secondary_lead_ids))
+            .group_by(DripEnrollment.campaign_id)
+        )
+        await self.session.execute(
+            delete(DripEnrollment)
+            .where(
+                DripEnrollment.tenant_id == tenant_id,
+                DripEnrollment.lead_id == any_of(secondary_lead_ids),
+                or_(
+                    DripEnrollment.campaign_id.in_(primary_campaigns),
+                    DripEnrollment.id.not_in(first_per_campaign),
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(
+            update(DripEnrollment)
+            .where(DripEnrollment.tenant_id == tenant_id, DripEnrollment.lead_id == any_of(secondary_lead_ids))
+            .values(lead_id=primary.id)
+            .execution_options(synchronize_session=False)
+        )
+
+        # --- 5. Create merge logs ---
+        self.session.add_all(merge_logs)
+
+        # --- 6. Delete secondary leads ---
+        await self.session.execute(
+            delete(Lead)
+            .where(Lead.tenant_id == tenant_id, Lead.id == any_of(secondary_lead_ids))
+            .execution_options(synchronize_session=False)
+        )
+        for secondary in secondaries:
+            self.session.expunge(secondary)
+
+        # --- 7. Update primary timestamp ---
+        primary.updated_at = datetime.utcnow()
+
+        await self.session.commit()
+        await self.session.refresh(primary)
 
-        logger.info(f"Merging lead {secondary.id} into lead {primary.id} for tenant {tenant_id}")
-
-        # --- 1. Snapshot secondary before any changes ---
-        secondary_snapshot = {
-            "id": secondary.id,
-            "name": secondary.name,
-            "email": secondary.email,
-            "phone": secondary.phone,
-            "conversation_id": secondary.conversation_id,
-            "contact_id": secondary.contact_id,
-            "status": secondary.status,
-            "extra_data": secondary.extra_data,
-            "created_at": secondary.created_at.isoformat() if secondary.created_at else None,
-        }
-
-        # --- 2. Copy missing fields from secondary -> primary ---
+        logger.info(
+            f"Merged leads {secondary_lead_ids} into {primary.id}: "
+            f"secondary_conversation_ids={[s.conversation_id for s in secondaries]}"
+        )
+        return primary
+
+    def _fold_lead_into_primary(self, primary: Lead, secondary: Lead) -> dict[str, str]:
+        """Copy missing fields and merge extra_data from secondary into primary.
+
+        Returns:
+            Field resolutions for the merge log
+        """
         field_resolutions = {}
 
         # Name: prefer real names over placeholders
@@ -829,7 +901,6 @@ class LeadService:
         if not primary.contact_id and secondary.contact_id:
             primary.contact_id = secondary.contact_id
 
-        # --- 3. Deep-merge extra_data ---
         primary_extra = dict(primary.extra_data or {})
         secondary_extra = dict(secondary.extra_data or {})
 
@@ -851,91 +922,14 @@ class LeadService:
             primary_extra["voice_calls"] = primary_calls + secondary_calls
 
         # Track merged conversation IDs
-        merged_convos = primary_extra.get("merged_conversation_ids", [])
+        merged_convos = list(primary_extra.get("merged_conversation_ids", []))
         if secondary.conversation_id:
             merged_convos.append(secondary.conversation_id)
         if merged_convos:
             primary_extra["merged_conversation_ids"] = merged_convos
 
         primary.extra_data = primary_extra
-
-        # --- 4. Reassign child FK records ---
-        # call_summaries (nullable)
-        await self.session.execute(
-            update(CallSummary)
-            .where(CallSummary.lead_id == secondary.id)
-            .values(lead_id=primary.id)
-        )
-
-        # email_conversations (nullable)
-        await self.session.execute(
-            update(EmailConversation)
-            .where(EmailConversation.lead_id == secondary.id)
-            .values(lead_id=primary.id)
-        )
-
-        # email_ingestion_logs (nullable)
-        await self.session.execute(
-            update(EmailIngestionLog)
-            .where(EmailIngestionLog.lead_id == secondary.id)
-            .values(lead_id=primary.id)
-        )
-
-        # contacts.lead_id (legacy, nullable)
-        await self.session.execute(
-            update(Contact)
-            .where(Contact.lead_id == secondary.id)
-            .values(lead_id=primary.id)
-        )
-
-        # drip_enrollments (NOT NULL + unique constraint per tenant/campaign/lead)
-        result = await self.session.execute(
-            select(DripEnrollment).where(DripEnrollment.lead_id == secondary.id)
-        )
-        for enrollment in result.scalars().all():
-            # Check if primary already enrolled in same campaign
-            existing_result = await self.session.execute(
-                select(DripEnrollment).where(
-                    DripEnrollment.lead_id == primary.id,
-                    DripEnrollment.campaign_id == enrollment.campaign_id,
-                    DripEnrollment.tenant_id == tenant_id,
-                )
-            )
-            if existing_result.scalar_one_or_none():
-                # Primary already enrolled — delete secondary's enrollment
-                await self.session.delete(enrollment)
-            else:
-                # Reassign to primary
-                enrollment.lead_id = primary.id
-
-        # --- 5. Create merge log ---
-        merge_log = LeadMergeLog(
-            tenant_id=tenant_id,
-            primary_lead_id=primary.id,
-            secondary_lead_id=secondary.id,
-            merged_by=user_id,
-            field_resolutions=field_resolutions,
-            secondary_data_snapshot=secondary_snapshot,
-        )
-        self.session.add(merge_log)
-
-        # --- 6. Delete secondary lead ---
-        await self.session.execute(
-            delete(Lead).where(Lead.id == secondary.id, Lead.tenant_id == tenant_id)
-        )
-
-        # --- 7. Update primary timestamp ---
-        primary.updated_at = datetime.utcnow()
-
-        await self.session.commit()
-        await self.session.refresh(primary)
-
-        logger.info(
-            f"Merged lead {secondary.id} into {primary.id}: "
-            f"fields={field_resolutions}, "
-            f"secondary_conversation_id={secondary_snapshot.get('conversation_id')}"
-        )
-        return primary
+        return field_resolutions
 
     async def _check_and_merge_duplicate_leads(
         self, tenant_id: int, lead: Lead
@@ -957,10 +951,12 @@ class LeadService:
             return lead
 
         conditions = []
-        if lead.email:
-            conditions.append(Lead.email == lead.email)
-        if lead.phone:
-            conditions.append(Lead.phone == lead.phone)
+        if lead.email_normalized:
+            conditions.append(Lead.email_normalized == lead.email_normalized)
+        if lead.phone_last10:
+            conditions.append(Lead.phone_last10 == lead.phone_last10)
+        if not conditions:
+            return lead
 
         stmt = (
             select(Lead)
@@ -979,15 +975,16 @@ class LeadService:
 
         logger.info(f"Found {len(duplicates)} duplicate leads for lead {lead.id}")
 
+        primary = lead
         for duplicate in duplicates:
-            primary, secondary = self._pick_primary_lead(lead, duplicate)
-            lead = await self.merge_leads(
-                tenant_id=tenant_id,
-                primary_lead_id=primary.id,
-                secondary_lead_id=secondary.id,
-            )
+            primary, _ = self._pick_primary_lead(primary, duplicate)
+        secondary_ids = [l.id for l in [lead] + duplicates if l.id != primary.id]
 
-        return lead
+        return await self.merge_leads_bulk(
+            tenant_id=tenant_id,
+            primary_lead_id=primary.id,
+            secondary_lead_ids=secondary_ids,
+        )
 
     async def delete_lead(self, tenant_id: int, lead_id: int) -> bool:
         """Delete a lead by ID.
@@ -4,6 +4,7 @@ from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.domain.services.compliance_gate import ComplianceGate
 from app.persistence.models.sms_opt_in import SmsOptIn
 from app.persistence.repositories.sms_opt_in_repository import SmsOptInRepository
 
@@ -56,16 +57,56 @@ class OptInService:
             opt_in.opt_out_method = None
             await self.session.commit()
             await self.session.refresh(opt_in)
-            return opt_in
         else:
             # Create new record
-            return await self.opt_in_repo.create(
+            opt_in = await self.opt_in_repo.create(
                 tenant_id,
                 phone_number=phone_number,
                 is_opted_in=True,
                 opted_in_at=datetime.utcnow(),
                 opt_in_method=method,
             )
+        await ComplianceGate(self.session).refresh(tenant_id, phone_number)
+        return opt_in
+
+    async def record_opt_in(
+        self,
+        tenant_id: int,
+        phone_number: str,
+        method: str = "keyword",
+    ) -> SmsOptIn:
+        """Opt in a phone number without committing.
+
+        For batch callers that commit once for the whole unit of work. The
+        caller must refresh the ComplianceGate cache for the number after
+        committing.
+
+        Args:
+            tenant_id: Tenant ID
+            phone_number: Phone number
+            method: Opt-in method (keyword, manual, api, etc.)
+
+        Returns:
+            Opt-in record (flushed, not committed)
+        """
+        opt_in = await self.opt_in_repo.get_by_phone(tenant_id, phone_number)
+
+        if opt_in:
+            opt_in.is_opted_in = True
+            opt_in.opted_in_at = datetime.utcnow()
+            opt_in.opt_in_method = method
+            opt_in.opted_out_at = None
+            opt_in.opt_out_method = None
+            await self.session.flush()
+        else:
+            opt_in = await self.opt_in_repo.add(
+                tenant_id,
+                phone_number=phone_number,
+                is_opted_in=True,
+                opted_in_at=datetime.utcnow(),
+                opt_in_method=method,
+            )
+        return opt_in
 
     async def opt_out(
         self,
@@ -92,16 +133,17 @@ class OptInService:
             opt_in.opt_out_method = method
             await self.session.commit()
             await self.session.refresh(opt_in)
-            return opt_in
         else:
             # Create new record (opted out)
-            return await self.opt_in_repo.create(
+            opt_in = await self.opt_in_repo.create(
                 tenant_id,
                 phone_number=phone_number,
                 is_opted_in=False,
                 opted_out_at=datetime.utcnow(),
                 opt_out_method=method,
             )
+        await ComplianceGate(self.session).refresh(tenant_id, phone_number)
+        return opt_in
 
     async def get_opt_in_status(
         self, tenant_id: int, phone_number: str
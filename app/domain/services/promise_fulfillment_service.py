@@ -9,7 +9,7 @@ from sqlalchemy import select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.services.dnc_service import DncService
+from app.domain.services.compliance_gate import ComplianceGate
 from app.domain.services.promise_detector import DetectedPromise
 from app.domain.services.conversation_context_extractor import (
     extract_context_from_messages,
@@ -20,15 +20,14 @@ from app.utils.jackrabbit_url_builder import (
     CustomerInfo,
     extract_customer_info_from_lead,
 )
-from app.persistence.models.tenant_sms_config import TenantSmsConfig
 from app.persistence.models.tenant_prompt_config import TenantPromptConfig
 from app.persistence.models.lead import Lead
 from app.persistence.models.conversation import Conversation, Message
 from app.persistence.models.sent_asset import SentAsset
-from app.infrastructure.telephony.telnyx_provider import TelnyxSmsProvider
+from app.infrastructure.telephony.factory import TelephonyProviderFactory
 from app.infrastructure.redis import redis_client
 from app.settings import settings
-from app.core.phone import normalize_phone_for_dedup
+from app.core.phone import normalize_phone_for_dedup, phone_match_key
 
 logger = logging.getLogger(__name__)
 
@@ -82,8 +81,7 @@ class PromiseFulfillmentService:
         )
 
         # Check Do Not Contact list - skip if blocked
-        dnc_service = DncService(self.session)
-        if await dnc_service.is_blocked(tenant_id, phone=phone):
+        if (await ComplianceGate(self.session).check(tenant_id, phone)).is_blocked:
             logger.info(f"DNC block - skipping promise fulfillment for {phone}")
             return {"status": "skipped", "reason": "do_not_contact"}
 
@@ -599,10 +597,9 @@ class PromiseFulfillmentService:
             f"to_phone={to_phone}, message_length={len(message)}"
         )
 
-        # Get tenant SMS config
-        stmt = select(TenantSmsConfig).where(TenantSmsConfig.tenant_id == tenant_id)
-        result = await self.session.execute(stmt)
-        sms_config = result.scalar_one_or_none()
+        # Get tenant SMS config (cached per instance)
+        factory = TelephonyProviderFactory(self.session)
+        sms_config = await factory.get_config(tenant_id)
 
         if not sms_config:
             logger.warning(
@@ -614,11 +611,10 @@ class PromiseFulfillmentService:
             }
 
         # Get Telnyx credentials
-        api_key = sms_config.telnyx_api_key
         from_number = sms_config.telnyx_phone_number
         messaging_profile_id = sms_config.telnyx_messaging_profile_id
 
-        if not api_key or not from_number:
+        if not sms_config.telnyx_api_key or not from_number:
             return {
                 "status": "not_configured",
                 "error": "Telnyx SMS not configured for tenant",
@@ -644,10 +640,7 @@ class PromiseFulfillmentService:
 
         # Send SMS
         try:
-            telnyx_provider = TelnyxSmsProvider(
-                api_key=api_key,
-                messaging_profile_id=messaging_profile_id,
-            )
+            telnyx_provider = await factory.get_sms_provider(tenant_id, require_enabled=False)
 
             sms_result = await telnyx_provider.send_sms(
                 to=formatted_phone,
@@ -807,11 +800,11 @@ class PromiseFulfillmentService:
             lead = result.scalar_one_or_none()
 
             # Fallback: Find lead by phone if conversation lookup fails
-            if not lead and phone:
-                phone_normalized = "".join(c for c in phone if c.isdigit())[-10:]
+            phone_key = phone_match_key(phone)
+            if not lead and phone_key:
                 stmt = select(Lead).where(
                     Lead.tenant_id == tenant_id,
-                    Lead.phone.like(f"%{phone_normalized}"),
+                    Lead.phone_last10 == phone_key,
                 ).order_by(Lead.created_at.desc()).limit(1)
                 result = await self.session.execute(stmt)
                 lead = result.scalar_one_or_none()
@@ -848,11 +841,11 @@ class PromiseFulfillmentService:
             lead = lead_result.scalar_one_or_none()
 
             # Fallback: Find lead by phone if conversation lookup fails
-            if not lead and phone:
-                phone_normalized = "".join(c for c in phone if c.isdigit())[-10:]
+            phone_key = phone_match_key(phone)
+            if not lead and phone_key:
                 stmt = select(Lead).where(
                     Lead.tenant_id == tenant_id,
-                    Lead.phone.like(f"%{phone_normalized}"),
+                    Lead.phone_last10 == phone_key,
                 ).order_by(Lead.created_at.desc()).limit(1)
                 lead_result = await self.session.execute(stmt)
                 lead = lead_result.scalar_one_or_none()
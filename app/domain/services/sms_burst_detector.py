@@ -2,14 +2,19 @@
 
 Detects repeated outbound SMS to the same recipient within a short time window.
 Uses Redis for fast-path tracking with database fallback.
+
+The Redis tracker keeps, per tenant+recipient, a sorted set of send timestamps
+and a hash of content-hash counts. A single Lua script prunes the window,
+records the send and returns the window statistics, so each check is one
+atomic round trip regardless of how many sends are in the window.
 """
 
 import hashlib
 import logging
 import time
+import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any
 
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -18,6 +23,7 @@ from app.infrastructure.redis import redis_client
 from app.persistence.models.conversation import Conversation, Message
 from app.persistence.models.sms_burst_config import SmsBurstConfig
 from app.persistence.models.sms_burst_incident import SmsBurstIncident
+from app.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +37,53 @@ DEFAULT_IDENTICAL_CONTENT_THRESHOLD = 2
 DEFAULT_SIMILARITY_THRESHOLD = 0.9
 DEFAULT_AUTO_BLOCK_THRESHOLD = 10
 
+# Per-instance cache of resolved tenant configs: {tenant_id: (expires_at, config)}
+_config_cache: dict[int, tuple[float, "BurstConfig"]] = {}
+
+# KEYS[1] = zset of sends in window (score = ts, member = "<ts>|<content hash>|<nonce>")
+# KEYS[2] = hash of content hash -> number of sends in window with that content
+# ARGV    = now, window seconds, content hash, nonce
+# Returns {count, avg_gap, max identical count, first ts, last ts}; floats are
+# returned as strings because Redis truncates Lua numbers to integers.
+_TRACK_SEND_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cutoff = '(' .. tostring(now - window)
+
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', cutoff)
+for _, member in ipairs(expired) do
+    local h = string.match(member, '^[^|]*|([^|]*)|')
+    if h and redis.call('HINCRBY', KEYS[2], h, -1) <= 0 then
+        redis.call('HDEL', KEYS[2], h)
+    end
+end
+if #expired > 0 then
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', cutoff)
+end
+
+redis.call('ZADD', KEYS[1], now, ARGV[1] .. '|' .. ARGV[3] .. '|' .. ARGV[4])
+redis.call('HINCRBY', KEYS[2], ARGV[3], 1)
+redis.call('EXPIRE', KEYS[1], window)
+redis.call('EXPIRE', KEYS[2], window)
+
+local count = redis.call('ZCARD', KEYS[1])
+local first = tonumber(redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')[2])
+local last = tonumber(redis.call('ZRANGE', KEYS[1], -1, -1, 'WITHSCORES')[2])
+local max_identical = 0
+for _, v in ipairs(redis.call('HVALS', KEYS[2])) do
+    local n = tonumber(v)
+    if n > max_identical then
+        max_identical = n
+    end
+end
+
+local avg_gap = 0
+if count > 1 then
+    avg_gap = (last - first) / (count - 1)
+end
+return {count, tostring(avg_gap), max_identical, tostring(first), tostring(last)}
+"""
+
 
 @dataclass
 class BurstConfig:
@@ -49,6 +102,21 @@ class BurstConfig:
     excluded_flows: list[str] = field(default_factory=list)
 
 
+@dataclass
+class WindowStats:
+    """Summary of the sends to one recipient inside the detection window."""
+
+    count: int
+    avg_gap: float
+    identical_count: int
+    first_ts: float
+    last_ts: float
+
+    @property
+    def has_identical(self) -> bool:
+        return self.identical_count >= 2
+
+
 @dataclass
 class BurstCheckResult:
     """Result of a burst detection check."""
@@ -85,6 +153,27 @@ def _detect_identical_content(hashes: list[str]) -> tuple[bool, int]:
     return max_count >= 2, max_count
 
 
+def _stats_from_sends(timestamps: list[float], hashes: list[str]) -> WindowStats:
+    """Build window stats from an explicit list of sends (DB fallback path)."""
+    ordered = sorted(timestamps)
+    _, identical_count = _detect_identical_content(hashes)
+    return WindowStats(
+        count=len(ordered),
+        avg_gap=_compute_avg_gap(ordered),
+        identical_count=identical_count,
+        first_ts=ordered[0],
+        last_ts=ordered[-1],
+    )
+
+
+def invalidate_burst_config(tenant_id: int | None = None) -> None:
+    """Drop cached burst config for a tenant (or all tenants) after an update."""
+    if tenant_id is None:
+        _config_cache.clear()
+    else:
+        _config_cache.pop(tenant_id, None)
+
+
 def _determine_likely_cause(avg_gap: float, count: int, has_identical: bool) -> str:
     """Heuristic root cause classification."""
     if avg_gap < 3:
@@ -137,7 +226,7 @@ class SmsBurstDetector:
         content_h = _content_hash(message_content)
 
         # Try Redis fast path, fall back to DB
-        if redis_client._enabled and redis_client._client is not None:
+        if redis_client.is_available:
             return await self._check_via_redis(
                 tenant_id, to_number, content_h, now, config
             )
@@ -147,7 +236,18 @@ class SmsBurstDetector:
         )
 
     async def _get_config(self, tenant_id: int) -> BurstConfig:
-        """Load tenant-specific config or return defaults."""
+        """Load tenant-specific config or return defaults (cached per instance)."""
+        now = time.monotonic()
+        cached = _config_cache.get(tenant_id)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        config = await self._load_config(tenant_id)
+        _config_cache[tenant_id] = (now + settings.sms_burst_config_cache_ttl_seconds, config)
+        return config
+
+    async def _load_config(self, tenant_id: int) -> BurstConfig:
+        """Load tenant-specific config from the database or return defaults."""
         try:
             stmt = select(SmsBurstConfig).where(SmsBurstConfig.tenant_id == tenant_id)
             result = await self.session.execute(stmt)
@@ -181,32 +281,29 @@ class SmsBurstDetector:
         now: float,
         config: BurstConfig,
     ) -> BurstCheckResult:
-        """Redis-based burst tracking using a JSON list of recent sends."""
-        key = f"sms_burst:{tenant_id}:{to_number}"
+        """Redis-based burst tracking using a timestamp ZSET and content-hash counts."""
+        # Hash tag keeps both keys in one cluster slot for the script
+        tag = f"{{{tenant_id}:{to_number}}}"
+        keys = [f"sms_burst:{tag}:sends", f"sms_burst:{tag}:content"]
         try:
-            # Get existing record
-            data = await redis_client.get_json(key)
-            entries: list[dict[str, Any]] = data.get("entries", []) if data else []
-
-            # Add current send
-            entries.append({"ts": now, "hash": content_hash})
-
-            # Prune entries outside window
-            cutoff = now - config.time_window_seconds
-            entries = [e for e in entries if e["ts"] >= cutoff]
-
-            # Save back
-            await redis_client.set_json(key, {"entries": entries}, ttl=config.time_window_seconds)
+            count, avg_gap, identical_count, first_ts, last_ts = await redis_client.run_script(
+                _TRACK_SEND_SCRIPT,
+                keys=keys,
+                args=[now, config.time_window_seconds, content_hash, uuid.uuid4().hex[:8]],
+            )
 
-            if len(entries) < config.message_threshold:
+            if int(count) < config.message_threshold:
                 return BurstCheckResult()
 
             # Burst detected — analyze
-            timestamps = [e["ts"] for e in entries]
-            hashes = [e["hash"] for e in entries]
-            return await self._analyze_and_record(
-                tenant_id, to_number, timestamps, hashes, config
+            stats = WindowStats(
+                count=int(count),
+                avg_gap=float(avg_gap),
+                identical_count=int(identical_count),
+                first_ts=float(first_ts),
+                last_ts=float(last_ts),
             )
+            return await self._analyze_and_record(tenant_id, to_number, stats, config)
         except Exception as e:
             logger.warning(f"Redis burst check failed: {e}, falling back to DB")
             return await self._check_via_database(
@@ -253,7 +350,7 @@ class SmsBurstDetector:
             hashes.append(content_hash)
 
             return await self._analyze_and_record(
-                tenant_id, to_number, timestamps, hashes, config
+                tenant_id, to_number, _stats_from_sends(timestamps, hashes), config
             )
         except Exception as e:
             logger.error(f"DB burst check failed: {e}", exc_info=True)
@@ -263,14 +360,14 @@ class SmsBurstDetector:
         self,
         tenant_id: int,
         to_number: str,
-        timestamps: list[float],
-        hashes: list[str],
+        stats: WindowStats,
         config: BurstConfig,
     ) -> BurstCheckResult:
         """Analyze burst characteristics, determine severity, and create incident."""
-        count = len(timestamps)
-        avg_gap = _compute_avg_gap(sorted(timestamps))
-        has_identical, identical_count = _detect_identical_content(hashes)
+        count = stats.count
+        avg_gap = stats.avg_gap
+        has_identical = stats.has_identical
+        identical_count = stats.identical_count
 
         # Determine severity
         severity = "warning"
@@ -312,8 +409,8 @@ class SmsBurstDetector:
             if existing:
                 # Update existing incident
                 existing.message_count = count
-                existing.last_message_at = datetime.utcfromtimestamp(max(timestamps))
-                existing.time_window_seconds = int(max(timestamps) - min(timestamps))
+                existing.last_message_at = datetime.utcfromtimestamp(stats.last_ts)
+                existing.time_window_seconds = int(stats.last_ts - stats.first_ts)
                 existing.avg_gap_seconds = round(avg_gap, 2)
                 existing.severity = severity
                 existing.has_identical_content = has_identical
@@ -328,9 +425,9 @@ class SmsBurstDetector:
                     tenant_id=tenant_id,
                     to_number=to_number,
                     message_count=count,
-                    first_message_at=datetime.utcfromtimestamp(min(timestamps)),
-                    last_message_at=datetime.utcfromtimestamp(max(timestamps)),
-                    time_window_seconds=int(max(timestamps) - min(timestamps)),
+                    first_message_at=datetime.utcfromtimestamp(stats.first_ts),
+                    last_message_at=datetime.utcfromtimestamp(stats.last_ts),
+                    time_window_seconds=int(stats.last_ts - stats.first_ts),
                     avg_gap_seconds=round(avg_gap, 2),
                     severity=severity,
                     has_identical_content=has_identical,
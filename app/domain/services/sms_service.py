@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.services.chat_service import ChatService
 from app.domain.services.compliance_handler import ComplianceHandler, ComplianceResult
+from app.domain.services.compliance_gate import ComplianceGate
 from app.domain.services.dnc_service import DncService
 from app.domain.services.escalation_service import EscalationService
 from app.domain.services.intent_detector import IntentDetector
@@ -92,17 +93,19 @@ class SmsService:
                 response_message="SMS service is not enabled for this tenant.",
             )
 
+        # DNC + opt-in state in one lookup
+        compliance = await ComplianceGate(self.session).check(tenant_id, phone_number)
+
         # Check if sender is on Do Not Contact list - if so, silently ignore
         dnc_service = DncService(self.session)
-        if await dnc_service.is_blocked(tenant_id, phone=phone_number):
+        if compliance.is_blocked:
             logger.info(f"DNC block - silently ignoring SMS from {phone_number}")
             return SmsResult(response_message="")  # Silent - no response
 
         # Auto opt-in: When someone texts us, they're implicitly opting in
         opt_in_service = OptInService(self.session)
         try:
-            is_opted_in = await opt_in_service.is_opted_in(tenant_id, phone_number)
-            if not is_opted_in:
+            if not compliance.allowed:
                 await opt_in_service.opt_in(tenant_id, phone_number, method="inbound_sms")
                 logger.info(f"Auto opt-in - tenant_id={tenant_id}, phone={phone_number}")
         except Exception as e:
@@ -448,18 +451,16 @@ class SmsService:
     async def _get_sms_config(self, tenant_id: int) -> TenantSmsConfig | None:
         """Get tenant SMS configuration.
 
+        Served from the shared telephony config cache, so the provider lookup
+        later in the same send does not query the row again.
+
         Args:
             tenant_id: Tenant ID
 
         Returns:
             SMS config or None if not found
         """
-        from sqlalchemy import select
-        from app.persistence.models.tenant_sms_config import TenantSmsConfig
-
-        stmt = select(TenantSmsConfig).where(TenantSmsConfig.tenant_id == tenant_id)
-        result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        return await TelephonyProviderFactory(self.session).get_config(tenant_id)
 
     async def _send_early_response(
         self,
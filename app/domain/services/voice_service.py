@@ -15,6 +15,7 @@ from app.domain.services.lead_service import LeadService
 from app.domain.services.prompt_service import PromptService
 from app.domain.services.voice_config_service import VoiceConfigService
 from app.infrastructure.notifications import NotificationService
+from app.core.metrics import VOICE_STAGE_DURATION
 from app.llm.orchestrator import LLMOrchestrator
 from app.persistence.models.call import Call
 from app.persistence.models.call_summary import CallSummary
@@ -76,6 +77,14 @@ class VoiceLatencyMetrics:
             f"post_proc={self.post_processing_ms:.1f}ms"
         )
 
+    def record(self) -> None:
+        """Record stage timings in the voice_stage_duration_seconds histogram."""
+        VOICE_STAGE_DURATION.observe(self.total_ms / 1000, "total")
+        VOICE_STAGE_DURATION.observe(self.intent_detection_ms / 1000, "intent")
+        if self.llm_full_ms:
+            VOICE_STAGE_DURATION.observe(self.llm_full_ms / 1000, "llm")
+            VOICE_STAGE_DURATION.observe(self.post_processing_ms / 1000, "post_processing")
+
 
 @dataclass
 class VoiceResult:
@@ -259,6 +268,7 @@ class VoiceService:
             # Check for escalation triggers
             if self._should_escalate(transcribed_text, intent):
                 metrics.total_ms = (time.time() - total_start) * 1000
+                metrics.record()
                 logger.info(
                     f"Voice escalation for {call_sid}: "
                     f"total={metrics.total_ms:.1f}ms, intent={metrics.intent_detection_ms:.1f}ms"
@@ -287,6 +297,7 @@ class VoiceService:
             
             # Calculate total
             metrics.total_ms = (time.time() - total_start) * 1000
+            metrics.record()
             
             # Log comprehensive latency metrics
             logger.info(
@@ -1,6 +1,5 @@
 """Zapier integration service for outbound webhooks and callback handling."""
 
-import asyncio
 import hashlib
 import hmac
 import json
@@ -12,6 +11,8 @@ from datetime import datetime
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.metrics import httpx_event_hooks
+from app.infrastructure.callback_broker import callback_broker
 from app.infrastructure.redis import redis_client
 from app.persistence.models.zapier_request import ZapierRequest
 from app.persistence.repositories.customer_service_config_repository import CustomerServiceConfigRepository
@@ -202,7 +203,9 @@ class ZapierIntegrationService:
 
         # Send HTTP request to Zapier
         try:
-            async with httpx.AsyncClient(timeout=self.HTTP_TIMEOUT_SECONDS) as client:
+            async with httpx.AsyncClient(
+                timeout=self.HTTP_TIMEOUT_SECONDS, event_hooks=httpx_event_hooks("zapier")
+            ) as client:
                 response = await client.post(
                     webhook_url,
                     json=payload,
@@ -299,12 +302,15 @@ class ZapierIntegrationService:
             error_message=error_message,
         )
 
-        # Store response in Redis for polling
+        # Store response in Redis for waiters that register late, then wake
+        # any waiter immediately (same instance directly, others via pub/sub)
+        response_data = {"status": status, "payload": payload}
         await redis_client.set_json(
             f"{self.RESPONSE_KEY_PREFIX}{correlation_id}",
-            {"status": status, "payload": payload},
+            response_data,
             ttl=300,  # 5 minute TTL
         )
+        await callback_broker.publish(correlation_id, response_data)
 
         # Delete pending key
         await redis_client.delete(f"{self.PENDING_KEY_PREFIX}{correlation_id}")
@@ -324,43 +330,39 @@ class ZapierIntegrationService:
         self,
         correlation_id: str,
         timeout_seconds: int | None = None,
-        poll_interval: float = 0.5,
     ) -> dict | None:
-        """Wait for Zapier callback response (polling Redis).
+        """Wait for Zapier callback response.
+
+        Wakes as soon as process_callback runs for this correlation ID, on
+        this instance or any other, instead of polling.
 
         Args:
             correlation_id: Request correlation ID
             timeout_seconds: Custom timeout (uses default if not provided)
-            poll_interval: Interval between polls in seconds
 
         Returns:
             Response payload or None if timeout
         """
         timeout = timeout_seconds or self.DEFAULT_TIMEOUT_SECONDS
-        start_time = asyncio.get_event_loop().time()
+        response_key = f"{self.RESPONSE_KEY_PREFIX}{correlation_id}"
 
-        while True:
-            # Check if response is available in Redis
-            response_data = await redis_client.get_json(
-                f"{self.RESPONSE_KEY_PREFIX}{correlation_id}"
-            )
+        async def fetch_stored_response() -> dict | None:
+            return await redis_client.get_json(response_key)
 
-            if response_data:
-                return response_data.get("payload")
-
-            # Check timeout
-            elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed >= timeout:
-                # Mark as timeout in database
-                await self.request_repo.mark_timeout(correlation_id)
-                logger.warning(
-                    f"Zapier response timeout after {timeout}s",
-                    extra={"correlation_id": correlation_id},
-                )
-                return None
+        response_data = await callback_broker.wait(
+            correlation_id, timeout, fetch_stored_response
+        )
+
+        if response_data is None:
+            # Mark as timeout in database
+            await self.request_repo.mark_timeout(correlation_id)
+            logger.warning(
+                f"Zapier response timeout after {timeout}s",
+                extra={"correlation_id": correlation_id},
+            )
+            return None
 
-            # Wait before next poll
-            await asyncio.sleep(poll_interval)
+        return response_data.get("payload")
 
     async def _mark_request_error(
         self, correlation_id: str, error_message: str
@@ -372,12 +374,14 @@ class ZapierIntegrationService:
             request.error_message = error_message
             await self.session.commit()
 
-        # Update Redis
+        # Update Redis and release any waiter
+        response_data = {"status": "error", "error": error_message}
         await redis_client.set_json(
             f"{self.RESPONSE_KEY_PREFIX}{correlation_id}",
-            {"status": "error", "error": error_message},
+            response_data,
             ttl=300,
         )
+        await callback_broker.publish(correlation_id, response_data)
         await redis_client.delete(f"{self.PENDING_KEY_PREFIX}{correlation_id}")
 
     def _generate_correlation_id(self) -> str:
@@ -0,0 +1,168 @@
+"""Parquet files and BigQuery loads for the analytics export.
+
+pyarrow is optional (``pip install .[analytics-export]``) and only
+imported when a ParquetSink is created.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import Sequence
+from datetime import date
+from typing import Any
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    Numeric,
+    TypeDecorator,
+)
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsExportError(Exception):
+    """Raised when the analytics export is misconfigured."""
+
+
+def _arrow_type(pa, column: Column):
+    sql_type = column.type
+    if isinstance(sql_type, TypeDecorator):
+        sql_type = sql_type.impl_instance
+    if isinstance(sql_type, Boolean):
+        return pa.bool_()
+    if isinstance(sql_type, Integer):
+        return pa.int64()
+    if isinstance(sql_type, (Float, Numeric)):
+        return pa.float64()
+    if isinstance(sql_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(sql_type, Date):
+        return pa.date32()
+    return pa.string()
+
+
+def _to_text(value: Any) -> str | None:
+    if value is None or isinstance(value, str):
+        return value
+    return str(value)
+
+
+def _to_json(value: Any) -> str | None:
+    return None if value is None else json.dumps(value, default=str)
+
+
+def _as_is(value: Any) -> Any:
+    return value
+
+
+class ParquetPartition:
+    """One open Parquet file; rows are appended as row groups."""
+
+    def __init__(self, writer, schema, converters, uri: str) -> None:
+        self._writer = writer
+        self._schema = schema
+        self._converters = converters
+        self.uri = uri
+
+    async def write(self, rows: Sequence[Sequence[Any]]) -> None:
+        import pyarrow as pa
+
+        columns = {
+            field.name: [convert(row[i]) for row in rows]
+            for i, (field, convert) in enumerate(zip(self._schema, self._converters))
+        }
+        table = pa.Table.from_pydict(columns, schema=self._schema)
+        await asyncio.to_thread(self._writer.write_table, table)
+
+    async def close(self) -> str:
+        await asyncio.to_thread(self._writer.close)
+        return self.uri
+
+
+class ParquetSink:
+    """Writes Hive-partitioned Parquet files under a local path or gs:// URI.
+
+    Layout: {uri}/{table}/tenant_id={id}/day={YYYY-MM-DD}/{part}.parquet
+    """
+
+    def __init__(self, uri: str) -> None:
+        try:
+            import pyarrow.fs
+        except ImportError as e:
+            raise AnalyticsExportError(
+                "pyarrow is required for the analytics export (install the analytics-export extra)"
+            ) from e
+        self.uri = uri.rstrip("/")
+        self._fs, self._root = pyarrow.fs.FileSystem.from_uri(self.uri)
+
+    async def open(
+        self, table_name: str, columns: Sequence[Column], tenant_id: int, day: date, part: str
+    ) -> ParquetPartition:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([(c.name, _arrow_type(pa, c)) for c in columns])
+        # JSON columns are stored as JSON text
+        converters = [
+            _to_json if isinstance(c.type, JSON)
+            else _to_text if pa.types.is_string(field.type)
+            else _as_is
+            for c, field in zip(columns, schema)
+        ]
+        relative = f"{table_name}/tenant_id={tenant_id}/day={day.isoformat()}"
+        directory = f"{self._root}/{relative}"
+        await asyncio.to_thread(self._fs.create_dir, directory, recursive=True)
+        writer = await asyncio.to_thread(
+            pq.ParquetWriter, f"{directory}/{part}.parquet", schema, filesystem=self._fs
+        )
+        return ParquetPartition(writer, schema, converters, f"{self.uri}/{relative}/{part}.parquet")
+
+
+class BigQueryLoader:
+    """Appends exported Parquet files to BigQuery tables, one per export table.
+
+    Tables are created on first load; tenant_id and day are read from the
+    Hive partition path. Needs the export to be written to a gs:// URI.
+    """
+
+    def __init__(self, dataset: str, export_uri: str) -> None:
+        if not export_uri.startswith("gs://"):
+            raise AnalyticsExportError("BigQuery loading needs a gs:// analytics_export_uri")
+        self.dataset = dataset
+        self.export_uri = export_uri.rstrip("/")
+        self._client = None
+
+    @property
+    def client(self):
+        """Lazy-load the BigQuery client."""
+        if self._client is None:
+            from google.cloud import bigquery
+
+            self._client = bigquery.Client(project=settings.gcp_project_id)
+        return self._client
+
+    async def load(self, table_name: str, uris: list[str]) -> None:
+        await asyncio.to_thread(self._load, table_name, uris)
+
+    def _load(self, table_name: str, uris: list[str]) -> None:
+        from google.cloud import bigquery
+
+        hive_partitioning = bigquery.HivePartitioningOptions()
+        hive_partitioning.mode = "AUTO"
+        hive_partitioning.source_uri_prefix = f"{self.export_uri}/{table_name}/"
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.PARQUET,
+            write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            hive_partitioning=hive_partitioning,
+        )
+        destination = f"{self.client.project}.{self.dataset}.{table_name}"
+        self.client.load_table_from_uri(uris, destination, job_config=job_config).result()
+        logger.info(f"Loaded {len(uris)} Parquet files into {destination}")
@@ -0,0 +1,128 @@
+"""Call recording storage service using Google Cloud Storage.
+
+Mirrors Telnyx call recordings into a private bucket so playback does not
+depend on the Telnyx API. Recordings are never public; they are played
+through short-lived signed URLs.
+"""
+
+import asyncio
+import logging
+from datetime import timedelta
+
+from google.auth.exceptions import GoogleAuthError
+from google.cloud import storage
+from google.cloud.exceptions import GoogleCloudError
+
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE_EXTENSIONS = {
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+    "audio/wav": "wav",
+    "audio/x-wav": "wav",
+}
+
+
+class CallRecordingStorageError(Exception):
+    """Custom exception for call recording storage errors."""
+
+
+class CallRecordingStorage:
+    """Service for storing call recordings in GCS."""
+
+    def __init__(self):
+        """Initialize the storage client."""
+        self._client: storage.Client | None = None
+        self._bucket: storage.Bucket | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether recordings are mirrored (a bucket is configured)."""
+        return bool(settings.gcs_call_recordings_bucket)
+
+    @property
+    def client(self) -> storage.Client:
+        """Lazy-load the GCS client."""
+        if self._client is None:
+            self._client = storage.Client(project=settings.gcp_project_id)
+        return self._client
+
+    @property
+    def bucket(self) -> storage.Bucket:
+        """Get the configured bucket."""
+        if self._bucket is None:
+            bucket_name = settings.gcs_call_recordings_bucket
+            if not bucket_name:
+                raise CallRecordingStorageError(
+                    "GCS_CALL_RECORDINGS_BUCKET is not configured"
+                )
+            self._bucket = self.client.bucket(bucket_name)
+        return self._bucket
+
+    def _get_blob_path(self, tenant_id: int, call_id: int, extension: str) -> str:
+        """Generate the blob path for a call recording.
+
+        Path format: tenants/{tenant_id}/call-recordings/{call_id}.{ext}
+        """
+        return f"tenants/{tenant_id}/call-recordings/{call_id}.{extension}"
+
+    async def upload_recording(
+        self,
+        tenant_id: int,
+        call_id: int,
+        data: bytes,
+        content_type: str,
+    ) -> str:
+        """Upload a call recording to GCS.
+
+        Args:
+            tenant_id: The tenant ID for isolation
+            call_id: The call the recording belongs to
+            data: Recording audio
+            content_type: MIME type of the audio
+
+        Returns:
+            Blob path of the stored recording
+
+        Raises:
+            CallRecordingStorageError: If upload fails
+        """
+        content_type = content_type.split(";")[0].strip().lower()
+        extension = CONTENT_TYPE_EXTENSIONS.get(content_type, "mp3")
+        blob_path = self._get_blob_path(tenant_id, call_id, extension)
+
+        try:
+            blob = self.bucket.blob(blob_path)
+            await asyncio.to_thread(blob.upload_from_string, data, content_type=content_type)
+            logger.info(
+                f"Mirrored call recording for tenant {tenant_id}: "
+                f"call_id={call_id}, size={len(data)}, type={content_type}"
+            )
+            return blob_path
+        except GoogleCloudError as e:
+            logger.error(f"GCS recording upload failed for call {call_id}: {e}")
+            raise CallRecordingStorageError(f"Failed to upload recording: {e}")
+
+    async def get_signed_url(self, blob_path: str, expires_in_seconds: int) -> str:
+        """Generate a signed GET URL for a stored recording.
+
+        Raises:
+            CallRecordingStorageError: If signing fails
+        """
+        try:
+            blob = self.bucket.blob(blob_path)
+            return await asyncio.to_thread(
+                blob.generate_signed_url,
+                version="v4",
+                expiration=timedelta(seconds=expires_in_seconds),
+                method="GET",
+            )
+        except (GoogleCloudError, GoogleAuthError) as e:
+            logger.error(f"GCS signed URL failed for {blob_path}: {e}")
+            raise CallRecordingStorageError(f"Failed to sign recording URL: {e}")
+
+
+# Global instance
+call_recording_storage = CallRecordingStorage()
@@ -0,0 +1,184 @@
+"""Await-able broker for asynchronous webhook callbacks.
+
+Some integrations (Zapier customer lookups) answer a request by calling back
+into a webhook, possibly on another Cloud Run instance. The broker lets the
+request that is waiting for that callback await it instead of polling:
+
+- Waiters register an in-process future keyed by correlation ID.
+- Callbacks handled on the same instance resolve that future directly.
+- Callbacks handled elsewhere are published on Redis pub/sub; each instance
+  runs one pattern subscription that resolves matching local futures.
+
+Callers still persist the result (e.g. in a Redis key) so a waiter that
+registers after the callback landed - or misses a pub/sub message while the
+listener reconnects - finds it on its periodic re-check.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable
+
+from app.core.metrics import QUEUE_DEPTH
+from app.infrastructure.redis import redis_client
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "callback:"
+
+# Safety re-check interval while waiting (covers dropped pub/sub messages)
+RECHECK_INTERVAL_SECONDS = 5.0
+# Longest a waiter holds for the subscription to be confirmed
+SUBSCRIBE_TIMEOUT_SECONDS = 2.0
+
+
+class CallbackBroker:
+    """In-process future map backed by a Redis pub/sub fan-out."""
+
+    def __init__(self) -> None:
+        self._waiters: dict[str, list[asyncio.Future]] = {}
+        self._listener: asyncio.Task | None = None
+        self._listener_loop: asyncio.AbstractEventLoop | None = None
+        self._subscribed: asyncio.Event | None = None
+
+    async def wait(
+        self,
+        key: str,
+        timeout: float,
+        fetch_existing: Callable[[], Awaitable[dict[str, Any] | None]],
+    ) -> dict[str, Any] | None:
+        """Wait for the callback published under key.
+
+        Args:
+            key: Correlation key shared by waiter and publisher
+            timeout: Maximum seconds to wait
+            fetch_existing: Reads an already-stored result (checked after the
+                waiter is registered, so a callback cannot slip between)
+
+        Returns:
+            Published message, or None on timeout
+        """
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+        self._waiters.setdefault(key, []).append(future)
+        try:
+            deadline = loop.time() + timeout
+            await self._ensure_listener(max(0.0, deadline - loop.time()))
+
+            while True:
+                existing = await fetch_existing()
+                if existing is not None:
+                    return existing
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                try:
+                    return await asyncio.wait_for(
+                        asyncio.shield(future),
+                        timeout=min(remaining, RECHECK_INTERVAL_SECONDS),
+                    )
+                except asyncio.TimeoutError:
+                    continue
+        finally:
+            self._discard(key, future)
+
+    async def publish(self, key: str, message: dict[str, Any]) -> None:
+        """Deliver a callback result to local and remote waiters.
+
+        Args:
+            key: Correlation key
+            message: JSON-serializable result
+        """
+        self._resolve(key, message)
+        await redis_client.publish(f"{CHANNEL_PREFIX}{key}", json.dumps(message))
+
+    async def close(self) -> None:
+        """Stop the pub/sub listener (application shutdown)."""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.warning(f"Callback broker listener failed on close: {e}", exc_info=True)
+        self._listener = None
+        self._listener_loop = None
+        self._subscribed = None
+
+    def _resolve(self, key: str, message: dict[str, Any]) -> None:
+        for future in self._waiters.get(key, []):
+            if not future.done():
+                future.set_result(message)
+
+    def _discard(self, key: str, future: asyncio.Future) -> None:
+        waiters = self._waiters.get(key)
+        if not waiters:
+            return
+        if future in waiters:
+            waiters.remove(future)
+        if not waiters:
+            del self._waiters[key]
+
+    async def _ensure_listener(self, timeout: float) -> None:
+        """Start the instance-wide pattern subscription if it isn't running.
+
+        Waits at most timeout (capped at SUBSCRIBE_TIMEOUT_SECONDS) for the
+        subscription to be confirmed; re-checks cover an unconfirmed one.
+        """
+        loop = asyncio.get_running_loop()
+        if (
+            self._listener is None
+            or self._listener.done()
+            or self._listener_loop is not loop
+        ):
+            pubsub = redis_client.pubsub()
+            if pubsub is None:
+                return  # Redis disabled - same-instance callbacks still resolve
+
+            self._subscribed = asyncio.Event()
+            self._listener = asyncio.create_task(self._listen(pubsub, self._subscribed))
+            self._listener_loop = loop
+
+        if self._subscribed is None or self._subscribed.is_set():
+            return
+        try:
+            await asyncio.wait_for(
+                self._subscribed.wait(), timeout=min(timeout, SUBSCRIBE_TIMEOUT_SECONDS)
+            )
+        except asyncio.TimeoutError:
+            logger.warning("Callback broker subscription not confirmed; relying on re-checks")
+
+    async def _listen(self, pubsub: Any, subscribed: asyncio.Event) -> None:
+        try:
+            await pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+            subscribed.set()
+            async for message in pubsub.listen():
+                if message.get("type") != "pmessage":
+                    continue
+                key = message["channel"][len(CHANNEL_PREFIX):]
+                if key not in self._waiters:
+                    continue
+                try:
+                    self._resolve(key, json.loads(message["data"]))
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"Invalid callback broker message for {key}: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Next wait() restarts the listener; re-checks cover the gap
+            logger.warning(f"Callback broker listener stopped: {e}", exc_info=True)
+        finally:
+            subscribed.set()
+            try:
+                await pubsub.aclose()
+            except Exception as e:
+                logger.warning(f"Callback broker failed to close its pub/sub connection: {e}")
+
+
+# Global broker instance
+callback_broker = CallbackBroker()
+QUEUE_DEPTH.set_function(
+    lambda: sum(len(futures) for futures in callback_broker._waiters.values()), "callback_waiters"
+)
@@ -13,11 +13,18 @@ from google_auth_oauthlib.flow import Flow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from app.core.metrics import observe_external
 from app.settings import settings
 
 logger = logging.getLogger(__name__)
 
 
+def _execute(request: Any, operation: str) -> Any:
+    """Execute a Gmail API request, recording its latency."""
+    with observe_external("gmail", operation):
+        return request.execute()
+
+
 def _to_naive_utc(dt: datetime | None) -> datetime | None:
     """Convert a datetime to naive UTC.
     
@@ -62,6 +69,9 @@ class GmailClient:
         "https://www.googleapis.com/auth/gmail.send",
     ]
 
+    # Gmail recommends at most 50 requests per batch to avoid rate limiting
+    MAX_BATCH_SIZE = 50
+
     def __init__(
         self,
         refresh_token: str | None = None,
@@ -259,7 +269,7 @@ class GmailClient:
                 "topicName": topic_name,
                 "labelIds": label_ids or ["INBOX"],
             }
-            response = service.users().watch(userId="me", body=request_body).execute()
+            response = _execute(service.users().watch(userId="me", body=request_body), "watch")
             
             # Convert expiration (ms since epoch) to naive UTC datetime
             # Database columns are timezone-naive, so we return naive UTC
@@ -339,7 +349,7 @@ class GmailClient:
             # Only add labelId if specified (None means get all labels)
             if label_id:
                 params["labelId"] = label_id
-            response = service.users().history().list(**params).execute()
+            response = _execute(service.users().history().list(**params), "history.list")
             
             messages = []
             for history in response.get("history", []):
@@ -369,37 +379,94 @@ class GmailClient:
         """
         try:
             service = self._get_service()
-            message = service.users().messages().get(
+            message = _execute(service.users().messages().get(
                 userId="me",
                 id=message_id,
                 format=format,
-            ).execute()
-            
-            # Parse headers
-            headers = {}
-            for header in message.get("payload", {}).get("headers", []):
-                headers[header["name"].lower()] = header["value"]
-            
-            # Extract body
-            body = self._extract_body(message.get("payload", {}))
-            
-            return {
-                "id": message.get("id"),
-                "thread_id": message.get("threadId"),
-                "label_ids": message.get("labelIds", []),
-                "snippet": message.get("snippet"),
-                "headers": headers,
-                "subject": headers.get("subject", ""),
-                "from": headers.get("from", ""),
-                "to": headers.get("to", ""),
-                "date": headers.get("date", ""),
-                "body": body,
-                "internal_date": message.get("internalDate"),
-            }
+            ), "messages.get")
+            return self._parse_message(message)
         except HttpError as e:
             logger.error(f"Gmail get message failed: {e}")
             raise GmailAPIError(f"Failed to get message: {str(e)}") from e
 
+    def get_messages_batch(
+        self,
+        message_ids: list[str],
+        format: str = "full",
+        metadata_headers: list[str] | None = None,
+    ) -> dict[str, dict[str, Any]]:
+        """Get several messages using Gmail batch requests.
+
+        Sends up to MAX_BATCH_SIZE message gets per HTTP round trip; Gmail
+        executes the parts of a batch in parallel. Use format="metadata"
+        with metadata_headers to triage messages without downloading bodies.
+
+        Args:
+            message_ids: Gmail message IDs
+            format: Response format (full, metadata, minimal, raw)
+            metadata_headers: Headers to return when format is "metadata"
+
+        Returns:
+            Parsed messages keyed by message ID. Messages that could not be
+            fetched (e.g. deleted since the notification) are omitted.
+
+        Raises:
+            GmailAPIError: If a batch request fails as a whole
+        """
+        messages: dict[str, dict[str, Any]] = {}
+        if not message_ids:
+            return messages
+
+        def _on_response(request_id: str, response: dict, exception: Exception | None) -> None:
+            if exception is not None:
+                logger.warning(f"Gmail batch get failed for message {request_id}: {exception}")
+                return
+            messages[request_id] = self._parse_message(response)
+
+        params: dict[str, Any] = {"userId": "me", "format": format}
+        if format == "metadata" and metadata_headers:
+            params["metadataHeaders"] = metadata_headers
+
+        try:
+            service = self._get_service()
+            unique_ids = list(dict.fromkeys(message_ids))
+            for i in range(0, len(unique_ids), self.MAX_BATCH_SIZE):
+                batch = service.new_batch_http_request(callback=_on_response)
+                for message_id in unique_ids[i:i + self.MAX_BATCH_SIZE]:
+                    batch.add(
+                        service.users().messages().get(id=message_id, **params),
+                        request_id=message_id,
+                    )
+                _execute(batch, "messages.batch_get")
+        except HttpError as e:
+            logger.error(f"Gmail batch get messages failed: {e}")
+            raise GmailAPIError(f"Failed to get messages: {str(e)}") from e
+
+        return messages
+
+    def _parse_message(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Convert a Gmail API message resource into our message dict."""
+        headers = {}
+        for header in message.get("payload", {}).get("headers", []):
+            headers[header["name"].lower()] = header["value"]
+
+        # metadata/minimal responses carry no body parts
+        body = self._extract_body(message.get("payload", {}))
+
+        return {
+            "id": message.get("id"),
+            "thread_id": message.get("threadId"),
+            "label_ids": message.get("labelIds", []),
+            "snippet": message.get("snippet"),
+            "headers": headers,
+            "subject": headers.get("subject", ""),
+            "from": headers.get("from", ""),
+            "to": headers.get("to", ""),
+            "date": headers.get("date", ""),
+            "body": body,
+            "internal_date": message.get("internalDate"),
+        }
+
     def _extract_body(self, payload: dict, depth: int = 0) -> str:
         """Extract plain text body from message payload.
         
@@ -531,11 +598,11 @@ class GmailClient:
         """
         try:
             service = self._get_service()
-            thread = service.users().threads().get(
+            thread = _execute(service.users().threads().get(
                 userId="me",
                 id=thread_id,
                 format=format,
-            ).execute()
+            ), "threads.get")
             
             messages = []
             for msg in thread.get("messages", []):
@@ -622,10 +689,10 @@ class GmailClient:
                 request_body["threadId"] = thread_id
             
             # Send message
-            sent_message = service.users().messages().send(
+            sent_message = _execute(service.users().messages().send(
                 userId="me",
                 body=request_body,
-            ).execute()
+            ), "messages.send")
             
             return {
                 "id": sent_message.get("id"),
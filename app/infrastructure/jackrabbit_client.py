@@ -1,13 +1,18 @@
-"""Jackrabbit class openings API client with TTL cache."""
+"""Jackrabbit API client: class openings (with TTL cache) and family export."""
 
+import asyncio
 import logging
+import math
 import time
 
 import httpx
 
+from app.core.metrics import httpx_event_hooks, record_cache
+
 logger = logging.getLogger(__name__)
 
 JACKRABBIT_OPENINGS_URL = "https://app.jackrabbitclass.com/jr3.0/Openings/OpeningsJson"
+JACKRABBIT_FAMILIES_URL = "https://app.jackrabbitclass.com/jr3.0/families"
 
 _DAY_LABELS = {"mon": "Mon", "tue": "Tue", "wed": "Wed", "thu": "Thu", "fri": "Fri", "sat": "Sat", "sun": "Sun"}
 
@@ -58,10 +63,12 @@ async def fetch_classes(org_id: str) -> list[dict]:
     now = time.time()
     cached = _cache.get(org_id)
     if cached and (now - cached[0]) < _CACHE_TTL_SECONDS:
+        record_cache("jackrabbit_classes", hit=True)
         return cached[1]
+    record_cache("jackrabbit_classes", hit=False)
 
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
+        async with httpx.AsyncClient(timeout=15.0, event_hooks=httpx_event_hooks("jackrabbit")) as client:
             resp = await client.get(JACKRABBIT_OPENINGS_URL, params={"OrgID": org_id})
             resp.raise_for_status()
             raw = resp.json()
@@ -96,6 +103,87 @@ async def fetch_classes(org_id: str) -> list[dict]:
         return []
 
 
+def _family_rows(data) -> list[dict]:
+    if isinstance(data, list):
+        return data
+    return data.get("families", data.get("rows", []))
+
+
+async def fetch_families(
+    api_key_1: str,
+    api_key_2: str,
+    page_size: int = 500,
+    concurrency: int = 4,
+    max_rows: int | None = None,
+) -> list[dict]:
+    """Fetch family records from the Jackrabbit Families API.
+
+    The first page reports the total (jqGrid-style "total" pages or
+    "records" rows); the remaining pages are then fetched concurrently,
+    at most `concurrency` at a time. Without a total, pages are read one
+    by one until a short page.
+
+    Args:
+        api_key_1: Jackrabbit API Key 1
+        api_key_2: Jackrabbit API Key 2
+        page_size: Rows per request
+        concurrency: Max requests in flight
+        max_rows: Stop after this many families
+
+    Returns:
+        Raw family records in page order
+
+    Raises:
+        httpx.HTTPError: If a page request fails
+    """
+    if max_rows is not None:
+        page_size = min(page_size, max_rows)
+    headers = {"Authorization": f"Basic {api_key_1}:{api_key_2}"}
+
+    async with httpx.AsyncClient(
+        timeout=30.0, headers=headers, event_hooks=httpx_event_hooks("jackrabbit")
+    ) as client:
+
+        async def get_page(page: int):
+            resp = await client.get(JACKRABBIT_FAMILIES_URL, params={"rows": page_size, "page": page})
+            resp.raise_for_status()
+            return resp.json()
+
+        first = await get_page(1)
+        families = _family_rows(first)
+
+        total_pages = None
+        if isinstance(first, dict):
+            if isinstance(first.get("total"), int):
+                total_pages = first["total"]
+            elif isinstance(first.get("records"), int):
+                total_pages = math.ceil(first["records"] / page_size)
+        if max_rows is not None:
+            max_pages = math.ceil(max_rows / page_size)
+            total_pages = min(total_pages or max_pages, max_pages)
+
+        if total_pages is not None:
+            semaphore = asyncio.Semaphore(max(1, concurrency))
+
+            async def bounded(page: int) -> list[dict]:
+                async with semaphore:
+                    return _family_rows(await get_page(page))
+
+            for rows in await asyncio.gather(*(bounded(p) for p in range(2, total_pages + 1))):
+                families.extend(rows)
+        else:
+            page, rows = 1, families
+            while len(rows) >= page_size:
+                page += 1
+                rows = _family_rows(await get_page(page))
+                families.extend(rows)
+
+    if max_rows is not None:
+        families = families[:max_rows]
+    logger.info(f"Fetched {len(families)} families from Jackrabbit")
+    return families
+
+
 def format_classes_for_voice(classes: list[dict]) -> str:
     """Build a plain-text, TTS-ready spoken summary of available classes.
 
@@ -0,0 +1,237 @@
+"""Outbox dispatcher for admin notification deliveries.
+
+NotificationService.notify_admins writes NotificationDelivery rows in the
+same transaction as the in-app notifications and hands their IDs to
+notification_dispatcher.schedule(), which sends them in a background task
+on its own session. Sends run concurrently, bounded per channel; results
+(sent / retry with backoff / failed / skipped) are written back to the
+rows. The /workers/dispatch-notifications sweep retries due deliveries
+and recovers ones orphaned by a crashed instance.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import QUEUE_DEPTH
+from app.persistence.models.notification import DeliveryStatus, NotificationDelivery
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 30
+# A delivery left in "sending" this long belongs to a dead process
+STALE_SENDING_AFTER = timedelta(minutes=10)
+SWEEP_BATCH_SIZE = 100
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the given number of failed attempts."""
+    return timedelta(seconds=RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)))
+
+
+class NotificationDispatcher:
+    """Sends outbox deliveries with per-channel concurrency limits."""
+
+    def __init__(self) -> None:
+        self._semaphores: dict[tuple[int, str], asyncio.Semaphore] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def _semaphore(self, channel: str) -> asyncio.Semaphore:
+        # Semaphores bind to the running loop, so keep one per loop
+        key = (id(asyncio.get_running_loop()), channel)
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            limit = (
+                settings.notification_sms_concurrency
+                if channel == "sms"
+                else settings.notification_email_concurrency
+            )
+            semaphore = asyncio.Semaphore(max(1, limit))
+            self._semaphores[key] = semaphore
+        return semaphore
+
+    def schedule(self, delivery_ids: list[int]) -> None:
+        """Dispatch deliveries in the background on a dedicated session."""
+        if not delivery_ids:
+            return
+        task = asyncio.create_task(self._dispatch_in_new_session(list(delivery_ids)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch_in_new_session(self, delivery_ids: list[int]) -> None:
+        from app.persistence.database import async_session_factory
+
+        try:
+            async with async_session_factory() as session:
+                await self.dispatch(session, delivery_ids=delivery_ids)
+        except Exception as e:
+            # Rows stay pending/sending and are picked up by the sweep
+            logger.error(f"Notification dispatch failed for {delivery_ids}: {e}", exc_info=True)
+
+    async def dispatch(
+        self,
+        session: AsyncSession,
+        delivery_ids: list[int] | None = None,
+        limit: int = SWEEP_BATCH_SIZE,
+    ) -> dict[str, int]:
+        """Claim and send deliveries.
+
+        Args:
+            session: Database session (used for claim and write-back only)
+            delivery_ids: Specific deliveries to send; None sweeps all due ones
+            limit: Max deliveries claimed per call
+
+        Returns:
+            Count of deliveries per resulting status
+        """
+        from app.infrastructure.notifications import NotificationService
+
+        deliveries = await self._claim(session, delivery_ids, limit)
+        counts = {
+            DeliveryStatus.SENT: 0,
+            DeliveryStatus.PENDING: 0,
+            DeliveryStatus.FAILED: 0,
+            DeliveryStatus.SKIPPED: 0,
+        }
+        if not deliveries:
+            return counts
+
+        service = NotificationService(session)
+
+        # Resolve SMS routes up front (DB reads on this session), so the
+        # concurrent sends below never share the session
+        sms_routes: dict[int, dict[str, Any]] = {}
+        for tenant_id in {d.tenant_id for d in deliveries if d.channel == "sms"}:
+            try:
+                sms_routes[tenant_id] = await service._resolve_admin_sms_route(tenant_id)
+            except Exception as e:
+                logger.error(f"Failed to resolve SMS route for tenant {tenant_id}: {e}", exc_info=True)
+                sms_routes[tenant_id] = {"status": "error", "error": str(e)}
+
+        results = await asyncio.gather(
+            *(self._deliver(service, d, sms_routes) for d in deliveries)
+        )
+
+        now = datetime.utcnow()
+        for delivery, result in zip(deliveries, results):
+            self._record_result(delivery, result, now)
+            counts[delivery.status] = counts.get(delivery.status, 0) + 1
+        await session.commit()
+
+        logger.info(f"Notification dispatch: {counts}")
+        return counts
+
+    async def _claim(
+        self,
+        session: AsyncSession,
+        delivery_ids: list[int] | None,
+        limit: int,
+    ) -> list[NotificationDelivery]:
+        """Mark due deliveries as sending so no other dispatcher picks them up."""
+        now = datetime.utcnow()
+        stmt = (
+            select(NotificationDelivery)
+            .where(
+                or_(
+                    and_(
+                        NotificationDelivery.status == DeliveryStatus.PENDING,
+                        NotificationDelivery.next_attempt_at <= now,
+                    ),
+                    and_(
+                        NotificationDelivery.status == DeliveryStatus.SENDING,
+                        NotificationDelivery.updated_at < now - STALE_SENDING_AFTER,
+                    ),
+                )
+            )
+            .order_by(NotificationDelivery.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if delivery_ids is not None:
+            stmt = stmt.where(NotificationDelivery.id.in_(delivery_ids))
+
+        result = await session.execute(stmt)
+        deliveries = list(result.scalars().all())
+        for delivery in deliveries:
+            delivery.status = DeliveryStatus.SENDING
+            delivery.attempts += 1
+            delivery.updated_at = now
+        await session.commit()
+        return deliveries
+
+    async def _deliver(
+        self,
+        service: Any,
+        delivery: NotificationDelivery,
+        sms_routes: dict[int, dict[str, Any]],
+    ) -> dict[str, Any]:
+        async with self._semaphore(delivery.channel):
+            try:
+                if delivery.channel == "email":
+                    sent = await service._send_email(
+                        to=delivery.recipient,
+                        subject=delivery.subject,
+                        body=delivery.body,
+                        metadata=delivery.extra_data,
+                    )
+                    return {"status": "sent"} if sent else {"status": "error", "error": "Email send returned False"}
+
+                if delivery.channel == "sms":
+                    route = sms_routes.get(delivery.tenant_id) or {"status": "error"}
+                    if route["status"] != "ok":
+                        return route
+                    return await service._send_admin_sms(delivery.tenant_id, route, delivery.body)
+
+                return {"status": "not_configured", "note": f"Unknown channel {delivery.channel}"}
+            except Exception as e:
+                logger.error(f"Notification delivery {delivery.id} failed: {e}", exc_info=True)
+                return {"status": "error", "error": str(e)}
+
+    def _record_result(
+        self,
+        delivery: NotificationDelivery,
+        result: dict[str, Any],
+        now: datetime,
+    ) -> None:
+        status = result.get("status")
+        delivery.updated_at = now
+        if status == "sent":
+            delivery.status = DeliveryStatus.SENT
+            delivery.sent_at = now
+            delivery.provider_message_id = result.get("message_id")
+            delivery.last_error = None
+            if result.get("to"):
+                delivery.recipient = result["to"]
+        elif status in ("no_phone", "not_configured"):
+            # Configuration problem, retrying won't help
+            delivery.status = DeliveryStatus.SKIPPED
+            delivery.last_error = result.get("note")
+        elif delivery.attempts >= MAX_ATTEMPTS:
+            delivery.status = DeliveryStatus.FAILED
+            delivery.last_error = result.get("error")
+        else:
+            delivery.status = DeliveryStatus.PENDING
+            delivery.next_attempt_at = now + retry_delay(delivery.attempts)
+            delivery.last_error = result.get("error")
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Wait briefly for in-flight dispatches (application shutdown).
+
+        Anything unfinished stays in the outbox for the next sweep.
+        """
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+
+
+# Global dispatcher instance
+notification_dispatcher = NotificationDispatcher()
+QUEUE_DEPTH.set_function(lambda: len(notification_dispatcher._tasks), "notification_dispatches")
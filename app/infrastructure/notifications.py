@@ -7,7 +7,15 @@ from typing import Any
 from sqlalchemy import String, cast, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.persistence.models.notification import Notification, NotificationPriority, NotificationType
+from app.infrastructure.notification_dispatcher import notification_dispatcher
+from app.persistence.database import async_session_factory
+from app.persistence.models.notification import (
+    DeliveryStatus,
+    Notification,
+    NotificationDelivery,
+    NotificationPriority,
+    NotificationType,
+)
 from app.persistence.models.tenant import User
 from app.persistence.repositories.user_repository import UserRepository
 from app.settings import settings
@@ -78,78 +86,104 @@ class NotificationService:
             logger.warning(f"No admins found for tenant {tenant_id}")
             return {"status": "no_admins", "notifications": []}
 
-        notification_results = []
-        
+        # Everything is written in one transaction on a dedicated session, so
+        # the caller's transaction is neither committed nor rolled back here;
+        # email/SMS go through the delivery outbox so the caller doesn't wait
+        # on providers.
+        in_app: dict[int, Notification] = {}
+        email_deliveries: dict[int, NotificationDelivery] = {}
+        sms_delivery: NotificationDelivery | None = None
+
         for admin in admins:
-            admin_notifications = {}
-            
-            # Create in-app notification
             if "in_app" in methods:
-                try:
-                    in_app_result = await self._create_in_app_notification(
-                        tenant_id=tenant_id,
-                        user_id=admin.id,
-                        title=subject,
-                        message=message,
-                        notification_type=notification_type,
-                        priority=priority,
-                        extra_data=metadata,
-                        action_url=action_url,
-                    )
-                    admin_notifications["in_app"] = {
-                        "status": "created" if in_app_result else "failed",
-                        "notification_id": in_app_result.id if in_app_result else None,
-                    }
-                except Exception as e:
-                    logger.error(f"Failed to create in-app notification for user {admin.id}: {e}", exc_info=True)
-                    admin_notifications["in_app"] = {
-                        "status": "error",
-                        "error": str(e),
-                    }
-            
-            # Send email notification
+                notification = Notification(
+                    tenant_id=tenant_id,
+                    user_id=admin.id,
+                    notification_type=notification_type,
+                    title=subject,
+                    message=message,
+                    extra_data=metadata,
+                    priority=priority,
+                    action_url=action_url,
+                    is_read=False,
+                )
+                in_app[admin.id] = notification
+
             if "email" in methods and admin.email:
-                try:
-                    email_result = await self._send_email(
-                        to=admin.email,
-                        subject=subject,
-                        body=message,
-                        metadata=metadata,
-                    )
-                    admin_notifications["email"] = {
-                        "status": "sent" if email_result else "failed",
-                        "address": admin.email,
-                    }
-                except Exception as e:
-                    logger.error(f"Failed to send email to {admin.email}: {e}", exc_info=True)
-                    admin_notifications["email"] = {
-                        "status": "error",
-                        "address": admin.email,
-                        "error": str(e),
-                    }
-            
-            # Send SMS notification
-            if "sms" in methods:
-                try:
-                    sms_result = await self._send_sms_notification(
-                        tenant_id=tenant_id,
-                        user_id=admin.id,
-                        message=f"{subject}: {message[:140]}",  # Truncate for SMS
-                    )
-                    admin_notifications["sms"] = sms_result
-                except Exception as e:
-                    logger.error(f"Failed to send SMS to admin {admin.id}: {e}", exc_info=True)
-                    admin_notifications["sms"] = {
-                        "status": "error",
-                        "error": str(e),
-                    }
-            
+                delivery = NotificationDelivery(
+                    tenant_id=tenant_id,
+                    user_id=admin.id,
+                    channel="email",
+                    notification_type=notification_type,
+                    recipient=admin.email,
+                    subject=subject,
+                    body=message,
+                    extra_data=metadata,
+                    status=DeliveryStatus.PENDING,
+                )
+                email_deliveries[admin.id] = delivery
+
+        # SMS goes to the tenant's business/alert phone, so one delivery
+        # per event regardless of how many admins there are
+        if "sms" in methods:
+            sms_delivery = NotificationDelivery(
+                tenant_id=tenant_id,
+                channel="sms",
+                notification_type=notification_type,
+                subject=subject,
+                body=f"{subject}: {message[:140]}",  # Truncate for SMS
+                extra_data=metadata,
+                status=DeliveryStatus.PENDING,
+            )
+
+        deliveries = list(email_deliveries.values())
+        if sms_delivery is not None:
+            deliveries.append(sms_delivery)
+        async with async_session_factory() as write_session:
+            write_session.info["rls"] = self.session.info.get("rls")
+            for notification in in_app.values():
+                write_session.add(notification)
+            if deliveries:
+                write_session.add_all(deliveries)
+            try:
+                await write_session.commit()
+            except Exception as e:
+                logger.error(f"Failed to write notifications for tenant {tenant_id}: {e}", exc_info=True)
+                await write_session.rollback()
+                return {"status": "error", "error": str(e), "notifications": []}
+
+        delivery_ids = [d.id for d in deliveries]
+        notification_dispatcher.schedule(delivery_ids)
+
+        notification_results = []
+        for admin in admins:
+            admin_notifications = {}
+            if admin.id in in_app:
+                admin_notifications["in_app"] = {
+                    "status": "created",
+                    "notification_id": in_app[admin.id].id,
+                }
+            if admin.id in email_deliveries:
+                admin_notifications["email"] = {
+                    "status": DeliveryStatus.PENDING,
+                    "address": admin.email,
+                    "delivery_id": email_deliveries[admin.id].id,
+                }
+            if sms_delivery is not None:
+                admin_notifications["sms"] = {
+                    "status": DeliveryStatus.PENDING,
+                    "delivery_id": sms_delivery.id,
+                }
             notification_results.append({
                 "admin_id": admin.id,
                 "admin_email": admin.email,
                 "notifications": admin_notifications,
             })
-        
+
+        logger.info(
+            f"Queued notifications for tenant {tenant_id}: {len(in_app)} in-app, "
+            f"{len(delivery_ids)} deliveries"
+        )
         return {
             "status": "sent",
             "notifications": notification_results,
@@ -931,51 +965,6 @@ class NotificationService:
             action_url=f"/inbox?conversation={conversation_id}",
         )
 
-    async def _create_in_app_notification(
-        self,
-        tenant_id: int,
-        user_id: int,
-        title: str,
-        message: str,
-        notification_type: str = NotificationType.SYSTEM,
-        priority: str = NotificationPriority.NORMAL,
-        extra_data: dict[str, Any] | None = None,
-        action_url: str | None = None,
-    ) -> Notification:
-        """Create an in-app notification.
-        
-        Args:
-            tenant_id: Tenant ID
-            user_id: User ID to notify
-            title: Notification title
-            message: Notification message
-            notification_type: Type of notification
-            priority: Priority level
-            extra_data: Additional data for the notification
-            action_url: Optional deep link URL
-            
-        Returns:
-            Created Notification
-        """
-        notification = Notification(
-            tenant_id=tenant_id,
-            user_id=user_id,
-            notification_type=notification_type,
-            title=title,
-            message=message,
-            extra_data=extra_data,
-            priority=priority,
-            action_url=action_url,
-            is_read=False,
-        )
-        
-        self.session.add(notification)
-        await self.session.commit()
-        await self.session.refresh(notification)
-        
-        logger.info(f"Created in-app notification {notification.id} for user {user_id}")
-        return notification
-
     async def _send_email(
         self,
         to: str,
@@ -1009,28 +998,15 @@ class NotificationService:
         
         return True
 
-    async def _send_sms_notification(
-        self,
-        tenant_id: int,
-        user_id: int,
-        message: str,
-    ) -> dict[str, Any]:
-        """Send SMS notification to the business owner.
-
-        Uses the tenant's business profile phone number as the destination
-        and Telnyx SMS provider to send the notification.
-
-        Args:
-            tenant_id: Tenant ID
-            user_id: User ID to notify (used for logging)
-            message: SMS message (will be truncated to 160 chars)
+    async def _resolve_admin_sms_route(self, tenant_id: int) -> dict[str, Any]:
+        """Resolve where and how to send admin SMS notifications for a tenant.
 
         Returns:
-            Result dictionary with status and details
+            {"status": "ok", "to", "from", "provider"} when sendable, otherwise
+            a result dictionary with the reason (no_phone / not_configured)
         """
-        from app.persistence.models.tenant_sms_config import TenantSmsConfig
+        from app.infrastructure.telephony.factory import TelephonyProviderFactory
         from app.persistence.models.tenant import TenantBusinessProfile
-        from app.infrastructure.telephony.telnyx_provider import TelnyxSmsProvider
 
         # Get tenant's business profile to get the destination phone number
         stmt = select(TenantBusinessProfile).where(TenantBusinessProfile.tenant_id == tenant_id)
@@ -1045,9 +1021,8 @@ class NotificationService:
             }
 
         # Get tenant SMS config for Telnyx credentials
-        stmt = select(TenantSmsConfig).where(TenantSmsConfig.tenant_id == tenant_id)
-        result = await self.session.execute(stmt)
-        sms_config = result.scalar_one_or_none()
+        factory = TelephonyProviderFactory(self.session)
+        sms_config = await factory.get_config(tenant_id)
 
         if not sms_config:
             logger.warning(f"No SMS config for tenant {tenant_id}, cannot send SMS notification")
@@ -1056,12 +1031,11 @@ class NotificationService:
                 "note": "Tenant SMS not configured",
             }
 
-        # Determine the sender phone number and API key (prefer Telnyx)
+        # Determine the sender phone number (prefer Telnyx)
         from_number = sms_config.telnyx_phone_number
-        api_key = sms_config.telnyx_api_key
-        messaging_profile_id = sms_config.telnyx_messaging_profile_id
+        provider = await factory.get_sms_provider(tenant_id, require_enabled=False)
 
-        if not from_number or not api_key:
+        if not from_number or not provider:
             logger.warning(f"No Telnyx config for tenant {tenant_id}, cannot send SMS notification")
             return {
                 "status": "not_configured",
@@ -1084,16 +1058,28 @@ class NotificationService:
             # Assume US number if no country code
             to_number = f"+1{to_number.replace('-', '').replace(' ', '').replace('(', '').replace(')', '')}"
 
-        # Send SMS via Telnyx
-        try:
-            telnyx_provider = TelnyxSmsProvider(
-                api_key=api_key,
-                messaging_profile_id=messaging_profile_id,
-            )
+        return {
+            "status": "ok",
+            "to": to_number,
+            "from": from_number,
+            "provider": provider,
+        }
 
-            sms_result = await telnyx_provider.send_sms(
+    async def _send_admin_sms(
+        self,
+        tenant_id: int,
+        route: dict[str, Any],
+        message: str,
+    ) -> dict[str, Any]:
+        """Send an admin SMS over a route from _resolve_admin_sms_route.
+
+        Does not touch the database, so several sends can run concurrently.
+        """
+        to_number = route["to"]
+        try:
+            sms_result = await route["provider"].send_sms(
                 to=to_number,
-                from_=from_number,
+                from_=route["from"],
                 body=message[:160],  # SMS character limit
             )
 
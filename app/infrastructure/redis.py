@@ -18,6 +18,13 @@ class RedisClient:
         """Initialize Redis client."""
         self._client: aioredis.Redis | None = None
         self._enabled: bool = settings.redis_enabled
+        # Registered Lua scripts keyed by source (EVALSHA with EVAL fallback)
+        self._scripts: dict[str, Any] = {}
+
+    @property
+    def is_available(self) -> bool:
+        """Check if Redis is enabled and connected."""
+        return self._enabled and self._client is not None
 
     async def connect(self) -> None:
         """Connect to Redis."""
@@ -41,6 +48,7 @@ class RedisClient:
         if self._client:
             await self._client.close()
             self._client = None
+            self._scripts.clear()
 
     async def get(self, key: str) -> str | None:
         """Get value from Redis.
@@ -111,6 +119,47 @@ class RedisClient:
             logger.warning(f"Redis setnx failed: {e}")
             return True  # On error, let caller proceed (DB fallback should catch it)
 
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        """Get several values from Redis in one round trip.
+
+        Args:
+            keys: Redis keys
+
+        Returns:
+            Values in key order (None for missing keys, or all None if disabled)
+        """
+        if not keys:
+            return []
+        if not self._enabled or self._client is None:
+            return [None] * len(keys)
+        try:
+            return await self._client.mget(keys)
+        except Exception as e:
+            logger.warning(f"Redis mget failed: {e}. Disabling Redis.")
+            self._enabled = False
+            return [None] * len(keys)
+
+    async def set_many(
+        self, mapping: dict[str, str], ttl: int | None = None, nx: bool = False
+    ) -> None:
+        """Set several values in one pipelined round trip.
+
+        Args:
+            mapping: Key -> value
+            ttl: Optional time-to-live in seconds
+            nx: Only set keys that do not already exist
+        """
+        if not mapping or not self._enabled or self._client is None:
+            return
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, value, ex=ttl, nx=nx)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Redis set_many failed: {e}. Disabling Redis.")
+            self._enabled = False
+
     async def delete(self, key: str) -> int:
         """Delete key from Redis.
 
@@ -147,6 +196,58 @@ class RedisClient:
             self._enabled = False
             return False
 
+    async def run_script(
+        self, script: str, keys: list[str], args: list[Any]
+    ) -> Any:
+        """Run a Lua script atomically.
+
+        Unlike the other helpers, errors are raised rather than swallowed so
+        callers can fall back to their own non-Redis path.
+
+        Args:
+            script: Lua source (registered once, then invoked via EVALSHA)
+            keys: Redis keys the script touches
+            args: Script arguments
+
+        Returns:
+            Raw script result, or None if Redis is disabled
+        """
+        if not self.is_available:
+            return None
+        registered = self._scripts.get(script)
+        if registered is None:
+            registered = self._client.register_script(script)
+            self._scripts[script] = registered
+        return await registered(keys=keys, args=args)
+
+    async def publish(self, channel: str, message: str) -> int:
+        """Publish a message on a pub/sub channel.
+
+        Args:
+            channel: Channel name
+            message: Message payload
+
+        Returns:
+            Number of subscribers that received the message
+        """
+        if not self.is_available:
+            return 0
+        try:
+            return await self._client.publish(channel, message)
+        except Exception as e:
+            logger.warning(f"Redis publish failed: {e}")
+            return 0
+
+    def pubsub(self) -> Any:
+        """Create a pub/sub handle on the shared connection pool.
+
+        Returns:
+            redis.asyncio PubSub instance, or None if Redis is disabled
+        """
+        if not self.is_available:
+            return None
+        return self._client.pubsub(ignore_subscribe_messages=True)
+
     async def get_json(self, key: str) -> dict[str, Any] | None:
         """Get JSON value from Redis.
 
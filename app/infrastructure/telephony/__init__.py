@@ -6,7 +6,10 @@ from app.infrastructure.telephony.base import (
     SmsResult,
     PhoneNumberResult,
 )
-from app.infrastructure.telephony.factory import TelephonyProviderFactory
+from app.infrastructure.telephony.factory import (
+    TelephonyProviderFactory,
+    invalidate_telephony_config,
+)
 
 __all__ = [
     "SmsProviderProtocol",
@@ -14,4 +17,5 @@ __all__ = [
     "SmsResult",
     "PhoneNumberResult",
     "TelephonyProviderFactory",
+    "invalidate_telephony_config",
 ]
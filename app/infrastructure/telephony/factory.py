@@ -1,20 +1,104 @@
 """Telephony provider factory."""
 
+import asyncio
+import copy
 import logging
+import time
 from typing import TYPE_CHECKING
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
+from app.core.metrics import record_cache
 from app.infrastructure.telephony.base import SmsProviderProtocol, VoiceProviderProtocol
 from app.infrastructure.telephony.telnyx_provider import TelnyxSmsProvider, TelnyxVoiceProvider
 from app.persistence.models.tenant_sms_config import TenantSmsConfig
+from app.settings import settings
 
 if TYPE_CHECKING:
     pass
 
 logger = logging.getLogger(__name__)
 
+# Process-wide caches shared by every factory instance (factories are created
+# per session/request). Configs are stored as detached snapshots so they can
+# outlive the session that loaded them, and providers are kept warm so their
+# HTTP connection pools survive between sends. Entries expire after
+# telephony_config_cache_ttl_seconds so changes made on other instances are
+# picked up; local config writes call invalidate_telephony_config().
+# {tenant_id: (expires_at, config snapshot or None)}
+_config_cache: dict[int, tuple[float, TenantSmsConfig | None]] = {}
+# {tenant_id: (credential fingerprint, provider)}
+_sms_provider_cache: dict[int, tuple[tuple, TelnyxSmsProvider]] = {}
+_voice_provider_cache: dict[int, tuple[tuple, TelnyxVoiceProvider]] = {}
+# Closes of evicted providers' pooled clients still in flight
+_closing: set[asyncio.Task] = set()
+
+
+def _detached_snapshot(config: TenantSmsConfig) -> TenantSmsConfig:
+    """Copy a loaded config into a detached instance that no session owns."""
+    values = {
+        attr.key: copy.deepcopy(getattr(config, attr.key))
+        for attr in TenantSmsConfig.__mapper__.column_attrs
+    }
+    snapshot = TenantSmsConfig(**values)
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+def _close_evicted(providers: list) -> None:
+    """Close the pooled HTTP clients of providers dropped from the cache.
+
+    Runs in the background on the current loop. Without a running loop the
+    clients belong to a loop that is gone, so there is nothing to release.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    for provider in providers:
+        task = loop.create_task(provider.aclose())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+
+
+def invalidate_telephony_config(tenant_id: int | None = None) -> None:
+    """Drop cached config for a tenant (or all tenants) after a config change.
+
+    Warm providers are dropped too so new credentials take effect on the next
+    send, and their pooled clients are closed.
+
+    Args:
+        tenant_id: Tenant whose config changed, or None to clear everything
+    """
+    if tenant_id is None:
+        evicted = [p for _, p in _sms_provider_cache.values()]
+        evicted += [p for _, p in _voice_provider_cache.values()]
+        _config_cache.clear()
+        _sms_provider_cache.clear()
+        _voice_provider_cache.clear()
+    else:
+        _config_cache.pop(tenant_id, None)
+        evicted = [
+            entry[1]
+            for entry in (_sms_provider_cache.pop(tenant_id, None), _voice_provider_cache.pop(tenant_id, None))
+            if entry is not None
+        ]
+    _close_evicted(evicted)
+
+
+async def close_cached_providers() -> None:
+    """Close pooled HTTP clients of all warm providers (application shutdown)."""
+    providers = [p for _, p in _sms_provider_cache.values()]
+    providers += [p for _, p in _voice_provider_cache.values()]
+    _sms_provider_cache.clear()
+    _voice_provider_cache.clear()
+    for provider in providers:
+        await provider.aclose()
+    if _closing:
+        await asyncio.gather(*_closing, return_exceptions=True)
+
 
 class TelephonyProviderFactory:
     """Factory for creating telephony provider instances based on tenant configuration."""
@@ -26,28 +110,50 @@ class TelephonyProviderFactory:
             session: Database session for fetching tenant config
         """
         self.session = session
-        self._config_cache: dict[int, TenantSmsConfig | None] = {}
 
-    async def get_sms_provider(self, tenant_id: int) -> SmsProviderProtocol | None:
+    async def get_sms_provider(
+        self,
+        tenant_id: int,
+        require_enabled: bool = True,
+    ) -> SmsProviderProtocol | None:
         """Get SMS provider for tenant.
 
+        Returns a warm, pooled provider shared across requests while the
+        tenant's credentials are unchanged.
+
         Args:
             tenant_id: Tenant ID
+            require_enabled: Return None when the tenant has SMS disabled.
+                Transactional sends promised during voice calls pass False.
 
         Returns:
             SMS provider instance or None if not configured/enabled
         """
         config = await self._get_config(tenant_id)
-        if not config or not config.is_enabled:
+        if not config or (require_enabled and not config.is_enabled):
             return None
 
         if not config.telnyx_api_key:
             logger.warning(f"Tenant {tenant_id} has no Telnyx API key configured")
             return None
-        return TelnyxSmsProvider(
+
+        fingerprint = (config.telnyx_api_key, config.telnyx_messaging_profile_id)
+        cached = _sms_provider_cache.get(tenant_id)
+        hit = bool(cached and cached[0] == fingerprint)
+        record_cache("telephony_sms_provider", hit)
+        if hit:
+            return cached[1]
+
+        if cached:
+            # Credentials changed on another instance
+            _close_evicted([cached[1]])
+        provider = TelnyxSmsProvider(
             api_key=config.telnyx_api_key,
             messaging_profile_id=config.telnyx_messaging_profile_id,
+            pooled=True,
         )
+        _sms_provider_cache[tenant_id] = (fingerprint, provider)
+        return provider
 
     async def get_voice_provider(self, tenant_id: int) -> VoiceProviderProtocol | None:
         """Get Voice provider for tenant.
@@ -65,10 +171,23 @@ class TelephonyProviderFactory:
         if not config.telnyx_api_key:
             logger.warning(f"Tenant {tenant_id} has no Telnyx API key configured")
             return None
-        return TelnyxVoiceProvider(
+
+        fingerprint = (config.telnyx_api_key, config.telnyx_connection_id)
+        cached = _voice_provider_cache.get(tenant_id)
+        hit = bool(cached and cached[0] == fingerprint)
+        record_cache("telephony_voice_provider", hit)
+        if hit:
+            return cached[1]
+
+        if cached:
+            _close_evicted([cached[1]])
+        provider = TelnyxVoiceProvider(
             api_key=config.telnyx_api_key,
             connection_id=config.telnyx_connection_id,
+            pooled=True,
         )
+        _voice_provider_cache[tenant_id] = (fingerprint, provider)
+        return provider
 
     async def get_config(self, tenant_id: int) -> TenantSmsConfig | None:
         """Get telephony config for tenant (public method).
@@ -84,6 +203,10 @@ class TelephonyProviderFactory:
     async def _get_config(self, tenant_id: int) -> TenantSmsConfig | None:
         """Fetch telephony config from database (with caching).
 
+        The returned config is a read-only detached snapshot when served from
+        cache - routes that modify config must select it through their own
+        session and call invalidate_telephony_config() after committing.
+
         Args:
             tenant_id: Tenant ID
 
@@ -91,16 +214,21 @@ class TelephonyProviderFactory:
             Tenant telephony config or None if not found
         """
         # Check cache first
-        if tenant_id in self._config_cache:
-            return self._config_cache[tenant_id]
+        now = time.monotonic()
+        cached = _config_cache.get(tenant_id)
+        hit = bool(cached and cached[0] > now)
+        record_cache("telephony_config", hit)
+        if hit:
+            return cached[1]
 
         stmt = select(TenantSmsConfig).where(TenantSmsConfig.tenant_id == tenant_id)
         result = await self.session.execute(stmt)
         config = result.scalar_one_or_none()
 
         # Cache the result
-        self._config_cache[tenant_id] = config
-        return config
+        snapshot = _detached_snapshot(config) if config else None
+        _config_cache[tenant_id] = (now + settings.telephony_config_cache_ttl_seconds, snapshot)
+        return snapshot
 
     def get_sms_phone_number(self, config: TenantSmsConfig) -> str | None:
         """Get SMS phone number based on provider.
@@ -141,10 +269,7 @@ class TelephonyProviderFactory:
         Args:
             tenant_id: Specific tenant to clear, or None to clear all
         """
-        if tenant_id is not None:
-            self._config_cache.pop(tenant_id, None)
-        else:
-            self._config_cache.clear()
+        invalidate_telephony_config(tenant_id)
 
 
 async def get_tenant_by_phone_number(
@@ -1,10 +1,13 @@
 """Telnyx telephony provider implementation."""
 
+import asyncio
 import logging
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 import httpx
 
+from app.core.metrics import httpx_event_hooks
 from app.infrastructure.telephony.base import (
     SmsProviderProtocol,
     VoiceProviderProtocol,
@@ -17,33 +20,77 @@ logger = logging.getLogger(__name__)
 TELNYX_API_BASE = "https://api.telnyx.com/v2"
 
 
-class TelnyxSmsProvider(SmsProviderProtocol):
+class _TelnyxHttpClientMixin:
+    """HTTP client handling shared by the Telnyx SMS and Voice providers.
+
+    By default every call opens (and closes) its own client. Pooled providers
+    - the warm instances held by TelephonyProviderFactory - keep one client
+    open so consecutive sends reuse the same TCP/TLS connections.
+    """
+
+    api_key: str
+    pooled: bool = False
+    _client: httpx.AsyncClient | None = None
+    _client_loop: asyncio.AbstractEventLoop | None = None
+
+    def _new_client(self) -> httpx.AsyncClient:
+        """Create HTTP client with auth headers."""
+        return httpx.AsyncClient(
+            base_url=TELNYX_API_BASE,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+            },
+            timeout=30.0,
+            event_hooks=httpx_event_hooks("telnyx"),
+        )
+
+    @asynccontextmanager
+    async def _get_client(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield an HTTP client for one API call."""
+        if not self.pooled:
+            async with self._new_client() as client:
+                yield client
+            return
+
+        # A client is bound to the loop that created it; rebuild if that changed
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = self._new_client()
+            self._client_loop = loop
+        yield self._client
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client, if one is open."""
+        if self._client is not None and not self._client.is_closed:
+            try:
+                await self._client.aclose()
+            except RuntimeError:
+                # Loop that owned the client is gone; nothing left to release
+                pass
+        self._client = None
+        self._client_loop = None
+
+
+class TelnyxSmsProvider(_TelnyxHttpClientMixin, SmsProviderProtocol):
     """Telnyx SMS provider implementation."""
 
     def __init__(
         self,
         api_key: str,
         messaging_profile_id: str | None = None,
+        pooled: bool = False,
     ) -> None:
         """Initialize Telnyx SMS client.
 
         Args:
             api_key: Telnyx API v2 key
             messaging_profile_id: Telnyx messaging profile ID (required for SMS)
+            pooled: Keep one HTTP client open across calls (caller must aclose())
         """
         self.api_key = api_key
         self.messaging_profile_id = messaging_profile_id
-
-    def _get_client(self) -> httpx.AsyncClient:
-        """Create HTTP client with auth headers."""
-        return httpx.AsyncClient(
-            base_url=TELNYX_API_BASE,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
-            timeout=30.0,
-        )
+        self.pooled = pooled
 
     async def send_sms(
         self,
@@ -79,8 +126,6 @@ class TelnyxSmsProvider(SmsProviderProtocol):
             f"Sending SMS via Telnyx: to={to}, from={from_}, body_len={len(body)}, profile={self.messaging_profile_id}"
         )
 
-        import asyncio
-
         max_retries = 3
         last_exc = None
         for attempt in range(max_retries):
@@ -208,6 +253,7 @@ class TelnyxAIService:
                 "Content-Type": "application/json",
             },
             timeout=30.0,
+            event_hooks=httpx_event_hooks("telnyx"),
         )
 
     async def find_conversation_by_call_control_id(
@@ -229,8 +275,8 @@ class TelnyxAIService:
                 response.raise_for_status()
                 data = response.json()
 
-                logger.info(f"[TELNYX-API] Searching for call_control_id: {call_control_id}")
-                logger.info(f"[TELNYX-API] Found {len(data.get('data', []))} conversations")
+                logger.debug(f"[TELNYX-API] Searching for call_control_id: {call_control_id}")
+                logger.debug(f"[TELNYX-API] Found {len(data.get('data', []))} conversations")
 
                 for conv in data.get("data", []):
                     # Check multiple places where call_control_id might be stored
@@ -260,8 +306,8 @@ class TelnyxAIService:
                 # Log first conversation's structure for debugging
                 if data.get("data"):
                     sample = data["data"][0]
-                    logger.info(f"[TELNYX-API] Sample conversation keys: {list(sample.keys())}")
-                    logger.info(f"[TELNYX-API] Sample metadata: {sample.get('metadata', {})}")
+                    logger.debug(f"[TELNYX-API] Sample conversation keys: {list(sample.keys())}")
+                    logger.debug(f"[TELNYX-API] Sample metadata: {sample.get('metadata', {})}")
                 return None
         except httpx.HTTPError as e:
             logger.warning(f"Failed to find conversation by call_control_id: {e}")
@@ -1016,7 +1062,7 @@ Return ONLY compact JSON (no extra whitespace or newlines):"""
             return self.extract_insights_from_transcript(messages)
 
 
-class TelnyxVoiceProvider(VoiceProviderProtocol):
+class TelnyxVoiceProvider(_TelnyxHttpClientMixin, VoiceProviderProtocol):
     """Telnyx Voice provider implementation using TeXML."""
 
     # Default voice for TeXML (Amazon Polly)
@@ -1026,26 +1072,18 @@ class TelnyxVoiceProvider(VoiceProviderProtocol):
         self,
         api_key: str,
         connection_id: str | None = None,
+        pooled: bool = False,
     ) -> None:
         """Initialize Telnyx Voice client.
 
         Args:
             api_key: Telnyx API v2 key
             connection_id: Telnyx connection ID (for voice)
+            pooled: Keep one HTTP client open across calls (caller must aclose())
         """
         self.api_key = api_key
         self.connection_id = connection_id
-
-    def _get_client(self) -> httpx.AsyncClient:
-        """Create HTTP client with auth headers."""
-        return httpx.AsyncClient(
-            base_url=TELNYX_API_BASE,
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            },
-            timeout=30.0,
-        )
+        self.pooled = pooled
 
     async def provision_phone_number(
         self,
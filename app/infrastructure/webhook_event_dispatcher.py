@@ -0,0 +1,360 @@
+"""Durable inbox and dispatcher for provider webhooks.
+
+Webhook routes call webhook_event_dispatcher.enqueue(), which stores the
+raw payload under the provider's idempotency key (a repeat of a stored
+event is ignored) and commits, so the provider is acked after a single
+INSERT. The event is then processed in a background task, on its own
+session, by the handler registered for its kind.
+
+Events that share an ordering_key (one call, one phone conversation) are
+processed one at a time, oldest first. A failed event is retried with
+backoff and holds back later events with its key until it succeeds or is
+dead-lettered after webhook_ingest_max_attempts. The
+/workers/dispatch-webhook-events sweep retries due events, recovers ones
+orphaned by a crashed instance and deletes processed events older than
+webhook_event_retention_days.
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.metrics import QUEUE_DEPTH, WEBHOOK_EVENT_LAG, WEBHOOK_EVENTS
+from app.persistence.models.webhook_event import WebhookEvent, WebhookEventStatus
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_SECONDS = 15
+SWEEP_BATCH_SIZE = 100
+PURGE_BATCH_SIZE = 1000
+
+Handler = Callable[[dict[str, Any], AsyncSession], Awaitable[Any]]
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the given number of failed attempts."""
+    return timedelta(seconds=RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)))
+
+
+def stale_processing_after() -> timedelta:
+    """Age at which an event left in "processing" belongs to a dead process.
+
+    Events are only claimed into a free handler slot and handlers time out,
+    so a live round finishes within one handler timeout; twice that leaves
+    room for the write-back.
+    """
+    return timedelta(seconds=2 * settings.webhook_event_handler_timeout_seconds)
+
+
+class WebhookEventDispatcher:
+    """Processes stored webhook events in per-key order with retries."""
+
+    def __init__(self) -> None:
+        self._handlers: dict[str, Handler] = {}
+        self._semaphores: dict[int, asyncio.Semaphore] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    def register(self, kind: str, handler: Handler) -> None:
+        """Set the handler for events of a kind.
+
+        The handler gets the raw payload and a fresh session, and should
+        raise on failure so the event is retried.
+        """
+        self._handlers[kind] = handler
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Semaphores bind to the running loop, so keep one per loop
+        key = id(asyncio.get_running_loop())
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, settings.webhook_ingest_concurrency))
+            self._semaphores[key] = semaphore
+        return semaphore
+
+    async def enqueue(
+        self,
+        session: AsyncSession,
+        kind: str,
+        payload: dict[str, Any],
+        idempotency_key: str,
+        ordering_key: str,
+        provider: str = "telnyx",
+    ) -> int | None:
+        """Store an event and schedule its processing.
+
+        Returns:
+            The event ID, or None if the event was already stored
+        """
+        now = datetime.utcnow()
+        stmt = (
+            pg_insert(WebhookEvent)
+            .values(
+                provider=provider,
+                kind=kind,
+                idempotency_key=idempotency_key,
+                ordering_key=ordering_key,
+                payload=payload,
+                status=WebhookEventStatus.PENDING,
+                attempts=0,
+                next_attempt_at=now,
+                created_at=now,
+                updated_at=now,
+            )
+            .on_conflict_do_nothing(index_elements=["provider", "idempotency_key"])
+            .returning(WebhookEvent.id)
+        )
+        event_id = (await session.execute(stmt)).scalar_one_or_none()
+        await session.commit()
+        if event_id is None:
+            WEBHOOK_EVENTS.inc(kind, "duplicate")
+            logger.info(f"Duplicate {kind} webhook ignored: {idempotency_key}")
+            return None
+        WEBHOOK_EVENTS.inc(kind, "queued")
+        self.schedule([ordering_key])
+        return event_id
+
+    def schedule(self, ordering_keys: list[str]) -> None:
+        """Process the given keys' due events in the background on a dedicated session."""
+        task = asyncio.create_task(self._dispatch_in_new_session(list(ordering_keys)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch_in_new_session(self, ordering_keys: list[str]) -> None:
+        from app.persistence.database import async_session_factory
+
+        try:
+            async with async_session_factory() as session:
+                await self.dispatch(session, ordering_keys=ordering_keys)
+        except Exception as e:
+            # Events stay pending/processing and are picked up by the sweep
+            logger.error(f"Webhook dispatch failed for {ordering_keys}: {e}", exc_info=True)
+
+    async def dispatch(
+        self,
+        session: AsyncSession,
+        ordering_keys: list[str] | None = None,
+        limit: int = SWEEP_BATCH_SIZE,
+    ) -> dict[str, int]:
+        """Claim and process events until none are due or limit is reached.
+
+        Each round waits for a free handler slot, then claims the oldest
+        unfinished event of as many ordering keys (if due) as there are
+        free slots and processes those concurrently. Claimed events never
+        wait for a slot, so they can't go stale while queued.
+
+        Args:
+            session: Database session (used for claim and write-back only)
+            ordering_keys: Only process these keys; None sweeps all
+            limit: Max events processed per call
+
+        Returns:
+            Count of events per resulting status
+        """
+        counts: Counter[str] = Counter()
+        processed = 0
+        semaphore = self._semaphore()
+        while processed < limit:
+            slots = await self._reserve_slots(semaphore, limit - processed)
+            try:
+                events = await self._claim(session, ordering_keys, slots)
+            except BaseException:
+                for _ in range(slots):
+                    semaphore.release()
+                raise
+            for _ in range(slots - len(events)):
+                semaphore.release()
+            if not events:
+                break
+            errors = await asyncio.gather(*(self._process(event) for event in events))
+            now = datetime.utcnow()
+            for event, error in zip(events, errors):
+                self._record_result(event, error, now)
+                counts[event.status] += 1
+            await session.commit()
+            processed += len(events)
+        return dict(counts)
+
+    async def _reserve_slots(self, semaphore: asyncio.Semaphore, wanted: int) -> int:
+        """Wait for one free handler slot, then take up to wanted free slots."""
+        await semaphore.acquire()
+        taken = 1
+        while taken < wanted and not semaphore.locked():
+            await semaphore.acquire()
+            taken += 1
+        return taken
+
+    async def _claim(
+        self,
+        session: AsyncSession,
+        ordering_keys: list[str] | None,
+        limit: int,
+    ) -> list[WebhookEvent]:
+        """Mark due head-of-key events as processing so no other dispatcher takes them."""
+        now = datetime.utcnow()
+        earlier = aliased(WebhookEvent)
+        has_earlier_unfinished = (
+            select(earlier.id)
+            .where(
+                earlier.ordering_key == WebhookEvent.ordering_key,
+                earlier.id < WebhookEvent.id,
+                earlier.status.in_([WebhookEventStatus.PENDING, WebhookEventStatus.PROCESSING]),
+            )
+            .exists()
+        )
+        stmt = (
+            select(WebhookEvent)
+            .where(
+                or_(
+                    and_(
+                        WebhookEvent.status == WebhookEventStatus.PENDING,
+                        WebhookEvent.next_attempt_at <= now,
+                    ),
+                    and_(
+                        WebhookEvent.status == WebhookEventStatus.PROCESSING,
+                        WebhookEvent.updated_at < now - stale_processing_after(),
+                    ),
+                ),
+                ~has_earlier_unfinished,
+            )
+            .order_by(WebhookEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True, of=WebhookEvent)
+        )
+        if ordering_keys is not None:
+            stmt = stmt.where(WebhookEvent.ordering_key.in_(ordering_keys))
+
+        result = await session.execute(stmt)
+        events = list(result.scalars().all())
+        for event in events:
+            event.status = WebhookEventStatus.PROCESSING
+            event.attempts += 1
+            event.updated_at = now
+        await session.commit()
+        return events
+
+    async def _process(self, event: WebhookEvent) -> str | None:
+        """Run the event's handler in its reserved slot; returns an error message on failure."""
+        from app.persistence.database import async_session_factory
+
+        try:
+            handler = self._handlers.get(event.kind)
+            if handler is None:
+                return f"No handler registered for {event.kind}"
+            async with async_session_factory() as session:
+                await asyncio.wait_for(
+                    handler(event.payload, session),
+                    timeout=settings.webhook_event_handler_timeout_seconds,
+                )
+            return None
+        except Exception as e:
+            logger.error(
+                f"Webhook event {event.id} ({event.kind}) failed on attempt {event.attempts}: {e}",
+                exc_info=True,
+            )
+            return f"{type(e).__name__}: {e}"
+        finally:
+            self._semaphore().release()
+
+    def _record_result(self, event: WebhookEvent, error: str | None, now: datetime) -> None:
+        event.updated_at = now
+        if error is None:
+            event.status = WebhookEventStatus.DONE
+            event.processed_at = now
+            event.last_error = None
+            WEBHOOK_EVENT_LAG.observe((now - event.created_at).total_seconds(), event.kind)
+            WEBHOOK_EVENTS.inc(event.kind, "done")
+        elif event.attempts >= settings.webhook_ingest_max_attempts:
+            event.status = WebhookEventStatus.DEAD
+            event.last_error = error
+            WEBHOOK_EVENTS.inc(event.kind, "dead")
+            logger.error(
+                f"Webhook event {event.id} ({event.kind}) dead-lettered after "
+                f"{event.attempts} attempts: {error}"
+            )
+        else:
+            event.status = WebhookEventStatus.PENDING
+            event.next_attempt_at = now + retry_delay(event.attempts)
+            event.last_error = error
+            WEBHOOK_EVENTS.inc(event.kind, "retry")
+
+    async def requeue_dead(self, session: AsyncSession, event_ids: list[int] | None = None) -> int:
+        """Move dead-lettered events back to pending with a fresh attempt budget.
+
+        Args:
+            session: Database session
+            event_ids: Specific events to requeue; None requeues all dead events
+
+        Returns:
+            Number of events requeued
+        """
+        now = datetime.utcnow()
+        stmt = (
+            update(WebhookEvent)
+            .where(WebhookEvent.status == WebhookEventStatus.DEAD)
+            .values(status=WebhookEventStatus.PENDING, attempts=0, next_attempt_at=now, updated_at=now)
+            .returning(WebhookEvent.id)
+        )
+        if event_ids is not None:
+            stmt = stmt.where(WebhookEvent.id.in_(event_ids))
+        requeued = list((await session.execute(stmt)).scalars())
+        await session.commit()
+        logger.info(f"Requeued {len(requeued)} dead-lettered webhook events")
+        return len(requeued)
+
+    async def purge_done(self, session: AsyncSession, max_batches: int = 10) -> int:
+        """Delete processed events older than webhook_event_retention_days.
+
+        Dead-lettered events are kept for requeue_dead.
+
+        Args:
+            session: Database session
+            max_batches: Max batches of PURGE_BATCH_SIZE deleted per call
+
+        Returns:
+            Number of events deleted
+        """
+        cutoff = datetime.utcnow() - timedelta(days=settings.webhook_event_retention_days)
+        deleted = 0
+        for _ in range(max_batches):
+            expired = (
+                select(WebhookEvent.id)
+                .where(
+                    WebhookEvent.status == WebhookEventStatus.DONE,
+                    WebhookEvent.processed_at < cutoff,
+                )
+                .limit(PURGE_BATCH_SIZE)
+                .scalar_subquery()
+            )
+            result = await session.execute(delete(WebhookEvent).where(WebhookEvent.id.in_(expired)))
+            await session.commit()
+            deleted += result.rowcount
+            if result.rowcount < PURGE_BATCH_SIZE:
+                break
+        if deleted:
+            logger.info(f"Purged {deleted} processed webhook events")
+        return deleted
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """Wait briefly for in-flight dispatches (application shutdown).
+
+        Anything unfinished stays in the inbox for the next sweep.
+        """
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+
+
+# Global dispatcher instance
+webhook_event_dispatcher = WebhookEventDispatcher()
+QUEUE_DEPTH.set_function(lambda: len(webhook_event_dispatcher._tasks), "webhook_event_dispatches")
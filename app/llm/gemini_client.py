@@ -2,6 +2,7 @@
 
 import logging
 import os
+import sys
 import time
 from collections.abc import AsyncIterator
 from typing import Any
@@ -9,12 +10,30 @@ from typing import Any
 from google import genai
 from google.genai import types
 
+from app.core import metrics
 from app.llm.client import LLMClient
 from app.settings import settings
 
 logger = logging.getLogger(__name__)
 
 
+def _call_site(context: dict | None) -> str:
+    """Metric label for the caller: context["call_site"] or module.function.
+
+    Frames inside app.llm (orchestrator, this client) are skipped so the
+    label names the service that asked for the completion.
+    """
+    if context and context.get("call_site"):
+        return context["call_site"]
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_globals.get("__name__", "").startswith("app.llm"):
+        frame = frame.f_back
+    if frame is None:
+        return "unknown"
+    module = frame.f_globals.get("__name__", "").rsplit(".", 1)[-1]
+    return f"{module}.{frame.f_code.co_name}"
+
+
 class GeminiClient(LLMClient):
     """Gemini client using Replit AI Integrations."""
 
@@ -70,6 +89,9 @@ class GeminiClient(LLMClient):
         Raises:
             Exception: If generation fails
         """
+        call_site = _call_site(context)
+        start_time = time.perf_counter()
+        outcome = "error"
         try:
             generation_config = self._build_generation_config(context)
             
@@ -92,9 +114,14 @@ class GeminiClient(LLMClient):
                 if hasattr(response, 'prompt_feedback') and response.prompt_feedback:
                     logger.warning(f"Prompt feedback: {response.prompt_feedback}")
 
+            outcome = "ok"
             return response.text or ""
         except Exception as e:
             raise Exception(f"Gemini generation failed: {str(e)}") from e
+        finally:
+            metrics.LLM_REQUEST_DURATION.observe(
+                time.perf_counter() - start_time, call_site, "generate", outcome
+            )
 
     async def generate_stream(
         self, prompt: str, context: dict | None = None
@@ -115,9 +142,11 @@ class GeminiClient(LLMClient):
         Raises:
             Exception: If streaming generation fails
         """
+        call_site = _call_site(context)
+        start_time = time.perf_counter()
+        outcome = "error"
         try:
             generation_config = self._build_generation_config(context)
-            start_time = time.time()
             first_token_time = None
             
             # Use async streaming API
@@ -128,16 +157,26 @@ class GeminiClient(LLMClient):
             ):
                 if chunk.text:
                     if first_token_time is None:
-                        first_token_time = time.time()
+                        first_token_time = time.perf_counter()
+                        metrics.LLM_TIME_TO_FIRST_TOKEN.observe(first_token_time - start_time, call_site)
                         ttft = (first_token_time - start_time) * 1000
                         logger.info(f"Gemini streaming TTFT: {ttft:.1f}ms")
                     
                     yield chunk.text
             
-            total_time = (time.time() - start_time) * 1000
+            outcome = "ok"
+            total_time = (time.perf_counter() - start_time) * 1000
             logger.info(f"Gemini streaming total: {total_time:.1f}ms")
             
+        except GeneratorExit:
+            # Consumer stopped reading early (e.g. voice barge-in)
+            outcome = "closed"
+            raise
         except Exception as e:
             logger.error(f"Gemini streaming failed: {e}", exc_info=True)
             raise Exception(f"Gemini streaming failed: {str(e)}") from e
+        finally:
+            metrics.LLM_REQUEST_DURATION.observe(
+                time.perf_counter() - start_time, call_site, "stream", outcome
+            )
 
@@ -1,45 +1,159 @@
-"""Structured JSON logging configuration for Cloud Logging compatibility."""
+"""Structured JSON logging configuration for Cloud Logging compatibility.
 
+Records are enqueued by a QueueHandler on the calling thread (after context
+is attached and high-frequency call sites are sampled) and serialized to
+stdout by a QueueListener thread, so JSON encoding and stdout writes do not
+run on the event loop.
+"""
+
+import atexit
+import copy
 import json
 import logging
+import queue
 import sys
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any
 
+from app.core.metrics import QUEUE_DEPTH
+from app.core.tenant_context import tenant_id_var
 from app.settings import settings
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _dumps(data: dict[str, Any]) -> str:
+    """Serialize a log payload, falling back to str() for unknown types."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode()
+    return json.dumps(data, default=str)
+
+
+# LogRecord attributes that are not user-supplied "extra" fields
+_RESERVED_ATTRS = frozenset((
+    "name", "msg", "args", "created", "filename", "funcName", "levelname",
+    "levelno", "lineno", "module", "msecs", "pathname", "process",
+    "processName", "relativeCreated", "stack_info", "exc_info", "exc_text",
+    "thread", "threadName", "taskName", "request_id", "tenant_id", "user_id",
+    "message",
+))
+
+_request_id_var = None
+
+
+def _get_request_id() -> str:
+    """Read the request ID context var, resolving it once on first use."""
+    global _request_id_var
+    if _request_id_var is None:
+        # Import here to avoid circular imports
+        from app.api.middleware import _request_id_var as request_id_var
+        _request_id_var = request_id_var
+    return _request_id_var.get() or ""
+
 
 class ContextFilter(logging.Filter):
     """Filter that adds request and tenant context to log records."""
 
     def filter(self, record: logging.LogRecord) -> bool:
         """Add context variables to the log record."""
-        # Import here to avoid circular imports
-        from app.core.tenant_context import get_tenant_context
-
-        # Try to get request_id from middleware context
         try:
-            from app.api.middleware import get_current_request_id
-            record.request_id = get_current_request_id() or ""
+            record.request_id = _get_request_id()
         except Exception:
             record.request_id = ""
+        record.tenant_id = tenant_id_var.get() or ""
+        return True
 
-        # Get tenant_id from tenant context
-        try:
-            record.tenant_id = get_tenant_context() or ""
-        except Exception:
-            record.tenant_id = ""
 
+class SamplingFilter(logging.Filter):
+    """Rate-limit INFO/DEBUG records per call site.
+
+    Within each window the first ``burst`` records from a call site
+    (logger, file, line) pass; after that only every ``every``-th record
+    passes and carries ``sampled_out`` with the number dropped since the
+    previous one. WARNING and above always pass.
+    """
+
+    def __init__(self, burst: int, window_seconds: float, every: int) -> None:
+        super().__init__()
+        self.burst = burst
+        self.window_seconds = window_seconds
+        self.every = every
+        self._sites: dict[tuple[str, str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        site = self._sites.get(key)
+        if site is None or now - site[0] >= self.window_seconds:
+            suppressed = site[2] if site else 0
+            self._sites[key] = [now, 1, 0]
+            if suppressed:
+                record.sampled_out = suppressed
+            return True
+        site[1] += 1
+        if site[1] <= self.burst:
+            return True
+        if (site[1] - self.burst) % self.every:
+            site[2] += 1
+            return False
+        if site[2]:
+            record.sampled_out = site[2]
+            site[2] = 0
         return True
 
 
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that renders only the message on the calling thread.
+
+    The stock handler runs the full formatter before enqueueing; here the
+    JSON encoding happens on the listener thread. When the queue is full
+    the record is dropped and counted rather than blocking the caller.
+    """
+
+    def __init__(self, log_queue: queue.SimpleQueue, max_size: int) -> None:
+        super().__init__(log_queue)
+        self.max_size = max_size
+        self.dropped = 0
+        self._exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            # Tracebacks reference live frames; render them before handing off
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.queue.qsize() >= self.max_size:
+            self.dropped += 1
+            return
+        if self.dropped:
+            record.dropped_records = self.dropped
+            self.dropped = 0
+        self.queue.put_nowait(record)
+
+
 class JSONFormatter(logging.Formatter):
     """JSON formatter for structured logging."""
 
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
         log_data: dict[str, Any] = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc)
+            .isoformat()
+            .replace("+00:00", "Z"),
             "severity": record.levelname,
             "message": record.getMessage(),
             "logger": record.name,
@@ -48,33 +162,36 @@ class JSONFormatter(logging.Formatter):
             "line": record.lineno,
         }
 
-        # Add exception info if present
+        # Add exception info if present (pre-rendered when queued)
         if record.exc_info:
             log_data["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            log_data["exception"] = record.exc_text
 
         # Add context fields (populated by ContextFilter)
-        if hasattr(record, "request_id") and record.request_id:
+        if getattr(record, "request_id", None):
             log_data["request_id"] = record.request_id
-        if hasattr(record, "tenant_id") and record.tenant_id:
+        if getattr(record, "tenant_id", None):
             log_data["tenant_id"] = record.tenant_id
-        if hasattr(record, "user_id") and record.user_id:
+        if getattr(record, "user_id", None):
             log_data["user_id"] = record.user_id
 
         # Add any extra fields passed via logger.info(..., extra={...})
         for key, value in record.__dict__.items():
-            if key not in log_data and not key.startswith("_") and key not in (
-                "name", "msg", "args", "created", "filename", "funcName", "levelname",
-                "levelno", "lineno", "module", "msecs", "pathname", "process",
-                "processName", "relativeCreated", "stack_info", "exc_info", "exc_text",
-                "thread", "threadName", "request_id", "tenant_id", "user_id", "message"
-            ):
+            if key not in _RESERVED_ATTRS and key not in log_data and not key.startswith("_"):
                 log_data[key] = value
 
-        return json.dumps(log_data)
+        return _dumps(log_data)
+
+
+_listener: QueueListener | None = None
+_listener_lock = threading.Lock()
 
 
 def setup_logging() -> None:
     """Configure application logging."""
+    global _listener
+
     # Get log level from settings
     log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
 
@@ -83,15 +200,32 @@ def setup_logging() -> None:
     root_logger.setLevel(log_level)
 
     # Remove existing handlers
+    shutdown_logging()
     root_logger.handlers.clear()
 
-    # Create console handler with JSON formatter and context filter
+    # Console handler with JSON formatter
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(log_level)
     console_handler.setFormatter(JSONFormatter())
-    console_handler.addFilter(ContextFilter())  # Add context (request_id, tenant_id)
 
-    root_logger.addHandler(console_handler)
+    if settings.log_async:
+        handler: logging.Handler = NonBlockingQueueHandler(queue.SimpleQueue(), settings.log_queue_size)
+        QUEUE_DEPTH.set_function(handler.queue.qsize, "log_records")
+        with _listener_lock:
+            _listener = QueueListener(handler.queue, console_handler, respect_handler_level=True)
+            _listener.start()
+    else:
+        handler = console_handler
+
+    # Context must be captured on the calling thread (context vars)
+    handler.addFilter(ContextFilter())
+    if settings.log_sample_every > 0:
+        handler.addFilter(SamplingFilter(
+            burst=settings.log_sample_burst,
+            window_seconds=settings.log_sample_window_seconds,
+            every=settings.log_sample_every,
+        ))
+    root_logger.addHandler(handler)
 
     # Set levels for third-party loggers
     # Note: In production, consider enabling uvicorn.access for HTTP traffic visibility
@@ -100,7 +234,32 @@ def setup_logging() -> None:
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
 
+def shutdown_logging() -> None:
+    """Stop the queue listener, flushing any queued records.
+
+    The root queue handler is replaced by the listener's own handlers
+    first, so records logged afterwards (e.g. during interpreter exit)
+    are written directly instead of piling up in a dead queue.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            return
+        root_logger = logging.getLogger()
+        for handler in list(root_logger.handlers):
+            if isinstance(handler, NonBlockingQueueHandler):
+                root_logger.removeHandler(handler)
+                for target in _listener.handlers:
+                    for log_filter in handler.filters:
+                        target.addFilter(log_filter)
+                    root_logger.addHandler(target)
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance with the given name."""
     return logging.getLogger(name)
-
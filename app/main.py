@@ -9,8 +9,10 @@ from sentry_sdk.integrations.httpx import HttpxIntegration
 from sentry_sdk.integrations.logging import LoggingIntegration
 from sentry_sdk.integrations.starlette import StarletteIntegration
 from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
+import hmac
 import logging
 
 from app.api.middleware import (
@@ -21,8 +23,14 @@ from app.api.middleware import (
     RequestContextMiddleware,
 )
 from app.api.routes import api_router
+from app.core.crypto_executor import shutdown_crypto_executor
+from app.core.metrics import REGISTRY as metrics_registry
+from app.infrastructure.callback_broker import callback_broker
+from app.infrastructure.notification_dispatcher import notification_dispatcher
+from app.infrastructure.webhook_event_dispatcher import webhook_event_dispatcher
 from app.infrastructure.redis import redis_client
-from app.logging_config import setup_logging
+from app.infrastructure.telephony.factory import close_cached_providers
+from app.logging_config import setup_logging, shutdown_logging
 from app.settings import settings
 
 # Setup logging
@@ -90,7 +98,13 @@ async def lifespan(app: FastAPI):
         raise
     yield
     # Shutdown
+    await notification_dispatcher.close()
+    await webhook_event_dispatcher.close()
+    await callback_broker.close()
     await redis_client.disconnect()
+    await close_cached_providers()
+    shutdown_crypto_executor()
+    shutdown_logging()
 
 
 # Create FastAPI app
@@ -125,6 +139,7 @@ app.include_router(api_router, prefix=settings.api_v1_prefix)
 # Include worker routes (for Cloud Tasks)
 from app.workers import sms_worker, email_worker, followup_worker, promise_worker, drip_worker, email_outreach_worker
 from app.workers import health_snapshot_worker, chi_worker, burst_detection_worker, topic_worker, telnyx_sync_worker
+from app.workers import notification_worker, duplicate_worker, analytics_export_worker, webhook_event_worker
 app.include_router(sms_worker.router, prefix="/workers", tags=["workers"])
 app.include_router(followup_worker.router, prefix="/workers", tags=["workers"])
 app.include_router(promise_worker.router, prefix="/workers", tags=["workers"])
@@ -136,6 +151,10 @@ app.include_router(topic_worker.router, prefix="/workers", tags=["workers"])
 app.include_router(drip_worker.router, prefix="/workers", tags=["workers"])
 app.include_router(email_outreach_worker.router, prefix="/workers", tags=["workers"])
 app.include_router(telnyx_sync_worker.router, prefix="/workers", tags=["workers"])
+app.include_router(notification_worker.router, prefix="/workers", tags=["workers"])
+app.include_router(duplicate_worker.router, prefix="/workers", tags=["workers"])
+app.include_router(analytics_export_worker.router, prefix="/workers", tags=["workers"])
+app.include_router(webhook_event_worker.router, prefix="/workers", tags=["workers"])
 
 @app.get("/health")
 async def health_check():
@@ -143,6 +162,16 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint(request: Request):
+    """Prometheus text exposition of this instance's metrics."""
+    if settings.metrics_bearer_token:
+        expected = f"Bearer {settings.metrics_bearer_token}"
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+            return PlainTextResponse("unauthorized", status_code=401)
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/api/v1/telnyx/diagnostics")
 async def telnyx_diagnostics():
     """Diagnose Telnyx connection/phone number/agent configuration for all tenants."""
@@ -299,7 +328,7 @@ async def telnyx_diagnostics():
 async def get_classes_proxy(request: Request):
     """Proxy endpoint for Telnyx AI Assistant to fetch Jackrabbit class openings."""
     from fastapi.responses import JSONResponse as JR
-    from sqlalchemy import select, text
+    from sqlalchemy import select
     from app.infrastructure.jackrabbit_client import fetch_classes, format_classes_for_voice
     from app.persistence.database import AsyncSessionLocal
     from app.persistence.models.tenant_customer_service_config import TenantCustomerServiceConfig
@@ -321,7 +350,6 @@ async def get_classes_proxy(request: Request):
             raw_tid = body.get("tenant_id") or request.query_params.get("tenant_id")
             if raw_tid:
                 async with AsyncSessionLocal() as session:
-                    await session.execute(text("SET app.current_tenant_id = ''"))
                     # Resolve tenant_number -> actual tenants.id
                     from app.persistence.models.tenant import Tenant
                     tid_int = int(raw_tid)
@@ -1,40 +1,254 @@
 """Database connection and session management."""
 
 import logging
+import time
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
 import sentry_sdk
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import declarative_base
+from sqlalchemy import event, exc, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
+from app.core import metrics, query_profiler
 from app.core.tenant_context import get_tenant_context
-from app.settings import get_async_database_url
+from app.settings import get_async_database_url, settings
 
 logger = logging.getLogger(__name__)
 
 # Get the async-compatible database URL
 async_database_url = get_async_database_url()
 
-# Create async engine with conservative pool settings for Supabase Pooler
-# Note: Supabase Pooler in Session mode has strict limits (typically 10-15 connections)
-engine = create_async_engine(
-    async_database_url,
-    echo=False,
-    future=True,
-    pool_size=3,  # Small pool for Supabase session mode limits
-    max_overflow=2,  # Allow 2 extra connections under load (5 total max per instance)
-    pool_recycle=180,  # Recycle connections every 3 minutes (faster turnover)
-    pool_pre_ping=True,  # Verify connections are alive
-    pool_timeout=10,  # Fail fast if no connection available in 10 seconds
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records checkout waits and timeouts per pool."""
+
+    pool_name = "primary"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics.DB_POOL_TIMEOUTS.inc(self.pool_name)
+            raise
+        finally:
+            metrics.DB_POOL_WAIT.observe(time.perf_counter() - start, self.pool_name)
+
+
+class ReadQueuePool(TimedQueuePool):
+    """Pool for the read engine (metrics labelled pool="read")."""
+
+    pool_name = "read"
+
+
+class ReplicaQueuePool(TimedQueuePool):
+    """Pool for the read replica engine (metrics labelled pool="replica")."""
+
+    pool_name = "replica"
+
+
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def _create_engine(
+    poolclass: type[TimedQueuePool],
+    pool_size: int,
+    max_overflow: int,
+    pool_timeout: int,
+    url: str = async_database_url,
+) -> AsyncEngine:
+    """Create an app engine with its own pool, query timing and pool metrics.
+
+    In transaction pool mode consecutive transactions may land on different
+    server connections, so asyncpg's prepared statement caches are turned off
+    and statements get unique names.
+    """
+    connect_args = {}
+    if settings.db_pool_mode == "transaction":
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+    new_engine = create_async_engine(
+        url,
+        echo=False,
+        future=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=True,  # Verify connections are alive
+        pool_timeout=pool_timeout,  # Fail fast if no connection is available
+        poolclass=poolclass,
+        connect_args=connect_args,
+    )
+    event.listen(new_engine.sync_engine, "before_cursor_execute", _start_query_timer)
+    event.listen(new_engine.sync_engine, "after_cursor_execute", _record_query_time)
+
+    pool_name = poolclass.pool_name
+    pool_metrics = metrics.DB_POOL_CONNECTIONS
+    pool_metrics.set_function(lambda: new_engine.pool.checkedout(), pool_name, "checked_out")
+    pool_metrics.set_function(lambda: new_engine.pool.checkedin(), pool_name, "idle")
+    pool_metrics.set_function(lambda: max(0, new_engine.pool.overflow()), pool_name, "overflow")
+    pool_metrics.set_function(lambda: pool_size + max_overflow, pool_name, "max")
+    return new_engine
+
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _record_query_time(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info.pop("query_start", None)
+    if start is not None:
+        duration = time.perf_counter() - start
+        metrics.record_db_query(duration)
+        query_profiler.record_statement(statement, duration)
+
+
+# Defaults (3 + 2 overflow) are conservative for Supabase session mode, which
+# has strict limits (typically 10-15 connections); a transaction-mode pooler
+# multiplexes server connections, so db_pool_size can be raised with it.
+engine = _create_engine(
+    TimedQueuePool, settings.db_pool_size, settings.db_max_overflow, settings.db_pool_timeout
 )
 
+# Separately sized pool for analytics and dashboard reads; also the
+# fallback when the replica is missing, unreachable or too far behind
+read_engine = _create_engine(
+    ReadQueuePool, settings.db_read_pool_size, settings.db_read_max_overflow,
+    settings.db_read_pool_timeout,
+)
+
+replica_engine = None
+if settings.database_replica_url:
+    replica_engine = _create_engine(
+        ReplicaQueuePool, settings.db_read_pool_size, settings.db_read_max_overflow,
+        settings.db_read_pool_timeout, url=get_async_database_url(settings.database_replica_url),
+    )
+
+# Zero when caught up, so an idle primary doesn't read as lag
+_REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+
+class ReplicaLagMonitor:
+    """Measures replica replay lag, at most once per check interval."""
+
+    def __init__(self, replica: AsyncEngine, check_interval: float) -> None:
+        self.replica = replica
+        self.check_interval = check_interval
+        self._lag = float("inf")
+        self._checked_at: float | None = None
+
+    async def lag_seconds(self) -> float:
+        """Replay lag in seconds; infinite when the replica can't be queried."""
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            self._lag = await self._measure()
+        return self._lag
+
+    async def _measure(self) -> float:
+        try:
+            async with self.replica.connect() as conn:
+                lag = float((await conn.execute(_REPLICA_LAG_SQL)).scalar() or 0.0)
+        except Exception as e:
+            logger.warning(f"Read replica lag check failed, reading from primary: {e}")
+            return float("inf")
+        metrics.DB_REPLICA_LAG.set(lag)
+        return lag
+
+
+replica_lag = (
+    ReplicaLagMonitor(replica_engine, settings.db_replica_lag_check_interval_seconds)
+    if replica_engine is not None
+    else None
+)
+
+
+async def choose_read_engine(max_lag_seconds: float) -> AsyncEngine:
+    """Replica engine if it is within max_lag_seconds, else the primary read engine."""
+    if replica_lag is not None and await replica_lag.lag_seconds() <= max_lag_seconds:
+        metrics.DB_READ_ROUTES.inc("replica")
+        return replica_engine
+    metrics.DB_READ_ROUTES.inc("primary")
+    return read_engine
+
+
+class TenantContextSession(Session):
+    """Session whose transactions carry the RLS tenant context when asked to.
+
+    Sessions opened by get_db/get_read_db set info["rls"]; each transaction
+    they begin then runs set_config(..., is_local=true), which Postgres
+    discards at COMMIT/ROLLBACK. Nothing leaks to the next user of the
+    server connection, so no reset is needed and it works behind
+    transaction-mode poolers. Sessions with info["read_only"] also make
+    their transactions read-only.
+    """
+
+
+RLS_TENANT = "tenant"  # Use the request's tenant context
+RLS_NONE = "none"  # Explicitly no tenant (cross-tenant features)
+
+
+@event.listens_for(TenantContextSession, "after_begin")
+def _apply_transaction_settings(session, transaction, connection) -> None:
+    rls = session.info.get("rls")
+    read_only = session.info.get("read_only", False)
+    if rls is None and not read_only:
+        return
+
+    settings_sql = []
+    params = {}
+    if rls is not None:
+        tenant_id = get_tenant_context() if rls == RLS_TENANT else None
+        settings_sql.append("set_config('app.current_tenant_id', :tenant_id, true)")
+        params["tenant_id"] = "" if tenant_id is None else str(tenant_id)
+    if read_only:
+        settings_sql.append("set_config('transaction_read_only', 'on', true)")
+    try:
+        connection.execute(text(f"SELECT {', '.join(settings_sql)}"), params)
+    except Exception as e:
+        # RLS setup failures are critical for tenant isolation security
+        logger.error(f"RLS context setup failed: {e}", exc_info=True)
+        sentry_sdk.capture_exception(e)
+        raise
+
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=TenantContextSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
+# Read-only sessions; bound per session by choose_read_engine
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    sync_session_class=TenantContextSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
+    info={"read_only": True},
 )
 
 # Alias for background tasks that need to create their own sessions
@@ -44,43 +258,33 @@ async_session_factory = AsyncSessionLocal
 Base = declarative_base()
 
 
-async def _set_tenant_context_async(session: AsyncSession) -> None:
-    """Set the tenant context on the database connection for RLS.
-
-    This is called asynchronously when a session is created.
-    It sets the PostgreSQL session variable that RLS policies use.
-    """
-    try:
-        tenant_id = get_tenant_context()
-        if tenant_id is not None:
-            await session.execute(text(f"SET app.current_tenant_id = '{tenant_id}'"))
-        else:
-            # Reset to empty for global admin operations
-            await session.execute(text("SET app.current_tenant_id = ''"))
-    except Exception as e:
-        # Log RLS setup errors - these are critical for tenant isolation security
-        logger.error(f"RLS context setup failed: {e}", exc_info=True)
-        sentry_sdk.capture_exception(e)
-        # Don't raise - allow session to proceed, but log the security concern
-
-
 async def get_db() -> AsyncSession:
     """Dependency for getting database session with RLS tenant context."""
     async with AsyncSessionLocal() as session:
+        session.info["rls"] = RLS_TENANT
         try:
-            # Set tenant context for RLS using proper async execution
-            await _set_tenant_context_async(session)
             yield session
         except Exception as e:
             logger.error(f"Database session error: {e}", exc_info=True)
             raise
-        finally:
-            # Reset tenant context when returning session
-            try:
-                await session.execute(text("SET app.current_tenant_id = ''"))
-            except Exception:
-                pass  # Ignore errors during cleanup
-            await session.close()
+
+
+async def get_read_db() -> AsyncSession:
+    """Dependency for read-only analytics/dashboard sessions with RLS tenant context.
+
+    Uses the read replica when it is within db_replica_max_lag_seconds,
+    otherwise the primary's read pool, so slow reports never queue behind
+    chat and webhook requests. Writes fail with a read-only transaction
+    error.
+    """
+    bind = await choose_read_engine(settings.db_replica_max_lag_seconds)
+    async with AsyncReadSessionLocal(bind=bind) as session:
+        session.info["rls"] = RLS_TENANT
+        try:
+            yield session
+        except Exception as e:
+            logger.error(f"Read database session error: {e}", exc_info=True)
+            raise
 
 
 async def get_db_no_rls() -> AsyncSession:
@@ -92,13 +296,25 @@ async def get_db_no_rls() -> AsyncSession:
     WARNING: Only use this for intentionally cross-tenant features.
     """
     async with AsyncSessionLocal() as session:
+        # Explicitly clear tenant context to ensure no RLS filtering
+        session.info["rls"] = RLS_NONE
         try:
-            # Explicitly clear tenant context to ensure no RLS filtering
-            await session.execute(text("SET app.current_tenant_id = ''"))
             yield session
         except Exception as e:
             logger.error(f"Database session (no RLS) error: {e}", exc_info=True)
             raise
-        finally:
-            await session.close()
 
+
+@asynccontextmanager
+async def read_session(max_lag_seconds: float | None = None) -> AsyncIterator[AsyncSession]:
+    """Read-only session for workers' scans, without RLS tenant context.
+
+    Routed like get_read_db, with the worker lag tolerance
+    (db_replica_worker_max_lag_seconds) unless max_lag_seconds is given.
+    Write results through a primary session.
+    """
+    if max_lag_seconds is None:
+        max_lag_seconds = settings.db_replica_worker_max_lag_seconds
+    bind = await choose_read_engine(max_lag_seconds)
+    async with AsyncReadSessionLocal(bind=bind) as session:
+        yield session
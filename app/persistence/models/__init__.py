@@ -5,13 +5,20 @@ from app.persistence.models.call import Call
 from app.persistence.models.call_summary import CallSummary
 from app.persistence.models.contact import Contact
 from app.persistence.models.contact_alias import ContactAlias
+from app.persistence.models.contact_duplicate import ContactDuplicateCluster, ContactDuplicatePair
 from app.persistence.models.contact_merge_log import ContactMergeLog
 from app.persistence.models.lead_merge_log import LeadMergeLog
 from app.persistence.models.conversation import Conversation, Message
 from app.persistence.models.escalation import Escalation
 from app.persistence.models.lead import Lead
 from app.persistence.models.lead_task import LeadTask
-from app.persistence.models.notification import Notification, NotificationPriority, NotificationType
+from app.persistence.models.notification import (
+    DeliveryStatus,
+    Notification,
+    NotificationDelivery,
+    NotificationPriority,
+    NotificationType,
+)
 from app.persistence.models.prompt import PromptBundle, PromptSection
 from app.persistence.models.sms_opt_in import SmsOptIn
 from app.persistence.models.do_not_contact import DoNotContact
@@ -34,6 +41,9 @@ from app.persistence.models.sms_burst_incident import SmsBurstIncident
 from app.persistence.models.sms_burst_config import SmsBurstConfig
 from app.persistence.models.communications_health_snapshot import CommunicationsHealthSnapshot
 from app.persistence.models.anomaly_alert import AnomalyAlert
+from app.persistence.models.activity_rollup import ActivityRollup, ActivityRollupWatermark
+from app.persistence.models.analytics_export import AnalyticsExportWatermark
+from app.persistence.models.webhook_event import WebhookEvent, WebhookEventStatus
 from app.persistence.models.service_health_incident import ServiceHealthIncident
 from app.persistence.models.drip_campaign import DripCampaign, DripCampaignStep, DripEnrollment
 from app.persistence.models.email_campaign import EmailCampaign, EmailCampaignRecipient
@@ -68,6 +78,8 @@ __all__ = [
     "LeadTask",
     "Contact",
     "ContactAlias",
+    "ContactDuplicateCluster",
+    "ContactDuplicatePair",
     "ContactMergeLog",
     "LeadMergeLog",
     "EmailConversation",
@@ -83,6 +95,8 @@ __all__ = [
     "DoNotContact",
     "Escalation",
     "Notification",
+    "NotificationDelivery",
+    "DeliveryStatus",
     "NotificationType",
     "NotificationPriority",
     "TenantCustomerServiceConfig",
@@ -97,6 +111,11 @@ __all__ = [
     "SmsBurstConfig",
     "CommunicationsHealthSnapshot",
     "AnomalyAlert",
+    "ActivityRollup",
+    "ActivityRollupWatermark",
+    "AnalyticsExportWatermark",
+    "WebhookEvent",
+    "WebhookEventStatus",
     "ServiceHealthIncident",
     "Customer",
     "TenantCustomerSupportConfig",
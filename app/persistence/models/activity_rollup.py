@@ -0,0 +1,75 @@
+"""Pre-aggregated per-channel activity rollups."""
+
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+
+from app.persistence.database import Base
+
+
+class ActivityRollup(Base):
+    """Activity counts per tenant, channel and time bucket.
+
+    Maintained incrementally by the health snapshot worker via
+    ActivityRollupService. granularity is "hour", "day" or "week";
+    bucket_start is the UTC start of the bucket (weeks start Monday).
+    channel is "call", "sms", "email" or "web".
+    """
+
+    __tablename__ = "activity_rollups"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
+    granularity = Column(String(10), nullable=False)
+    channel = Column(String(20), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+
+    inbound_count = Column(Integer, nullable=False, default=0)
+    outbound_count = Column(Integer, nullable=False, default=0)
+    total_count = Column(Integer, nullable=False, default=0)
+    duration_seconds = Column(Float, nullable=False, default=0.0)  # Calls only
+
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "tenant_id", "granularity", "channel", "bucket_start",
+            name="uix_activity_rollup_bucket",
+        ),
+        Index("ix_activity_rollup_tenant_gran_bucket", "tenant_id", "granularity", "bucket_start"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ActivityRollup(tenant={self.tenant_id}, {self.granularity}, "
+            f"{self.channel}, {self.bucket_start}, total={self.total_count})>"
+        )
+
+
+class ActivityRollupWatermark(Base):
+    """Per-tenant high-water mark for activity rollups.
+
+    Hour buckets strictly before rolled_up_through are materialized;
+    readers compute anything after it from the raw tables.
+    """
+
+    __tablename__ = "activity_rollup_watermarks"
+
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), primary_key=True)
+    rolled_up_through = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ActivityRollupWatermark(tenant={self.tenant_id}, "
+            f"through={self.rolled_up_through})>"
+        )
@@ -0,0 +1,27 @@
+"""Progress of the incremental analytics (Parquet) export."""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String
+
+from app.persistence.database import Base
+
+
+class AnalyticsExportWatermark(Base):
+    """Per-table high-water mark for the analytics export.
+
+    Rows whose change timestamp is before exported_through have been
+    written by AnalyticsExportService.
+    """
+
+    __tablename__ = "analytics_export_watermarks"
+
+    table_name = Column(String(50), primary_key=True)
+    exported_through = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self) -> str:
+        return (
+            f"<AnalyticsExportWatermark(table={self.table_name}, "
+            f"through={self.exported_through})>"
+        )
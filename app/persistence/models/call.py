@@ -30,6 +30,10 @@ class Call(Base):
     duration = Column(Integer, nullable=True)  # Duration in seconds
     recording_sid = Column(String(255), nullable=True)
     recording_url = Column(Text, nullable=True)
+    # Telnyx AI conversation holding the recording (resolved when viewed)
+    recording_conversation_id = Column(String(255), nullable=True)
+    # Blob path of our copy of the recording, when mirrored
+    recording_storage_path = Column(Text, nullable=True)
     
     # Language tracking (detected from phone number routing)
     language = Column(String(20), nullable=True)  # 'english', 'spanish', or None if unknown
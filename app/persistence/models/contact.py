@@ -3,11 +3,13 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 
+from app.core.phone import normalize_email, phone_match_key
 from app.persistence.database import Base
+from app.utils.name_matching import name_block_key
 
 if TYPE_CHECKING:
     from app.persistence.models.call_summary import CallSummary
@@ -28,7 +30,11 @@ class Contact(Base):
     lead_id = Column(Integer, ForeignKey("leads.id"), nullable=True, index=True)
     email = Column(String(255), nullable=True, index=True)
     phone = Column(String(50), nullable=True, index=True)
+    # Lookup keys derived from email/phone on assignment (see validators below)
+    email_normalized = Column(String(255), nullable=True)
+    phone_last10 = Column(String(10), nullable=True)
     name = Column(String(255), nullable=True)
+    name_key = Column(String(20), nullable=True)  # Phonetic blocking key for duplicate detection
     source = Column(String(50), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
@@ -48,6 +54,20 @@ class Contact(Base):
     merged_at = Column(DateTime, nullable=True)
     merged_by = Column(Integer, ForeignKey("users.id"), nullable=True)
 
+    # Set whenever a matching field changes; cleared by DuplicateDetectionService
+    dedup_pending = Column(Boolean, nullable=False, default=True, server_default=text("true"))
+
+    __table_args__ = (
+        Index("ix_contacts_tenant_phone_last10", "tenant_id", "phone_last10"),
+        Index("ix_contacts_tenant_email_normalized", "tenant_id", "email_normalized"),
+        Index("ix_contacts_tenant_name_key", "tenant_id", "name_key"),
+        Index(
+            "ix_contacts_dedup_pending",
+            "tenant_id",
+            postgresql_where=text("dedup_pending"),
+        ),
+    )
+
     # Relationships
     tenant = relationship("Tenant", back_populates="contacts")
     # New one-to-many relationship: one contact can have many leads
@@ -91,5 +111,28 @@ class Contact(Base):
     # Email conversations
     email_conversations = relationship("EmailConversation", back_populates="contact")
 
+    @validates("email")
+    def _sync_email_normalized(self, key: str, value: str | None) -> str | None:
+        self.email_normalized = normalize_email(value)
+        self.dedup_pending = True
+        return value
+
+    @validates("phone")
+    def _sync_phone_last10(self, key: str, value: str | None) -> str | None:
+        self.phone_last10 = phone_match_key(value)
+        self.dedup_pending = True
+        return value
+
+    @validates("name")
+    def _sync_name_key(self, key: str, value: str | None) -> str | None:
+        self.name_key = name_block_key(value)
+        self.dedup_pending = True
+        return value
+
+    @validates("deleted_at", "merged_into_contact_id")
+    def _flag_dedup_pending(self, key: str, value):
+        self.dedup_pending = True
+        return value
+
     def __repr__(self) -> str:
         return f"<Contact(id={self.id}, tenant_id={self.tenant_id}, email={self.email}, phone={self.phone})>"
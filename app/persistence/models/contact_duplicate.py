@@ -0,0 +1,73 @@
+"""Duplicate-contact candidate pairs and clusters."""
+
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.persistence.database import Base
+
+
+class ContactDuplicatePair(Base):
+    """A scored candidate match between two contacts.
+
+    Stored once per pair with contact_id < other_contact_id.
+    """
+
+    __tablename__ = "contact_duplicate_pairs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
+    contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False)
+    other_contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), nullable=False)
+    confidence = Column(Float, nullable=False)
+    match_type = Column(String(20), nullable=False)  # email, phone, name, multiple
+    match_value = Column(String(255), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "contact_id", "other_contact_id", name="uix_contact_duplicate_pair"),
+        Index("ix_contact_duplicate_pairs_other", "tenant_id", "other_contact_id"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ContactDuplicatePair(contact_id={self.contact_id}, other={self.other_contact_id}, "
+            f"confidence={self.confidence}, match_type={self.match_type})>"
+        )
+
+
+class ContactDuplicateCluster(Base):
+    """A connected group of candidate pairs, served by GET /contacts/duplicates."""
+
+    __tablename__ = "contact_duplicate_clusters"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False)
+    contact_ids = Column(ARRAY(Integer), nullable=False)
+    size = Column(Integer, nullable=False)
+    # Strongest pair in the cluster
+    confidence = Column(Float, nullable=False)
+    match_type = Column(String(20), nullable=False)
+    match_value = Column(String(255), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_contact_duplicate_clusters_tenant_confidence", "tenant_id", "confidence", "id"),
+        Index("ix_contact_duplicate_clusters_members", "contact_ids", postgresql_using="gin"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ContactDuplicateCluster(id={self.id}, tenant_id={self.tenant_id}, "
+            f"size={self.size}, confidence={self.confidence})>"
+        )
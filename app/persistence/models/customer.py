@@ -5,8 +5,9 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Index
 from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 
+from app.core.phone import normalize_email, phone_match_key
 from app.persistence.database import Base
 
 if TYPE_CHECKING:
@@ -40,6 +41,9 @@ class Customer(Base):
     name = Column(String(255), nullable=True)
     email = Column(String(255), nullable=True, index=True)
     phone = Column(String(50), nullable=False, index=True)  # Primary identifier
+    # Lookup keys derived from email/phone on assignment (see validators below)
+    email_normalized = Column(String(255), nullable=True)
+    phone_last10 = Column(String(10), nullable=True)
 
     # Account status
     status = Column(String(50), default="active", nullable=False)  # active, inactive, suspended
@@ -52,13 +56,16 @@ class Customer(Base):
     # Sync management
     last_synced_at = Column(DateTime, nullable=True)
     sync_source = Column(String(50), nullable=True)  # jackrabbit, manual, import
+    sync_hash = Column(String(32), nullable=True)  # Hash of the last synced source record
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     __table_args__ = (
         Index("ix_customers_tenant_phone", "tenant_id", "phone", unique=True),
-        Index("ix_customers_tenant_external_id", "tenant_id", "external_customer_id"),
+        Index("ix_customers_tenant_external_id", "tenant_id", "external_customer_id", unique=True),
+        Index("ix_customers_tenant_phone_last10", "tenant_id", "phone_last10"),
+        Index("ix_customers_tenant_email_normalized", "tenant_id", "email_normalized"),
     )
 
     # Relationships
@@ -66,5 +73,15 @@ class Customer(Base):
     contact = relationship("Contact", foreign_keys=[contact_id])
     jackrabbit_customer = relationship("JackrabbitCustomer", foreign_keys=[jackrabbit_customer_id])
 
+    @validates("email")
+    def _sync_email_normalized(self, key: str, value: str | None) -> str | None:
+        self.email_normalized = normalize_email(value)
+        return value
+
+    @validates("phone")
+    def _sync_phone_last10(self, key: str, value: str | None) -> str | None:
+        self.phone_last10 = phone_match_key(value)
+        return value
+
     def __repr__(self) -> str:
         return f"<Customer(id={self.id}, tenant_id={self.tenant_id}, name={self.name}, phone={self.phone})>"
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, JSON, String, Text, UniqueConstraint
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, JSON, String, Text, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 
 from app.persistence.database import Base
@@ -70,6 +70,12 @@ class DripEnrollment(Base):
     __tablename__ = "drip_enrollments"
     __table_args__ = (
         UniqueConstraint("tenant_id", "campaign_id", "lead_id", name="uq_drip_enrollment_tenant_campaign_lead"),
+        # Due-step claims by the batch drip dispatcher
+        Index(
+            "ix_drip_enrollments_due",
+            "next_step_at",
+            postgresql_where=text("status = 'active' AND next_task_id IS NULL"),
+        ),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -78,6 +84,8 @@ class DripEnrollment(Base):
     lead_id = Column(Integer, ForeignKey("leads.id"), nullable=False, index=True)
     status = Column(String(30), default="active", nullable=False, index=True)  # active/responded/completed/cancelled
     current_step = Column(Integer, default=0, nullable=False)  # 0 = not started
+    # Failed tries at the current step (batch dispatch); reset when a step is sent
+    send_attempts = Column(Integer, default=0, server_default=text("0"), nullable=False)
     next_task_id = Column(String(500), nullable=True)  # Cloud Task name
     next_step_at = Column(DateTime, nullable=True)
     context_data = Column(JSON, nullable=True)  # Template variables from email body
@@ -4,8 +4,9 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 
 from sqlalchemy import Column, DateTime, ForeignKey, Integer, JSON, String, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 
+from app.core.phone import normalize_email, phone_match_key
 from app.persistence.database import Base
 
 if TYPE_CHECKING:
@@ -27,6 +28,9 @@ class JackrabbitCustomer(Base):
     phone_number = Column(String(50), nullable=False, index=True)
     email = Column(String(255), nullable=True, index=True)
     name = Column(String(255), nullable=True)
+    # Lookup keys derived from email/phone_number on assignment (see validators below)
+    email_normalized = Column(String(255), nullable=True)
+    phone_last10 = Column(String(10), nullable=True)
 
     # Additional Jackrabbit Data (flexible storage)
     customer_data = Column(JSON, nullable=True)  # Full customer record from Jackrabbit
@@ -34,17 +38,30 @@ class JackrabbitCustomer(Base):
     # Cache Management
     last_synced_at = Column(DateTime, nullable=False)
     cache_expires_at = Column(DateTime, nullable=True)  # Optional TTL
+    sync_hash = Column(String(32), nullable=True)  # Hash of the last synced source record
 
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     __table_args__ = (
         Index("ix_jackrabbit_tenant_phone", "tenant_id", "phone_number"),
-        Index("ix_jackrabbit_tenant_jid", "tenant_id", "jackrabbit_id"),
+        Index("ix_jackrabbit_tenant_jid", "tenant_id", "jackrabbit_id", unique=True),
+        Index("ix_jackrabbit_tenant_phone_last10", "tenant_id", "phone_last10"),
+        Index("ix_jackrabbit_tenant_email_normalized", "tenant_id", "email_normalized"),
     )
 
     # Relationships
     tenant = relationship("Tenant")
 
+    @validates("email")
+    def _sync_email_normalized(self, key: str, value: str | None) -> str | None:
+        self.email_normalized = normalize_email(value)
+        return value
+
+    @validates("phone_number")
+    def _sync_phone_last10(self, key: str, value: str | None) -> str | None:
+        self.phone_last10 = phone_match_key(value)
+        return value
+
     def __repr__(self) -> str:
         return f"<JackrabbitCustomer(id={self.id}, jackrabbit_id={self.jackrabbit_id}, phone={self.phone_number})>"
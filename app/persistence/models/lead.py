@@ -3,9 +3,10 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, JSON, String, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, JSON, String, Text
+from sqlalchemy.orm import relationship, validates
 
+from app.core.phone import normalize_email, phone_match_key
 from app.persistence.database import Base
 
 if TYPE_CHECKING:
@@ -26,6 +27,9 @@ class Lead(Base):
     contact_id = Column(Integer, ForeignKey("contacts.id"), nullable=True, index=True)
     email = Column(String(255), nullable=True, index=True)
     phone = Column(String(50), nullable=True, index=True)
+    # Lookup keys derived from email/phone on assignment (see validators below)
+    email_normalized = Column(String(255), nullable=True)
+    phone_last10 = Column(String(10), nullable=True)
     name = Column(String(255), nullable=True)
     status = Column(String(50), nullable=True, default='new', index=True)
     pipeline_stage = Column(String(50), nullable=True, default='new_lead', index=True)
@@ -35,6 +39,11 @@ class Lead(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index("ix_leads_tenant_phone_last10", "tenant_id", "phone_last10"),
+        Index("ix_leads_tenant_email_normalized", "tenant_id", "email_normalized"),
+    )
+
     # Relationships
     tenant = relationship("Tenant", back_populates="leads")
     conversation = relationship("Conversation", back_populates="leads")
@@ -43,5 +52,15 @@ class Lead(Base):
     email_conversations = relationship("EmailConversation", back_populates="lead")
     tasks = relationship("LeadTask", back_populates="lead", cascade="all, delete-orphan")
 
+    @validates("email")
+    def _sync_email_normalized(self, key: str, value: str | None) -> str | None:
+        self.email_normalized = normalize_email(value)
+        return value
+
+    @validates("phone")
+    def _sync_phone_last10(self, key: str, value: str | None) -> str | None:
+        self.phone_last10 = phone_match_key(value)
+        return value
+
     def __repr__(self) -> str:
         return f"<Lead(id={self.id}, tenant_id={self.tenant_id}, email={self.email}, phone={self.phone}, status={self.status})>"
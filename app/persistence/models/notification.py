@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, JSON, String, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, JSON, String, Text
 from sqlalchemy.orm import relationship
 
 from app.persistence.database import Base
@@ -57,6 +57,50 @@ class Notification(Base):
         self.read_at = datetime.utcnow()
 
 
+class NotificationDelivery(Base):
+    """Outbox row for an email/SMS notification delivery.
+
+    Written in the same transaction as the in-app notifications and sent
+    asynchronously by the NotificationDispatcher, which records the result.
+    """
+
+    __tablename__ = "notification_deliveries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+
+    # "email" or "sms"
+    channel = Column(String(20), nullable=False)
+    notification_type = Column(String(50), nullable=False)
+    # Email address for email; SMS destination is resolved at send time
+    recipient = Column(String(255), nullable=True)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    extra_data = Column(JSON, nullable=True)
+
+    # Delivery state: see DeliveryStatus
+    status = Column(String(20), default="pending", nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(Text, nullable=True)
+    provider_message_id = Column(String(255), nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("ix_notification_deliveries_status_next", "status", "next_attempt_at"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<NotificationDelivery(id={self.id}, tenant_id={self.tenant_id}, "
+            f"channel={self.channel}, status={self.status}, attempts={self.attempts})>"
+        )
+
+
 # Notification types
 class NotificationType:
     """Notification type constants."""
@@ -85,3 +129,13 @@ class NotificationPriority:
     HIGH = "high"
     URGENT = "urgent"
 
+
+
+# Outbox delivery statuses
+class DeliveryStatus:
+    """Notification delivery status constants."""
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+    SKIPPED = "skipped"  # Channel not configured for tenant; not retried
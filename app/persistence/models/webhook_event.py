@@ -0,0 +1,68 @@
+"""Inbox of raw provider webhooks awaiting processing."""
+
+from datetime import datetime
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
+
+from app.persistence.database import Base
+
+
+class WebhookEvent(Base):
+    """A received webhook, stored before processing.
+
+    Written by the webhook route (which acks the provider right away) and
+    processed by the WebhookEventDispatcher, one event at a time per
+    ordering_key, oldest first. idempotency_key is the provider's event ID
+    (or a hash of the payload), so provider retries are stored once.
+    """
+
+    __tablename__ = "webhook_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    provider = Column(String(20), nullable=False)
+    # Handler name, e.g. "telnyx.sms_inbound"
+    kind = Column(String(50), nullable=False)
+    idempotency_key = Column(String(255), nullable=False)
+    # Events with the same key are processed in arrival order, e.g. "call:<id>"
+    ordering_key = Column(String(255), nullable=False)
+    payload = Column(JSON, nullable=False)
+
+    # Processing state: see WebhookEventStatus
+    status = Column(String(20), default="pending", nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_error = Column(Text, nullable=True)
+    processed_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("provider", "idempotency_key", name="uq_webhook_events_idempotency"),
+        Index("ix_webhook_events_status_next", "status", "next_attempt_at"),
+        Index("ix_webhook_events_ordering", "ordering_key", "id"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<WebhookEvent(id={self.id}, kind={self.kind}, "
+            f"status={self.status}, attempts={self.attempts})>"
+        )
+
+
+class WebhookEventStatus:
+    """Webhook event processing states."""
+    PENDING = "pending"
+    PROCESSING = "processing"
+    DONE = "done"
+    # Dead letter: failed webhook_ingest_max_attempts times; see requeue_dead
+    DEAD = "dead"
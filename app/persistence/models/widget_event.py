@@ -1,10 +1,12 @@
 """Widget event model for tracking widget engagement analytics."""
 
+import hashlib
+import json
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, JSON, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, JSON, String, text
+from sqlalchemy.orm import relationship, validates
 
 from app.persistence.database import Base
 
@@ -12,6 +14,13 @@ if TYPE_CHECKING:
     from app.persistence.models.tenant import Tenant
 
 
+def settings_hash(snapshot: dict | None) -> str | None:
+    """Stable 12-char variant key for a widget settings snapshot."""
+    if not snapshot:
+        return None
+    return hashlib.md5(json.dumps(snapshot, sort_keys=True).encode()).hexdigest()[:12]
+
+
 class WidgetEvent(Base):
     """Raw widget engagement events from client-side tracking."""
 
@@ -42,6 +51,8 @@ class WidgetEvent(Base):
     # Only populated on impression events to track which settings were active
     settings_snapshot = Column(JSON, nullable=True)
     # Examples: { colors: {...}, behavior: {...}, icon: {...}, attention: {...} }
+    # Variant key for grouping impressions, kept in sync with settings_snapshot
+    settings_hash = Column(String(12), nullable=True)
 
     # Device/browser info
     user_agent = Column(String(500), nullable=True)
@@ -57,7 +68,17 @@ class WidgetEvent(Base):
     # Composite index for efficient analytics queries
     __table_args__ = (
         Index("ix_widget_events_tenant_type_date", "tenant_id", "event_type", "created_at"),
+        Index(
+            "ix_widget_events_tenant_settings_hash",
+            "tenant_id", "created_at", "settings_hash", "visitor_id",
+            postgresql_where=text("event_type = 'impression' AND settings_hash IS NOT NULL"),
+        ),
     )
 
+    @validates("settings_snapshot")
+    def _sync_settings_hash(self, key: str, value: dict | None) -> dict | None:
+        self.settings_hash = settings_hash(value)
+        return value
+
     def __repr__(self) -> str:
         return f"<WidgetEvent(id={self.id}, tenant_id={self.tenant_id}, event_type={self.event_type})>"
@@ -1,8 +1,12 @@
 """Base repository with tenant-scoped queries."""
 
+from __future__ import annotations
+
 import logging
-from typing import Generic, TypeVar, Type
-from sqlalchemy import select
+from collections import defaultdict
+from typing import Any, Generic, Iterable, Sequence, TypeVar, Type
+from sqlalchemy import Integer, any_, bindparam, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.persistence.database import Base
@@ -12,6 +16,15 @@ logger = logging.getLogger(__name__)
 ModelType = TypeVar("ModelType", bound=Base)
 
 
+def any_of(ids: Iterable[int]):
+    """Right-hand side for ``column == any_of(ids)`` → ``column = ANY(:ids)``.
+
+    Binds the IDs as one array parameter, so statement size and plan
+    caching don't depend on how many IDs are passed (unlike IN).
+    """
+    return any_(literal(list(ids), ARRAY(Integer)))
+
+
 class BaseRepository(Generic[ModelType]):
     """Base repository with tenant-scoped query methods."""
 
@@ -100,6 +113,101 @@ class BaseRepository(Generic[ModelType]):
         )
         return instance
 
+    async def add(self, tenant_id: int | None, **data) -> ModelType:
+        """Create new entity without committing or refreshing.
+
+        For hot paths that commit once at the end of the unit of work. The
+        INSERT is flushed so the instance has its id; column defaults are set
+        client-side and the session doesn't expire on commit, so there is
+        nothing to refresh.
+        """
+        if tenant_id is not None:
+            data["tenant_id"] = tenant_id
+        instance = self.model(**data)
+        self.session.add(instance)
+        await self.session.flush()
+        return instance
+
+    async def create_many(
+        self, tenant_id: int | None, rows: Sequence[dict[str, Any]]
+    ) -> list[int]:
+        """Insert many rows in one statement; returns their ids in input order.
+
+        Rows go through a Core INSERT, so column defaults apply but
+        @validates hooks don't - set derived columns in the rows. The caller
+        commits.
+        """
+        if not rows:
+            return []
+        rows = self._with_tenant(tenant_id, rows)
+        stmt = insert(self.model).returning(self.model.id, sort_by_parameter_order=True)
+        result = await self.session.execute(stmt, rows)
+        return list(result.scalars())
+
+    async def update_many(self, tenant_id: int | None, rows: Sequence[dict[str, Any]]) -> None:
+        """Update many rows by primary key.
+
+        Each row needs an "id" plus the columns to set. Rows setting the same
+        columns share one executemany UPDATE; rows outside the tenant are left
+        untouched. Instances already loaded in the session are not refreshed.
+        The caller commits.
+        """
+        groups: dict[tuple[str, ...], list[dict[str, Any]]] = defaultdict(list)
+        for row in rows:
+            groups[tuple(sorted(key for key in row if key != "id"))].append(row)
+
+        mapper = self.model.__mapper__
+        for keys, group in groups.items():
+            table_update = update(mapper.local_table).where(mapper.c.id == bindparam("b_id"))
+            if tenant_id is not None:
+                table_update = table_update.where(mapper.c.tenant_id == tenant_id)
+            table_update = table_update.values(
+                {mapper.attrs[key].columns[0]: bindparam(f"b_{key}") for key in keys}
+            )
+            params = [
+                {"b_id": row["id"], **{f"b_{key}": row[key] for key in keys}} for row in group
+            ]
+            await self.session.execute(table_update, params)
+
+    async def upsert_many(
+        self,
+        tenant_id: int | None,
+        rows: Sequence[dict[str, Any]],
+        index_elements: Sequence[str],
+        update_columns: Sequence[str] | None = None,
+    ) -> list[int]:
+        """INSERT ... ON CONFLICT DO UPDATE for many rows in one statement.
+
+        Args:
+            tenant_id: Tenant ID set on every row (None for global tables)
+            rows: Rows to insert; all must have the same keys
+            index_elements: Columns of the unique index to conflict on
+            update_columns: Columns overwritten on conflict (default: every
+                non-key column in the rows)
+
+        Returns:
+            Ids of the inserted or updated rows. Conflict keys must be unique
+            within rows. The caller commits.
+        """
+        if not rows:
+            return []
+        rows = self._with_tenant(tenant_id, rows)
+        if update_columns is None:
+            update_columns = [k for k in rows[0] if k not in index_elements and k != "id"]
+        stmt = pg_insert(self.model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(index_elements),
+            set_={column: stmt.excluded[column] for column in update_columns},
+        ).returning(self.model.id)
+        result = await self.session.execute(stmt)
+        return list(result.scalars())
+
+    @staticmethod
+    def _with_tenant(tenant_id: int | None, rows: Sequence[dict[str, Any]]) -> list[dict[str, Any]]:
+        if tenant_id is None:
+            return list(rows)
+        return [{**row, "tenant_id": tenant_id} for row in rows]
+
     async def update(self, tenant_id: int | None, id: int, **data) -> ModelType | None:
         """Update entity, scoped to tenant."""
         instance = await self.get_by_id(tenant_id, id)
@@ -3,9 +3,10 @@
 from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_, func
+from sqlalchemy import select, or_, and_
 from sqlalchemy.orm import selectinload
 
+from app.core.phone import normalize_email, phone_match_key
 from app.persistence.models.contact import Contact
 from app.persistence.repositories.base import BaseRepository
 
@@ -96,10 +97,14 @@ class ContactRepository(BaseRepository[Contact]):
             return None
 
         conditions = []
-        if email:
-            conditions.append(Contact.email == email)
-        if phone:
-            conditions.append(Contact.phone == phone)
+        email_key = normalize_email(email)
+        if email_key:
+            conditions.append(Contact.email_normalized == email_key)
+        phone_key = phone_match_key(phone)
+        if phone_key:
+            conditions.append(Contact.phone_last10 == phone_key)
+        if not conditions:
+            return None
 
         stmt = (
             select(Contact)
@@ -156,7 +161,7 @@ class ContactRepository(BaseRepository[Contact]):
             select(Contact)
             .where(
                 Contact.tenant_id == tenant_id,
-                func.lower(Contact.email) == email.lower().strip(),
+                Contact.email_normalized == normalize_email(email),
                 Contact.deleted_at.is_(None),
                 Contact.merged_into_contact_id.is_(None)
             )
@@ -185,10 +190,14 @@ class ContactRepository(BaseRepository[Contact]):
             return []
 
         conditions = []
-        if email:
-            conditions.append(func.lower(Contact.email) == email.lower().strip())
-        if phone:
-            conditions.append(Contact.phone == phone)
+        email_key = normalize_email(email)
+        if email_key:
+            conditions.append(Contact.email_normalized == email_key)
+        phone_key = phone_match_key(phone)
+        if phone_key:
+            conditions.append(Contact.phone_last10 == phone_key)
+        if not conditions:
+            return []
 
         stmt = (
             select(Contact)
@@ -5,7 +5,7 @@ from datetime import datetime
 from sqlalchemy import select, or_, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.phone import normalize_phone_e164
+from app.core.phone import normalize_email, normalize_phone_e164, phone_match_key
 from app.persistence.models.customer import Customer
 from app.persistence.repositories.base import BaseRepository
 
@@ -30,10 +30,11 @@ class CustomerRepository(BaseRepository[Customer]):
         Returns:
             Customer or None if not found
         """
+        phone_key = phone_match_key(phone)
         stmt = select(Customer).where(
             Customer.tenant_id == tenant_id,
-            Customer.phone == phone,
-        )
+            Customer.phone_last10 == phone_key if phone_key else Customer.phone == phone,
+        ).order_by(Customer.id).limit(1)
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
@@ -74,8 +75,8 @@ class CustomerRepository(BaseRepository[Customer]):
         """
         stmt = select(Customer).where(
             Customer.tenant_id == tenant_id,
-            func.lower(Customer.email) == email.lower(),
-        )
+            Customer.email_normalized == normalize_email(email),
+        ).order_by(Customer.id).limit(1)
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
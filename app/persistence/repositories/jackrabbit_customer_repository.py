@@ -5,6 +5,7 @@ from datetime import datetime
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.phone import phone_match_key
 from app.persistence.models.jackrabbit_customer import JackrabbitCustomer
 from app.persistence.repositories.base import BaseRepository
 
@@ -29,10 +30,15 @@ class JackrabbitCustomerRepository(BaseRepository[JackrabbitCustomer]):
         Returns:
             Customer or None if not found
         """
+        phone_key = phone_match_key(phone_number)
         stmt = select(JackrabbitCustomer).where(
             JackrabbitCustomer.tenant_id == tenant_id,
-            JackrabbitCustomer.phone_number == phone_number,
-        )
+            (
+                JackrabbitCustomer.phone_last10 == phone_key
+                if phone_key
+                else JackrabbitCustomer.phone_number == phone_number
+            ),
+        ).order_by(JackrabbitCustomer.last_synced_at.desc()).limit(1)
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
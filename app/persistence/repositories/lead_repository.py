@@ -5,6 +5,7 @@ from __future__ import annotations
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_
 
+from app.core.phone import normalize_email, phone_match_key
 from app.persistence.models.lead import Lead
 from app.persistence.repositories.base import BaseRepository
 
@@ -83,10 +84,14 @@ class LeadRepository(BaseRepository[Lead]):
             return []
 
         conditions = []
-        if email:
-            conditions.append(Lead.email == email)
-        if phone:
-            conditions.append(Lead.phone == phone)
+        email_key = normalize_email(email)
+        if email_key:
+            conditions.append(Lead.email_normalized == email_key)
+        phone_key = phone_match_key(phone)
+        if phone_key:
+            conditions.append(Lead.phone_last10 == phone_key)
+        if not conditions:
+            return []
 
         stmt = (
             select(Lead)
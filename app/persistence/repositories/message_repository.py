@@ -1,7 +1,7 @@
 """Message repository."""
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select
 
 from app.persistence.models.conversation import Message
 from app.persistence.repositories.base import BaseRepository
@@ -36,8 +36,15 @@ class MessageRepository(BaseRepository[Message]):
         self, tenant_id: int, conversation_id: int
     ) -> int:
         """Get the next sequence number for a conversation."""
-        messages = await self.get_by_conversation(tenant_id, conversation_id)
-        if not messages:
-            return 1
-        return max(msg.sequence_number for msg in messages) + 1
+        from app.persistence.models.conversation import Conversation
+        stmt = (
+            select(func.coalesce(func.max(Message.sequence_number), 0) + 1)
+            .join(Conversation, Message.conversation_id == Conversation.id)
+            .where(
+                Message.conversation_id == conversation_id,
+                Conversation.tenant_id == tenant_id
+            )
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
 
@@ -11,9 +11,13 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 env_path = Path(__file__).parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
-def get_async_database_url() -> str:
-    """Get database URL converted for asyncpg driver."""
-    url = os.environ.get("DATABASE_URL", "")
+def get_async_database_url(url: str | None = None) -> str:
+    """Get database URL converted for asyncpg driver.
+
+    Converts the given URL, or DATABASE_URL when none is given.
+    """
+    if url is None:
+        url = os.environ.get("DATABASE_URL", "")
     # Convert postgres:// to postgresql+asyncpg:// for SQLAlchemy async
     if url.startswith("postgres://"):
         url = url.replace("postgres://", "postgresql+asyncpg://", 1)
@@ -37,12 +41,35 @@ class Settings(BaseSettings):
     gcp_project_id: str = "local-development"
     gcp_region: str = "us-central1"
     gcs_widget_assets_bucket: str = ""  # GCS bucket for widget assets (icons, images)
+    gcs_call_recordings_bucket: str = ""  # Private GCS bucket for mirrored call recordings (off if empty)
 
     # Cloud SQL (Postgres)
     database_url: str = ""
     cloud_sql_instance_connection_name: str | None = None
     cloud_sql_database_name: str = "chattercheatah"
 
+    # Connection pools. "session" suits Supabase session mode and direct
+    # connections; "transaction" is for transaction-mode poolers (PgBouncer,
+    # Supavisor :6543) - prepared statement caching is turned off and tenant
+    # context is set per transaction. The read pool serves analytics and
+    # dashboard routes so they can't starve chat and webhook traffic.
+    db_pool_mode: str = "session"
+    db_pool_size: int = 3
+    db_max_overflow: int = 2
+    db_pool_timeout: int = 10
+    db_pool_recycle: int = 180
+    db_read_pool_size: int = 2
+    db_read_max_overflow: int = 1
+    db_read_pool_timeout: int = 30
+
+    # Optional read replica for analytics/dashboard routes and worker scans.
+    # Reads go to the primary's read pool when no replica is configured, the
+    # replica can't be reached, or its replay lag exceeds the tolerance.
+    database_replica_url: str = ""
+    db_replica_max_lag_seconds: float = 30.0
+    db_replica_worker_max_lag_seconds: float = 300.0
+    db_replica_lag_check_interval_seconds: float = 15.0
+
     # Redis (optional)
     redis_url: str = "redis://localhost:6379/0"
     redis_host: str = "localhost"
@@ -57,6 +84,13 @@ class Settings(BaseSettings):
     # Field-level encryption (for API keys, tokens, secrets in database)
     # Generate with: python -c "from cryptography.fernet import Fernet; print(Fernet.generate_key().decode())"
     field_encryption_key: str | None = None
+    # Decrypted credentials are cached in-process (keyed by ciphertext hash) so
+    # provider construction doesn't run Fernet on every config read
+    credential_cache_ttl_seconds: int = 300
+    credential_cache_max_entries: int = 1024
+
+    # Crypto executor (bounded thread pool for bcrypt so logins don't block the event loop)
+    crypto_executor_max_workers: int = 4
 
     # LLM (Gemini) - optional for basic functionality
     gemini_api_key: str = ""
@@ -78,6 +112,23 @@ class Settings(BaseSettings):
     # Application
     environment: str = "development"
     log_level: str = "INFO"
+    # Log records are queued and written to stdout by a background thread;
+    # set log_async=False to write synchronously (e.g. when debugging startup)
+    log_async: bool = True
+    log_queue_size: int = 10000  # Records beyond this are dropped and counted
+    # Per call site sampling for INFO/DEBUG: after log_sample_burst records in
+    # a window, only every log_sample_every-th record is kept (0 disables)
+    log_sample_burst: int = 50
+    log_sample_window_seconds: float = 10.0
+    log_sample_every: int = 20
+    # Bearer token required by GET /metrics (empty = unauthenticated)
+    metrics_bearer_token: str = ""
+    # Per-request SQL profiling: attributes statements to the calling
+    # repository/service and warns when one statement shape repeats at least
+    # query_profiler_n_plus_one_threshold times (walks the stack per statement,
+    # so enable in staging/load tests rather than production)
+    query_profiler_enabled: bool = False
+    query_profiler_n_plus_one_threshold: int = 5
     sms_dedup_disabled: bool = False  # Set to True to disable SMS deduplication (for testing)
     api_v1_prefix: str = "/api/v1"
     api_base_url: str = ""  # Base URL for embed code generation (e.g., https://chattercheatah-900139201687.us-central1.run.app)
@@ -85,6 +136,65 @@ class Settings(BaseSettings):
     # Idempotency
     idempotency_ttl_seconds: int = 3600
 
+    # Tenant telephony config cache (per instance; local config writes invalidate
+    # immediately, the TTL bounds staleness for writes made on other instances)
+    telephony_config_cache_ttl_seconds: int = 60
+    sms_burst_config_cache_ttl_seconds: int = 60
+
+    # Drip campaigns: with batch dispatch enabled, steps are scheduled by
+    # next_step_at and sent by /workers/drip-dispatch instead of one Cloud
+    # Task per step. Claimed rows are leased for drip_dispatch_lease_seconds.
+    # Steps that can't be sent back off (lease * 2^n) and are cancelled after
+    # drip_dispatch_max_attempts.
+    drip_batch_dispatch_enabled: bool = False
+    drip_dispatch_batch_size: int = 200
+    drip_dispatch_send_concurrency: int = 10
+    drip_dispatch_lease_seconds: int = 600
+    drip_dispatch_max_attempts: int = 5
+
+    # Compliance gate (DNC + opt-in) cache in Redis. DNC/opt-in writes refresh
+    # the cached state immediately; the TTL bounds anything missed.
+    compliance_cache_ttl_seconds: int = 3600
+
+    # Dashboard activity rollups: tenants processed concurrently per worker run.
+    # Each tenant holds its own DB connection, so keep this below the pool size.
+    activity_rollup_tenant_concurrency: int = 2
+
+    # Streaming CSV/NDJSON exports: rows fetched per server-side cursor batch
+    export_batch_size: int = 1000
+
+    # Offline analytics export: Parquet snapshots of conversations, messages,
+    # calls, call summaries and leads, written under a local path or
+    # gs://bucket/prefix. Disabled when the URI is empty. When a BigQuery
+    # dataset is set, new files are loaded into it (needs a gs:// URI).
+    analytics_export_uri: str = ""
+    analytics_export_delay_minutes: int = 15
+    analytics_export_bigquery_dataset: str = ""
+
+    # Call recordings are resolved when viewed and the playback URL is cached
+    # in Redis until shortly before it expires. Telnyx URLs without an
+    # expiry are cached for call_recording_url_cache_ttl_seconds; signed URLs
+    # for mirrored recordings are valid for call_recording_signed_url_ttl_seconds.
+    call_recording_url_cache_ttl_seconds: int = 480
+    call_recording_signed_url_ttl_seconds: int = 3600
+
+    # Webhook inbox: when enabled, Telnyx call and inbound SMS webhooks are
+    # stored and acked immediately, then processed in the background in
+    # per-call / per-phone order. Events failing webhook_ingest_max_attempts
+    # times are dead-lettered. Processed events are deleted after
+    # webhook_event_retention_days; provider retries of an event are only
+    # deduplicated within that window.
+    webhook_ingest_enabled: bool = False
+    webhook_ingest_max_attempts: int = 5
+    webhook_ingest_concurrency: int = 4
+    # Events still "processing" after twice this are presumed orphaned
+    webhook_event_handler_timeout_seconds: int = 300
+    webhook_event_retention_days: int = 3
+
+    # Admin notification outbox: concurrent deliveries per channel per instance
+    notification_email_concurrency: int = 10
+    notification_sms_concurrency: int = 4
+
     # Telnyx (Voice AI)
     telnyx_api_key: str | None = None  # Global Telnyx API key for AI conversation fetching
 
@@ -128,6 +238,7 @@ class Settings(BaseSettings):
     zapier_signature_header: str = "X-Zapier-Signature"  # Header for HMAC signature
     customer_service_cache_ttl_seconds: int = 3600  # 1 hour cache for Jackrabbit customers
     customer_lookup_retry_count: int = 2  # Number of retries for failed lookups
+    jackrabbit_sync_batch_size: int = 500  # Families per upsert statement in bulk sync
 
     # Admin Alerting (for GLOBAL system-wide issues only)
     # Per-tenant alerts use escalation_settings in TenantPromptConfig:
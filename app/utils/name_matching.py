@@ -0,0 +1,76 @@
+"""Name keys and similarity for duplicate-contact detection."""
+
+import re
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+_NON_ALPHA = re.compile(r"[^a-z ]+")
+
+
+def _name_tokens(name: str | None) -> list[str]:
+    if not name:
+        return []
+    return _NON_ALPHA.sub(" ", name.lower()).split()
+
+
+def soundex(word: str) -> str:
+    """American Soundex code (e.g. "Robert" → "R163")."""
+    word = _NON_ALPHA.sub("", word.lower()).replace(" ", "")
+    if not word:
+        return ""
+
+    code = word[0].upper()
+    previous = _SOUNDEX_CODES.get(word[0], "")
+    for char in word[1:]:
+        digit = _SOUNDEX_CODES.get(char, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        # h/w do not separate letters with the same code; vowels do
+        if char not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def name_block_key(name: str | None) -> str | None:
+    """Blocking key for fuzzy name matches.
+
+    First initial plus the Soundex code of the last name token, so
+    "Jon Smith", "John Smyth" and "J. Smith" share the key "j:S530".
+    Single-token names use the token's Soundex code alone.
+
+    Returns:
+        Key string, or None when the name has no letters
+    """
+    tokens = _name_tokens(name)
+    if not tokens:
+        return None
+    if len(tokens) == 1:
+        return soundex(tokens[0])
+    return f"{tokens[0][0]}:{soundex(tokens[-1])}"
+
+
+def trigrams(name: str | None) -> set[str]:
+    """Word trigrams in the style of pg_trgm (each word padded "  w ")."""
+    grams: set[str] = set()
+    for token in _name_tokens(name):
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def name_similarity(a: str | None, b: str | None) -> float:
+    """Trigram similarity between two names (0.0 to 1.0), like pg_trgm."""
+    grams_a = trigrams(a)
+    grams_b = trigrams(b)
+    if not grams_a or not grams_b:
+        return 0.0
+    return len(grams_a & grams_b) / len(grams_a | grams_b)
@@ -0,0 +1,42 @@
+"""Analytics export worker.
+
+Runs nightly via Cloud Tasks. Appends new and changed conversations,
+messages, calls, call summaries and leads to the partitioned Parquet
+export (and optionally BigQuery), so offline analysis doesn't query the
+application database.
+"""
+
+import logging
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.services.analytics_export_service import AnalyticsExportService
+from app.infrastructure.analytics_export_storage import BigQueryLoader, ParquetSink
+from app.persistence.database import get_db
+from app.settings import settings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.post("/export-analytics")
+async def export_analytics_task(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> dict[str, Any]:
+    """Export rows changed since the last run.
+
+    Does nothing unless analytics_export_uri is configured.
+    """
+    if not settings.analytics_export_uri:
+        logger.info("Analytics export skipped: analytics_export_uri not configured")
+        return {"skipped": True, "exported": {}}
+
+    loader = None
+    if settings.analytics_export_bigquery_dataset:
+        loader = BigQueryLoader(settings.analytics_export_bigquery_dataset, settings.analytics_export_uri)
+    service = AnalyticsExportService(db, ParquetSink(settings.analytics_export_uri), loader)
+    exported = await service.run()
+    return {"skipped": False, "exported": exported}
@@ -1,7 +1,9 @@
 """CHI computation worker.
 
 Runs daily via Cloud Tasks. Computes Customer Happiness Index scores
-for recent conversations that haven't been scored yet.
+for recent conversations that haven't been scored yet. The scans for
+unscored conversations run on the read replica when it is within
+db_replica_worker_max_lag_seconds; scores are written to the primary.
 """
 
 import logging
@@ -13,7 +15,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.services.chi_service import CHIService
-from app.persistence.database import get_db
+from app.persistence.database import get_db, read_session
 from app.persistence.models.conversation import Conversation
 from app.persistence.models.tenant import Tenant
 
@@ -35,8 +37,9 @@ async def compute_chi_task(
 
     # Get active tenants
     tenant_stmt = select(Tenant.id).where(Tenant.is_active.is_(True))
-    tenant_result = await db.execute(tenant_stmt)
-    tenant_ids = [r[0] for r in tenant_result.all()]
+    async with read_session() as reader:
+        tenant_result = await reader.execute(tenant_stmt)
+        tenant_ids = [r[0] for r in tenant_result.all()]
 
     total_scored = 0
     errors = 0
@@ -70,8 +73,9 @@ async def _compute_for_tenant(
         .order_by(Conversation.created_at.desc())
         .limit(500)  # Process max 500 per tenant per run
     )
-    result = await db.execute(stmt)
-    conversation_ids = [r[0] for r in result.all()]
+    async with read_session() as reader:
+        result = await reader.execute(stmt)
+        conversation_ids = [r[0] for r in result.all()]
 
     if not conversation_ids:
         return 0
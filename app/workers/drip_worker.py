@@ -3,11 +3,12 @@
 import logging
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.services.drip_campaign_service import DripCampaignService
+from app.domain.services.drip_dispatcher import DripDispatcher
 from app.persistence.database import get_db
 
 logger = logging.getLogger(__name__)
@@ -57,3 +58,19 @@ async def process_drip_step(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Drip step processing failed: {str(e)}",
         )
+
+
+@router.post("/drip-dispatch")
+async def dispatch_due_drip_steps(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    batch_size: int | None = Query(None, ge=1, le=1000),
+) -> dict[str, Any]:
+    """Send all due drip steps in batches.
+
+    Called every minute by Cloud Scheduler when drip_batch_dispatch_enabled
+    is set (steps are then scheduled by next_step_at rather than as
+    individual /drip-step tasks). Safe to run concurrently.
+    """
+    outcomes = await DripDispatcher(db).dispatch(batch_size)
+    logger.info(f"Drip dispatch complete: {outcomes}")
+    return outcomes
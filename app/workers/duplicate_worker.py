@@ -0,0 +1,44 @@
+"""Duplicate-contact detection sweep.
+
+Runs every few minutes via Cloud Tasks. Re-scores contacts flagged
+dedup_pending (new, edited, deleted or merged) and rebuilds the duplicate
+clusters around them. After the initial backfill each run only touches
+the contacts that changed since the last one.
+"""
+
+import logging
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.services.duplicate_detection_service import (
+    REFRESH_BATCH_SIZE,
+    DuplicateDetectionService,
+)
+from app.persistence.database import get_db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.post("/refresh-contact-duplicates")
+async def refresh_contact_duplicates_task(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    max_batches: int = Query(20, ge=1, le=500),
+) -> dict[str, Any]:
+    """Process pending contacts in batches of REFRESH_BATCH_SIZE.
+
+    Called every 5 minutes by Cloud Tasks.
+    """
+    service = DuplicateDetectionService(db)
+    processed = 0
+    for _ in range(max_batches):
+        count = await service.refresh_pending()
+        processed += count
+        if count < REFRESH_BATCH_SIZE:
+            break
+
+    logger.info(f"Duplicate detection sweep processed {processed} contacts")
+    return {"processed": processed}
@@ -10,8 +10,8 @@ from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.domain.services.compliance_gate import ComplianceGate
 from app.domain.services.conversation_service import ConversationService
-from app.domain.services.dnc_service import DncService
 from app.domain.services.followup_message_service import FollowUpMessageService
 from app.domain.services.opt_in_service import OptInService
 from app.infrastructure.telephony.factory import TelephonyProviderFactory
@@ -86,17 +86,14 @@ async def process_followup_task(
         if defer_result is not None:
             return defer_result
 
-        # Check Do Not Contact list - skip if blocked
-        dnc_service = DncService(db)
-        if await dnc_service.is_blocked(payload.tenant_id, phone=payload.phone_number):
+        # Check Do Not Contact list and opt-in status in one lookup
+        compliance = await ComplianceGate(db).check(payload.tenant_id, payload.phone_number)
+        if compliance.is_blocked:
             logger.info(f"DNC block - skipping follow-up for {payload.phone_number}")
             return {"status": "skipped", "reason": "do_not_contact"}
 
-        # Check opt-in status
-        opt_in_service = OptInService(db)
-        is_opted_in = await opt_in_service.is_opted_in(payload.tenant_id, payload.phone_number)
-
-        if not is_opted_in:
+        if not compliance.allowed:
+            opt_in_service = OptInService(db)
             # For leads from voice calls or email inquiries, consider implied consent
             # (they provided their phone number expecting to be contacted)
             source = lead.extra_data.get("source") if lead.extra_data else None
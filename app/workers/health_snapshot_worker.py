@@ -1,18 +1,23 @@
 """Health snapshot worker for pre-computing communications metrics.
 
 Runs hourly via Cloud Tasks. Aggregates operational data into
-communications_health_snapshots for fast dashboard queries.
+communications_health_snapshots and activity_rollups for fast dashboard
+queries. Snapshot aggregates are read from the read replica when it has
+caught up past the end of the hour being computed.
 """
 
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta
 from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.persistence.database import get_db
+from app.domain.services.activity_rollup_service import ActivityRollupService
+from app.persistence.database import async_session_factory, get_db, read_session
 from app.persistence.models.anomaly_alert import AnomalyAlert
 from app.persistence.models.call import Call
 from app.persistence.models.communications_health_snapshot import (
@@ -21,6 +26,7 @@ from app.persistence.models.communications_health_snapshot import (
 from app.persistence.models.conversation import Conversation, Message
 from app.persistence.models.escalation import Escalation
 from app.persistence.models.tenant import Tenant
+from app.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -38,9 +44,12 @@ SHORT_CALL_PCT = 40
 async def compute_health_snapshot_task(
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> dict[str, Any]:
-    """Compute health snapshots for all active tenants for the previous hour.
+    """Compute health snapshots and activity rollups for all active tenants.
 
-    Called hourly by Cloud Tasks.
+    Called hourly by Cloud Tasks. Snapshots cover the previous hour; activity
+    rollups are rolled forward from each tenant's watermark. Tenants are
+    processed concurrently (bounded by activity_rollup_tenant_concurrency),
+    each on its own session.
     """
     now = datetime.utcnow()
     # Compute for the hour that just ended
@@ -48,26 +57,15 @@ async def compute_health_snapshot_task(
     hour_start = hour_end - timedelta(hours=1)
     snapshot_hour = hour_start.hour
 
-    # Get all active tenants
-    tenant_stmt = select(Tenant.id).where(Tenant.is_active.is_(True))
-    tenant_result = await db.execute(tenant_stmt)
-    tenant_ids = [r[0] for r in tenant_result.all()]
+    tenant_ids = await _get_active_tenant_ids(db)
 
-    processed = 0
-    errors = 0
+    async def process(session: AsyncSession, tenant_id: int) -> None:
+        await _compute_for_tenant(
+            session, tenant_id, hour_start, hour_end, snapshot_hour
+        )
+        await ActivityRollupService(session).refresh_tenant(tenant_id, now=now)
 
-    for tenant_id in tenant_ids:
-        try:
-            await _compute_for_tenant(
-                db, tenant_id, hour_start, hour_end, snapshot_hour
-            )
-            processed += 1
-        except Exception as e:
-            logger.error(
-                f"Health snapshot failed for tenant {tenant_id}: {e}",
-                exc_info=True,
-            )
-            errors += 1
+    processed, errors = await _run_for_tenants(tenant_ids, process, "Health snapshot")
 
     logger.info(
         f"Health snapshot complete: {processed} tenants processed, {errors} errors"
@@ -75,6 +73,69 @@ async def compute_health_snapshot_task(
     return {"processed": processed, "errors": errors, "hour": snapshot_hour}
 
 
+@router.post("/backfill-activity-rollups")
+async def backfill_activity_rollups_task(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    days: int = Query(30, ge=1, le=400),
+    tenant_id: int | None = Query(None),
+) -> dict[str, Any]:
+    """Rebuild activity rollups for the last N days.
+
+    Use after data repairs or imports that wrote historical calls/messages.
+    Defaults to all active tenants.
+    """
+    end = datetime.utcnow()
+    start = end - timedelta(days=days)
+    tenant_ids = [tenant_id] if tenant_id is not None else await _get_active_tenant_ids(db)
+
+    async def process(session: AsyncSession, tid: int) -> None:
+        await ActivityRollupService(session).backfill(tid, start, end)
+
+    processed, errors = await _run_for_tenants(tenant_ids, process, "Activity rollup backfill")
+
+    logger.info(
+        f"Activity rollup backfill complete: {processed} tenants processed, {errors} errors"
+    )
+    return {"processed": processed, "errors": errors, "days": days}
+
+
+async def _get_active_tenant_ids(db: AsyncSession) -> list[int]:
+    tenant_stmt = select(Tenant.id).where(Tenant.is_active.is_(True))
+    tenant_result = await db.execute(tenant_stmt)
+    return [r[0] for r in tenant_result.all()]
+
+
+async def _run_for_tenants(
+    tenant_ids: list[int],
+    process: Callable[[AsyncSession, int], Awaitable[None]],
+    label: str,
+) -> tuple[int, int]:
+    """Run process(session, tenant_id) for each tenant with bounded concurrency.
+
+    Returns:
+        (processed, errors) counts
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.activity_rollup_tenant_concurrency))
+
+    async def run_one(tenant_id: int) -> bool:
+        async with semaphore:
+            async with async_session_factory() as session:
+                try:
+                    await process(session, tenant_id)
+                    return True
+                except Exception as e:
+                    await session.rollback()
+                    logger.error(
+                        f"{label} failed for tenant {tenant_id}: {e}",
+                        exc_info=True,
+                    )
+                    return False
+
+    results = await asyncio.gather(*(run_one(tid) for tid in tenant_ids))
+    processed = sum(1 for ok in results if ok)
+    return processed, len(results) - processed
+
+
 async def _compute_for_tenant(
     db: AsyncSession,
     tenant_id: int,
@@ -83,88 +144,91 @@ async def _compute_for_tenant(
     snapshot_hour: int,
 ) -> None:
     """Compute and store metrics for one tenant for one hour."""
-    # --- Calls ---
-    call_stmt = select(Call).where(
-        Call.tenant_id == tenant_id,
-        Call.started_at >= hour_start,
-        Call.started_at < hour_end,
-    )
-    call_result = await db.execute(call_stmt)
-    calls = list(call_result.scalars().all())
-
-    total_calls = len(calls)
-    inbound_calls = sum(1 for c in calls if c.direction == "inbound")
-    outbound_calls = sum(1 for c in calls if c.direction == "outbound")
-
-    durations = [c.duration for c in calls if c.duration is not None]
-    total_minutes = sum(durations) / 60 if durations else 0.0
-    avg_dur = sum(durations) / len(durations) if durations else 0.0
-    sorted_dur = sorted(durations)
-    median_dur = sorted_dur[len(sorted_dur) // 2] if sorted_dur else 0.0
-    short_calls = sum(1 for d in durations if d < 30)
-    long_calls = sum(1 for d in durations if d > 600)
-    dropped = sum(1 for c in calls if c.status in ("no-answer", "busy", "canceled"))
-    failed_calls = sum(1 for c in calls if c.status == "failed")
-
-    # --- SMS ---
-    sms_stmt = (
-        select(Message.role, func.count())
-        .join(Conversation)
-        .where(
-            Conversation.tenant_id == tenant_id,
-            Conversation.channel == "sms",
-            Message.created_at >= hour_start,
-            Message.created_at < hour_end,
+    # Aggregates read from the replica only once it has replayed past hour_end
+    replica_max_lag = (datetime.utcnow() - hour_end).total_seconds()
+    async with read_session(max_lag_seconds=replica_max_lag) as reader:
+        # --- Calls ---
+        call_stmt = select(Call).where(
+            Call.tenant_id == tenant_id,
+            Call.started_at >= hour_start,
+            Call.started_at < hour_end,
         )
-        .group_by(Message.role)
-    )
-    sms_result = await db.execute(sms_stmt)
-    sms_counts = dict(sms_result.all())
-    inbound_sms = sms_counts.get("user", 0)
-    outbound_sms = sms_counts.get("assistant", 0)
-
-    # --- Email ---
-    email_stmt = (
-        select(Message.role, func.count())
-        .join(Conversation)
-        .where(
-            Conversation.tenant_id == tenant_id,
-            Conversation.channel == "email",
-            Message.created_at >= hour_start,
-            Message.created_at < hour_end,
+        call_result = await reader.execute(call_stmt)
+        calls = list(call_result.scalars().all())
+
+        total_calls = len(calls)
+        inbound_calls = sum(1 for c in calls if c.direction == "inbound")
+        outbound_calls = sum(1 for c in calls if c.direction == "outbound")
+
+        durations = [c.duration for c in calls if c.duration is not None]
+        total_minutes = sum(durations) / 60 if durations else 0.0
+        avg_dur = sum(durations) / len(durations) if durations else 0.0
+        sorted_dur = sorted(durations)
+        median_dur = sorted_dur[len(sorted_dur) // 2] if sorted_dur else 0.0
+        short_calls = sum(1 for d in durations if d < 30)
+        long_calls = sum(1 for d in durations if d > 600)
+        dropped = sum(1 for c in calls if c.status in ("no-answer", "busy", "canceled"))
+        failed_calls = sum(1 for c in calls if c.status == "failed")
+
+        # --- SMS ---
+        sms_stmt = (
+            select(Message.role, func.count())
+            .join(Conversation)
+            .where(
+                Conversation.tenant_id == tenant_id,
+                Conversation.channel == "sms",
+                Message.created_at >= hour_start,
+                Message.created_at < hour_end,
+            )
+            .group_by(Message.role)
         )
-        .group_by(Message.role)
-    )
-    email_result = await db.execute(email_stmt)
-    email_counts = dict(email_result.all())
-    inbound_emails = email_counts.get("user", 0)
-    outbound_emails = email_counts.get("assistant", 0)
-
-    # --- Bot vs Human ---
-    conv_stmt = (
-        select(func.count())
-        .select_from(Conversation)
-        .where(
-            Conversation.tenant_id == tenant_id,
-            Conversation.created_at >= hour_start,
-            Conversation.created_at < hour_end,
+        sms_result = await reader.execute(sms_stmt)
+        sms_counts = dict(sms_result.all())
+        inbound_sms = sms_counts.get("user", 0)
+        outbound_sms = sms_counts.get("assistant", 0)
+
+        # --- Email ---
+        email_stmt = (
+            select(Message.role, func.count())
+            .join(Conversation)
+            .where(
+                Conversation.tenant_id == tenant_id,
+                Conversation.channel == "email",
+                Message.created_at >= hour_start,
+                Message.created_at < hour_end,
+            )
+            .group_by(Message.role)
         )
-    )
-    conv_result = await db.execute(conv_stmt)
-    total_convs = conv_result.scalar() or 0
-
-    esc_stmt = (
-        select(func.count())
-        .select_from(Escalation)
-        .where(
-            Escalation.tenant_id == tenant_id,
-            Escalation.created_at >= hour_start,
-            Escalation.created_at < hour_end,
+        email_result = await reader.execute(email_stmt)
+        email_counts = dict(email_result.all())
+        inbound_emails = email_counts.get("user", 0)
+        outbound_emails = email_counts.get("assistant", 0)
+
+        # --- Bot vs Human ---
+        conv_stmt = (
+            select(func.count())
+            .select_from(Conversation)
+            .where(
+                Conversation.tenant_id == tenant_id,
+                Conversation.created_at >= hour_start,
+                Conversation.created_at < hour_end,
+            )
         )
-    )
-    esc_result = await db.execute(esc_stmt)
-    escalated = esc_result.scalar() or 0
-    bot_handled = max(0, total_convs - escalated)
+        conv_result = await reader.execute(conv_stmt)
+        total_convs = conv_result.scalar() or 0
+
+        esc_stmt = (
+            select(func.count())
+            .select_from(Escalation)
+            .where(
+                Escalation.tenant_id == tenant_id,
+                Escalation.created_at >= hour_start,
+                Escalation.created_at < hour_end,
+            )
+        )
+        esc_result = await reader.execute(esc_stmt)
+        escalated = esc_result.scalar() or 0
+        bot_handled = max(0, total_convs - escalated)
 
     # --- Upsert snapshot ---
     existing_stmt = select(CommunicationsHealthSnapshot).where(
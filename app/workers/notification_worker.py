@@ -0,0 +1,33 @@
+"""Notification outbox sweep.
+
+Runs every minute via Cloud Tasks. Sends admin email/SMS deliveries that
+are due for retry, and recovers deliveries left in "sending" by an
+instance that died mid-dispatch. First attempts are dispatched in-process
+right after the notification is written.
+"""
+
+import logging
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.notification_dispatcher import notification_dispatcher
+from app.persistence.database import get_db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.post("/dispatch-notifications")
+async def dispatch_notifications_task(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> dict[str, Any]:
+    """Dispatch due notification deliveries from the outbox.
+
+    Called every minute by Cloud Tasks.
+    """
+    counts = await notification_dispatcher.dispatch(db)
+    logger.info(f"Notification sweep complete: {counts}")
+    return counts
@@ -2,7 +2,9 @@
 
 Runs daily via Cloud Tasks. Classifies topics for recent conversations
 that haven't been classified yet, populating conversations.topic for
-the analytics histogram.
+the analytics histogram. Conversations are scanned and read on the read
+replica when it is within db_replica_worker_max_lag_seconds; topics are
+written to the primary.
 """
 
 import logging
@@ -14,7 +16,7 @@ from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.domain.services.topic_classifier import TopicClassifier
-from app.persistence.database import get_db
+from app.persistence.database import get_db, read_session
 from app.persistence.models.call import Call
 from app.persistence.models.call_summary import CallSummary
 from app.persistence.models.conversation import Conversation, Message
@@ -48,8 +50,9 @@ async def compute_topics_task(
 
     # Get active tenants
     tenant_stmt = select(Tenant.id).where(Tenant.is_active.is_(True))
-    tenant_result = await db.execute(tenant_stmt)
-    tenant_ids = [r[0] for r in tenant_result.all()]
+    async with read_session() as reader:
+        tenant_result = await reader.execute(tenant_stmt)
+        tenant_ids = [r[0] for r in tenant_result.all()]
 
     total_classified = 0
     errors = 0
@@ -72,6 +75,17 @@ async def _classify_for_tenant(
     cutoff: datetime,
 ) -> int:
     """Classify topics for unclassified conversations of a single tenant."""
+    async with read_session() as reader:
+        return await _classify_conversations(db, reader, tenant_id, cutoff)
+
+
+async def _classify_conversations(
+    db: AsyncSession,
+    reader: AsyncSession,
+    tenant_id: int,
+    cutoff: datetime,
+) -> int:
+    """Classify with reads on reader and topic updates on db."""
     # Find unclassified conversations with at least 1 user message
     conv_with_messages = (
         select(Conversation.id)
@@ -83,7 +97,7 @@ async def _classify_for_tenant(
         .order_by(Conversation.created_at.desc())
         .limit(500)
     )
-    result = await db.execute(conv_with_messages)
+    result = await reader.execute(conv_with_messages)
     conversation_ids = [r[0] for r in result.all()]
 
     if not conversation_ids:
@@ -97,7 +111,7 @@ async def _classify_for_tenant(
         batch_ids = conversation_ids[i : i + 50]
 
         for conv_id in batch_ids:
-            topic = await _classify_single(db, conv_id, tenant_id, classifier)
+            topic = await _classify_single(reader, conv_id, tenant_id, classifier)
             if topic:
                 await db.execute(
                     update(Conversation)
@@ -0,0 +1,48 @@
+"""Webhook inbox sweep.
+
+Runs every minute via Cloud Tasks. Processes stored webhook events that
+are due for retry, recovers events left in "processing" by an instance
+that died mid-dispatch, and deletes processed events past their retention.
+First attempts are dispatched in-process right after the event is stored.
+"""
+
+import logging
+from typing import Annotated, Any
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.webhook_event_dispatcher import webhook_event_dispatcher
+from app.persistence.database import get_db
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.post("/dispatch-webhook-events")
+async def dispatch_webhook_events_task(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> dict[str, Any]:
+    """Process due webhook events from the inbox.
+
+    Called every minute by Cloud Tasks.
+    """
+    counts = await webhook_event_dispatcher.dispatch(db)
+    purged = await webhook_event_dispatcher.purge_done(db)
+    logger.info(f"Webhook event sweep complete: {counts}, purged {purged}")
+    return {**counts, "purged": purged}
+
+
+@router.post("/requeue-webhook-events")
+async def requeue_webhook_events_task(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    event_id: Annotated[list[int] | None, Query()] = None,
+) -> dict[str, Any]:
+    """Move dead-lettered webhook events back to pending.
+
+    Requeues the given event_id values, or every dead event if none are
+    given. They are processed by the next sweep.
+    """
+    requeued = await webhook_event_dispatcher.requeue_dead(db, event_id)
+    return {"requeued": requeued}
@@ -94,14 +94,14 @@ export default function Calls() {
   // Fetch fresh recording URL when a call with a recording is selected
   useEffect(() => {
     setRecordingUrl(null);
-    if (!selectedCall?.recording_url) return;
+    if (!selectedCall?.has_recording) return;
 
     let cancelled = false;
     api.getCallRecordingUrl(selectedCall.id)
       .then(data => { if (!cancelled) setRecordingUrl(data.url); })
       .catch(() => {}); // Silently fail — recording section just won't show
     return () => { cancelled = true; };
-  }, [selectedCall?.id, selectedCall?.recording_url]);
+  }, [selectedCall?.id, selectedCall?.has_recording]);
 
   const fetchCalls = useCallback(async () => {
     try {
@@ -214,7 +214,7 @@ export default function Calls() {
                       <td className="name-cell">{call.summary?.extracted_fields?.name || '—'}</td>
                       <td className="duration-cell">{formatDuration(call.duration)}</td>
                       <td className="recording-cell">
-                        {call.recording_url && (
+                        {call.has_recording && (
                           <Mic size={16} className="recording-icon" title="Recording available" />
                         )}
                       </td>
@@ -255,9 +255,9 @@ export default function Calls() {
             <div className="call-modal-header">
               <h2>Call Details</h2>
               <div className="call-modal-actions">
-                {selectedCall?.recording_url && (
+                {recordingUrl && (
                   <a
-                    href={selectedCall.recording_url}
+                    href={recordingUrl}
                     target="_blank"
                     rel="noopener noreferrer"
                     className="btn-modal-link"
@@ -385,7 +385,7 @@ export default function Calls() {
                 );
               })()}
 
-              {selectedCall.recording_url && (
+              {selectedCall.has_recording && (
                 <div className="call-recording-section">
                   <h3>Recording</h3>
                   {recordingUrl ? (
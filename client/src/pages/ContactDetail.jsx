@@ -48,6 +48,7 @@ export default function ContactDetail() {
   const [calls, setCalls] = useState([]);
   const [loadingCalls, setLoadingCalls] = useState(true);
   const [selectedCall, setSelectedCall] = useState(null);
+  const [recordingUrl, setRecordingUrl] = useState(null);
   const [emailConversations, setEmailConversations] = useState([]);
   const [loadingEmails, setLoadingEmails] = useState(true);
   const [dncStatus, setDncStatus] = useState({ is_blocked: false, record: null });
@@ -72,6 +73,18 @@ export default function ContactDetail() {
     }
   }, [id]);
 
+  // Fetch a playable recording URL when a call with a recording is selected
+  useEffect(() => {
+    setRecordingUrl(null);
+    if (!selectedCall?.has_recording) return;
+
+    let cancelled = false;
+    api.getCallRecordingUrl(selectedCall.id)
+      .then(data => { if (!cancelled) setRecordingUrl(data.url); })
+      .catch(() => {}); // Silently fail — the link just won't show
+    return () => { cancelled = true; };
+  }, [selectedCall?.id, selectedCall?.has_recording]);
+
   // Fetch DNC status when contact loads
   useEffect(() => {
     if (contact?.phone || contact?.email) {
@@ -616,10 +629,10 @@ export default function ContactDetail() {
                   <p>{selectedCall.summary_preview}</p>
                 </div>
               )}
-              {selectedCall.recording_url && (
+              {recordingUrl && (
                 <div className="call-detail-recording">
                   <a
-                    href={selectedCall.recording_url}
+                    href={recordingUrl}
                     target="_blank"
                     rel="noopener noreferrer"
                     className="btn-listen"
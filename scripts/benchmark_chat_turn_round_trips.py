@@ -0,0 +1,147 @@
+"""Benchmark database round trips per chat turn.
+
+A chat turn stores the user's message and the assistant's reply. Compares:
+
+- before: BaseRepository.create for each message (INSERT, COMMIT, then a
+  refresh SELECT), with the next sequence number found by loading every
+  message in the conversation
+- after: ConversationService.add_message, which flushes through
+  BaseRepository.add (no refresh) and reads the sequence number with MAX()
+
+It also compares storing a batch of messages (e.g. an imported transcript)
+with one create() per message against a single create_many().
+
+Round trips are statements plus COMMITs. Runs against DATABASE_URL and
+deletes the tenant it creates.
+
+Usage:
+    python scripts/benchmark_chat_turn_round_trips.py [turns] [batch_size]
+"""
+
+import asyncio
+import sys
+import time
+import uuid
+from unittest.mock import patch
+
+from sqlalchemy import delete, event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.query_profiler import instrument, profile_queries
+from app.domain.services.conversation_service import ConversationService
+from app.persistence.models.conversation import Conversation, Message
+from app.persistence.models.tenant import Tenant
+from app.persistence.repositories.conversation_repository import ConversationRepository
+from app.persistence.repositories.message_repository import MessageRepository
+from app.settings import get_async_database_url
+
+
+async def add_message_before(
+    session: AsyncSession, tenant_id: int, conversation_id: int, role: str, content: str
+) -> Message:
+    """add_message as it was: full history load for the sequence, create() with refresh."""
+    await ConversationRepository(session).get_by_id(tenant_id, conversation_id)
+    message_repo = MessageRepository(session)
+    history = await message_repo.get_by_conversation(tenant_id, conversation_id)
+    sequence_number = max((m.sequence_number for m in history), default=0) + 1
+    return await message_repo.create(
+        None,
+        conversation_id=conversation_id,
+        role=role,
+        content=content,
+        sequence_number=sequence_number,
+    )
+
+
+async def add_message_after(
+    session: AsyncSession, tenant_id: int, conversation_id: int, role: str, content: str
+) -> Message:
+    return await ConversationService(session).add_message(tenant_id, conversation_id, role, content)
+
+
+class RoundTripCounter:
+    """Counts COMMITs on a session (statements come from the query profiler)."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.commits = 0
+        event.listen(session.sync_session, "after_commit", self._on_commit)
+
+    def _on_commit(self, session) -> None:
+        self.commits += 1
+
+
+async def run_turns(session, tenant_id, add_message, turns: int) -> tuple[int, float]:
+    conversation = await ConversationRepository(session).create(tenant_id, channel="web")
+    counter = RoundTripCounter(session)
+    start = time.perf_counter()
+    with profile_queries("chat turns") as profile:
+        for turn in range(turns):
+            await add_message(session, tenant_id, conversation.id, "user", f"Question {turn}")
+            await add_message(session, tenant_id, conversation.id, "assistant", f"Answer {turn}")
+    elapsed = time.perf_counter() - start
+    return profile.count + counter.commits, elapsed
+
+
+async def run_batch(session, tenant_id, batch_size: int, use_create_many: bool) -> tuple[int, float]:
+    conversation = await ConversationRepository(session).create(tenant_id, channel="web")
+    rows = [
+        {"conversation_id": conversation.id, "role": "user", "content": f"Line {n}", "sequence_number": n + 1}
+        for n in range(batch_size)
+    ]
+    message_repo = MessageRepository(session)
+    counter = RoundTripCounter(session)
+    start = time.perf_counter()
+    with profile_queries("message batch") as profile:
+        if use_create_many:
+            await message_repo.create_many(None, rows)
+            await session.commit()
+        else:
+            for row in rows:
+                await message_repo.create(None, **row)
+    elapsed = time.perf_counter() - start
+    return profile.count + counter.commits, elapsed
+
+
+async def main(turns: int, batch_size: int) -> None:
+    engine = create_async_engine(get_async_database_url())
+    remove = instrument(engine.sync_engine)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        tenant = Tenant(name="Round trip benchmark", subdomain=f"bench-{uuid.uuid4().hex[:8]}")
+        session.add(tenant)
+        await session.commit()
+        tenant_id = tenant.id
+
+    print(f"Chat turns: {turns} (user message + assistant reply each)")
+    try:
+        # Notifications are the same on both paths and not what's measured
+        with patch.object(ConversationService, "_maybe_notify_new_message"):
+            for label, add_message in [("before", add_message_before), ("after", add_message_after)]:
+                async with session_factory() as session:
+                    round_trips, elapsed = await run_turns(session, tenant_id, add_message, turns)
+                print(
+                    f"  {label:<7} {round_trips / turns:5.1f} round trips/turn  "
+                    f"{elapsed / turns * 1000:7.2f} ms/turn"
+                )
+
+        print(f"Storing {batch_size} messages")
+        for label, use_create_many in [("create", False), ("create_many", True)]:
+            async with session_factory() as session:
+                round_trips, elapsed = await run_batch(session, tenant_id, batch_size, use_create_many)
+            print(f"  {label:<12} {round_trips:5d} round trips  {elapsed * 1000:8.2f} ms")
+    finally:
+        async with session_factory() as session:
+            conversation_ids = select(Conversation.id).where(Conversation.tenant_id == tenant_id)
+            await session.execute(delete(Message).where(Message.conversation_id.in_(conversation_ids)))
+            await session.execute(delete(Conversation).where(Conversation.tenant_id == tenant_id))
+            await session.execute(delete(Tenant).where(Tenant.id == tenant_id))
+            await session.commit()
+        remove()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    turns = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    asyncio.run(main(turns, batch_size))
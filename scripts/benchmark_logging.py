@@ -0,0 +1,120 @@
+"""Benchmark per-request logging overhead on the calling thread.
+
+Simulates a webhook request that logs a handful of INFO lines plus a hot
+loop (like a Telnyx conversation scan) logging once per item, and measures
+how long the request spends inside logging calls for:
+
+- sync: JSON formatted and written to the stream on the calling thread
+  (the previous setup)
+- queued: NonBlockingQueueHandler + QueueListener, no sampling
+- queued+sampled: as above with the per call site SamplingFilter
+
+Output goes to /dev/null. write_latency_us adds a sleep per write to model
+a backpressured stdout pipe (Cloud Run's log agent falling behind); with 0
+only the in-process CPU cost is compared, and since the listener thread
+shares the GIL, queueing alone does not make that cheaper.
+
+Usage:
+    python scripts/benchmark_logging.py [requests] [hot_loop_lines] [write_latency_us]
+"""
+
+import logging
+import os
+import queue
+import sys
+import time
+from logging.handlers import QueueListener
+
+from app.logging_config import (
+    ContextFilter,
+    JSONFormatter,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+)
+
+REQUEST_LINES = 8
+
+
+class SlowStream:
+    """File wrapper that blocks for a fixed time on every write."""
+
+    def __init__(self, stream, latency_seconds: float) -> None:
+        self.stream = stream
+        self.latency_seconds = latency_seconds
+
+    def write(self, data: str) -> int:
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def simulate_request(logger: logging.Logger, request_no: int, hot_loop_lines: int) -> None:
+    logger.info(f"Webhook received: request={request_no}", extra={"event_type": "call.hangup"})
+    for i in range(REQUEST_LINES - 2):
+        logger.info(f"Processing step {i} for request {request_no}")
+    for i in range(hot_loop_lines):
+        logger.info(f"Checking conversation {i} for request {request_no}")
+    logger.info(f"Webhook processed: request={request_no}")
+
+
+def run(name: str, handler: logging.Handler, requests: int, hot_loop_lines: int, listener=None) -> None:
+    logger = logging.getLogger(f"benchmark.{name}")
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+
+    per_request = []
+    started = time.perf_counter()
+    for n in range(requests):
+        t0 = time.perf_counter()
+        simulate_request(logger, n, hot_loop_lines)
+        per_request.append(time.perf_counter() - t0)
+    caller_ms = (time.perf_counter() - started) * 1000
+    if listener:
+        listener.stop()
+    drained_ms = (time.perf_counter() - started) * 1000
+
+    per_request.sort()
+    p50 = per_request[len(per_request) // 2] * 1000
+    p99 = per_request[int(len(per_request) * 0.99) - 1] * 1000
+    print(
+        f"{name:<15} request_p50={p50:7.3f}ms request_p99={p99:7.3f}ms "
+        f"caller_total={caller_ms:8.1f}ms drained_total={drained_ms:8.1f}ms"
+    )
+
+
+def main(requests: int, hot_loop_lines: int, write_latency_us: float) -> None:
+    lines = requests * (REQUEST_LINES + hot_loop_lines)
+    print(
+        f"requests={requests} lines_per_request={REQUEST_LINES + hot_loop_lines} "
+        f"total_lines={lines} write_latency={write_latency_us}us"
+    )
+
+    with open(os.devnull, "w") as devnull:
+        stream = SlowStream(devnull, write_latency_us / 1_000_000)
+        sync = logging.StreamHandler(stream)
+        sync.setFormatter(JSONFormatter())
+        sync.addFilter(ContextFilter())
+        run("sync", sync, requests, hot_loop_lines)
+
+        for name, sampled in (("queued", False), ("queued+sampled", True)):
+            target = logging.StreamHandler(stream)
+            target.setFormatter(JSONFormatter())
+            handler = NonBlockingQueueHandler(queue.SimpleQueue(), lines + 1)
+            handler.addFilter(ContextFilter())
+            if sampled:
+                handler.addFilter(SamplingFilter(burst=50, window_seconds=10.0, every=20))
+            listener = QueueListener(handler.queue, target)
+            listener.start()
+            run(name, handler, requests, hot_loop_lines, listener)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 0.0,
+    )
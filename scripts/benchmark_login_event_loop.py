@@ -0,0 +1,75 @@
+"""Benchmark event-loop lag under concurrent logins.
+
+Simulates N concurrent logins (one bcrypt check each) while a probe task
+measures how late the event loop wakes it up. Compares the old inline
+verify_password call with verify_password_async on the crypto executor.
+
+No database is needed - only the password check is exercised.
+
+Usage:
+    python scripts/benchmark_login_event_loop.py [concurrent_logins]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from app.core.crypto_executor import shutdown_crypto_executor
+from app.core.password import hash_password, verify_password, verify_password_async
+
+PROBE_INTERVAL_SECONDS = 0.005
+
+
+async def probe_loop_lag(samples: list[float], stop: asyncio.Event) -> None:
+    """Record how far past its deadline each sleep wakes up (ms)."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+        samples.append((time.perf_counter() - start - PROBE_INTERVAL_SECONDS) * 1000)
+
+
+async def login_inline(password: str, hashed: str) -> bool:
+    """Login path before: bcrypt runs on the event loop thread."""
+    return verify_password(password, hashed)
+
+
+async def login_offloaded(password: str, hashed: str) -> bool:
+    """Login path after: bcrypt runs on the crypto executor."""
+    return await verify_password_async(password, hashed)
+
+
+async def run_scenario(name: str, login, concurrency: int, password: str, hashed: str) -> None:
+    samples: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop_lag(samples, stop))
+    await asyncio.sleep(PROBE_INTERVAL_SECONDS * 2)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login(password, hashed) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await probe
+    assert all(results)
+
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1] if len(samples) > 1 else samples[0]
+    print(
+        f"{name:<10} logins={concurrency:<4} wall={elapsed * 1000:8.1f}ms "
+        f"lag_max={max(samples):8.1f}ms lag_p99={p99:8.1f}ms "
+        f"lag_median={statistics.median(samples):6.2f}ms probes={len(samples)}"
+    )
+
+
+async def main(concurrency: int) -> None:
+    password = "benchmark-password"
+    hashed = hash_password(password)
+
+    await run_scenario("inline", login_inline, concurrency, password, hashed)
+    await run_scenario("executor", login_offloaded, concurrency, password, hashed)
+    shutdown_crypto_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20))
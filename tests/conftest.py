@@ -1,14 +1,70 @@
 """Pytest configuration and fixtures."""
 
+import asyncio
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import httpx
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
-from app.persistence.database import Base, get_db
+from app.core.query_profiler import instrument, profile_queries
+from app.infrastructure.telephony.factory import invalidate_telephony_config
+from app.persistence import database
+from app.persistence.database import Base, get_db, get_read_db
 from app.persistence.models import *  # noqa: F401, F403
+from app.persistence.models.tenant import Tenant
 from app.settings import get_async_database_url
 
 
+@pytest.fixture(autouse=True)
+def clear_telephony_config_cache():
+    """Keep the process-wide telephony config cache from leaking between tests."""
+    invalidate_telephony_config()
+    yield
+    invalidate_telephony_config()
+
+
+@pytest.fixture(autouse=True, scope="session")
+def app_pools_follow_event_loop():
+    """Replace pooled app-engine connections opened on another event loop.
+
+    asyncpg connections belong to the loop that opened them, but async tests
+    and TestClient requests each run on their own loop. Failing the pool's
+    pre-ping for those makes it discard the connection and open a new one.
+    """
+    dialects = [database.engine.dialect, database.read_engine.dialect]
+    for dialect in dialects:
+        def do_ping(dbapi_connection, _original=dialect.do_ping):
+            if dbapi_connection.driver_connection._loop is not asyncio.get_running_loop():
+                return False
+            return _original(dbapi_connection)
+
+        dialect.do_ping = do_ping
+    yield
+    for dialect in dialects:
+        del dialect.do_ping
+
+
+@pytest.fixture(scope="session")
+def postgres_available():
+    """Skip tests that need a real database when DATABASE_URL is unreachable."""
+
+    async def probe():
+        engine = create_async_engine(get_async_database_url())
+        try:
+            async with engine.connect():
+                pass
+        finally:
+            await engine.dispose()
+
+    try:
+        asyncio.run(asyncio.wait_for(probe(), timeout=5))
+    except Exception as e:
+        pytest.skip(f"Postgres not reachable: {e}")
+
+
 @pytest.fixture
 async def db_session():
     """Create a test database session using PostgreSQL with transaction rollback."""
@@ -43,9 +99,69 @@ async def test_client(db_session):
     from app.main import app
 
     app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_read_db] = lambda: db_session
 
     with TestClient(app) as client:
         yield client
 
     app.dependency_overrides.clear()
 
+
+@pytest.fixture
+async def db_tenant(postgres_available, db_session):
+    """A tenant row in the rolled-back test transaction."""
+    tenant = Tenant(name="Test Tenant", subdomain="test-tenant")
+    db_session.add(tenant)
+    await db_session.flush()
+    return tenant
+
+
+@pytest.fixture
+async def api_client(db_session, db_tenant):
+    """Async client running the app in the test's event loop and context.
+
+    Authenticated as a tenant admin of db_tenant. Unlike test_client, the
+    app shares the test's contextvars, so query_budget sees its statements.
+    """
+    from app.api.deps import get_current_user, require_tenant_context
+    from app.main import app
+
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_read_db] = lambda: db_session
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+        id=1, email="owner@example.com", tenant_id=db_tenant.id, role="tenant_admin",
+        is_global_admin=False,
+    )
+    app.dependency_overrides[require_tenant_context] = lambda: db_tenant.id
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def query_budget(db_session):
+    """Assert statement budgets for code run against db_session.
+
+        with query_budget("GET /leads", max_queries=8) as profile:
+            await client.get("/api/v1/leads")
+
+    Fails with the per-caller report when the block issues more than
+    max_queries statements, or (with max_repeats) when any statement shape
+    repeats more than max_repeats times - the usual N+1 signature.
+    """
+    remove = instrument(db_session.bind.sync_connection)
+
+    @contextmanager
+    def budget(label: str, max_queries: int, max_repeats: int | None = None):
+        with profile_queries(label) as profile:
+            yield profile
+        assert profile.count <= max_queries, (
+            f"query budget exceeded ({profile.count} > {max_queries})\n{profile.report()}"
+        )
+        if max_repeats is not None:
+            repeated = profile.repeated_shapes(max_repeats + 1)
+            assert not repeated, f"repeated statements (N+1?)\n{profile.report()}"
+
+    yield budget
+    remove()
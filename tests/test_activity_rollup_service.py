@@ -0,0 +1,176 @@
+"""Tests for incremental activity rollups."""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.domain.services.activity_rollup_service import (
+    ActivityRollupService,
+    RollupBucket,
+    floor_bucket,
+)
+
+
+def _rollup_row(bucket_start, channel, total, inbound=0, outbound=0, duration=0.0):
+    row = MagicMock()
+    row.bucket_start = bucket_start
+    row.channel = channel
+    row.total_count = total
+    row.inbound_count = inbound
+    row.outbound_count = outbound
+    row.duration_seconds = duration
+    return row
+
+
+def _session_returning(rows):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+class TestFloorBucket:
+    def test_hour(self):
+        assert floor_bucket(datetime(2026, 3, 4, 15, 42, 7), "hour") == datetime(2026, 3, 4, 15)
+
+    def test_day(self):
+        assert floor_bucket(datetime(2026, 3, 4, 15, 42), "day") == datetime(2026, 3, 4)
+
+    def test_week_starts_monday(self):
+        # 2026-03-04 is a Wednesday
+        assert floor_bucket(datetime(2026, 3, 4, 15), "week") == datetime(2026, 3, 2)
+
+    def test_unknown_granularity(self):
+        with pytest.raises(ValueError):
+            floor_bucket(datetime(2026, 3, 4), "month")
+
+
+class TestGetBuckets:
+    async def test_no_watermark_aggregates_live(self):
+        service = ActivityRollupService(MagicMock())
+        service.get_watermark = AsyncMock(return_value=None)
+        service._aggregate_hours = AsyncMock(return_value=[
+            RollupBucket(datetime(2026, 3, 4, 9), "sms", inbound=2, outbound=1, total=3),
+            RollupBucket(datetime(2026, 3, 4, 17), "sms", inbound=1, total=1),
+        ])
+
+        buckets = await service.get_buckets(
+            1, "day", datetime(2026, 3, 4, 6), datetime(2026, 3, 5)
+        )
+
+        service._aggregate_hours.assert_awaited_once_with(
+            1, datetime(2026, 3, 4), datetime(2026, 3, 5)
+        )
+        assert len(buckets) == 1
+        assert buckets[0].bucket_start == datetime(2026, 3, 4)
+        assert (buckets[0].inbound, buckets[0].outbound, buckets[0].total) == (3, 1, 4)
+
+    async def test_hourly_combines_materialized_and_live_tail(self):
+        session = _session_returning([
+            _rollup_row(datetime(2026, 3, 4, 8), "call", total=2, duration=120.0),
+        ])
+        service = ActivityRollupService(session)
+        service.get_watermark = AsyncMock(return_value=datetime(2026, 3, 4, 10))
+        service._aggregate_hours = AsyncMock(return_value=[
+            RollupBucket(datetime(2026, 3, 4, 10), "call", total=1, duration_seconds=30.0),
+        ])
+
+        buckets = await service.get_buckets(
+            1, "hour", datetime(2026, 3, 4, 8), datetime(2026, 3, 4, 10, 30)
+        )
+
+        # Live aggregation only covers the tail after the watermark
+        service._aggregate_hours.assert_awaited_once_with(
+            1, datetime(2026, 3, 4, 10), datetime(2026, 3, 4, 10, 30)
+        )
+        assert [(b.bucket_start.hour, b.total) for b in buckets] == [(8, 2), (10, 1)]
+        assert sum(b.duration_seconds for b in buckets) == 150.0
+
+    async def test_daily_partial_day_uses_hour_rollups_then_live(self):
+        service = ActivityRollupService(MagicMock())
+        service.get_watermark = AsyncMock(return_value=datetime(2026, 3, 4, 10))
+        day_rows = [RollupBucket(datetime(2026, 3, 3), "email", total=5)]
+        hour_rows = [RollupBucket(datetime(2026, 3, 4, 9), "email", total=2)]
+        live_rows = [RollupBucket(datetime(2026, 3, 4, 11), "email", total=1)]
+
+        original = service.get_buckets
+
+        async def fake_get_buckets(tenant_id, granularity, start, end):
+            if granularity == "hour":
+                assert (start, end) == (datetime(2026, 3, 4), datetime(2026, 3, 4, 10))
+                return hour_rows
+            return await original(tenant_id, granularity, start, end)
+
+        service.get_buckets = fake_get_buckets
+        service.session = _session_returning([
+            _rollup_row(b.bucket_start, b.channel, b.total) for b in day_rows
+        ])
+        service._aggregate_hours = AsyncMock(return_value=live_rows)
+
+        buckets = await service.get_buckets(
+            1, "day", datetime(2026, 3, 3), datetime(2026, 3, 4, 12)
+        )
+
+        service._aggregate_hours.assert_awaited_once_with(
+            1, datetime(2026, 3, 4, 10), datetime(2026, 3, 4, 12)
+        )
+        by_day = {b.bucket_start: b.total for b in buckets}
+        assert by_day == {datetime(2026, 3, 3): 5, datetime(2026, 3, 4): 3}
+
+
+class TestRefreshTenant:
+    async def test_rolls_forward_from_watermark_with_late_arrival_window(self):
+        service = ActivityRollupService(MagicMock())
+        service.get_watermark = AsyncMock(return_value=datetime(2026, 3, 4, 9))
+        service._rebuild = AsyncMock(return_value=3)
+
+        rebuilt = await service.refresh_tenant(1, now=datetime(2026, 3, 4, 10, 5))
+
+        assert rebuilt == 3
+        service._rebuild.assert_awaited_once_with(
+            1, datetime(2026, 3, 4, 7), datetime(2026, 3, 4, 10)
+        )
+
+    async def test_first_run_backfills_history(self):
+        service = ActivityRollupService(MagicMock())
+        service.get_watermark = AsyncMock(return_value=None)
+        service._rebuild = AsyncMock(return_value=0)
+
+        await service.refresh_tenant(1, now=datetime(2026, 3, 4, 10, 5))
+
+        start, end = service._rebuild.await_args.args[1:]
+        assert end == datetime(2026, 3, 4, 10)
+        assert (end - start).days >= 365
+        assert start == floor_bucket(start, "day")
+
+
+class TestBackfill:
+    async def test_backfill_on_fresh_tenant_includes_initial_build(self):
+        service = ActivityRollupService(MagicMock())
+        watermark = {}
+        service.get_watermark = AsyncMock(side_effect=lambda tenant_id: watermark.get(tenant_id))
+
+        async def rebuild(tenant_id, start, end):
+            watermark[tenant_id] = end
+            return int((end - start).total_seconds() // 3600)
+
+        service._rebuild = AsyncMock(side_effect=rebuild)
+        now = datetime(2026, 3, 4, 10, 5)
+
+        await service.backfill(1, datetime(2026, 2, 1), datetime(2026, 2, 3), now=now)
+        await service.refresh_tenant(1, now=datetime(2026, 3, 4, 11, 5))
+
+        (_, start, end), (_, tail_start, tail_end) = [c.args for c in service._rebuild.await_args_list]
+        assert (end - start).days >= 365 and end == datetime(2026, 3, 4, 10)
+        assert (tail_start, tail_end) == (datetime(2026, 3, 4, 8), datetime(2026, 3, 4, 11))
+
+    async def test_backfill_with_watermark_rebuilds_only_the_range(self):
+        service = ActivityRollupService(MagicMock())
+        service.get_watermark = AsyncMock(return_value=datetime(2026, 3, 4, 9))
+        service._rebuild = AsyncMock(return_value=48)
+
+        await service.backfill(1, datetime(2026, 2, 1), datetime(2026, 2, 3), now=datetime(2026, 3, 4, 10, 5))
+
+        service._rebuild.assert_awaited_once_with(1, datetime(2026, 2, 1), datetime(2026, 2, 3))
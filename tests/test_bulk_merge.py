@@ -0,0 +1,120 @@
+"""Tests for set-based contact and lead merges."""
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.domain.services.contact_merge_service import (
+    ContactMergeService,
+    _merge_mapping,
+)
+from app.domain.services.lead_service import LeadService
+from app.persistence.models.contact import Contact
+from app.persistence.models.lead import Lead
+from app.persistence.repositories.base import any_of
+
+
+def _contact(contact_id, name=None, email=None, phone=None, day=1):
+    return SimpleNamespace(
+        id=contact_id,
+        name=name,
+        email=email,
+        phone=phone,
+        created_at=datetime(2026, 1, day),
+    )
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+class TestSqlHelpers:
+    def test_any_of_binds_one_array_parameter(self):
+        stmt = select(Contact.id).where(Contact.id == any_of([1, 2, 3]))
+        assert "= ANY (" in _sql(stmt)
+        assert list(stmt.compile(dialect=postgresql.dialect()).params.values()) == [[1, 2, 3]]
+
+    def test_merge_mapping_unnests_parallel_arrays(self):
+        sql = _sql(select(_merge_mapping({5: 1, 6: 1, 9: 7})))
+        assert sql.count("unnest(") == 2
+
+
+class TestBulkMerge:
+    @pytest.fixture
+    def service(self):
+        session = MagicMock()
+        session.commit = AsyncMock()
+        service = ContactMergeService(session)
+        service._merge_groups = AsyncMock()
+        return service
+
+    async def test_oldest_contact_is_primary_and_fields_filled(self, service):
+        contacts = [
+            _contact(1, "Jon Smith", day=3),
+            _contact(2, None, email="jon@x.com", day=1),
+            _contact(3, "John Smith", phone="+12817882316", day=2),
+        ]
+        service.contact_repo.get_multiple_by_ids = AsyncMock(return_value=contacts)
+
+        results = await service.bulk_merge(1, [[1, 2, 3]], user_id=9)
+
+        assert results[0]["primary_contact_id"] == 2
+        assert results[0]["merged_contact_ids"] == [1, 3]
+        group = service._merge_groups.await_args.args[1][0]
+        assert group.field_resolutions == {"name": 1, "email": "primary", "phone": 3}
+        service.session.commit.assert_awaited_once()
+
+    async def test_contacts_claimed_once_and_bad_groups_skipped(self, service):
+        contacts = [_contact(i, f"C {i}", day=i) for i in (1, 2, 3, 4)]
+        service.contact_repo.get_multiple_by_ids = AsyncMock(return_value=contacts)
+
+        results = await service.bulk_merge(
+            1, [[1, 2], [2, 3], [3, 4], [1, 99]], user_id=9, primary_ids={2: 4},
+        )
+
+        assert [r["status"] for r in results] == ["merged", "skipped", "merged", "skipped"]
+        assert results[2]["primary_contact_id"] == 4
+        assert len(service._merge_groups.await_args.args[1]) == 2
+
+    async def test_nothing_to_merge_does_not_commit(self, service):
+        service.contact_repo.get_multiple_by_ids = AsyncMock(return_value=[])
+
+        results = await service.bulk_merge(1, [[1, 2]], user_id=9)
+
+        assert results[0]["status"] == "skipped"
+        service.session.commit.assert_not_awaited()
+
+
+class TestMergeLeadsBulk:
+    def test_fold_prefers_real_name_and_combines_extra_data(self):
+        service = LeadService(MagicMock())
+        primary = Lead(name="Caller 555", phone="+12817882316", extra_data={"source": "voice"})
+        secondary = Lead(
+            name="Maria Lopez", email="m@x.com", conversation_id=42,
+            extra_data={"sources": ["sms"], "voice_calls": [{"id": 1}]},
+        )
+
+        resolutions = service._fold_lead_into_primary(primary, secondary)
+
+        assert resolutions == {"name": "secondary", "email": "secondary", "phone": "primary"}
+        assert primary.extra_data["sources"] == ["voice", "sms"]
+        assert primary.extra_data["voice_calls"] == [{"id": 1}]
+        assert primary.extra_data["merged_conversation_ids"] == [42]
+
+    async def test_missing_secondary_raises_before_writing(self):
+        primary = Lead(id=1, tenant_id=1, name="A")
+        loaded = MagicMock()
+        loaded.scalars.return_value.all.return_value = [primary]
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=loaded)
+        session.commit = AsyncMock()
+
+        with pytest.raises(ValueError):
+            await LeadService(session).merge_leads_bulk(1, 1, [2, 3])
+
+        assert session.execute.await_count == 1
+        session.commit.assert_not_awaited()
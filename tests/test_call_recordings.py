@@ -0,0 +1,150 @@
+"""Tests for lazy call recording URL resolution and caching."""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.domain.services.call_recording_service import (
+    CallRecordingService,
+    TelnyxNotConfiguredError,
+    url_cache_ttl,
+)
+from app.persistence.models.call import Call
+from app.settings import settings
+
+SIGNED_AT = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc).timestamp()
+S3_URL = "https://s3.amazonaws.com/rec.mp3?X-Amz-Date=20260101T120000Z&X-Amz-Expires=600&X-Amz-Signature=x"
+
+
+def _call(**kwargs):
+    defaults = dict(id=7, tenant_id=1, call_sid="v3:call", recording_sid=None,
+                    recording_conversation_id=None, recording_storage_path=None)
+    return Call(**{**defaults, **kwargs})
+
+
+@pytest.fixture
+def redis():
+    with patch("app.domain.services.call_recording_service.redis_client") as redis:
+        redis.connect = AsyncMock()
+        redis.get = AsyncMock(return_value=None)
+        redis.set = AsyncMock(return_value=True)
+        redis.delete = AsyncMock(return_value=1)
+        yield redis
+
+
+@pytest.fixture
+def session():
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = "telnyx-key"
+    session.execute.return_value = result
+    return session
+
+
+@pytest.fixture
+def telnyx():
+    with patch("app.infrastructure.telephony.telnyx_provider.TelnyxAIService") as service_cls:
+        service = service_cls.return_value
+        service.get_fresh_recording_url = AsyncMock(return_value=None)
+        service.get_recording_for_call = AsyncMock(return_value=None)
+        yield service
+
+
+class TestUrlCacheTtl:
+    def test_uses_signed_url_expiry_minus_margin(self):
+        assert url_cache_ttl(S3_URL, now=SIGNED_AT) == 540
+        assert url_cache_ttl(S3_URL, now=SIGNED_AT + 590) == 0
+
+    def test_legacy_expires_and_unsigned_urls(self):
+        assert url_cache_ttl(f"https://x/rec.mp3?Expires={int(SIGNED_AT) + 3600}", now=SIGNED_AT) == 3540
+        assert url_cache_ttl("https://x/rec.mp3") == settings.call_recording_url_cache_ttl_seconds
+
+
+class TestGetPlaybackUrl:
+    async def test_cache_hit_skips_telnyx(self, session, redis, telnyx):
+        redis.get.return_value = S3_URL
+
+        assert await CallRecordingService(session).get_playback_url(_call(recording_sid="rec-1")) == S3_URL
+        telnyx.get_fresh_recording_url.assert_not_awaited()
+        session.execute.assert_not_awaited()
+
+    async def test_cached_missing_recording(self, session, redis, telnyx):
+        redis.get.return_value = ""
+
+        assert await CallRecordingService(session).get_playback_url(_call()) is None
+        telnyx.get_recording_for_call.assert_not_awaited()
+
+    async def test_resolves_by_recording_id_and_caches_until_expiry(self, session, redis, telnyx):
+        telnyx.get_fresh_recording_url.return_value = S3_URL
+
+        with patch("app.domain.services.call_recording_service.url_cache_ttl", return_value=540):
+            url = await CallRecordingService(session).get_playback_url(_call(recording_sid="rec-1"))
+
+        assert url == S3_URL
+        telnyx.get_fresh_recording_url.assert_awaited_once_with("rec-1")
+        telnyx.get_recording_for_call.assert_not_awaited()
+        redis.set.assert_awaited_once_with("call_recording_url:7", S3_URL, ttl=540)
+
+    async def test_looks_up_by_conversation_and_remembers_recording_id(self, session, redis, telnyx):
+        telnyx.get_recording_for_call.return_value = {"recording_id": "rec-9", "recording_url": "https://x/r.mp3"}
+        call = _call(recording_conversation_id="conv-1")
+
+        assert await CallRecordingService(session).get_playback_url(call) == "https://x/r.mp3"
+        telnyx.get_recording_for_call.assert_awaited_once_with("v3:call", conversation_id="conv-1")
+        assert call.recording_sid == "rec-9"
+        session.flush.assert_awaited_once()
+        session.commit.assert_not_awaited()
+
+    async def test_missing_recording_is_cached_briefly(self, session, redis, telnyx):
+        assert await CallRecordingService(session).get_playback_url(_call()) is None
+        redis.set.assert_awaited_once_with("call_recording_url:7", "", ttl=300)
+
+    async def test_requires_telnyx_key_for_lookup(self, session, redis, telnyx):
+        session.execute.return_value.scalar_one_or_none.return_value = None
+
+        with pytest.raises(TelnyxNotConfiguredError):
+            await CallRecordingService(session).get_playback_url(_call(recording_sid="rec-1"))
+
+    async def test_mirrored_recording_uses_signed_url(self, session, redis, telnyx):
+        storage = MagicMock()
+        storage.get_signed_url = AsyncMock(return_value="https://storage.googleapis.com/signed")
+        call = _call(recording_storage_path="tenants/1/call-recordings/7.mp3")
+
+        url = await CallRecordingService(session, storage=storage).get_playback_url(call)
+
+        assert url == "https://storage.googleapis.com/signed"
+        storage.get_signed_url.assert_awaited_once_with(
+            "tenants/1/call-recordings/7.mp3", settings.call_recording_signed_url_ttl_seconds
+        )
+        telnyx.get_fresh_recording_url.assert_not_awaited()
+        redis.set.assert_awaited_once_with(
+            "call_recording_url:7", url, ttl=settings.call_recording_signed_url_ttl_seconds - 60
+        )
+
+
+async def test_mirror_uploads_and_records_path(session, redis):
+    storage = MagicMock(enabled=True)
+    storage.upload_recording = AsyncMock(return_value="tenants/1/call-recordings/7.mp3")
+    response = MagicMock(content=b"audio", headers={"content-type": "audio/mpeg"})
+    client = AsyncMock()
+    client.get.return_value = response
+    client.__aenter__.return_value = client
+    call = _call()
+
+    with patch("app.domain.services.call_recording_service.httpx.AsyncClient", return_value=client):
+        path = await CallRecordingService(session, storage=storage).mirror(call, S3_URL)
+
+    assert path == call.recording_storage_path == "tenants/1/call-recordings/7.mp3"
+    storage.upload_recording.assert_awaited_once_with(1, 7, b"audio", "audio/mpeg")
+    redis.delete.assert_awaited_once_with("call_recording_url:7")
+
+
+def test_has_recording_without_stored_url():
+    from app.api.routes.calls import _has_recording
+
+    assert _has_recording(_call(recording_conversation_id="conv-1"))
+    assert _has_recording(_call(recording_sid="rec-1"))
+    # Found through call_sid when played
+    assert _has_recording(_call(status="completed"))
+    assert not _has_recording(_call(status="in-progress"))
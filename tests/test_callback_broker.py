@@ -0,0 +1,131 @@
+"""Tests for the await-able callback broker used by Zapier lookups."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.infrastructure import callback_broker as broker_module
+from app.infrastructure.callback_broker import CallbackBroker
+
+
+async def _nothing_stored():
+    return None
+
+
+@pytest.mark.asyncio
+async def test_same_instance_publish_wakes_waiter_immediately():
+    """A callback handled in-process resolves the waiter without polling."""
+    broker = CallbackBroker()
+    loop = asyncio.get_running_loop()
+
+    async def deliver():
+        await asyncio.sleep(0.01)
+        await broker.publish("cs-1", {"status": "completed", "payload": {"found": True}})
+
+    started = loop.time()
+    asyncio.create_task(deliver())
+    result = await broker.wait("cs-1", timeout=5, fetch_existing=_nothing_stored)
+
+    assert result == {"status": "completed", "payload": {"found": True}}
+    assert loop.time() - started < 0.5
+    assert broker._waiters == {}
+
+
+@pytest.mark.asyncio
+async def test_already_stored_result_returned_without_waiting():
+    """A callback that landed before the waiter registered is still seen."""
+    broker = CallbackBroker()
+    stored = {"status": "completed", "payload": {"found": False}}
+
+    result = await broker.wait("cs-2", timeout=5, fetch_existing=AsyncMock(return_value=stored))
+
+    assert result == stored
+
+
+@pytest.mark.asyncio
+async def test_timeout_returns_none_and_cleans_up():
+    broker = CallbackBroker()
+
+    result = await broker.wait("cs-3", timeout=0.05, fetch_existing=_nothing_stored)
+
+    assert result is None
+    assert broker._waiters == {}
+
+
+@pytest.mark.asyncio
+async def test_cross_instance_delivery_over_pubsub():
+    """A callback published by another instance reaches this instance's waiter."""
+    fakeredis = pytest.importorskip("fakeredis")
+    from app.infrastructure.redis import RedisClient
+
+    server = fakeredis.FakeServer()
+    waiter_redis, callback_redis = RedisClient(), RedisClient()
+    for client in (waiter_redis, callback_redis):
+        client._enabled = True
+        client._client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+
+    waiting_instance, callback_instance = CallbackBroker(), CallbackBroker()
+
+    with patch.object(broker_module, "redis_client", waiter_redis):
+        waiter = asyncio.create_task(
+            waiting_instance.wait("cs-4", timeout=5, fetch_existing=_nothing_stored)
+        )
+        await asyncio.sleep(0.1)
+
+    with patch.object(broker_module, "redis_client", callback_redis):
+        await callback_instance.publish("cs-4", {"status": "completed", "payload": {"id": 7}})
+
+    with patch.object(broker_module, "redis_client", waiter_redis):
+        result = await asyncio.wait_for(waiter, timeout=2)
+        await waiting_instance.close()
+
+    assert result == {"status": "completed", "payload": {"id": 7}}
+
+
+@pytest.mark.asyncio
+async def test_zapier_wait_for_response_uses_broker():
+    """wait_for_response returns the callback payload and skips timeout marking."""
+    from app.domain.services.zapier_integration_service import ZapierIntegrationService
+
+    service = ZapierIntegrationService(MagicMock())
+    service.request_repo = MagicMock(mark_timeout=AsyncMock())
+    broker = CallbackBroker()
+
+    async def deliver():
+        await asyncio.sleep(0.01)
+        await broker.publish("cs-5", {"status": "completed", "payload": {"data": {"found": True}}})
+
+    with patch("app.domain.services.zapier_integration_service.callback_broker", broker):
+        asyncio.create_task(deliver())
+        payload = await service.wait_for_response("cs-5", timeout_seconds=5)
+
+    assert payload == {"data": {"found": True}}
+    service.request_repo.mark_timeout.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_waiter_joining_a_starting_listener_keeps_its_timeout():
+    """A subscription that never confirms does not hold waiters past their timeout."""
+    broker = CallbackBroker()
+    async def never_confirms(*_):
+        await asyncio.sleep(60)
+
+    pubsub = MagicMock()
+    pubsub.psubscribe = never_confirms
+    pubsub.aclose = AsyncMock()
+    redis = MagicMock()
+    redis.pubsub.return_value = pubsub
+    loop = asyncio.get_running_loop()
+
+    with patch.object(broker_module, "redis_client", redis):
+        first = asyncio.create_task(broker.wait("cs-6", timeout=5, fetch_existing=_nothing_stored))
+        await asyncio.sleep(0.01)
+        started = loop.time()
+        result = await broker.wait("cs-7", timeout=0.05, fetch_existing=_nothing_stored)
+        elapsed = loop.time() - started
+        first.cancel()
+        await broker.close()
+
+    assert result is None
+    assert elapsed < 0.5
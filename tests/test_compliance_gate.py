@@ -0,0 +1,79 @@
+"""Tests for the DNC + opt-in compliance gate.
+
+Needs a reachable Postgres (DATABASE_URL); skipped otherwise.
+"""
+
+from unittest.mock import patch
+
+from app.domain.services.compliance_gate import ComplianceGate
+from app.domain.services.dnc_service import DncService
+from app.domain.services.opt_in_service import OptInService
+
+OPTED_IN = "+15550000001"
+BLOCKED = "+15550000002"
+UNKNOWN = "+15550000003"
+
+
+class FakeRedis:
+    """In-memory stand-in for the redis_client calls the gate makes."""
+
+    def __init__(self):
+        self.data = {}
+        self.mget_calls = 0
+
+    async def mget(self, keys):
+        self.mget_calls += 1
+        return [self.data.get(k) for k in keys]
+
+    async def set_many(self, mapping, ttl=None, nx=False):
+        for key, value in mapping.items():
+            if not nx or key not in self.data:
+                self.data[key] = value
+
+    async def set(self, key, value, ttl=None):
+        self.data[key] = value
+        return True
+
+
+async def _seed(db, tenant_id):
+    await OptInService(db).opt_in(tenant_id, OPTED_IN)
+    await OptInService(db).opt_in(tenant_id, BLOCKED)
+    await DncService(db).block(tenant_id, phone=BLOCKED)
+
+
+async def test_check_many_answers_from_one_query(db_session, db_tenant, query_budget):
+    await _seed(db_session, db_tenant.id)
+    gate = ComplianceGate(db_session)
+
+    with query_budget("compliance check_many", max_queries=1):
+        decisions = await gate.check_many(db_tenant.id, [OPTED_IN, BLOCKED, UNKNOWN, OPTED_IN])
+
+    assert list(decisions) == [OPTED_IN, BLOCKED, UNKNOWN]
+    assert decisions[OPTED_IN].allowed
+    # DNC wins over the opt-in record for the same number
+    assert decisions[BLOCKED].is_blocked and decisions[BLOCKED].reason == "do_not_contact"
+    assert not decisions[UNKNOWN].allowed and decisions[UNKNOWN].reason == "not_opted_in"
+
+
+async def test_cached_state_follows_stop_start_and_unblock(db_session, db_tenant, query_budget):
+    fake = FakeRedis()
+    with patch("app.domain.services.compliance_gate.redis_client", fake):
+        await _seed(db_session, db_tenant.id)
+        gate = ComplianceGate(db_session)
+
+        # Writes populated the cache, so checks don't touch the database
+        with query_budget("cached compliance check", max_queries=0):
+            assert (await gate.check(db_tenant.id, OPTED_IN)).allowed
+            assert (await gate.check(db_tenant.id, BLOCKED)).is_blocked
+
+        await OptInService(db_session).opt_out(db_tenant.id, OPTED_IN)
+        assert (await gate.check(db_tenant.id, OPTED_IN)).reason == "not_opted_in"
+        await OptInService(db_session).opt_in(db_tenant.id, OPTED_IN, method="START")
+        assert (await gate.check(db_tenant.id, OPTED_IN)).allowed
+
+        await DncService(db_session).unblock(db_tenant.id, phone=BLOCKED)
+        assert (await gate.check(db_tenant.id, BLOCKED)).allowed
+
+        # A miss is loaded and cached
+        assert not (await gate.check(db_tenant.id, UNKNOWN)).allowed
+        assert fake.data[f"compliance:{db_tenant.id}:{UNKNOWN}"] == "not_opted_in"
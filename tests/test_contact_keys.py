@@ -0,0 +1,84 @@
+"""Tests for persisted phone/email lookup keys."""
+
+import logging
+
+import pytest
+
+from app.core.phone import normalize_email, phone_match_key
+from app.persistence.models.contact import Contact
+from app.persistence.models.customer import Customer
+from app.persistence.models.jackrabbit_customer import JackrabbitCustomer
+from app.persistence.models.lead import Lead
+
+
+class TestPhoneMatchKey:
+    @pytest.mark.parametrize("phone", [
+        "+12817882316",
+        "12817882316",
+        "(281) 788-2316",
+        "281.788.2316",
+        "+1 281 788 2316",
+    ])
+    def test_formats_share_a_key(self, phone):
+        assert phone_match_key(phone) == "2817882316"
+
+    @pytest.mark.parametrize("phone", [None, "", "555-1234", "ext 12"])
+    def test_short_or_empty_has_no_key(self, phone):
+        assert phone_match_key(phone) is None
+
+
+class TestNormalizeEmail:
+    def test_strips_and_lowercases(self):
+        assert normalize_email("  Jane.Doe@Example.COM ") == "jane.doe@example.com"
+
+    @pytest.mark.parametrize("email", [None, "", "   "])
+    def test_empty(self, email):
+        assert normalize_email(email) is None
+
+
+class TestModelKeys:
+    @pytest.mark.parametrize("model", [Contact, Lead, Customer])
+    def test_keys_follow_assignment(self, model):
+        record = model(phone="(281) 788-2316", email="Jane@Example.com")
+        assert record.phone_last10 == "2817882316"
+        assert record.email_normalized == "jane@example.com"
+
+        record.phone = "+17135550100"
+        record.email = None
+        assert record.phone_last10 == "7135550100"
+        assert record.email_normalized is None
+
+    def test_jackrabbit_customer_uses_phone_number(self):
+        record = JackrabbitCustomer(phone_number="+12817882316", email="A@B.com")
+        assert record.phone_last10 == "2817882316"
+        assert record.email_normalized == "a@b.com"
+
+
+async def test_short_code_call_is_not_merged_into_phoneless_lead(api_client, db_session, db_tenant):
+    from sqlalchemy import select
+
+    from app.persistence.models.call import Call
+
+    phoneless = Lead(tenant_id=db_tenant.id, name="Web form lead", email="web@example.com")
+    db_session.add_all([
+        phoneless,
+        Call(tenant_id=db_tenant.id, call_sid=f"short-code-{db_tenant.id}", from_number="22395", to_number="+15550001111"),
+    ])
+    await db_session.flush()
+
+    response = await api_client.post("/api/v1/telnyx/sync-calls-to-leads")
+
+    assert response.json()["leads_created"] >= 1
+    await db_session.refresh(phoneless)
+    assert not (phoneless.extra_data or {}).get("voice_calls")
+    [created] = (await db_session.execute(
+        select(Lead).where(Lead.tenant_id == db_tenant.id, Lead.id != phoneless.id)
+    )).scalars().all()
+    assert created.phone and len(created.extra_data["voice_calls"]) == 1
+
+
+def test_match_key_does_not_log_unkeyable_input(caplog):
+    with caplog.at_level(logging.DEBUG, logger="app.core.phone"):
+        assert phone_match_key("22395") is None
+        assert phone_match_key("call me") is None
+    assert caplog.records == []
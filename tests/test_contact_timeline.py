@@ -0,0 +1,164 @@
+"""Tests for the unified contact timeline (activity feed) and combined history.
+
+Needs a reachable Postgres (DATABASE_URL); skipped otherwise.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.domain.services.contact_timeline_service import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
+from app.persistence.models.call import Call
+from app.persistence.models.call_summary import CallSummary
+from app.persistence.models.contact import Contact
+from app.persistence.models.conversation import Conversation, Message
+from app.persistence.models.lead import Lead
+from app.persistence.models.tenant_email_config import EmailConversation
+
+BASE = datetime(2026, 3, 1, 12, 0, 0)
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    ts = datetime(2026, 3, 1, 12, 30, 15, 123456)
+    assert decode_cursor(encode_cursor(ts, "sms", 42)) == (ts, "sms", 42)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+
+async def _seed(db, tenant_id):
+    """Contact with 3 calls, 4 conversations and 2 email threads.
+
+    Two items share each timestamp to exercise the (kind, id) tie-breaker.
+    """
+    contact = Contact(tenant_id=tenant_id, name="Timeline Tess", phone="+15550001111")
+    db.add(contact)
+    await db.flush()
+
+    for i in range(3):
+        call = Call(
+            tenant_id=tenant_id, call_sid=f"timeline-call-{i}", from_number=contact.phone,
+            to_number="+15550009999", duration=125, started_at=BASE + timedelta(hours=i),
+        )
+        db.add(call)
+        await db.flush()
+        db.add(CallSummary(call_id=call.id, contact_id=contact.id, intent="pricing_inquiry"))
+
+    for i in range(4):
+        conv = Conversation(
+            tenant_id=tenant_id, channel="sms" if i % 2 else "web",
+            updated_at=BASE + timedelta(hours=i),
+        )
+        db.add(conv)
+        await db.flush()
+        db.add_all([
+            Message(conversation_id=conv.id, role="system", content="sys", sequence_number=1,
+                    created_at=BASE),
+            Message(conversation_id=conv.id, role="user", content=f"old {i}", sequence_number=2,
+                    created_at=BASE + timedelta(minutes=1)),
+            Message(conversation_id=conv.id, role="user", content="x" * 150 if i == 3 else f"new {i}",
+                    sequence_number=3, created_at=BASE + timedelta(minutes=2)),
+            Message(conversation_id=conv.id, role="assistant", content="reply", sequence_number=4,
+                    created_at=BASE + timedelta(minutes=3)),
+        ])
+        db.add(Lead(tenant_id=tenant_id, conversation_id=conv.id, contact_id=contact.id))
+
+    for i in range(2):
+        db.add(EmailConversation(
+            tenant_id=tenant_id, contact_id=contact.id, from_email="tess@example.com",
+            to_email="hello@example.com", subject=f"Question {i}", message_count=3,
+            created_at=BASE, last_response_at=BASE + timedelta(hours=i, minutes=30),
+        ))
+    await db.flush()
+    return contact
+
+
+async def test_pages_follow_cursor_without_gaps_or_repeats(db_session, db_tenant, api_client, query_budget):
+    contact = await _seed(db_session, db_tenant.id)
+    url = f"/api/v1/contacts/{contact.id}/activity-feed"
+
+    seen = []
+    params = {"page_size": 4}
+    while True:
+        with query_budget("activity-feed page", max_queries=2):
+            response = await api_client.get(url, params=params)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        assert body["total"] == 9
+        seen.extend(body["items"])
+        if not body["has_more"]:
+            assert body["next_cursor"] is None
+            break
+        params = {"page_size": 4, "cursor": body["next_cursor"]}
+
+    ids = [item["id"] for item in seen]
+    assert len(ids) == len(set(ids)) == 9
+    timestamps = [item["timestamp"] for item in seen]
+    assert timestamps == sorted(timestamps, reverse=True)
+
+    by_id = {item["id"]: item for item in seen}
+    web = next(i for i in seen if i["type"] == "chat")
+    assert web["summary"].startswith("new ") and web["details"]["message_count"] == 3
+    long_sms = next(i for i in seen if i["type"] == "sms" and i["summary"].startswith("xxx"))
+    assert long_sms["summary"] == "x" * 100 + "..."
+    call = next(i for i in seen if i["type"] == "call")
+    assert call["summary"] == "2m 5s - Pricing Inquiry"
+    assert any(i["summary"] == "Question 1" for i in by_id.values())
+
+
+async def test_page_numbers_and_channel_filter(db_session, db_tenant, api_client):
+    contact = await _seed(db_session, db_tenant.id)
+    url = f"/api/v1/contacts/{contact.id}/activity-feed"
+
+    first = (await api_client.get(url, params={"page_size": 5})).json()
+    second = (await api_client.get(url, params={"page_size": 5, "page": 2})).json()
+    assert [i["id"] for i in first["items"] + second["items"]] == [
+        i["id"] for i in (await api_client.get(url, params={"page_size": 20})).json()["items"]
+    ]
+    assert second["has_more"] is False
+
+    sms = (await api_client.get(url, params={"channel": "sms"})).json()
+    assert sms["total"] == 2 and {i["type"] for i in sms["items"]} == {"sms"}
+
+    past_end = (await api_client.get(url, params={"page": 5})).json()
+    assert past_end["items"] == [] and past_end["total"] == 9
+
+    bad = await api_client.get(url, params={"cursor": "garbage"})
+    assert bad.status_code == 400
+
+
+async def test_combined_history_counts_messages_across_merged_contacts(
+    db_session, db_tenant, api_client, query_budget
+):
+    primary = Contact(tenant_id=db_tenant.id, name="Primary")
+    db_session.add(primary)
+    await db_session.flush()
+    for contact_id in (primary.id, None):
+        conv = Conversation(tenant_id=db_tenant.id, channel="sms")
+        db_session.add(conv)
+        await db_session.flush()
+        db_session.add_all([
+            Message(conversation_id=conv.id, role="user", content="hi", sequence_number=n)
+            for n in range(3)
+        ])
+        lead = Lead(tenant_id=db_tenant.id, conversation_id=conv.id)
+        db_session.add(lead)
+        await db_session.flush()
+        if contact_id:
+            primary.lead_id = lead.id
+        else:
+            db_session.add(Contact(
+                tenant_id=db_tenant.id, name="Merged", lead_id=lead.id,
+                merged_into_contact_id=primary.id,
+            ))
+    await db_session.flush()
+
+    with query_budget("combined-history", max_queries=5, max_repeats=1):
+        response = await api_client.get(f"/api/v1/contacts/{primary.id}/combined-history")
+
+    assert response.status_code == 200, response.text
+    conversations = response.json()["conversations"]
+    assert [c["message_count"] for c in conversations] == [3, 3]
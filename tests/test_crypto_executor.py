@@ -0,0 +1,90 @@
+"""Tests for the crypto executor and decrypted-credential cache."""
+
+import pytest
+from cryptography.fernet import Fernet
+
+from app.core.encryption import EncryptionService
+from app.core.password import hash_password, hash_password_async, verify_password_async
+
+
+@pytest.mark.asyncio
+async def test_async_password_round_trip():
+    """Hashes produced off-loop verify, and wrong passwords are rejected."""
+    hashed = await hash_password_async("correct horse")
+
+    assert await verify_password_async("correct horse", hashed)
+    assert not await verify_password_async("wrong horse", hashed)
+
+
+@pytest.mark.asyncio
+async def test_async_verify_accepts_sync_hash():
+    """Existing hashes created by the sync helper still verify."""
+    hashed = hash_password("legacy-password")
+
+    assert await verify_password_async("legacy-password", hashed)
+
+
+@pytest.mark.asyncio
+async def test_async_verify_invalid_hash_returns_false():
+    """A malformed stored hash is treated as a failed login, not an error."""
+    assert not await verify_password_async("anything", "not-a-bcrypt-hash")
+
+
+class TestDecryptCache:
+    """Decrypted values are cached by ciphertext hash."""
+
+    @pytest.fixture
+    def service(self, monkeypatch):
+        service = EncryptionService()
+        monkeypatch.setattr(service, "_fernet", Fernet(Fernet.generate_key()))
+        service.clear_decrypt_cache()
+        yield service
+        service.clear_decrypt_cache()
+
+    def test_repeat_decrypt_skips_fernet(self, service, monkeypatch):
+        ciphertext = service.encrypt("telnyx-secret")
+        assert service.decrypt(ciphertext) == "telnyx-secret"
+
+        def fail(*args, **kwargs):
+            raise AssertionError("Fernet should not run for a cached value")
+
+        monkeypatch.setattr(service._fernet, "decrypt", fail)
+        assert service.decrypt(ciphertext) == "telnyx-secret"
+
+    def test_plaintext_not_used_as_cache_key(self, service):
+        ciphertext = service.encrypt("gmail-refresh-token")
+        service.decrypt(ciphertext)
+
+        assert all("gmail-refresh-token" not in key for key in service._decrypt_cache)
+
+    def test_expired_entry_is_redecrypted(self, service, monkeypatch):
+        from app.settings import settings
+
+        clock = [1000.0]
+        monkeypatch.setattr("app.core.encryption.time.monotonic", lambda: clock[0])
+        monkeypatch.setattr(settings, "credential_cache_ttl_seconds", 60)
+        ciphertext = service.encrypt("short-lived")
+        service.decrypt(ciphertext)
+
+        decrypt_calls = []
+        real_decrypt = service._fernet.decrypt
+        monkeypatch.setattr(
+            service._fernet, "decrypt", lambda token: decrypt_calls.append(token) or real_decrypt(token)
+        )
+
+        clock[0] += 59
+        assert service.decrypt(ciphertext) == "short-lived"
+        assert decrypt_calls == []
+
+        clock[0] += 2
+        assert service.decrypt(ciphertext) == "short-lived"
+        assert len(decrypt_calls) == 1
+
+    def test_zero_ttl_disables_cache(self, service, monkeypatch):
+        from app.settings import settings
+
+        monkeypatch.setattr(settings, "credential_cache_ttl_seconds", 0)
+        ciphertext = service.encrypt("short-lived")
+        service.decrypt(ciphertext)
+
+        assert len(service._decrypt_cache) == 0
@@ -0,0 +1,124 @@
+"""Tests for session dependencies, tenant context, the read pool and replica routing.
+
+These use the app engines directly, so they need a reachable Postgres
+(DATABASE_URL); skipped otherwise.
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+from app.core import metrics
+from app.core.tenant_context import clear_tenant_context, set_tenant_context
+from app.persistence import database
+from app.persistence.database import (
+    AsyncSessionLocal,
+    ReplicaLagMonitor,
+    get_db,
+    get_db_no_rls,
+    get_read_db,
+    read_session,
+)
+
+CURRENT_TENANT = text("SELECT current_setting('app.current_tenant_id', true)")
+
+
+@pytest.fixture
+async def app_engines(postgres_available):
+    yield
+    clear_tenant_context()
+    # Pooled connections belong to this test's event loop
+    await database.engine.dispose()
+    await database.read_engine.dispose()
+
+
+async def _open(dependency):
+    gen = dependency()
+    return gen, await gen.__anext__()
+
+
+async def test_tenant_context_is_transaction_local(app_engines):
+    set_tenant_context(42)
+    gen, session = await _open(get_db)
+    assert (await session.execute(CURRENT_TENANT)).scalar() == "42"
+    await session.commit()
+    # A later transaction in the same session sees the context again
+    assert (await session.execute(CURRENT_TENANT)).scalar() == "42"
+    await gen.aclose()
+
+    # Nothing is left on the pooled connection for the next session
+    async with AsyncSessionLocal() as session:
+        assert (await session.execute(CURRENT_TENANT)).scalar() in (None, "")
+
+    gen, session = await _open(get_db_no_rls)
+    assert (await session.execute(CURRENT_TENANT)).scalar() == ""
+    await gen.aclose()
+
+
+async def test_read_sessions_are_read_only_on_their_own_pool(app_engines):
+    set_tenant_context(7)
+    gen, session = await _open(get_read_db)
+    assert session.bind is database.read_engine
+    assert (await session.execute(CURRENT_TENANT)).scalar() == "7"
+    assert (await session.execute(text("SHOW transaction_read_only"))).scalar() == "on"
+    with pytest.raises(DBAPIError):
+        await session.execute(text("CREATE TEMP TABLE read_pool_probe (id int)"))
+    await gen.aclose()
+
+    rendered = metrics.DB_POOL_CONNECTIONS.render()
+    assert 'db_pool_connections{pool="read",state="idle"} 1' in rendered
+    assert 'db_pool_connections{pool="primary",state="max"}' in rendered
+    assert metrics.DB_POOL_WAIT.count("read") >= 1
+
+
+class ProbePool(database.TimedQueuePool):
+    pool_name = "probe"
+
+
+async def test_transaction_pool_mode_disables_statement_caches(app_engines):
+    with patch("app.persistence.database.settings.db_pool_mode", "transaction"):
+        engine = database._create_engine(ProbePool, 1, 0, 5)
+    try:
+        async with engine.connect() as conn:
+            for _ in range(2):
+                assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+            raw = await conn.get_raw_connection()
+            assert raw.driver_connection._stmt_cache.get_max_size() == 0
+    finally:
+        await engine.dispose()
+
+
+async def test_reads_use_primary_read_pool_without_replica(app_engines):
+    assert database.replica_engine is None
+    before = metrics.DB_READ_ROUTES.value("primary")
+    async with read_session() as session:
+        assert session.bind is database.read_engine
+        assert (await session.execute(CURRENT_TENANT)).scalar() in (None, "")
+        assert (await session.execute(text("SHOW transaction_read_only"))).scalar() == "on"
+    assert metrics.DB_READ_ROUTES.value("primary") == before + 1
+
+
+async def test_replica_used_only_within_lag_tolerance(app_engines):
+    # The test database stands in for the replica; it isn't in recovery, so lag is 0
+    monitor = ReplicaLagMonitor(database.read_engine, check_interval=60)
+    assert await monitor.lag_seconds() == 0
+    assert "db_replica_lag_seconds 0" in metrics.DB_REPLICA_LAG.render()
+
+    replica = object()
+    monitor.lag_seconds = AsyncMock(return_value=45.0)
+    with patch.object(database, "replica_engine", replica), patch.object(database, "replica_lag", monitor):
+        assert await database.choose_read_engine(60) is replica
+        assert await database.choose_read_engine(30) is database.read_engine
+
+
+async def test_lag_check_failure_falls_back_to_primary():
+    broken = database._create_engine(
+        ProbePool, 1, 0, 1, url="postgresql+asyncpg://nobody@127.0.0.1:1/none",
+    )
+    monitor = ReplicaLagMonitor(broken, check_interval=60)
+    try:
+        assert await monitor.lag_seconds() == float("inf")
+    finally:
+        await broken.dispose()
@@ -0,0 +1,190 @@
+"""Tests for the batch drip dispatcher.
+
+Needs a reachable Postgres (DATABASE_URL); skipped otherwise.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from app.domain.services.compliance_gate import ComplianceGate
+from app.domain.services.dnc_service import DncService
+from app.domain.services.drip_dispatcher import DripDispatcher
+from app.domain.services.opt_in_service import OptInService
+from app.persistence.models.conversation import Conversation, Message
+from app.persistence.models.drip_campaign import (
+    DripCampaign,
+    DripCampaignStep,
+    DripEnrollment,
+)
+from app.persistence.models.lead import Lead
+from app.settings import settings
+
+
+@pytest.fixture
+def dispatcher_env():
+    """Fake SMS provider, batch mode on, outside quiet hours."""
+    provider = MagicMock()
+    provider.send_sms = AsyncMock(return_value=MagicMock(message_id="m-1"))
+    factory = MagicMock()
+    factory.get_config = AsyncMock(return_value=SimpleNamespace(is_enabled=True, timezone="UTC"))
+    factory.get_sms_phone_number = MagicMock(return_value="+15559990000")
+    factory.get_sms_provider = AsyncMock(return_value=provider)
+    with patch("app.llm.orchestrator.get_llm_client", return_value=MagicMock()), \
+         patch("app.workers.followup_worker._is_quiet_hours", return_value=False), \
+         patch("app.domain.services.drip_campaign_service.settings.drip_batch_dispatch_enabled", True):
+        yield SimpleNamespace(provider=provider, factory=factory)
+
+
+async def _seed(db, tenant_id):
+    campaign = DripCampaign(tenant_id=tenant_id, name="Kids", campaign_type="kids", is_enabled=True)
+    campaign.steps = [
+        DripCampaignStep(step_number=1, delay_minutes=0, message_template="Hi {{First Name}}!"),
+        DripCampaignStep(step_number=2, delay_minutes=60, message_template="Still there {{First Name}}?"),
+    ]
+    db.add(campaign)
+    past = datetime.utcnow() - timedelta(minutes=5)
+
+    enrollments = {}
+    for key, phone, current_step, due in [
+        ("first", "+15550000001", 0, past),
+        ("last", "+15550000002", 1, past),
+        ("blocked", "+15550000003", 0, past),
+        ("not_opted_in", "+15550000004", 0, past),
+        ("not_due", "+15550000005", 0, datetime.utcnow() + timedelta(hours=1)),
+    ]:
+        lead = Lead(tenant_id=tenant_id, name=f"{key.title()} Lead", phone=phone)
+        db.add(lead)
+        await db.flush()
+        enrollment = DripEnrollment(
+            tenant_id=tenant_id, campaign=campaign, lead=lead,
+            current_step=current_step, next_step_at=due,
+        )
+        db.add(enrollment)
+        enrollments[key] = enrollment
+    await db.flush()
+
+    for key in ("first", "last", "blocked", "not_due"):
+        await OptInService(db).opt_in(tenant_id, enrollments[key].lead.phone)
+    await DncService(db).block(tenant_id, phone=enrollments["blocked"].lead.phone)
+    return enrollments
+
+
+async def test_dispatch_sends_due_steps_and_schedules_next(db_session, db_tenant, dispatcher_env):
+    enrollments = await _seed(db_session, db_tenant.id)
+    dispatcher = DripDispatcher(db_session)
+    dispatcher.factory = dispatcher_env.factory
+
+    outcomes = await dispatcher.dispatch(batch_size=2)
+
+    assert outcomes == {"sent": 2, "cancelled": 2}
+    assert dispatcher_env.provider.send_sms.await_count == 2
+    assert {c.kwargs["body"] for c in dispatcher_env.provider.send_sms.await_args_list} == {
+        "Hi First!", "Still there Last?",
+    }
+    # Tenant config was looked up once per batch, not once per enrollment
+    assert dispatcher_env.factory.get_config.await_count <= 2
+
+    first, last = enrollments["first"], enrollments["last"]
+    assert (first.status, first.current_step) == ("active", 1)
+    assert first.next_step_at > datetime.utcnow() + timedelta(minutes=55)
+    assert (last.status, last.current_step, last.next_step_at) == ("completed", 2, None)
+    assert enrollments["blocked"].cancelled_reason == "dnc"
+    assert enrollments["not_opted_in"].cancelled_reason == "not_opted_in"
+    assert enrollments["not_due"].current_step == 0
+
+    conversation = (await db_session.execute(
+        select(Conversation).where(Conversation.external_id == f"drip-{first.id}")
+    )).scalar_one()
+    assert conversation.phone_number == first.lead.phone
+    [message] = (await db_session.execute(
+        select(Message).where(Message.conversation_id == conversation.id)
+    )).scalars().all()
+    assert (message.role, message.sequence_number) == ("assistant", 1)
+
+    # Nothing is due any more
+    assert await dispatcher.dispatch() == {}
+
+
+async def test_quiet_hours_defer_whole_tenant(db_session, db_tenant, dispatcher_env):
+    enrollments = await _seed(db_session, db_tenant.id)
+    dispatcher = DripDispatcher(db_session)
+    dispatcher.factory = dispatcher_env.factory
+
+    with patch("app.workers.followup_worker._is_quiet_hours", return_value=True), \
+         patch("app.workers.followup_worker._seconds_until_quiet_hours_end", return_value=3600):
+        outcomes = await dispatcher.dispatch()
+
+    assert outcomes == {"deferred": 4}
+    dispatcher_env.provider.send_sms.assert_not_awaited()
+    assert enrollments["first"].next_step_at > datetime.utcnow() + timedelta(minutes=55)
+
+
+async def test_implied_opt_in_is_committed_with_the_batch(db_session, db_tenant, dispatcher_env):
+    campaign = DripCampaign(tenant_id=db_tenant.id, name="Voice", campaign_type="kids", is_enabled=True)
+    campaign.steps = [DripCampaignStep(step_number=1, delay_minutes=0, message_template="Hi!")]
+    lead = Lead(tenant_id=db_tenant.id, name="Caller", phone="+15550000009",
+                extra_data={"source": "voice_call"})
+    db_session.add_all([campaign, lead])
+    db_session.add(DripEnrollment(
+        tenant_id=db_tenant.id, campaign=campaign, lead=lead,
+        current_step=0, next_step_at=datetime.utcnow() - timedelta(minutes=5),
+    ))
+    await db_session.flush()
+    dispatcher = DripDispatcher(db_session)
+    dispatcher.factory = dispatcher_env.factory
+
+    # The committing opt_in must not run mid-batch
+    with patch.object(OptInService, "opt_in", side_effect=AssertionError("commits mid-batch")):
+        outcomes = await dispatcher.dispatch()
+
+    assert outcomes == {"sent": 1}
+    assert await OptInService(db_session).is_opted_in(db_tenant.id, lead.phone)
+    assert (await ComplianceGate(db_session).check(db_tenant.id, lead.phone)).allowed
+
+
+async def test_failed_send_backs_off_then_cancels(db_session, db_tenant, dispatcher_env, monkeypatch):
+    monkeypatch.setattr(settings, "drip_dispatch_max_attempts", 2)
+    enrollments = await _seed(db_session, db_tenant.id)
+    failing = enrollments["first"].lead.phone
+
+    async def send_sms(to, **kwargs):
+        if to == failing:
+            raise RuntimeError("carrier error")
+        return MagicMock(message_id="m-1")
+
+    dispatcher_env.provider.send_sms = AsyncMock(side_effect=send_sms)
+    dispatcher = DripDispatcher(db_session)
+    dispatcher.factory = dispatcher_env.factory
+
+    assert await dispatcher.dispatch() == {"sent": 1, "error": 1, "cancelled": 2}
+    first = enrollments["first"]
+    assert (first.status, first.current_step, first.send_attempts) == ("active", 0, 1)
+    assert first.next_step_at > datetime.utcnow() + timedelta(seconds=settings.drip_dispatch_lease_seconds - 60)
+
+    first.next_step_at = datetime.utcnow() - timedelta(seconds=1)
+    await db_session.commit()
+    assert await dispatcher.dispatch() == {"cancelled": 1}
+    assert (first.status, first.cancelled_reason) == ("cancelled", "send_failed")
+
+
+async def test_sent_steps_stay_recorded_when_another_record_fails(db_session, db_tenant, dispatcher_env):
+    enrollments = await _seed(db_session, db_tenant.id)
+    dispatcher = DripDispatcher(db_session)
+    dispatcher.factory = dispatcher_env.factory
+    record_sent = dispatcher._record_sent
+
+    async def flaky_record(tenant_id, sent):
+        if sent[0][0] is enrollments["last"]:
+            raise RuntimeError("db hiccup")
+        await record_sent(tenant_id, sent)
+
+    with patch.object(dispatcher, "_record_sent", side_effect=flaky_record):
+        outcomes = await dispatcher.dispatch()
+
+    assert outcomes["sent"] == 2
+    await db_session.refresh(enrollments["first"])
+    assert enrollments["first"].current_step == 1
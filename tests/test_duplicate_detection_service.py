@@ -0,0 +1,137 @@
+"""Tests for incremental duplicate-contact detection."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.phone import normalize_email, phone_match_key
+from app.domain.services.duplicate_detection_service import (
+    DuplicateDetectionService,
+    PairScore,
+    build_clusters,
+    score_pair,
+    split_oversized_clusters,
+)
+from app.persistence.models.contact import Contact
+from app.utils.name_matching import name_block_key, name_similarity, soundex
+
+
+def _contact(contact_id, name=None, email=None, phone=None):
+    return SimpleNamespace(
+        id=contact_id,
+        name=name,
+        name_key=name_block_key(name),
+        email_normalized=normalize_email(email),
+        phone_last10=phone_match_key(phone),
+    )
+
+
+class TestNameMatching:
+    @pytest.mark.parametrize("word,code", [
+        ("Robert", "R163"),
+        ("Rupert", "R163"),
+        ("Ashcraft", "A261"),
+        ("Tymczak", "T522"),
+        ("Pfister", "P236"),
+    ])
+    def test_soundex(self, word, code):
+        assert soundex(word) == code
+
+    def test_block_key_tolerates_spelling_and_initials(self):
+        assert name_block_key("Jon Smith") == name_block_key("John Smyth") == name_block_key("J. Smith")
+        assert name_block_key("") is None
+
+    def test_similarity(self):
+        assert name_similarity("John Smith", "john  smith") == 1.0
+        assert name_similarity("Jon Smith", "John Smith") > 0.5
+        assert name_similarity("Jon Smith", "Jane Smythe") < 0.5
+
+
+class TestScorePair:
+    def test_email_and_phone(self):
+        a = _contact(1, email="A@x.com", phone="(281) 788-2316")
+        b = _contact(2, email="a@x.com", phone="+12817882316")
+        assert score_pair(a, b).match_type == "multiple"
+
+    def test_phone_with_agreeing_names_is_boosted(self):
+        a = _contact(1, "John Smith", phone="2817882316")
+        b = _contact(2, "Jon Smith", phone="+12817882316")
+        c = _contact(3, "Maria Lopez", phone="+12817882316")
+        assert score_pair(a, b).confidence > score_pair(a, c).confidence
+        assert score_pair(a, c).match_type == "phone"
+
+    def test_fuzzy_name_only(self):
+        score = score_pair(_contact(1, "John Smith"), _contact(2, "Jon Smith"))
+        assert score.match_type == "name"
+        assert 0.5 <= score.confidence < 0.6
+
+    def test_exact_name_only(self):
+        assert score_pair(_contact(1, "John Smith"), _contact(2, "john smith")).confidence == 0.6
+
+    def test_unrelated(self):
+        assert score_pair(_contact(1, "John Smith"), _contact(2, "Jane Smythe")) is None
+
+
+class TestBuildClusters:
+    def test_connected_pairs_form_one_cluster_with_best_score(self):
+        clusters = build_clusters([
+            (1, 2, PairScore(0.9, "phone", "2817882316")),
+            (2, 3, PairScore(0.95, "email", "a@x.com")),
+            (7, 8, PairScore(0.6, "name", "jo smith")),
+        ])
+        by_members = {tuple(c.contact_ids): c for c in clusters}
+        assert set(by_members) == {(1, 2, 3), (7, 8)}
+        assert by_members[(1, 2, 3)].match_type == "email"
+        assert by_members[(1, 2, 3)].confidence == 0.95
+
+
+    def test_oversized_cluster_is_split_on_strong_pairs(self, monkeypatch):
+        monkeypatch.setattr("app.domain.services.duplicate_detection_service.MAX_COMPONENT_SIZE", 3)
+        edges = {
+            (1, 2): PairScore(0.9, "phone", "2817882316"),
+            (2, 3): PairScore(0.55, "name", "jo smith"),
+            (3, 4): PairScore(0.95, "email", "a@x.com"),
+            (7, 8): PairScore(0.6, "name", "maria lopez"),
+        }
+        clusters = build_clusters((a, b, score) for (a, b), score in edges.items())
+
+        split = split_oversized_clusters(clusters, edges)
+
+        # Only the oversized cluster loses its name-only pairs
+        assert sorted(c.contact_ids for c in split) == [[1, 2], [3, 4], [7, 8]]
+
+
+class TestContactFlags:
+    def test_matching_fields_mark_contact_pending(self):
+        contact = Contact(name="Jon Smith")
+        assert contact.name_key == "j:S530"
+        contact.dedup_pending = False
+        contact.phone = "+12817882316"
+        assert contact.dedup_pending is True
+
+        contact.dedup_pending = False
+        contact.merged_into_contact_id = 5
+        assert contact.dedup_pending is True
+
+
+class TestScoreCandidates:
+    async def test_pairs_found_through_blocks(self):
+        rows = [
+            _contact(1, "John Smith", phone="2817882316"),
+            _contact(2, "Jon Smith", email="jon@x.com"),
+            _contact(3, "Maria Lopez", phone="+12817882316"),
+        ]
+        oversized = MagicMock()
+        oversized.scalars.return_value.all.return_value = []
+        candidates = MagicMock()
+        candidates.all.return_value = rows
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=[oversized, candidates])
+
+        service = DuplicateDetectionService(session)
+        pairs = await service._score_candidates(1, [rows[0]])
+
+        assert set(pairs) == {(1, 2), (1, 3)}
+        assert pairs[(1, 2)].match_type == "name"
+        assert pairs[(1, 3)].match_type == "phone"
@@ -289,3 +289,57 @@ async def test_email_service_format_response():
         assert response.strip() in formatted
         assert signature in formatted
 
+
+
+@pytest.mark.asyncio
+async def test_process_gmail_notification_fetches_bodies_only_for_matches(email_service):
+    """Test that Gmail notifications triage on metadata before fetching bodies."""
+    email_config = MagicMock()
+    email_config.tenant_id = 1
+    email_config.is_enabled = True
+    email_config.last_history_id = "100"
+    email_config.gmail_access_token = "token"
+    email_config.lead_capture_subject_prefixes = ["New Lead"]
+    email_service.email_config_repo.get_by_email = AsyncMock(return_value=email_config)
+    email_service.email_config_repo.update_history_id = AsyncMock()
+    email_service._maybe_refresh_watch = AsyncMock()
+
+    metadata = {
+        "lead": {"subject": "New Lead: Jane", "from": "form@site.com", "label_ids": ["INBOX"]},
+        "newsletter": {"subject": "Weekly digest", "from": "news@site.com", "label_ids": ["INBOX"]},
+        "sent": {"subject": "New Lead: reply", "from": "us@company.com", "label_ids": ["SENT"]},
+    }
+    full = {
+        "lead": {
+            "subject": "New Lead: Jane",
+            "from": "form@site.com",
+            "to": "us@company.com",
+            "body": "Name: Jane",
+            "thread_id": "t1",
+        },
+    }
+
+    def get_messages_batch(message_ids, format="full", metadata_headers=None):
+        source = metadata if format == "metadata" else full
+        return {m: source[m] for m in message_ids if m in source}
+
+    with patch("app.domain.services.email_service.GmailClient") as mock_client_cls:
+        gmail_client = mock_client_cls.return_value
+        gmail_client.get_history.return_value = {
+            "messages": [{"id": "lead"}, {"id": "newsletter"}, {"id": "sent"}, {"id": "lead"}],
+            "history_id": None,
+        }
+        gmail_client.get_token_info.return_value = {"access_token": "token"}
+        gmail_client.get_messages_batch.side_effect = get_messages_batch
+        email_service.process_inbound_email = AsyncMock(return_value=EmailResult(response_message=""))
+
+        results = await email_service.process_gmail_notification("us@company.com", "101")
+
+    assert len(results) == 1
+    calls = gmail_client.get_messages_batch.call_args_list
+    assert calls[0].args[0] == ["lead", "newsletter", "sent"]
+    assert calls[0].kwargs["format"] == "metadata"
+    assert calls[1].args[0] == ["lead"]
+    assert calls[1].kwargs["format"] == "full"
+    gmail_client.get_message.assert_not_called()
+    assert email_service.process_inbound_email.await_args.kwargs["body"] == "Name: Jane"
@@ -0,0 +1,62 @@
+"""Tests for streaming exports.
+
+The streaming tests need a reachable Postgres (DATABASE_URL); skipped otherwise.
+"""
+
+import json
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.api.exports import CsvEncoder, NdjsonEncoder, stream_batches
+from app.persistence.models.customer import Customer
+from app.persistence.repositories.base import BaseRepository
+
+
+def test_encoders():
+    csv_encoder = CsvEncoder(["id", "name", "seen"])
+    assert csv_encoder.header() == "id,name,seen\r\n"
+    assert csv_encoder.encode([(1, 'Lee, "Ann"', None)]) == '1,"Lee, ""Ann""",\r\n'
+    assert csv_encoder.encode([(2, "Bo", datetime(2026, 1, 2, 3, 4))]) == "2,Bo,2026-01-02 03:04:00\r\n"
+
+    ndjson_encoder = NdjsonEncoder(["id", "seen"])
+    assert ndjson_encoder.header() == ""
+    lines = ndjson_encoder.encode([(1, None), (2, datetime(2026, 1, 2))]).splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"id": 1, "seen": None}, {"id": 2, "seen": "2026-01-02 00:00:00"},
+    ]
+
+
+async def _customers(db_session, tenant_id, count):
+    await BaseRepository(Customer, db_session).create_many(tenant_id, [
+        {"name": f"Customer {n:02d}", "phone": f"+1555010{n:04d}"} for n in range(count)
+    ])
+
+
+async def test_stream_batches_reads_in_cursor_batches(db_session, db_tenant):
+    await _customers(db_session, db_tenant.id, 5)
+    stmt = select(Customer.name).where(Customer.tenant_id == db_tenant.id).order_by(Customer.name)
+
+    batches = [batch async for batch in stream_batches(db_session, stmt, batch_size=2)]
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert batches[0][0].name == "Customer 00"
+
+
+async def test_savings_export_streams_csv_and_ndjson(db_session, db_tenant, api_client):
+    await _customers(db_session, db_tenant.id, 3)
+    url = "/api/v1/analytics/savings/export/customers"
+
+    response = await api_client.get(url)
+    assert response.headers["content-disposition"] == "attachment; filename=customers.csv"
+    lines = response.text.splitlines()
+    assert lines[0] == "id,name,phone,email,status,external_id"
+    assert [line.split(",")[1] for line in lines[1:]] == ["Customer 00", "Customer 01", "Customer 02"]
+
+    response = await api_client.get(url, params={"format": "ndjson"})
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == 3
+    assert (rows[0]["name"], rows[0]["status"], rows[0]["email"]) == ("Customer 00", "active", None)
+
+    assert (await api_client.get(url, params={"format": "xml"})).status_code == 422
@@ -158,3 +158,74 @@ class TestGmailClientCredentials:
                 token_info = client.get_token_info()
                 assert token_info["access_token"] == "new_access_token"
 
+
+
+class TestGmailClientBatch:
+    """Tests for batched message retrieval."""
+
+    def _client_with_batches(self, responses):
+        """Client whose batch requests reply from a {message_id: response} map."""
+        client = GmailClient()
+        service = MagicMock()
+        batches = []
+
+        def new_batch(callback):
+            batch = MagicMock()
+            batch.ids = []
+            batch.add.side_effect = lambda request, request_id: batch.ids.append(request_id)
+
+            def execute():
+                for message_id in batch.ids:
+                    response = responses.get(message_id)
+                    if response is None:
+                        callback(message_id, None, Exception("404 Not Found"))
+                    else:
+                        callback(message_id, response, None)
+
+            batch.execute.side_effect = execute
+            batches.append(batch)
+            return batch
+
+        service.new_batch_http_request.side_effect = new_batch
+        client._service = service
+        return client, service, batches
+
+    def test_get_messages_batch_parses_and_skips_failures(self):
+        """Test that failed parts are omitted and headers are parsed."""
+        responses = {
+            "m1": {
+                "id": "m1",
+                "threadId": "t1",
+                "labelIds": ["INBOX"],
+                "payload": {"headers": [{"name": "Subject", "value": "Lead: Jane"}]},
+            },
+        }
+        client, service, _ = self._client_with_batches(responses)
+
+        messages = client.get_messages_batch(
+            ["m1", "gone"], format="metadata", metadata_headers=["Subject"]
+        )
+
+        assert list(messages) == ["m1"]
+        assert messages["m1"]["subject"] == "Lead: Jane"
+        assert messages["m1"]["body"] == ""
+        service.users().messages().get.assert_any_call(
+            userId="me", id="m1", format="metadata", metadataHeaders=["Subject"]
+        )
+
+    def test_get_messages_batch_chunks_requests(self):
+        """Test that large ID lists are split into MAX_BATCH_SIZE batches."""
+        ids = [f"m{i}" for i in range(GmailClient.MAX_BATCH_SIZE + 5)]
+        client, _, batches = self._client_with_batches({i: {"id": i} for i in ids})
+
+        messages = client.get_messages_batch(ids)
+
+        assert len(messages) == len(ids)
+        assert [len(b.ids) for b in batches] == [GmailClient.MAX_BATCH_SIZE, 5]
+
+    def test_get_messages_batch_empty(self):
+        """Test that no request is made for an empty ID list."""
+        client, service, _ = self._client_with_batches({})
+
+        assert client.get_messages_batch([]) == {}
+        service.new_batch_http_request.assert_not_called()
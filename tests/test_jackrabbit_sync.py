@@ -0,0 +1,116 @@
+"""Tests for bulk Jackrabbit family sync.
+
+The sync tests need a reachable Postgres (DATABASE_URL); skipped otherwise.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy import select
+
+from app.domain.services.jackrabbit_sync_service import (
+    FamilyRecord,
+    JackrabbitSyncService,
+    family_record_from_api,
+)
+from app.infrastructure.jackrabbit_client import fetch_families
+from app.persistence.models.customer import Customer
+from app.persistence.models.jackrabbit_customer import JackrabbitCustomer
+
+
+def _family(i, **overrides):
+    return {"id": f"JR{i}", "family_name": f"Family {i}", "phone": f"(555) 010-{i:04d}",
+            "email": f"Fam{i}@Example.com", **overrides}
+
+
+async def test_fetch_families_fetches_remaining_pages_after_first():
+    def response(page):
+        r = MagicMock()
+        r.raise_for_status = MagicMock()
+        r.json.return_value = {"page": page, "total": 3, "rows": [_family(page * 10 + n) for n in range(2)]}
+        return r
+
+    with patch("app.infrastructure.jackrabbit_client.httpx.AsyncClient") as mock_client:
+        client = AsyncMock()
+        client.get = AsyncMock(side_effect=lambda url, params: response(params["page"]))
+        mock_client.return_value.__aenter__ = AsyncMock(return_value=client)
+        mock_client.return_value.__aexit__ = AsyncMock(return_value=None)
+
+        families = await fetch_families("k1", "k2", page_size=2)
+
+    assert [f["id"] for f in families] == ["JR10", "JR11", "JR20", "JR21", "JR30", "JR31"]
+    assert sorted(c.kwargs["params"]["page"] for c in client.get.await_args_list) == [1, 2, 3]
+
+
+def test_family_record_from_api():
+    record = family_record_from_api({"fam_id": 7, "first_name": "Ann", "last_name": "Lee", "cell_phone": "5550100"})
+    assert (record.jackrabbit_id, record.name, record.phone) == ("7", "Ann Lee", "5550100")
+    assert family_record_from_api({"name": "No ID"}) is None
+
+
+async def test_sync_upserts_in_bulk_and_skips_unchanged(db_session, db_tenant, query_budget):
+    service = JackrabbitSyncService(db_session)
+    records = [family_record_from_api(_family(i)) for i in range(1, 6)]
+
+    with query_budget("jackrabbit bulk sync", max_queries=3):
+        result = await service.sync(db_tenant.id, records)
+    assert (result.created, result.updated, result.unchanged, result.skipped) == (5, 0, 0, 0)
+
+    customers = (await db_session.execute(
+        select(Customer).where(Customer.tenant_id == db_tenant.id).order_by(Customer.external_customer_id)
+    )).scalars().all()
+    assert [c.external_customer_id for c in customers] == ["JR1", "JR2", "JR3", "JR4", "JR5"]
+    first = customers[0]
+    assert (first.phone, first.phone_last10, first.email_normalized) == (
+        "+15550100001", "5550100001", "fam1@example.com",
+    )
+    assert first.jackrabbit_customer_id is not None and first.sync_source == "jackrabbit"
+    assert result.customer_ids["JR1"] == first.id
+
+    # Second run: one family changed, the rest are skipped by content hash
+    records = [family_record_from_api(_family(i, status="inactive" if i == 2 else None))
+               for i in range(1, 6)]
+    with query_budget("jackrabbit resync", max_queries=3):
+        result = await service.sync(db_tenant.id, records)
+    assert (result.created, result.updated, result.unchanged) == (0, 1, 4)
+
+    await db_session.refresh(customers[1])
+    assert customers[1].status == "inactive"
+    cache_rows = (await db_session.execute(
+        select(JackrabbitCustomer).where(JackrabbitCustomer.tenant_id == db_tenant.id)
+    )).scalars().all()
+    assert len(cache_rows) == 5
+
+
+async def test_sync_adopts_or_skips_existing_phone_owner(db_session, db_tenant):
+    db_session.add_all([
+        Customer(tenant_id=db_tenant.id, phone="+15550100001", name="Manual entry"),
+        Customer(tenant_id=db_tenant.id, phone="+15550100002", external_customer_id="OTHER"),
+    ])
+    await db_session.flush()
+
+    result = await JackrabbitSyncService(db_session).sync(db_tenant.id, [
+        family_record_from_api(_family(1)),
+        family_record_from_api(_family(2)),
+        FamilyRecord(jackrabbit_id="JR9", phone=None),
+    ])
+
+    assert (result.created, result.updated, result.skipped) == (0, 1, 2)
+    adopted = (await db_session.execute(
+        select(Customer).where(Customer.tenant_id == db_tenant.id, Customer.phone == "+15550100001")
+    )).scalar_one()
+    await db_session.refresh(adopted)
+    assert (adopted.external_customer_id, adopted.name) == ("JR1", "Family 1")
+
+
+async def test_sync_matches_existing_customer_in_another_phone_format(db_session, db_tenant):
+    db_session.add(Customer(tenant_id=db_tenant.id, phone="5550100003", name="Imported"))
+    await db_session.flush()
+
+    result = await JackrabbitSyncService(db_session).sync(db_tenant.id, [family_record_from_api(_family(3))])
+
+    assert (result.created, result.updated) == (0, 1)
+    [customer] = (await db_session.execute(
+        select(Customer).where(Customer.tenant_id == db_tenant.id, Customer.phone_last10 == "5550100003")
+    )).scalars().all()
+    await db_session.refresh(customer)
+    assert (customer.external_customer_id, customer.phone) == ("JR3", "+15550100003")
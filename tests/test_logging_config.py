@@ -0,0 +1,114 @@
+"""Tests for queued JSON logging and call-site sampling."""
+
+import io
+import json
+import logging
+import queue
+from unittest.mock import patch
+
+from app.logging_config import (
+    JSONFormatter,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    setup_logging,
+    shutdown_logging,
+)
+from app.settings import settings
+
+
+def _record(msg="hello %s", args=("world",), level=logging.INFO, lineno=10, exc_info=None):
+    return logging.LogRecord("app.test", level, "/app/test.py", lineno, msg, args, exc_info)
+
+
+class TestSamplingFilter:
+    def test_burst_then_every_nth_with_suppressed_count(self):
+        sampler = SamplingFilter(burst=3, window_seconds=60, every=5)
+        records = [_record() for _ in range(13)]
+
+        passed = [r for r in records if sampler.filter(r)]
+
+        assert len(passed) == 5  # 3 burst + records 8 and 13
+        assert passed[3].sampled_out == 4
+        assert passed[4].sampled_out == 4
+
+    def test_call_sites_and_warnings_are_independent(self):
+        sampler = SamplingFilter(burst=1, window_seconds=60, every=100)
+        assert sampler.filter(_record(lineno=1))
+        assert not sampler.filter(_record(lineno=1))
+        assert sampler.filter(_record(lineno=2))
+        assert sampler.filter(_record(lineno=1, level=logging.WARNING))
+
+    def test_new_window_reports_suppressed(self):
+        sampler = SamplingFilter(burst=1, window_seconds=10, every=100)
+        with patch("app.logging_config.time.monotonic", return_value=0.0):
+            sampler.filter(_record())
+            sampler.filter(_record())
+        with patch("app.logging_config.time.monotonic", return_value=11.0):
+            record = _record()
+            assert sampler.filter(record)
+        assert record.sampled_out == 1
+
+
+class TestNonBlockingQueueHandler:
+    def test_renders_message_and_traceback_before_enqueue(self):
+        handler = NonBlockingQueueHandler(queue.SimpleQueue(), max_size=10)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            import sys
+            handler.emit(_record(exc_info=sys.exc_info()))
+
+        queued = handler.queue.get_nowait()
+        assert queued.msg == "hello world" and queued.args is None
+        assert queued.exc_info is None
+        assert "ValueError: boom" in queued.exc_text
+
+    def test_full_queue_drops_and_reports_count(self):
+        handler = NonBlockingQueueHandler(queue.SimpleQueue(), max_size=1)
+        for _ in range(3):
+            handler.emit(_record())
+        handler.queue.get_nowait()
+        handler.emit(_record())
+
+        assert handler.queue.get_nowait().dropped_records == 2
+
+
+class TestShutdownLogging:
+    def test_records_after_shutdown_are_written_directly(self, monkeypatch):
+        monkeypatch.setattr(settings, "log_async", True)
+        root_logger = logging.getLogger()
+        saved_handlers, saved_level = root_logger.handlers[:], root_logger.level
+        stdout = io.StringIO()
+        try:
+            with patch("app.logging_config.sys.stdout", stdout):
+                setup_logging()
+            logging.getLogger("app.test").warning("queued")
+            shutdown_logging()
+            logging.getLogger("app.test").warning("after shutdown")
+
+            assert not any(isinstance(h, NonBlockingQueueHandler) for h in root_logger.handlers)
+            lines = [json.loads(line)["message"] for line in stdout.getvalue().splitlines()]
+            assert lines == ["queued", "after shutdown"]
+        finally:
+            root_logger.handlers[:] = saved_handlers
+            root_logger.setLevel(saved_level)
+
+
+class TestJSONFormatter:
+    def test_extras_exception_text_and_unserializable_values(self):
+        record = _record()
+        record.request_id = "req-1"
+        record.tenant_id = ""
+        record.exc_text = "Traceback ..."
+        record.call = object()
+        record.sampled_out = 4
+
+        data = json.loads(JSONFormatter().format(record))
+
+        assert data["message"] == "hello world"
+        assert data["timestamp"].endswith("Z")
+        assert data["request_id"] == "req-1"
+        assert "tenant_id" not in data
+        assert data["exception"] == "Traceback ..."
+        assert data["sampled_out"] == 4
+        assert data["call"].startswith("<object object")
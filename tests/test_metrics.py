@@ -0,0 +1,77 @@
+"""Tests for the in-process metrics registry and recording helpers."""
+
+import httpx
+import pytest
+
+from app.core import metrics
+from app.core.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+class TestExposition:
+    def test_histogram_buckets_are_cumulative(self):
+        h = Histogram("req_seconds", "Request time", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            h.observe(value, "/a")
+
+        lines = h.render().splitlines()
+
+        assert lines[:2] == ["# HELP req_seconds Request time", "# TYPE req_seconds histogram"]
+        assert 'req_seconds_bucket{route="/a",le="0.1"} 2' in lines
+        assert 'req_seconds_bucket{route="/a",le="1"} 3' in lines
+        assert 'req_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+        assert 'req_seconds_sum{route="/a"} 3.65' in lines
+        assert 'req_seconds_count{route="/a"} 4' in lines
+        assert h.count("/a") == 4
+
+    def test_counter_and_label_escaping(self):
+        c = Counter("hits", "Hits", ("key",))
+        c.inc('a"b')
+        c.inc('a"b', amount=2)
+        assert 'hits_total{key="a\\"b"} 3' in c.render()
+
+    def test_gauge_callbacks_read_at_scrape_and_errors_skipped(self):
+        g = Gauge("depth", "Depth", ("queue",))
+        items = [1, 2]
+        g.set_function(lambda: len(items), "q")
+        g.set_function(lambda: 1 / 0, "broken")
+        items.append(3)
+
+        rendered = g.render()
+
+        assert 'depth{queue="q"} 3' in rendered
+        assert "broken" not in rendered
+
+    def test_registry_reuses_existing_family(self):
+        registry = MetricsRegistry()
+        first = registry.register(Counter("x", "X"))
+        assert registry.register(Counter("x", "X")) is first
+
+
+class TestRecordingHelpers:
+    def test_db_queries_accumulate_per_request(self):
+        stats = metrics.start_request_db_stats()
+        metrics.record_db_query(0.002)
+        metrics.record_db_query(0.003)
+        assert stats[0] == 2
+        assert stats[1] == pytest.approx(0.005)
+
+    def test_observe_external_marks_errors(self):
+        before = metrics.EXTERNAL_API_DURATION.count("svc", "op", "error")
+        with pytest.raises(RuntimeError):
+            with metrics.observe_external("svc", "op"):
+                raise RuntimeError("down")
+        assert metrics.EXTERNAL_API_DURATION.count("svc", "op", "error") == before + 1
+
+    async def test_httpx_hooks_record_status_class(self):
+        transport = httpx.MockTransport(lambda request: httpx.Response(503))
+        before = metrics.EXTERNAL_API_DURATION.count("test_api", "GET", "5xx")
+        async with httpx.AsyncClient(
+            transport=transport, event_hooks=metrics.httpx_event_hooks("test_api")
+        ) as client:
+            await client.get("https://example.test/x")
+        assert metrics.EXTERNAL_API_DURATION.count("test_api", "GET", "5xx") == before + 1
+
+    def test_cache_counter(self):
+        before = metrics.CACHE_REQUESTS.value("test_cache", "hit")
+        metrics.record_cache("test_cache", hit=True)
+        assert metrics.CACHE_REQUESTS.value("test_cache", "hit") == before + 1
@@ -0,0 +1,188 @@
+"""Tests for the admin notification outbox and dispatcher."""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.infrastructure.notification_dispatcher import (
+    MAX_ATTEMPTS,
+    NotificationDispatcher,
+    retry_delay,
+)
+from app.infrastructure.notifications import NotificationService
+from app.persistence.models.notification import (
+    DeliveryStatus,
+    Notification,
+    NotificationDelivery,
+)
+
+
+def _admin(admin_id, email):
+    admin = MagicMock()
+    admin.id = admin_id
+    admin.email = email
+    admin.role = "tenant_admin"
+    return admin
+
+
+def _delivery(delivery_id, channel, tenant_id=1, attempts=1):
+    return NotificationDelivery(
+        id=delivery_id,
+        tenant_id=tenant_id,
+        channel=channel,
+        notification_type="escalation",
+        recipient="admin@example.com" if channel == "email" else None,
+        subject="Subject",
+        body="Body",
+        status=DeliveryStatus.SENDING,
+        attempts=attempts,
+    )
+
+
+@pytest.fixture
+def session():
+    session = AsyncMock()
+    session.add = MagicMock()
+    session.add_all = MagicMock()
+    return session
+
+
+@pytest.fixture
+def write_session():
+    """Session notify_admins writes on (instead of the caller's)."""
+    write_session = AsyncMock()
+    write_session.add = MagicMock()
+    write_session.add_all = MagicMock()
+    write_session.info = {}
+    factory = MagicMock()
+    factory.return_value.__aenter__.return_value = write_session
+    with patch("app.infrastructure.notifications.async_session_factory", factory):
+        yield write_session
+
+
+class TestNotifyAdminsOutbox:
+    async def test_writes_everything_in_one_commit_and_schedules_deliveries(self, session, write_session):
+        session.info = {"rls": "tenant"}
+        service = NotificationService(session)
+        service.user_repo.list = AsyncMock(return_value=[
+            _admin(1, "a@example.com"),
+            _admin(2, "b@example.com"),
+        ])
+        service._get_escalation_settings = AsyncMock(return_value={})
+
+        with patch("app.infrastructure.notifications.notification_dispatcher") as dispatcher:
+            result = await service.notify_admins(
+                tenant_id=1,
+                subject="Hello",
+                message="World",
+                methods=["in_app", "email", "sms"],
+            )
+
+        # The caller's transaction is left to the caller
+        session.commit.assert_not_awaited()
+        session.rollback.assert_not_awaited()
+        write_session.commit.assert_awaited_once()
+        assert write_session.info["rls"] == "tenant"
+        in_app = [c.args[0] for c in write_session.add.call_args_list]
+        assert all(isinstance(n, Notification) for n in in_app)
+        assert len(in_app) == 2
+
+        deliveries = write_session.add_all.call_args.args[0]
+        assert [d.channel for d in deliveries] == ["email", "email", "sms"]
+        assert {d.recipient for d in deliveries if d.channel == "email"} == {"a@example.com", "b@example.com"}
+        dispatcher.schedule.assert_called_once()
+        assert len(dispatcher.schedule.call_args.args[0]) == 3
+
+        assert result["status"] == "sent"
+        assert result["notifications"][0]["notifications"]["email"]["status"] == DeliveryStatus.PENDING
+
+    async def test_in_app_only_schedules_nothing(self, session, write_session):
+        service = NotificationService(session)
+        service.user_repo.list = AsyncMock(return_value=[_admin(1, "a@example.com")])
+        service._get_escalation_settings = AsyncMock(return_value={})
+
+        with patch("app.infrastructure.notifications.notification_dispatcher") as dispatcher:
+            await service.notify_admins(tenant_id=1, subject="s", message="m", methods=["in_app"])
+
+        write_session.add_all.assert_not_called()
+        dispatcher.schedule.assert_called_once_with([])
+
+
+class TestDispatcher:
+    async def test_records_sent_skipped_and_retry(self, session):
+        dispatcher = NotificationDispatcher()
+        email_ok = _delivery(1, "email")
+        sms_unconfigured = _delivery(2, "sms", tenant_id=2)
+        email_fail = _delivery(3, "email")
+        email_fail.recipient = "down@example.com"
+        dispatcher._claim = AsyncMock(return_value=[email_ok, sms_unconfigured, email_fail])
+
+        service = MagicMock()
+
+        async def send_email(to, subject, body, metadata=None):
+            if to == "down@example.com":
+                raise RuntimeError("smtp down")
+            return True
+
+        service._send_email = send_email
+        service._resolve_admin_sms_route = AsyncMock(
+            return_value={"status": "not_configured", "note": "Tenant SMS not configured"}
+        )
+
+        with patch("app.infrastructure.notifications.NotificationService", return_value=service):
+            counts = await dispatcher.dispatch(session)
+
+        assert email_ok.status == DeliveryStatus.SENT
+        assert email_ok.sent_at is not None
+        assert sms_unconfigured.status == DeliveryStatus.SKIPPED
+        assert email_fail.status == DeliveryStatus.PENDING
+        assert email_fail.last_error == "smtp down"
+        assert email_fail.next_attempt_at > datetime.utcnow()
+        assert counts[DeliveryStatus.SENT] == 1
+        session.commit.assert_awaited()
+
+    async def test_gives_up_after_max_attempts(self, session):
+        dispatcher = NotificationDispatcher()
+        delivery = _delivery(1, "email", attempts=MAX_ATTEMPTS)
+        dispatcher._claim = AsyncMock(return_value=[delivery])
+        service = MagicMock()
+        service._send_email = AsyncMock(return_value=False)
+
+        with patch("app.infrastructure.notifications.NotificationService", return_value=service):
+            await dispatcher.dispatch(session)
+
+        assert delivery.status == DeliveryStatus.FAILED
+
+    async def test_sms_route_resolved_once_per_tenant_and_concurrency_bounded(self, session):
+        dispatcher = NotificationDispatcher()
+        deliveries = [_delivery(i, "sms") for i in range(4)]
+        dispatcher._claim = AsyncMock(return_value=deliveries)
+
+        in_flight = 0
+        peak = 0
+
+        async def send_admin_sms(tenant_id, route, message):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {"status": "sent", "message_id": "m", "to": "+15555550100"}
+
+        service = MagicMock()
+        service._resolve_admin_sms_route = AsyncMock(return_value={"status": "ok"})
+        service._send_admin_sms = send_admin_sms
+
+        with patch("app.infrastructure.notifications.NotificationService", return_value=service), \
+                patch("app.infrastructure.notification_dispatcher.settings") as mock_settings:
+            mock_settings.notification_sms_concurrency = 2
+            await dispatcher.dispatch(session)
+
+        service._resolve_admin_sms_route.assert_awaited_once_with(1)
+        assert peak == 2
+        assert all(d.status == DeliveryStatus.SENT for d in deliveries)
+
+    def test_retry_delay_backs_off(self):
+        assert retry_delay(1) < retry_delay(2) < retry_delay(3)
@@ -3,6 +3,7 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from app.domain.services.compliance_gate import STATE_OPTED_IN, ComplianceDecision
 from app.domain.services.promise_fulfillment_service import PromiseFulfillmentService
 from app.domain.services.promise_detector import DetectedPromise
 
@@ -207,9 +208,9 @@ class TestFulfillPromise:
         """Test promise fulfillment with dynamic URL extraction."""
         service = PromiseFulfillmentService(mock_session)
 
-        # Mock DNC service to not block
-        with patch('app.domain.services.promise_fulfillment_service.DncService') as MockDnc:
-            MockDnc.return_value.is_blocked = AsyncMock(return_value=False)
+        # Mock compliance gate to allow the send
+        with patch('app.domain.services.promise_fulfillment_service.ComplianceGate') as MockGate:
+            MockGate.return_value.check = AsyncMock(return_value=ComplianceDecision(STATE_OPTED_IN))
 
             # Mock Redis - setnx returns True when key was set (no duplicate)
             with patch('app.domain.services.promise_fulfillment_service.redis_client') as mock_redis:
@@ -264,9 +265,9 @@ class TestFulfillPromise:
         """Test that duplicate promises are skipped via Redis."""
         service = PromiseFulfillmentService(mock_session)
 
-        # Mock DNC service to not block
-        with patch('app.domain.services.promise_fulfillment_service.DncService') as MockDnc:
-            MockDnc.return_value.is_blocked = AsyncMock(return_value=False)
+        # Mock compliance gate to allow the send
+        with patch('app.domain.services.promise_fulfillment_service.ComplianceGate') as MockGate:
+            MockGate.return_value.check = AsyncMock(return_value=ComplianceDecision(STATE_OPTED_IN))
 
             with patch('app.domain.services.promise_fulfillment_service.redis_client') as mock_redis:
                 # Redis setnx returns False when key already exists (duplicate)
@@ -293,9 +294,9 @@ class TestFulfillPromise:
         """Test that DB dedup catches duplicates when Redis passes (race condition protection)."""
         service = PromiseFulfillmentService(mock_session)
 
-        # Mock DNC service to not block
-        with patch('app.domain.services.promise_fulfillment_service.DncService') as MockDnc:
-            MockDnc.return_value.is_blocked = AsyncMock(return_value=False)
+        # Mock compliance gate to allow the send
+        with patch('app.domain.services.promise_fulfillment_service.ComplianceGate') as MockGate:
+            MockGate.return_value.check = AsyncMock(return_value=ComplianceDecision(STATE_OPTED_IN))
 
             with patch('app.domain.services.promise_fulfillment_service.redis_client') as mock_redis:
                 # Redis setnx succeeds (key was set)
@@ -330,9 +331,9 @@ class TestFulfillPromise:
         """Test that setnx is used (not exists+set) for atomic deduplication."""
         service = PromiseFulfillmentService(mock_session)
 
-        # Mock DNC service to not block
-        with patch('app.domain.services.promise_fulfillment_service.DncService') as MockDnc:
-            MockDnc.return_value.is_blocked = AsyncMock(return_value=False)
+        # Mock compliance gate to allow the send
+        with patch('app.domain.services.promise_fulfillment_service.ComplianceGate') as MockGate:
+            MockGate.return_value.check = AsyncMock(return_value=ComplianceDecision(STATE_OPTED_IN))
 
             with patch('app.domain.services.promise_fulfillment_service.redis_client') as mock_redis:
                 # setnx returns False = key already existed
@@ -0,0 +1,135 @@
+"""Query-count budgets for hot routes.
+
+Each test seeds a tenant, runs the route once with a small data set and once
+with a larger one, and asserts the statement count stays flat (no per-row
+queries) and under a ceiling. On failure the message lists statements per
+calling repository/service and the repeated statement shapes.
+
+Needs a reachable Postgres (DATABASE_URL); skipped otherwise.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.domain.services.prompt_service import PromptService
+from app.domain.services.sms_service import SmsService
+from app.persistence.models.contact import Contact
+from app.persistence.models.conversation import Conversation, Message
+from app.persistence.models.lead import Lead
+from app.persistence.models.tenant_sms_config import TenantSmsConfig
+
+
+@pytest.fixture
+def fake_llm():
+    client = MagicMock()
+    client.generate = AsyncMock(return_value="We're open 9 to 5, Monday through Friday.")
+    with patch("app.llm.orchestrator.get_llm_client", return_value=client):
+        yield client
+
+
+async def _seed_conversations(db, tenant_id, contact, count, start=0):
+    for i in range(start, start + count):
+        conv = Conversation(
+            tenant_id=tenant_id, channel="sms" if i % 2 else "web",
+            phone_number=contact.phone, contact_id=contact.id,
+        )
+        db.add(conv)
+        await db.flush()
+        db.add_all([
+            Message(conversation_id=conv.id, role="user", content=f"hello {i}", sequence_number=1),
+            Message(conversation_id=conv.id, role="assistant", content="hi!", sequence_number=2),
+        ])
+        db.add(Lead(
+            tenant_id=tenant_id, conversation_id=conv.id, contact_id=contact.id,
+            phone=contact.phone, name=contact.name,
+        ))
+    await db.flush()
+
+
+async def _contact(db, tenant_id):
+    contact = Contact(tenant_id=tenant_id, name="Pat Budget", phone="+15551230000")
+    db.add(contact)
+    await db.flush()
+    return contact
+
+
+async def _flat(db_session, tenant, client, query_budget, path, max_queries):
+    """Run path with 2 and then 12 conversations; counts must match."""
+    contact = await _contact(db_session, tenant.id)
+    url = path.format(contact_id=contact.id)
+
+    await _seed_conversations(db_session, tenant.id, contact, 2)
+    with query_budget(f"GET {path} (2 rows)", max_queries, max_repeats=1) as small:
+        response = await client.get(url)
+    assert response.status_code == 200, response.text
+
+    await _seed_conversations(db_session, tenant.id, contact, 10, start=2)
+    with query_budget(f"GET {path} (12 rows)", max_queries, max_repeats=1) as large:
+        response = await client.get(url)
+    assert response.status_code == 200, response.text
+
+    assert large.count == small.count, large.report()
+    return response.json()
+
+
+async def test_leads_list_budget(db_session, db_tenant, api_client, query_budget):
+    body = await _flat(db_session, db_tenant, api_client, query_budget, "/api/v1/leads", max_queries=6)
+    assert body["total"] == 12
+
+
+async def test_inbox_list_budget(db_session, db_tenant, api_client, query_budget):
+    body = await _flat(
+        db_session, db_tenant, api_client, query_budget, "/api/v1/inbox/conversations", max_queries=4,
+    )
+    assert body["total"] == 12
+
+
+async def test_activity_feed_budget(db_session, db_tenant, api_client, query_budget):
+    body = await _flat(
+        db_session, db_tenant, api_client, query_budget,
+        "/api/v1/contacts/{contact_id}/activity-feed", max_queries=2,
+    )
+    assert body["total"] == 12
+    chat = next(item for item in body["items"] if item["type"] == "chat")
+    assert chat["summary"].startswith("hello") and chat["details"]["message_count"] == 2
+
+
+async def test_chat_turn_budget(db_session, db_tenant, api_client, query_budget, fake_llm):
+    payload = {"tenant_id": db_tenant.id, "session_id": "budget-session", "message": "what are your hours?"}
+    with patch.object(PromptService, "compose_prompt_chat", AsyncMock(return_value="You are helpful.")):
+        response = await api_client.post("/api/v1/chat", json=payload)
+        assert response.status_code == 200, response.text
+        payload["session_id"] = response.json()["session_id"]
+        for _ in range(2):
+            await api_client.post("/api/v1/chat", json=payload)
+
+        with query_budget("POST /chat (turn 4)", max_queries=30, max_repeats=3) as early:
+            response = await api_client.post("/api/v1/chat", json=payload)
+        assert response.status_code == 200, response.text
+        for _ in range(4):
+            await api_client.post("/api/v1/chat", json=payload)
+        with query_budget("POST /chat (turn 9)", max_queries=30, max_repeats=3) as late:
+            await api_client.post("/api/v1/chat", json=payload)
+
+    assert late.count <= early.count, late.report()
+
+
+async def test_inbound_sms_budget(db_session, db_tenant, query_budget, fake_llm):
+    db_session.add(TenantSmsConfig(tenant_id=db_tenant.id, is_enabled=True))
+    await db_session.flush()
+    service = SmsService(db_session)
+
+    async def inbound(text):
+        return await service.process_inbound_sms(db_tenant.id, "+15557654321", text)
+
+    with patch.object(PromptService, "compose_prompt_sms", AsyncMock(return_value="You are helpful.")):
+        await inbound("hi there")
+        with query_budget("inbound SMS (turn 2)", max_queries=30, max_repeats=3) as early:
+            await inbound("what time do you open?")
+        for _ in range(4):
+            await inbound("what time do you open?")
+        with query_budget("inbound SMS (turn 7)", max_queries=30, max_repeats=3) as late:
+            await inbound("what time do you open?")
+
+    assert late.count <= early.count, late.report()
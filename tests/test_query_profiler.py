@@ -0,0 +1,61 @@
+"""Tests for the SQL profiler and per-request N+1 warnings."""
+
+import logging
+from unittest.mock import patch
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+
+from app.api.middleware import RequestContextMiddleware
+from app.core import query_profiler
+from app.core.query_profiler import instrument, profile_queries, statement_shape
+
+
+class TestStatementShape:
+    def test_bound_values_and_in_lists_collapse(self):
+        a = "SELECT * FROM leads WHERE id IN ($1::INTEGER)  AND tenant_id = $2"
+        b = "SELECT * FROM leads\nWHERE id IN ($1::INTEGER, $2::INTEGER, $3::INTEGER) AND tenant_id = $4"
+        assert statement_shape(a) == statement_shape(b)
+        assert statement_shape("SELECT 1 LIMIT %(param_1)s") == "SELECT N LIMIT ?"
+
+
+class TestProfile:
+    def test_records_only_inside_profile_and_flags_repeats(self):
+        engine = create_engine("sqlite://")
+        remove = instrument(engine)
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                with profile_queries("loop") as profile:
+                    for i in range(3):
+                        conn.execute(text("SELECT :x"), {"x": i})
+                    conn.execute(text("SELECT 2"))
+        finally:
+            remove()
+
+        assert profile.count == 4
+        assert [(n, caller) for _, n, caller in profile.repeated_shapes(3)] == [(3, "unknown")]
+        assert "repeated x3" in profile.report()
+        assert profile.by_caller()["unknown"][0] == 4
+
+    async def test_middleware_warns_about_repeated_shapes(self, caplog):
+        app = FastAPI()
+        app.add_middleware(RequestContextMiddleware)
+
+        @app.get("/items/{item_id}")
+        async def items(item_id: int):
+            for _ in range(3):
+                query_profiler.record_statement("SELECT * FROM items WHERE id = $1", 0.001)
+            return {}
+
+        transport = httpx.ASGITransport(app=app)
+        with patch("app.api.middleware.settings.query_profiler_enabled", True), \
+             patch("app.api.middleware.settings.query_profiler_n_plus_one_threshold", 3), \
+             caplog.at_level(logging.WARNING, logger="app.core.query_profiler"):
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                await client.get("/items/1")
+
+        [record] = [r for r in caplog.records if r.name == "app.core.query_profiler"]
+        assert record.getMessage().startswith("Possible N+1 in GET /items/{item_id}: x3")
+        assert record.query_count == 3
@@ -0,0 +1,88 @@
+"""Tests for the BaseRepository batch primitives.
+
+Needs a reachable Postgres (DATABASE_URL); skipped otherwise.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.domain.services.conversation_service import ConversationService
+from app.persistence.models.conversation import Conversation
+from app.persistence.models.jackrabbit_customer import JackrabbitCustomer
+from app.persistence.models.tenant import Tenant
+from app.persistence.repositories.base import BaseRepository
+from app.persistence.repositories.conversation_repository import ConversationRepository
+
+
+def _family(jackrabbit_id, name):
+    return {"jackrabbit_id": jackrabbit_id, "name": name, "phone_number": "+15550000000",
+            "last_synced_at": datetime.utcnow()}
+
+
+async def test_create_and_update_many_in_one_statement_each(db_session, db_tenant, query_budget):
+    repo = ConversationRepository(db_session)
+    other = Tenant(name="Other", subdomain=f"other-{db_tenant.id}")
+    db_session.add(other)
+    await db_session.flush()
+    [foreign_id] = await repo.create_many(other.id, [{"channel": "web"}])
+
+    with query_budget("create_many", max_queries=1):
+        ids = await repo.create_many(db_tenant.id, [
+            {"channel": "sms", "external_id": f"batch-{n}"} for n in range(5)
+        ])
+    rows = (await db_session.execute(
+        select(Conversation.id, Conversation.external_id, Conversation.created_at)
+        .where(Conversation.id.in_(ids))
+    )).all()
+    assert {row.id: row.external_id for row in rows} == {
+        conversation_id: f"batch-{n}" for n, conversation_id in enumerate(ids)
+    }
+    assert all(row.created_at is not None for row in rows)
+
+    # One executemany per distinct set of columns
+    with query_budget("update_many", max_queries=2):
+        await repo.update_many(db_tenant.id, [
+            {"id": ids[0], "status": "resolved"},
+            {"id": ids[1], "topic": "pricing"},
+            {"id": foreign_id, "status": "resolved"},  # other tenant: ignored
+        ])
+    rows = (await db_session.execute(
+        select(Conversation.id, Conversation.status, Conversation.topic)
+        .where(Conversation.id.in_([ids[0], ids[1], foreign_id]))
+    )).all()
+    by_id = {row.id: row for row in rows}
+    assert by_id[ids[0]].status == "resolved"
+    assert by_id[ids[1]].topic == "pricing"
+    assert by_id[foreign_id].status != "resolved"
+
+
+async def test_upsert_many_inserts_then_updates(db_session, db_tenant):
+    repo = BaseRepository(JackrabbitCustomer, db_session)
+    rows = [_family(f"JR{n}", f"Family {n}") for n in range(3)]
+
+    first = await repo.upsert_many(db_tenant.id, rows, index_elements=["tenant_id", "jackrabbit_id"])
+    rows[1]["name"] = "Renamed"
+    second = await repo.upsert_many(
+        db_tenant.id, rows[1:] + [_family("JR9", "New")],
+        index_elements=["tenant_id", "jackrabbit_id"],
+    )
+
+    assert len(set(first)) == 3 and first[1:] == second[:2]
+    names = dict((await db_session.execute(
+        select(JackrabbitCustomer.jackrabbit_id, JackrabbitCustomer.name)
+        .where(JackrabbitCustomer.tenant_id == db_tenant.id)
+    )).all())
+    assert names == {"JR0": "Family 0", "JR1": "Renamed", "JR2": "Family 2", "JR9": "New"}
+
+
+async def test_add_message_skips_refresh(db_session, db_tenant, query_budget):
+    service = ConversationService(db_session)
+    conversation = await service.create_conversation(db_tenant.id, channel="web")
+
+    # conversation lookup, next sequence number, INSERT
+    with query_budget("add_message", max_queries=3):
+        message = await service.add_message(db_tenant.id, conversation.id, "assistant", "Hi")
+
+    assert message.id is not None and message.created_at is not None
+    assert message.sequence_number == 1
@@ -0,0 +1,126 @@
+"""Tests for SMS burst detection."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.domain.services import sms_burst_detector
+from app.domain.services.sms_burst_detector import (
+    BurstConfig,
+    SmsBurstDetector,
+    _stats_from_sends,
+    invalidate_burst_config,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_config_cache():
+    invalidate_burst_config()
+    yield
+    invalidate_burst_config()
+
+
+def _session_with_config(row) -> AsyncMock:
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = row
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+class TestConfigCache:
+    """Tenant burst config is loaded once per TTL, not per send."""
+
+    @pytest.mark.asyncio
+    async def test_config_loaded_once(self):
+        session = _session_with_config(None)
+        detector = SmsBurstDetector(session)
+
+        first = await detector._get_config(1)
+        second = await SmsBurstDetector(session)._get_config(1)
+
+        assert first == BurstConfig()
+        assert second is first
+        session.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reloads(self):
+        session = _session_with_config(None)
+        await SmsBurstDetector(session)._get_config(1)
+
+        invalidate_burst_config(1)
+        await SmsBurstDetector(session)._get_config(1)
+
+        assert session.execute.await_count == 2
+
+
+def test_stats_from_sends():
+    """DB fallback stats match the Redis script's definitions."""
+    stats = _stats_from_sends([130.0, 100.0, 110.0], ["a", "b", "a"])
+
+    assert stats.count == 3
+    assert stats.avg_gap == 15.0
+    assert stats.identical_count == 2
+    assert stats.has_identical
+    assert (stats.first_ts, stats.last_ts) == (100.0, 130.0)
+
+
+class TestRedisTracker:
+    """The Lua tracker prunes, records and summarizes in one call."""
+
+    @pytest.fixture
+    async def fake_redis(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        from app.infrastructure.redis import RedisClient
+
+        client = RedisClient()
+        client._enabled = True
+        client._client = fakeredis.FakeAsyncRedis(decode_responses=True)
+        with patch.object(sms_burst_detector, "redis_client", client):
+            yield client
+
+    async def _send(self, detector, now, body="hello", config=None):
+        config = config or BurstConfig(message_threshold=100)
+        with patch.object(detector, "_analyze_and_record", new_callable=AsyncMock) as analyze:
+            await detector._check_via_redis(1, "+15551234567", sms_burst_detector._content_hash(body), now, config)
+        return analyze
+
+    @pytest.mark.asyncio
+    async def test_counts_gap_and_identical_content(self, fake_redis):
+        detector = SmsBurstDetector(AsyncMock())
+        config = BurstConfig(message_threshold=3)
+
+        await self._send(detector, 1000.0, "same", config)
+        await self._send(detector, 1010.0, "other", config)
+        analyze = await self._send(detector, 1030.0, "same", config)
+
+        stats = analyze.call_args.args[2]
+        assert stats.count == 3
+        assert stats.avg_gap == pytest.approx(15.0)
+        assert stats.identical_count == 2
+        assert stats.first_ts == pytest.approx(1000.0)
+        assert stats.last_ts == pytest.approx(1030.0)
+
+    @pytest.mark.asyncio
+    async def test_prunes_sends_outside_window(self, fake_redis):
+        detector = SmsBurstDetector(AsyncMock())
+        config = BurstConfig(message_threshold=1, time_window_seconds=60)
+
+        await self._send(detector, 1000.0, "same", config)
+        await self._send(detector, 1001.0, "same", config)
+        analyze = await self._send(detector, 1100.0, "same", config)
+
+        stats = analyze.call_args.args[2]
+        assert stats.count == 1
+        assert stats.identical_count == 1
+        content = await fake_redis._client.hgetall("sms_burst:{1:+15551234567}:content")
+        assert list(content.values()) == ["1"]
+
+    @pytest.mark.asyncio
+    async def test_below_threshold_skips_analysis(self, fake_redis):
+        detector = SmsBurstDetector(AsyncMock())
+
+        analyze = await self._send(detector, 1000.0, config=BurstConfig(message_threshold=3))
+
+        analyze.assert_not_called()
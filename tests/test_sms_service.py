@@ -3,6 +3,7 @@
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from app.domain.services.compliance_gate import STATE_OPTED_IN, ComplianceDecision
 from app.domain.services.sms_service import SmsService
 
 
@@ -28,15 +29,15 @@ def sms_service():
 @pytest.mark.asyncio
 async def test_sms_service_opt_out_handling(sms_service):
     """Test SMS service handles STOP keyword."""
-    # Mock DNC service to not block
-    with patch('app.domain.services.sms_service.DncService') as MockDnc:
-        MockDnc.return_value.is_blocked = AsyncMock(return_value=False)
+    # Mock compliance gate: not blocked, already opted in
+    with patch('app.domain.services.sms_service.ComplianceGate') as MockGate, \
+         patch('app.domain.services.sms_service.DncService'):
+        MockGate.return_value.check = AsyncMock(return_value=ComplianceDecision(STATE_OPTED_IN))
 
         # Mock opt-in service - OptInService is created locally in process_inbound_sms
         with patch('app.domain.services.sms_service.OptInService') as MockOptInService:
             mock_instance = MockOptInService.return_value
             mock_instance.opt_out = AsyncMock()
-            mock_instance.is_opted_in = AsyncMock(return_value=True)
             mock_instance.opt_in = AsyncMock()  # For auto opt-in
 
             result = await sms_service.process_inbound_sms(
@@ -0,0 +1,138 @@
+"""Tests for the cached telephony provider factory."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.infrastructure.telephony.factory import (
+    TelephonyProviderFactory,
+    _config_cache,
+    close_cached_providers,
+    invalidate_telephony_config,
+)
+from app.persistence.models.tenant_sms_config import TenantSmsConfig
+
+
+def _config(**overrides) -> TenantSmsConfig:
+    values = {
+        "id": 1,
+        "tenant_id": 1,
+        "is_enabled": True,
+        "provider": "telnyx",
+        "telnyx_api_key": "KEY_one",
+        "telnyx_messaging_profile_id": "profile-1",
+        "telnyx_phone_number": "+15550001111",
+        "voice_enabled": False,
+        "settings": {"followup_enabled": True},
+    }
+    values.update(overrides)
+    return TenantSmsConfig(**values)
+
+
+def _session_returning(config: TenantSmsConfig | None) -> AsyncMock:
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = config
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_config_is_shared_across_factories():
+    """A second factory (new request/session) reuses the cached config."""
+    first_session = _session_returning(_config())
+    second_session = _session_returning(_config())
+
+    config = await TelephonyProviderFactory(first_session).get_config(1)
+    again = await TelephonyProviderFactory(second_session).get_config(1)
+
+    assert config.telnyx_phone_number == "+15550001111"
+    assert again is config
+    first_session.execute.assert_awaited_once()
+    second_session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_send_path_does_no_config_queries_when_warm():
+    """get_config + get_sms_provider on a warm cache hit the DB zero times."""
+    await TelephonyProviderFactory(_session_returning(_config())).get_config(1)
+
+    session = _session_returning(None)
+    factory = TelephonyProviderFactory(session)
+    config = await factory.get_config(1)
+    provider = await factory.get_sms_provider(1)
+
+    assert config is not None
+    assert provider is not None
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_provider_is_reused_and_pooled():
+    """The same warm provider instance is returned for repeated sends."""
+    session = _session_returning(_config())
+
+    first = await TelephonyProviderFactory(session).get_sms_provider(1)
+    second = await TelephonyProviderFactory(session).get_sms_provider(1)
+
+    assert first is second
+    assert first.pooled is True
+
+
+@pytest.mark.asyncio
+async def test_invalidate_picks_up_new_credentials():
+    """After a config write, the next lookup reloads config and rebuilds the provider."""
+    old_provider = await TelephonyProviderFactory(
+        _session_returning(_config())
+    ).get_sms_provider(1)
+
+    invalidate_telephony_config(1)
+    new_provider = await TelephonyProviderFactory(
+        _session_returning(_config(telnyx_api_key="KEY_two"))
+    ).get_sms_provider(1)
+
+    assert new_provider is not old_provider
+    assert new_provider.api_key == "KEY_two"
+
+
+@pytest.mark.asyncio
+async def test_evicted_providers_are_closed():
+    """Invalidation and credential changes close the replaced provider's client."""
+    invalidated = await TelephonyProviderFactory(_session_returning(_config())).get_sms_provider(1)
+    invalidated.aclose = AsyncMock()
+    invalidate_telephony_config(1)
+
+    replaced = await TelephonyProviderFactory(
+        _session_returning(_config(telnyx_api_key="KEY_two"))
+    ).get_sms_provider(1)
+    replaced.aclose = AsyncMock()
+    # Config expired and was changed on another instance
+    _config_cache.clear()
+    await TelephonyProviderFactory(
+        _session_returning(_config(telnyx_api_key="KEY_three"))
+    ).get_sms_provider(1)
+    await close_cached_providers()
+
+    invalidated.aclose.assert_awaited_once()
+    replaced.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_disabled_tenant_only_gets_provider_when_not_required():
+    """Transactional sends can opt out of the is_enabled requirement."""
+    session = _session_returning(_config(is_enabled=False))
+    factory = TelephonyProviderFactory(session)
+
+    assert await factory.get_sms_provider(1) is None
+    assert await factory.get_sms_provider(1, require_enabled=False) is not None
+
+
+@pytest.mark.asyncio
+async def test_cached_snapshot_does_not_share_mutable_settings():
+    """Mutating the session-loaded row's JSON does not leak into the cache."""
+    loaded = _config()
+    snapshot = await TelephonyProviderFactory(_session_returning(loaded)).get_config(1)
+
+    loaded.settings["followup_enabled"] = False
+
+    assert snapshot.settings["followup_enabled"] is True
@@ -19,6 +19,7 @@ import json
 
 from fastapi.testclient import TestClient
 
+from app.domain.services.compliance_gate import STATE_DNC, ComplianceDecision
 from app.main import app
 
 client = TestClient(app)
@@ -623,9 +624,9 @@ class TestSmsNotSending:
         from app.domain.services.promise_fulfillment_service import PromiseFulfillmentService
         from app.domain.services.promise_detector import DetectedPromise
 
-        with patch("app.domain.services.promise_fulfillment_service.DncService") as MockDnc:
+        with patch("app.domain.services.promise_fulfillment_service.ComplianceGate") as MockGate:
             # Simulate DNC block
-            MockDnc.return_value.is_blocked = AsyncMock(return_value=True)
+            MockGate.return_value.check = AsyncMock(return_value=ComplianceDecision(STATE_DNC))
 
             mock_session = AsyncMock()
             service = PromiseFulfillmentService(mock_session)
@@ -13,8 +13,10 @@ def mock_session():
     """Create a mock database session."""
     session = AsyncMock()
     session.add = MagicMock()
+    session.add_all = MagicMock()
     session.commit = AsyncMock()
     session.refresh = AsyncMock()
+    session.info = {}
     # Mock execute to return None for escalation settings query (uses defaults)
     mock_result = MagicMock()
     mock_result.scalar_one_or_none.return_value = None
@@ -29,7 +31,13 @@ def notification_service(mock_session):
     service = NotificationService(mock_session)
     # Pre-mock user_repo.list to return empty by default (tests override as needed)
     service.user_repo.list = AsyncMock(return_value=[])
-    return service
+    # Notifications are written on their own session; hand back the mock
+    factory = MagicMock()
+    factory.return_value.__aenter__.return_value = mock_session
+    # Email/SMS deliveries are dispatched in the background; keep that out of unit tests
+    with patch("app.infrastructure.notifications.notification_dispatcher"), \
+            patch("app.infrastructure.notifications.async_session_factory", factory):
+        yield service
 
 
 class TestNotifyCallSummary:
@@ -0,0 +1,168 @@
+"""Tests for the webhook inbox and its ordered dispatcher.
+
+Needs a reachable Postgres (DATABASE_URL); skipped otherwise.
+"""
+
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import func, select
+
+from app.infrastructure.webhook_event_dispatcher import WebhookEventDispatcher
+from app.persistence.models.webhook_event import WebhookEvent, WebhookEventStatus
+from app.settings import settings
+
+
+@asynccontextmanager
+async def _handler_session():
+    yield None
+
+
+@pytest.fixture
+def dispatcher(postgres_available):
+    dispatcher = WebhookEventDispatcher()
+    with (
+        patch.object(dispatcher, "schedule"),
+        patch("app.persistence.database.async_session_factory", _handler_session),
+    ):
+        yield dispatcher
+
+
+@pytest.fixture
+def handled(dispatcher):
+    """Registers a "test" handler; returns (payload ids handled, ids set to fail)."""
+    calls, failing = [], set()
+
+    async def handler(payload, session):
+        calls.append(payload["n"])
+        if payload["n"] in failing:
+            raise RuntimeError("boom")
+
+    dispatcher.register("test", handler)
+    return calls, failing
+
+
+async def _enqueue(dispatcher, session, n, ordering_key):
+    return await dispatcher.enqueue(session, "test", {"n": n}, f"evt-{n}", ordering_key)
+
+
+async def _make_due(session):
+    for event in (await session.execute(select(WebhookEvent))).scalars():
+        event.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+    await session.commit()
+
+
+async def test_enqueue_ignores_repeated_events(db_session, dispatcher):
+    first = await _enqueue(dispatcher, db_session, 1, "call:a")
+    repeat = await _enqueue(dispatcher, db_session, 1, "call:a")
+
+    assert first is not None and repeat is None
+    events = (await db_session.execute(select(WebhookEvent))).scalars().all()
+    assert [(e.idempotency_key, e.status) for e in events] == [("evt-1", WebhookEventStatus.PENDING)]
+    dispatcher.schedule.assert_called_once_with(["call:a"])
+
+
+async def test_failed_event_holds_back_its_key_only(db_session, dispatcher, handled):
+    calls, failing = handled
+    ids = [
+        await _enqueue(dispatcher, db_session, n, key)
+        for n, key in [(1, "call:a"), (2, "call:a"), (3, "call:b"), (4, "call:b")]
+    ]
+    failing.add(1)
+
+    counts = await dispatcher.dispatch(db_session)
+
+    assert calls == [1, 3, 4]
+    assert counts == {WebhookEventStatus.PENDING: 1, WebhookEventStatus.DONE: 2}
+    head = await db_session.get(WebhookEvent, ids[0])
+    assert (head.attempts, head.last_error) == (1, "RuntimeError: boom")
+    assert head.next_attempt_at > datetime.utcnow()
+
+    # Not due yet: nothing runs
+    assert await dispatcher.dispatch(db_session) == {}
+
+    failing.clear()
+    await _make_due(db_session)
+    await dispatcher.dispatch(db_session)
+
+    assert calls == [1, 3, 4, 1, 2]
+    statuses = (await db_session.execute(select(WebhookEvent.status))).scalars().all()
+    assert set(statuses) == {WebhookEventStatus.DONE}
+
+
+async def test_dead_letters_after_max_attempts_and_requeues(db_session, dispatcher, handled, monkeypatch):
+    monkeypatch.setattr(settings, "webhook_ingest_max_attempts", 2)
+    calls, failing = handled
+    first = await _enqueue(dispatcher, db_session, 1, "sms:+1:+2")
+    await _enqueue(dispatcher, db_session, 2, "sms:+1:+2")
+    failing.add(1)
+
+    await dispatcher.dispatch(db_session)
+    await _make_due(db_session)
+    await dispatcher.dispatch(db_session)
+
+    # The dead event no longer blocks the next one
+    assert calls == [1, 1, 2]
+    dead = await db_session.get(WebhookEvent, first)
+    assert (dead.status, dead.attempts) == (WebhookEventStatus.DEAD, 2)
+
+    assert await dispatcher.requeue_dead(db_session) == 1
+    await db_session.refresh(dead)
+    assert (dead.status, dead.attempts) == (WebhookEventStatus.PENDING, 0)
+
+    failing.clear()
+    await dispatcher.dispatch(db_session)
+    await db_session.refresh(dead)
+    assert dead.status == WebhookEventStatus.DONE
+
+
+async def test_ai_call_webhook_is_stored_and_acked(api_client, db_session, monkeypatch):
+    from app.infrastructure.webhook_event_dispatcher import webhook_event_dispatcher
+
+    monkeypatch.setattr(settings, "webhook_ingest_enabled", True)
+    body = {"data": {"id": "evt-123", "event_type": "call.conversation.ended",
+                     "payload": {"call_control_id": "v3:abc"}}}
+
+    with patch.object(webhook_event_dispatcher, "schedule") as schedule:
+        first = await api_client.post("/api/v1/telnyx/ai-call-complete", json=body)
+        repeat = await api_client.post("/api/v1/telnyx/ai-call-complete", json=body)
+
+    assert first.json() == {"status": "ok", "queued": True}
+    assert repeat.json() == {"status": "ok", "queued": False}
+    schedule.assert_called_once_with(["call:v3:abc"])
+    [event] = (await db_session.execute(select(WebhookEvent))).scalars().all()
+    assert (event.kind, event.idempotency_key, event.payload) == ("telnyx.ai_call_complete", "evt-123", body)
+
+
+async def test_purge_deletes_processed_events_past_retention(db_session, dispatcher, handled):
+    old, recent, pending = [await _enqueue(dispatcher, db_session, n, f"call:{n}") for n in (1, 2, 3)]
+    await dispatcher.dispatch(db_session, ordering_keys=["call:1", "call:2"])
+    (await db_session.get(WebhookEvent, old)).processed_at = (
+        datetime.utcnow() - timedelta(days=settings.webhook_event_retention_days, hours=1)
+    )
+    await db_session.commit()
+
+    assert await dispatcher.purge_done(db_session) == 1
+
+    remaining = (await db_session.execute(select(WebhookEvent.id))).scalars().all()
+    assert sorted(remaining) == [recent, pending]
+
+
+async def test_claims_no_more_events_than_free_slots(db_session, dispatcher, monkeypatch):
+    monkeypatch.setattr(settings, "webhook_ingest_concurrency", 1)
+    in_processing = []
+
+    async def handler(payload, session):
+        result = await db_session.execute(
+            select(func.count()).where(WebhookEvent.status == WebhookEventStatus.PROCESSING)
+        )
+        in_processing.append(result.scalar_one())
+
+    dispatcher.register("test", handler)
+    for n in (1, 2, 3):
+        await _enqueue(dispatcher, db_session, n, f"call:{n}")
+
+    assert await dispatcher.dispatch(db_session) == {WebhookEventStatus.DONE: 3}
+    assert in_processing == [1, 1, 1]
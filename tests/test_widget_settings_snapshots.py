@@ -0,0 +1,73 @@
+"""Tests for per-variant widget A/B analytics grouped by stored settings_hash.
+
+Needs a reachable Postgres (DATABASE_URL); skipped otherwise.
+"""
+
+from datetime import datetime
+
+from app.persistence.models.widget_event import WidgetEvent, settings_hash
+
+VARIANT_A = {"colors": {"primary": "#ff0000"}, "behavior": {"auto_open": False}}
+VARIANT_B = {"behavior": {"auto_open": True}, "colors": {"primary": "#00ff00"}}
+
+
+def test_settings_hash_ignores_key_order_and_follows_snapshot():
+    reordered = {"behavior": VARIANT_A["behavior"], "colors": VARIANT_A["colors"]}
+    assert settings_hash(VARIANT_A) == settings_hash(reordered)
+    assert settings_hash(VARIANT_A) != settings_hash(VARIANT_B)
+    assert settings_hash({}) is None
+
+    event = WidgetEvent(tenant_id=1, event_type="impression", visitor_id="v", settings_snapshot=VARIANT_A)
+    assert event.settings_hash == settings_hash(VARIANT_A)
+
+
+async def test_variants_aggregate_in_one_statement(db_session, db_tenant, api_client, query_budget):
+    now = datetime.utcnow()
+
+    def event(event_type, visitor, snapshot=None):
+        return WidgetEvent(
+            tenant_id=db_tenant.id, event_type=event_type, visitor_id=visitor,
+            settings_snapshot=snapshot, created_at=now,
+        )
+
+    db_session.add_all([
+        # Variant A: 3 impressions from 2 visitors, one of whom opens twice
+        event("impression", "v1", VARIANT_A),
+        event("impression", "v1", VARIANT_A),
+        event("impression", "v2", VARIANT_A),
+        event("widget_open", "v1"),
+        event("manual_open", "v1"),
+        event("widget_open", "v1"),
+        # Variant B: 1 impression, auto-opened
+        event("impression", "v3", VARIANT_B),
+        event("auto_open", "v3"),
+        # Opens from a visitor with no impression in range are ignored
+        event("widget_open", "v9"),
+    ])
+    await db_session.flush()
+
+    with query_budget("settings-snapshots", max_queries=3):
+        response = await api_client.get("/api/v1/analytics/widget/settings-snapshots")
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["total_variations"] == 2
+    a, b = body["variations"]
+
+    assert a["settings_hash"] == settings_hash(VARIANT_A)
+    assert a["settings"] == VARIANT_A
+    assert a["metrics"] | {"first_seen": None, "last_seen": None} == {
+        "impressions": 3,
+        "widget_opens": 2,
+        "open_rate": 0.667,
+        "manual_opens": 1,
+        "auto_opens": 0,
+        "unique_visitors": 2,
+        "converted_visitors": 1,
+        "conversion_rate": 0.5,
+        "first_seen": None,
+        "last_seen": None,
+    }
+    assert b["settings_hash"] == settings_hash(VARIANT_B)
+    assert (b["metrics"]["impressions"], b["metrics"]["auto_opens"]) == (1, 1)
+    assert b["metrics"]["converted_visitors"] == 1